@@ -0,0 +1,124 @@
+"""Audio payload framing shared by the producer and every audio consumer.
+
+A message on ``audio.live.*`` / ``audio.backfill.*`` / ``preroll.audio`` is a
+run of raw int16 PCM. With chunk packing enabled the producer concatenates
+several equal-sized capture periods into one message and describes them in
+NATS headers:
+
+- ``LiveSTT-Periods``: number of capture periods in the payload
+- ``LiveSTT-Sample-Offset``: index of the first sample since capture start
+- ``LiveSTT-Capture-Ts``: wall-clock capture time of the first sample, when
+  latency tracing is on (see ``messaging.latency``)
+
+The payload may also be compressed with a transport codec named in
+``LiveSTT-Codec`` (see ``messaging.codec``); the whole packed frame is
+encoded as one unit. Messages without these headers are a single raw PCM
+period, so consumers written against unpacked audio keep working.
+"""
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .codec import HEADER_CODEC, PcmCodec, get_codec
+from .latency import HEADER_CAPTURE_TS, format_ts, header_ts
+
+HEADER_EOS = "LiveSTT-EOS"
+HEADER_PERIODS = "LiveSTT-Periods"
+HEADER_SAMPLE_OFFSET = "LiveSTT-Sample-Offset"
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # int16 mono
+
+
+def _header_int(headers: Mapping[str, Any] | None, key: str) -> int | None:
+    if not headers:
+        return None
+    try:
+        value = int(headers.get(key))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+@dataclass(frozen=True)
+class AudioFrame:
+    """One audio message: payload plus its packing and codec metadata.
+
+    ``data`` is int16 PCM when ``codec`` is ``"pcm"``, otherwise the encoded
+    bytes.
+    """
+
+    data: bytes
+    periods: int = 1
+    sample_offset: int | None = None
+    codec: str = PcmCodec.name
+    capture_ts: float | None = None
+
+    @classmethod
+    def from_msg(cls, msg: Any, decode: bool = True) -> "AudioFrame":
+        """Build a frame from a NATS message (headers are optional).
+
+        With ``decode`` (the default) the payload is decoded to PCM; pass
+        False to keep it encoded, e.g. to forward it unchanged.
+        """
+        headers = getattr(msg, "headers", None)
+        periods = _header_int(headers, HEADER_PERIODS) or 1
+        codec = headers.get(HEADER_CODEC) if isinstance(headers, Mapping) else None
+        frame = cls(
+            data=msg.data,
+            periods=max(periods, 1),
+            sample_offset=_header_int(headers, HEADER_SAMPLE_OFFSET),
+            codec=codec or PcmCodec.name,
+            capture_ts=header_ts(headers, HEADER_CAPTURE_TS),
+        )
+        return frame.decoded() if decode else frame
+
+    def encoded(self, codec: str) -> "AudioFrame":
+        """This frame's PCM compressed with ``codec``."""
+        pcm = self.decoded()
+        return replace(pcm, data=get_codec(codec).encode(pcm.data), codec=codec)
+
+    def decoded(self) -> "AudioFrame":
+        """This frame with its payload as raw PCM."""
+        if self.codec == PcmCodec.name:
+            return self
+        pcm = get_codec(self.codec).decode(self.data)
+        return replace(self, data=pcm, codec=PcmCodec.name)
+
+    @property
+    def samples(self) -> int:
+        width = get_codec(self.codec).sample_width
+        if width is None:
+            return self.decoded().samples
+        return len(self.data) // width
+
+    @property
+    def duration_s(self) -> float:
+        return self.samples / SAMPLE_RATE
+
+    def headers(self) -> dict[str, str]:
+        """NATS headers describing this frame."""
+        headers = {HEADER_PERIODS: str(self.periods)}
+        if self.sample_offset is not None:
+            headers[HEADER_SAMPLE_OFFSET] = str(self.sample_offset)
+        if self.codec != PcmCodec.name:
+            headers[HEADER_CODEC] = self.codec
+        if self.capture_ts is not None:
+            headers[HEADER_CAPTURE_TS] = format_ts(self.capture_ts)
+        return headers
+
+    def iter_periods(self) -> Iterator[bytes]:
+        """Yield the PCM capture periods in order (the whole payload if unpacked)."""
+        data = self.decoded().data
+        if self.periods <= 1:
+            if data:
+                yield data
+            return
+        size = len(data) // self.periods
+        if size == 0 or size * self.periods != len(data):
+            # Corrupt or truncated packing — hand over the payload unsplit
+            yield data
+            return
+        for start in range(0, len(data), size):
+            yield data[start : start + size]
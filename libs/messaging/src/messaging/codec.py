@@ -0,0 +1,158 @@
+"""Pluggable transport codecs for audio payloads.
+
+The producer encodes each message with one codec and names it in the
+``LiveSTT-Codec`` header; consumers look the codec up here and decode back
+to 16 kHz int16 PCM. A missing header means raw PCM.
+
+- ``pcm``: identity (linear16)
+- ``mulaw``: G.711 µ-law, 2x, near-lossless for speech; Deepgram accepts it
+  as-is (``encoding=mulaw``)
+- ``mulaw-zlib``: µ-law bytes deflated at level 1, ~3x on speech with
+  pauses; Deepgram does not accept it, so stt-provider decodes it to PCM
+  (and re-encodes if DEEPGRAM_ENCODING=mulaw)
+- ``zlib-delta``: lossless — first-order sample deltas, split into byte
+  planes and deflated at level 1 (~1.5x)
+
+Codecs are stateless per message, so any message can be decoded on its own
+(replay, backfill, pre-roll flush).
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+HEADER_CODEC = "LiveSTT-Codec"
+
+
+class AudioCodec(ABC):
+    name: str = ""
+    # Deepgram ``encoding`` that accepts the encoded bytes unchanged, if any
+    deepgram_encoding: str | None = None
+    # Encoded bytes per sample for fixed-rate codecs (None = variable)
+    sample_width: int | None = None
+
+    @abstractmethod
+    def encode(self, pcm: bytes) -> bytes:
+        """Encode int16 PCM."""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> bytes:
+        """Decode back to int16 PCM."""
+
+
+class PcmCodec(AudioCodec):
+    name = "pcm"
+    deepgram_encoding = "linear16"
+    sample_width = 2
+
+    def encode(self, pcm: bytes) -> bytes:
+        return pcm
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+
+def _mulaw_tables() -> tuple[np.ndarray, np.ndarray]:
+    """Lookup tables: uint16 sample bits -> µ-law byte, µ-law byte -> int16.
+
+    Bit-exact with the reference G.711 coder (as in CPython's audioop).
+    """
+    bias = 0x84
+    y = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(y < 0, 0x7F, 0xFF)
+    mag = np.minimum(np.abs(y), 8159) + (bias >> 2)
+    seg = np.floor(np.log2(mag)).astype(np.int32) - 5
+    uval = np.where(seg > 7, 0x7F, (seg << 4) | ((mag >> (seg + 1)) & 0x0F))
+    encode = ((uval ^ mask) & 0xFF).astype(np.uint8)
+
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exp = (u >> 4) & 0x07
+    value = ((((u & 0x0F) << 3) + bias) << exp) - bias
+    decode = np.where(u & 0x80, -value, value).astype(np.int16)
+    return encode, decode
+
+
+class MulawCodec(AudioCodec):
+    name = "mulaw"
+    deepgram_encoding = "mulaw"
+    sample_width = 1
+
+    def __init__(self) -> None:
+        self._encode, self._decode = _mulaw_tables()
+
+    def encode(self, pcm: bytes) -> bytes:
+        bits = np.frombuffer(pcm, dtype=np.uint16)
+        return bytes(self._encode[bits].data)
+
+    def decode(self, data: bytes) -> bytes:
+        codes = np.frombuffer(data, dtype=np.uint8)
+        return bytes(self._decode[codes].data)
+
+
+class MulawZlibCodec(MulawCodec):
+    name = "mulaw-zlib"
+    deepgram_encoding = None
+    sample_width = None
+
+    def __init__(self, level: int = 1) -> None:
+        super().__init__()
+        self.level = level
+
+    def encode(self, pcm: bytes) -> bytes:
+        return zlib.compress(super().encode(pcm), self.level)
+
+    def decode(self, data: bytes) -> bytes:
+        return super().decode(zlib.decompress(data))
+
+
+class ZlibDeltaCodec(AudioCodec):
+    name = "zlib-delta"
+
+    def __init__(self, level: int = 1) -> None:
+        self.level = level
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        delta = np.empty_like(samples)
+        if samples.size:
+            delta[0] = samples[0]
+            # int16 wrap-around is undone exactly by the int16 cumsum in decode
+            np.subtract(samples[1:], samples[:-1], out=delta[1:])
+        planes = delta.view(np.uint8).reshape(-1, 2).T  # low bytes, then high
+        return zlib.compress(planes.tobytes(), self.level)
+
+    def decode(self, data: bytes) -> bytes:
+        raw = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        delta = raw.reshape(2, -1).T.copy().view(np.int16).ravel()
+        return bytes(np.cumsum(delta, dtype=np.int16).data)
+
+
+_CODECS: dict[str, AudioCodec] = {}
+
+
+def register_codec(codec: AudioCodec) -> None:
+    """Make a codec available by name to producers and consumers."""
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str | None) -> AudioCodec:
+    """Look up a codec by header value; ``None`` or empty means raw PCM."""
+    try:
+        return _CODECS[name or PcmCodec.name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown audio codec {name!r} (available: {sorted(_CODECS)})"
+        ) from None
+
+
+def codec_for_deepgram(encoding: str) -> AudioCodec | None:
+    """The codec whose output Deepgram accepts as ``encoding``, if any."""
+    for codec in _CODECS.values():
+        if codec.deepgram_encoding == encoding:
+            return codec
+    return None
+
+
+for _codec in (PcmCodec(), MulawCodec(), MulawZlibCodec(), ZlibDeltaCodec()):
+    register_codec(_codec)
@@ -0,0 +1,187 @@
+"""Consumer lag across every JetStream durable, sampled continuously.
+
+``LagMonitor`` lists all streams and their durable consumers every
+``interval_s`` and turns two consecutive ``consumer_info`` samples into:
+
+- ``pending``: messages not yet processed (``num_pending`` plus delivered
+  but unacked)
+- ``pending_s``: the same in seconds of audio, for audio streams; the audio
+  per message is read from the stream's newest message (packing and codec
+  headers, see ``messaging.audio``) rather than assumed
+- ``ack_rate``: messages acknowledged per second
+- ``drain_rate``: net reduction of ``pending`` per second (negative while the
+  consumer falls further behind)
+- ``eta_s``: time to catch up at the current drain rate; None while the
+  backlog is not shrinking
+
+Each sample is kept as ``latest`` and, with a NATS client, published as JSON
+on ``system.lag``. Lag reporting is advisory: a failed sample is logged at
+debug level and retried on the next interval.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .audio import AudioFrame
+
+SUBJECT_LAG = "system.lag"
+
+# Streams whose messages are audio (pending converts to seconds)
+AUDIO_STREAMS = ("AUDIO_STREAM", "PRE_BUFFER")
+# Audio per message until a stream's newest message has been read
+_DEFAULT_MSG_S = 0.096
+# Seconds between samples
+_INTERVAL_S = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConsumerLag:
+    """One durable's backlog and how fast it is draining."""
+
+    stream: str
+    durable: str
+    pending: int
+    redelivered: int = 0
+    pending_s: float | None = None  # audio streams only
+    ack_rate: float | None = None  # msgs/s; None until two samples exist
+    drain_rate: float | None = None  # msgs/s of backlog removed
+    eta_s: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        def _round(value: float | None) -> float | None:
+            return None if value is None else round(value, 2)
+
+        return {
+            "stream": self.stream,
+            "durable": self.durable,
+            "pending": self.pending,
+            "redelivered": self.redelivered,
+            "pending_s": _round(self.pending_s),
+            "ack_rate": _round(self.ack_rate),
+            "drain_rate": _round(self.drain_rate),
+            "eta_s": _round(self.eta_s),
+        }
+
+
+def eta_s(pending: int, drain_rate: float | None) -> float | None:
+    """Seconds until ``pending`` reaches zero; None if it is not shrinking."""
+    if pending <= 0:
+        return 0.0
+    if drain_rate is None or drain_rate <= 0:
+        return None
+    return pending / drain_rate
+
+
+@dataclass
+class _Sample:
+    at: float
+    pending: int
+    acked: int  # ack floor consumer sequence
+
+
+class LagMonitor:
+    """Sample lag of every durable consumer on an interval."""
+
+    def __init__(
+        self,
+        js: Any,
+        nc: Any = None,
+        interval_s: float = _INTERVAL_S,
+        subject: str = SUBJECT_LAG,
+    ) -> None:
+        self._js = js
+        self._nc = nc
+        self.interval_s = interval_s
+        self._subject = subject
+        self._previous: dict[tuple[str, str], _Sample] = {}
+        # stream -> (last_seq the duration was read at, seconds per message)
+        self._msg_s: dict[str, tuple[int, float]] = {}
+        self.latest: list[ConsumerLag] = []
+        self.sampled_at: float | None = None
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Sample and publish every ``interval_s`` until stop_event fires."""
+        while not stop_event.is_set():
+            try:
+                await self.sample()
+                await self._publish()
+            except Exception as e:
+                logger.debug(f"Consumer lag sample failed: {e}")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=self.interval_s)
+
+    async def sample(self) -> list[ConsumerLag]:
+        """Read every stream's durables once and update ``latest``."""
+        lags: list[ConsumerLag] = []
+        for stream in await self._js.streams_info():
+            name = stream.config.name
+            consumers = [
+                c for c in await self._js.consumers_info(name) if c.config.durable_name
+            ]
+            if not consumers:
+                continue
+            msg_s = None
+            if name in AUDIO_STREAMS:
+                msg_s = await self._seconds_per_msg(name, stream.state.last_seq)
+            lags.extend(self._lag(name, info, msg_s) for info in consumers)
+        self.latest = lags
+        self.sampled_at = time.time()
+        return lags
+
+    def _lag(self, stream: str, info: Any, msg_s: float | None) -> ConsumerLag:
+        now = time.monotonic()
+        durable = info.config.durable_name
+        pending = (info.num_pending or 0) + (info.num_ack_pending or 0)
+        current = _Sample(now, pending, info.ack_floor.consumer_seq or 0)
+        previous = self._previous.get((stream, durable))
+        self._previous[(stream, durable)] = current
+        ack_rate = drain_rate = None
+        if previous is not None and now > previous.at:
+            elapsed = now - previous.at
+            ack_rate = max(current.acked - previous.acked, 0) / elapsed
+            drain_rate = (previous.pending - current.pending) / elapsed
+        return ConsumerLag(
+            stream=stream,
+            durable=durable,
+            pending=pending,
+            redelivered=info.num_redelivered or 0,
+            pending_s=None if msg_s is None else pending * msg_s,
+            ack_rate=ack_rate,
+            drain_rate=drain_rate,
+            eta_s=eta_s(pending, drain_rate),
+        )
+
+    async def _seconds_per_msg(self, stream: str, last_seq: int) -> float:
+        """Audio per message, from the stream's newest message."""
+        cached = self._msg_s.get(stream)
+        if cached is not None and cached[0] == last_seq:
+            return cached[1]
+        seconds = cached[1] if cached is not None else _DEFAULT_MSG_S
+        if last_seq:
+            try:
+                raw = await self._js.get_msg(stream, seq=last_seq)
+                frame_s = AudioFrame.from_msg(raw, decode=False).duration_s
+                if frame_s > 0:  # EOS markers carry no audio
+                    seconds = frame_s
+            except Exception as e:
+                logger.debug(f"Could not read newest {stream} message: {e}")
+        self._msg_s[stream] = (last_seq, seconds)
+        return seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": self.sampled_at,
+            "consumers": [lag.as_dict() for lag in self.latest],
+        }
+
+    async def _publish(self) -> None:
+        if self._nc is None:
+            return
+        await self._nc.publish(self._subject, json.dumps(self.as_dict()).encode())
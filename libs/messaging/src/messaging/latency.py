@@ -0,0 +1,152 @@
+"""End-to-end latency tracing from capture to WebSocket broadcast.
+
+Every hop stamps a wall-clock time (epoch seconds) into a trace:
+
+- ``capture``: audio-producer, when the first period of a message was read
+  from the device (``LiveSTT-Capture-Ts`` header)
+- ``publish``: audio-producer, when the message entered the publish
+  pipeline (``LiveSTT-Publish-Ts`` header)
+- ``stt_send``: stt-provider, when the audio was sent to Deepgram
+- ``stt_result``: stt-provider, when the transcript for it came back
+- ``fuse``: identity-manager, when the speaker was attached
+- ``broadcast``: api-gateway, when the transcript went out on WebSockets
+
+Audio carries the first two as NATS headers; transcripts carry the whole
+trace as a ``trace`` object in their JSON payload. ``LatencyStats``
+aggregates traces into per-stage histograms, where each stage is the time
+since the previous stamped stage.
+"""
+
+import bisect
+import math
+from collections.abc import Collection, Mapping
+from typing import Any
+
+HEADER_CAPTURE_TS = "LiveSTT-Capture-Ts"
+HEADER_PUBLISH_TS = "LiveSTT-Publish-Ts"
+TRACE_FIELD = "trace"
+
+# Hops in pipeline order
+STAGES = ("capture", "publish", "stt_send", "stt_result", "fuse", "broadcast")
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (5, 10, 25, 50, 100, 200, 300, 500, 750, 1000, 2000, 5000, 10000)
+
+
+def header_ts(headers: Mapping[str, Any] | None, key: str) -> float | None:
+    """Read a timestamp header; None if absent or malformed."""
+    if not isinstance(headers, Mapping):
+        return None
+    try:
+        value = float(headers[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def format_ts(ts: float) -> str:
+    return f"{ts:.6f}"
+
+
+def trace_from_headers(headers: Mapping[str, Any] | None) -> dict[str, float]:
+    """The producer's part of a trace, from an audio message's headers."""
+    trace: dict[str, float] = {}
+    for stage, key in (("capture", HEADER_CAPTURE_TS), ("publish", HEADER_PUBLISH_TS)):
+        ts = header_ts(headers, key)
+        if ts is not None:
+            trace[stage] = ts
+    return trace
+
+
+def stage_latencies(trace: Mapping[str, Any]) -> dict[str, float]:
+    """Seconds spent reaching each stamped stage from the previous one.
+
+    ``total`` spans the first to the last stamped stage. Stages missing from
+    the trace are skipped (their time is attributed to the next stage).
+    """
+    latencies: dict[str, float] = {}
+    first: float | None = None
+    prev: float | None = None
+    for stage in STAGES:
+        ts = trace.get(stage)
+        if not isinstance(ts, int | float):
+            continue
+        if prev is not None:
+            latencies[stage] = ts - prev
+        else:
+            first = ts
+        prev = ts
+    if first is not None and prev is not None and len(latencies) > 0:
+        latencies["total"] = prev - first
+    return latencies
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = max(seconds * 1000, 0.0)
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding quantile ``q``."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"le_{b}" for b in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p90_ms": self.quantile(0.9),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class LatencyStats:
+    """Per-stage latency histograms, grouped by a key (e.g. live/backfill)."""
+
+    def __init__(self) -> None:
+        self._groups: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def observe(
+        self,
+        trace: Mapping[str, Any],
+        group: str = "live",
+        stages: Collection[str] | None = None,
+    ) -> None:
+        """Record a trace's stages; ``stages`` limits it to those hops (e.g.
+        one measured on a side path that the rest of the trace skips)."""
+        histograms = self._groups.setdefault(group, {})
+        for stage, seconds in stage_latencies(trace).items():
+            if stages is None or stage in stages:
+                histograms.setdefault(stage, LatencyHistogram()).observe(seconds)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        order = {stage: i for i, stage in enumerate((*STAGES, "total"))}
+        return {
+            group: {
+                stage: histograms[stage].as_dict()
+                for stage in sorted(histograms, key=order.__getitem__)
+            }
+            for group, histograms in self._groups.items()
+        }
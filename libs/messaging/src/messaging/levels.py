@@ -0,0 +1,103 @@
+"""Signal level and silence detection on int16 PCM.
+
+audio-producer runs ``SilenceDetector.update`` on every published chunk, on
+the same core as capture (session auto-stop); stt-provider runs it on every
+message it forwards (the silence gate). Energy is computed from a zero-copy
+int16 view of the chunk, widened into a preallocated float32 scratch buffer
+and reduced with a single dot product — steady state allocates no
+per-sample memory.
+"""
+
+import math
+
+import numpy as np
+
+_FULL_SCALE = 32768.0
+# Scratch capacity for one capture period (ADR-0012: 1536 samples)
+_DEFAULT_MAX_SAMPLES = 1536
+
+
+def energy_to_dbfs(sum_sq: float, n_samples: int) -> float:
+    """Convert a sum of squared int16 samples to an RMS level in dBFS."""
+    if n_samples <= 0 or sum_sq <= 0.0:
+        return -math.inf
+    return 20.0 * math.log10(math.sqrt(sum_sq / n_samples) / _FULL_SCALE)
+
+
+class SilenceDetector:
+    """Rolling-window RMS gate with hysteresis.
+
+    The window holds the energy of the last ``window_chunks`` chunks; its
+    mean level decides the state. Entering silence requires the level to
+    drop below ``threshold_dbfs``; leaving it requires the level to rise
+    above ``threshold_dbfs + hysteresis_db``, so a signal hovering around
+    the threshold does not flap between states.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -50.0,
+        hysteresis_db: float = 6.0,
+        window_chunks: int = 8,
+        max_chunk_samples: int = _DEFAULT_MAX_SAMPLES,
+    ) -> None:
+        if window_chunks < 1:
+            raise ValueError("window_chunks must be >= 1")
+        self.threshold_dbfs = threshold_dbfs
+        self.hysteresis_db = hysteresis_db
+        self._scratch = np.empty(max_chunk_samples, dtype=np.float32)
+        self._energies = [0.0] * window_chunks
+        self._counts = [0] * window_chunks
+        self._pos = 0
+        self._sum_sq = 0.0
+        self._n = 0
+        self.is_silent = False
+        self.level_dbfs = -math.inf
+        self.chunk_dbfs = -math.inf
+
+    def reset(self) -> None:
+        """Clear the window and return to the non-silent state."""
+        size = len(self._energies)
+        self._energies = [0.0] * size
+        self._counts = [0] * size
+        self._pos = 0
+        self._sum_sq = 0.0
+        self._n = 0
+        self.is_silent = False
+        self.level_dbfs = -math.inf
+        self.chunk_dbfs = -math.inf
+
+    def chunk_energy(self, data: bytes | memoryview) -> tuple[float, int]:
+        """Return (sum of squares, sample count) for one int16 PCM chunk."""
+        n = len(data) // 2
+        if n == 0:
+            return 0.0, 0
+        samples = np.frombuffer(data, dtype=np.int16, count=n)
+        if n > len(self._scratch):
+            # Larger period than configured — grow once and keep the buffer
+            self._scratch = np.empty(n, dtype=np.float32)
+        scratch = self._scratch[:n]
+        np.copyto(scratch, samples)
+        return float(np.dot(scratch, scratch)), n
+
+    def update(self, data: bytes | memoryview) -> bool:
+        """Feed one chunk and return True while the window is silent."""
+        sum_sq, n = self.chunk_energy(data)
+        self.chunk_dbfs = energy_to_dbfs(sum_sq, n)
+
+        pos = self._pos
+        self._sum_sq += sum_sq - self._energies[pos]
+        self._n += n - self._counts[pos]
+        self._energies[pos] = sum_sq
+        self._counts[pos] = n
+        self._pos = (pos + 1) % len(self._energies)
+        if self._sum_sq < 0.0:
+            self._sum_sq = 0.0  # float drift after many subtractions
+
+        self.level_dbfs = energy_to_dbfs(self._sum_sq, self._n)
+        if self.is_silent:
+            if self.level_dbfs > self.threshold_dbfs + self.hysteresis_db:
+                self.is_silent = False
+        elif self.level_dbfs < self.threshold_dbfs:
+            self.is_silent = True
+        return self.is_silent
@@ -16,13 +16,29 @@ SUBJECT_TRANSCRIPT_FINAL = "transcript.final.>"
 SUBJECT_AUDIO_LIVE = f"{SUBJECT_PREFIX_AUDIO_LIVE}.>"
 SUBJECT_AUDIO_BACKFILL = f"{SUBJECT_PREFIX_AUDIO_BACKFILL}.>"
 
+SUBJECT_SESSION_CONTROL = "session.control"
+# Session KV key holding the active session of the default room
+SESSION_KV_KEY = "current"
+
+
+def room_scoped(base: str, room: str = "") -> str:
+    """Narrow a subject prefix or KV key to one room.
+
+    Rooms add one token after the base (``audio.live.<room>.<sid>``,
+    ``preroll.audio.<room>``, ``session.control.<room>``, KV key
+    ``current.<room>``). The default room ``""`` keeps the unscoped names,
+    so single-room deployments are unchanged.
+    """
+    return f"{base}.{room}" if room else base
+
+
 # Configuration for the Pre-Roll Buffer (Memory Ring Buffer)
 PREROLL_STREAM_CONFIG: dict[str, Any] = {
     "name": "PRE_BUFFER",
-    "subjects": [SUBJECT_PREFIX_PREROLL],
+    "subjects": [SUBJECT_PREFIX_PREROLL, f"{SUBJECT_PREFIX_PREROLL}.>"],
     "storage": StorageType.MEMORY,
     "retention": RetentionPolicy.LIMITS,
-    "max_msg_size": 8192,  # 8KB - Safely holds 1600 bytes + headers
+    "max_msg_size": 64 * 1024,  # 64KB - holds a packed frame (up to ~20 periods)
     "max_bytes": 64 * 1024 * 1024,  # 64MB Buffer (~10 mins 16kHz)
     "max_age": 6 * 60,  # 6 minutes — evict stale pre-roll data
 }
@@ -54,10 +70,10 @@ TRANSCRIPTION_STREAM_CONFIG: dict[str, Any] = {
 # Configuration for the Session Control Stream
 SESSION_STREAM_CONFIG: dict[str, Any] = {
     "name": "SESSION_STREAM",
-    "subjects": ["session.control"],
+    "subjects": [SUBJECT_SESSION_CONTROL, f"{SUBJECT_SESSION_CONTROL}.>"],
     "storage": StorageType.FILE,
     "retention": RetentionPolicy.LIMITS,
-    "max_msgs_per_subject": 1,  # only the latest command matters
+    "max_msgs_per_subject": 1,  # only the latest command (per room) matters
     "max_age": 60,  # stale commands (>60s old) are discarded on restart
 }
 
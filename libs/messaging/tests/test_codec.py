@@ -0,0 +1,71 @@
+"""Unit tests for audio transport codecs and codec-aware framing."""
+
+import numpy as np
+import pytest
+from messaging.audio import AudioFrame
+from messaging.codec import HEADER_CODEC, codec_for_deepgram, get_codec
+
+
+def _speech_like(n: int = 16000) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(n) / 16000
+    tone = np.sin(2 * np.pi * 220 * t) * 8000 * (t < 0.5)  # half silence
+    return (tone + rng.standard_normal(n) * 30).astype(np.int16).tobytes()
+
+
+def test_zlib_delta_is_lossless() -> None:
+    codec = get_codec("zlib-delta")
+    extremes = np.array([32767, -32768, 32767, -32768, 0], dtype=np.int16).tobytes()
+    for pcm in (_speech_like(), extremes, b""):
+        assert codec.decode(codec.encode(pcm)) == pcm
+    assert len(codec.encode(_speech_like())) < len(_speech_like()) * 0.75
+
+
+def test_mulaw_halves_size_with_bounded_error() -> None:
+    codec = get_codec("mulaw")
+    pcm = _speech_like()
+    encoded = codec.encode(pcm)
+    assert len(encoded) == len(pcm) // 2
+
+    original = np.frombuffer(pcm, dtype=np.int16).astype(np.int32)
+    decoded = np.frombuffer(codec.decode(encoded), dtype=np.int16).astype(np.int32)
+    # µ-law quantisation error is relative: ~3% of magnitude, floor of 4 LSB
+    assert np.all(np.abs(decoded - original) <= np.abs(original) // 16 + 8)
+
+
+def test_unknown_codec_rejected() -> None:
+    with pytest.raises(ValueError):
+        get_codec("opus")
+
+
+def test_deepgram_encoding_lookup() -> None:
+    assert codec_for_deepgram("mulaw") is get_codec("mulaw")
+    assert codec_for_deepgram("linear16") is get_codec("pcm")
+    assert codec_for_deepgram("flac") is None
+
+
+def test_frame_decodes_transparently() -> None:
+    pcm = _speech_like(3072)
+    packed = AudioFrame(pcm, periods=2, sample_offset=0).encoded("zlib-delta")
+
+    class _Msg:
+        data = packed.data
+        headers = packed.headers()
+
+    assert _Msg.headers[HEADER_CODEC] == "zlib-delta"
+    frame = AudioFrame.from_msg(_Msg())
+    assert frame.codec == "pcm"
+    assert list(frame.iter_periods()) == [pcm[:3072], pcm[3072:]]
+
+    raw = AudioFrame.from_msg(_Msg(), decode=False)
+    assert raw.data == packed.data
+    assert raw.samples == 3072
+
+
+def test_mulaw_zlib_matches_mulaw_and_compresses() -> None:
+    pcm = _speech_like()
+    packed = get_codec("mulaw-zlib")
+    mulaw = get_codec("mulaw")
+    encoded = packed.encode(pcm)
+    assert packed.decode(encoded) == mulaw.decode(mulaw.encode(pcm))
+    assert len(encoded) < len(pcm) / 2.5
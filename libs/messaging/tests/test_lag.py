@@ -0,0 +1,79 @@
+"""Unit tests for consumer lag sampling and catch-up ETA."""
+
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from messaging.audio import AudioFrame
+from messaging.lag import LagMonitor, eta_s
+
+
+def _stream(name: str, last_seq: int) -> Any:
+    return SimpleNamespace(
+        config=SimpleNamespace(name=name), state=SimpleNamespace(last_seq=last_seq)
+    )
+
+
+def _consumer(durable: str | None, pending: int, acked: int) -> Any:
+    return SimpleNamespace(
+        config=SimpleNamespace(durable_name=durable),
+        num_pending=pending,
+        num_ack_pending=0,
+        num_redelivered=0,
+        ack_floor=SimpleNamespace(consumer_seq=acked),
+    )
+
+
+def _js(consumers: dict[str, list[Any]]) -> AsyncMock:
+    js = AsyncMock()
+    js.streams_info.return_value = [
+        _stream("AUDIO_STREAM", 100),
+        _stream("TRANSCRIPTION_STREAM", 10),
+    ]
+    js.consumers_info.side_effect = lambda name: consumers[name]
+    # Newest audio message: 4 packed periods of 1536 samples (0.384 s)
+    frame = AudioFrame(b"\x00" * 4 * 3072, periods=4)
+    js.get_msg.return_value = SimpleNamespace(data=frame.data, headers=frame.headers())
+    return js
+
+
+def test_eta_is_none_while_backlog_is_not_shrinking() -> None:
+    assert eta_s(0, None) == 0.0
+    assert eta_s(100, 20.0) == 5.0
+    assert eta_s(100, 0.0) is None
+    assert eta_s(100, -3.0) is None
+
+
+@pytest.mark.asyncio
+async def test_sample_reports_pending_audio_and_drain_rate(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    consumers = {
+        "AUDIO_STREAM": [_consumer("stt_backfill", 50, 0), _consumer(None, 9, 0)],
+        "TRANSCRIPTION_STREAM": [_consumer("api_gateway", 0, 10)],
+    }
+    monitor = LagMonitor(_js(consumers), AsyncMock())
+    clock = iter([100.0, 100.0, 102.0, 102.0])
+    fake_time = SimpleNamespace(monotonic=lambda: next(clock), time=time.time)
+    monkeypatch.setattr("messaging.lag.time", fake_time)
+
+    first = await monitor.sample()
+    assert [lag.durable for lag in first] == ["stt_backfill", "api_gateway"]
+    backfill, gateway = first
+    assert backfill.pending_s == pytest.approx(50 * 0.384)
+    assert backfill.drain_rate is None and backfill.eta_s is None
+    assert gateway.pending_s is None and gateway.eta_s == 0.0
+
+    consumers["AUDIO_STREAM"] = [_consumer("stt_backfill", 30, 30)]
+    backfill, _ = await monitor.sample()
+    assert backfill.ack_rate == pytest.approx(15.0)
+    assert backfill.drain_rate == pytest.approx(10.0)  # 20 msgs in 2 s
+    assert backfill.eta_s == pytest.approx(3.0)
+
+    await monitor._publish()
+    subject, data = monitor._nc.publish.call_args.args
+    assert subject == "system.lag"
+    assert json.loads(data)["consumers"][0]["eta_s"] == 3.0
@@ -0,0 +1,61 @@
+"""Unit tests for latency traces and per-stage histograms."""
+
+from messaging.audio import AudioFrame
+from messaging.latency import (
+    HEADER_CAPTURE_TS,
+    HEADER_PUBLISH_TS,
+    LatencyHistogram,
+    LatencyStats,
+    stage_latencies,
+    trace_from_headers,
+)
+
+
+class _Msg:
+    def __init__(self, data: bytes, headers: dict[str, str] | None) -> None:
+        self.data = data
+        self.headers = headers
+
+
+def test_capture_ts_round_trips_through_headers() -> None:
+    frame = AudioFrame(b"\x00" * 8, capture_ts=1700000000.123456)
+    headers = frame.headers()
+    assert headers[HEADER_CAPTURE_TS] == "1700000000.123456"
+    assert AudioFrame.from_msg(_Msg(frame.data, headers)).capture_ts == 1700000000.123456
+    assert HEADER_CAPTURE_TS not in AudioFrame(b"").headers()
+
+
+def test_trace_from_headers_ignores_missing_and_malformed() -> None:
+    headers = {HEADER_CAPTURE_TS: "10.0", HEADER_PUBLISH_TS: "nan"}
+    assert trace_from_headers(headers) == {"capture": 10.0}
+    assert trace_from_headers(None) == {}
+
+
+def test_stage_latencies_measure_from_previous_stamped_stage() -> None:
+    trace = {"capture": 10.0, "publish": 10.01, "stt_send": 10.05, "broadcast": 10.4}
+    latencies = stage_latencies(trace)
+    assert latencies.keys() == {"publish", "stt_send", "broadcast", "total"}
+    assert round(latencies["broadcast"], 6) == 0.35  # stt_result/fuse skipped
+    assert round(latencies["total"], 6) == 0.4
+    assert stage_latencies({"capture": 10.0}) == {}
+
+
+def test_histogram_quantiles_use_bucket_bounds() -> None:
+    histogram = LatencyHistogram()
+    for ms in [3] * 90 + [80] * 9 + [12000]:
+        histogram.observe(ms / 1000)
+    summary = histogram.as_dict()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 5
+    assert summary["p99_ms"] == 100
+    assert summary["max_ms"] == 12000
+    assert summary["buckets"]["inf"] == 1
+
+
+def test_latency_stats_group_by_source_in_stage_order() -> None:
+    stats = LatencyStats()
+    stats.observe({"capture": 1.0, "stt_result": 1.2, "publish": 1.01})
+    stats.observe({"capture": 1.0, "broadcast": 5.0}, group="backfill")
+    summary = stats.as_dict()
+    assert list(summary["live"]) == ["publish", "stt_result", "total"]
+    assert summary["backfill"]["total"]["count"] == 1
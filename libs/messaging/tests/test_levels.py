@@ -0,0 +1,95 @@
+"""Unit tests for the rolling-window silence detector."""
+
+import math
+import struct
+
+import numpy as np
+import pytest
+from messaging.levels import SilenceDetector, energy_to_dbfs
+
+
+def _chunk(value: int, n_samples: int = 1536) -> bytes:
+    return struct.pack(f"<{n_samples}h", *([value] * n_samples))
+
+
+def test_energy_to_dbfs_full_scale_is_zero() -> None:
+    n = 1536
+    assert energy_to_dbfs(32768.0**2 * n, n) == pytest.approx(0.0)
+
+
+def test_energy_to_dbfs_empty_is_minus_inf() -> None:
+    assert energy_to_dbfs(0.0, 0) == -math.inf
+    assert energy_to_dbfs(0.0, 1536) == -math.inf
+
+
+def test_chunk_energy_matches_reference() -> None:
+    rng = np.random.default_rng(7)
+    samples = (rng.standard_normal(1536) * 4000).astype(np.int16)
+    det = SilenceDetector()
+    sum_sq, n = det.chunk_energy(samples.tobytes())
+    expected = float(np.sum(samples.astype(np.float64) ** 2))
+    assert n == 1536
+    assert sum_sq == pytest.approx(expected, rel=1e-5)
+
+
+def test_chunk_energy_reuses_scratch_buffer() -> None:
+    det = SilenceDetector(max_chunk_samples=1536)
+    scratch = det._scratch
+    det.chunk_energy(_chunk(100))
+    det.chunk_energy(_chunk(100, 512))
+    assert det._scratch is scratch
+
+
+def test_chunk_energy_grows_scratch_for_large_chunk() -> None:
+    det = SilenceDetector(max_chunk_samples=16)
+    sum_sq, n = det.chunk_energy(_chunk(2, 64))
+    assert n == 64
+    assert sum_sq == pytest.approx(4.0 * 64)
+    assert len(det._scratch) == 64
+
+
+def test_chunk_energy_ignores_trailing_odd_byte() -> None:
+    det = SilenceDetector()
+    _, n = det.chunk_energy(_chunk(10, 4) + b"\x01")
+    assert n == 4
+
+
+def test_silent_chunk_enters_silence() -> None:
+    det = SilenceDetector()
+    assert det.update(_chunk(0)) is True
+    assert det.level_dbfs == -math.inf
+
+
+def test_loud_chunk_is_not_silent() -> None:
+    det = SilenceDetector()
+    assert det.update(_chunk(16384)) is False
+    assert det.chunk_dbfs == pytest.approx(-6.02, abs=0.01)
+
+
+def test_window_smooths_single_quiet_chunk() -> None:
+    """One quiet chunk after speech must not flip the state on its own."""
+    det = SilenceDetector(window_chunks=4)
+    for _ in range(4):
+        det.update(_chunk(8000))
+    assert det.update(_chunk(0)) is False
+
+
+def test_hysteresis_requires_margin_to_leave_silence() -> None:
+    # -50 dBFS ≈ amplitude 104; -47 dBFS ≈ 147; -40 dBFS ≈ 328
+    det = SilenceDetector(threshold_dbfs=-50.0, hysteresis_db=6.0, window_chunks=1)
+    assert det.update(_chunk(0)) is True
+    assert det.update(_chunk(147)) is True, "inside the hysteresis band"
+    assert det.update(_chunk(328)) is False
+
+
+def test_reset_clears_window() -> None:
+    det = SilenceDetector(window_chunks=4)
+    det.update(_chunk(0))
+    det.reset()
+    assert det.is_silent is False
+    assert det.level_dbfs == -math.inf
+
+
+def test_invalid_window_rejected() -> None:
+    with pytest.raises(ValueError):
+        SilenceDetector(window_chunks=0)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Benchmark: stt-provider catch-up speed (Scenario C) and live caption lag.
+
+Runs the real ``STTProviderService`` session loop against an in-process
+JetStream stand-in and a simulated Deepgram connection:
+
+- every ``fetch`` costs one broker round trip (``--rtt-ms``)
+- ``send_audio`` returns at once while the socket send buffer has room and
+  blocks once the upload (``--uplink-mbps``) falls a full buffer behind
+
+- like nats-py, a ``fetch(n)`` with nothing pending waits until n messages
+  arrive or the timeout expires
+
+Scenario C (performance_benchmarks.md) buffers ``--backlog`` seconds of
+audio during a WAN outage; the drain rate must exceed 2x real time. It is
+measured with one message per fetch (the old fetch size) and with the
+adaptive batch size. The second part measures how long live captions wait
+behind a pre-roll backfill in serial and in parallel-lane mode; the third
+how long real-time live audio is held between arriving and being sent.
+
+Exits non-zero if the adaptive drain misses the 2x target or live audio is
+held longer than ``_MAX_HOLD_S``.
+
+Usage: uv run python scripts/bench_catchup.py [--backlog S] [--preroll S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import stt_provider.main as stt_main
+import stt_provider.prefetch as prefetch
+from stt_provider.interfaces import TranscriptionEvent
+from stt_provider.main import STTProviderService
+
+_CHUNK = b"\x00" * 3072  # one 96 ms period of 16 kHz int16
+_CHUNK_S = 0.096
+_SESSION = "bench"
+_TARGET_X = 2.0
+# Longest a caught-up live message may wait before it is sent
+_MAX_HOLD_S = 0.25
+# Kernel socket send buffer in front of the uplink
+_SEND_BUFFER_BYTES = 64 * 1024
+
+
+class _Msg:
+    def __init__(self, sub: _Sub, subject: str, eos: bool = False) -> None:
+        self._sub = sub
+        self.subject = subject
+        self.data = b"" if eos else _CHUNK
+        self.headers = {"LiveSTT-EOS": "true"} if eos else None
+        self.metadata = SimpleNamespace(num_pending=0)
+        self.arrived: float | None = None
+
+    async def ack(self) -> None:
+        self._sub.acked(self)
+
+    async def nak(self) -> None:
+        self._sub.pending.insert(0, self)
+
+
+class _Sub:
+    """Pull subscription over ``seconds`` of audio, ending with an EOS marker.
+
+    The audio is a backlog, or with ``realtime`` arrives one period at a time.
+    """
+
+    def __init__(
+        self, lane: str, seconds: float, rtt_s: float, realtime: bool = False
+    ) -> None:
+        subject = f"audio.{lane}.{_SESSION}"
+        count = round(seconds / _CHUNK_S)
+        msgs = [_Msg(self, subject) for _ in range(count)]
+        msgs.append(_Msg(self, subject, eos=True))
+        self.pending: list[_Msg] = []
+        self.rtt_s = rtt_s
+        self.first_ack: float | None = None
+        self.eos_ack = 0.0
+        self.done = asyncio.Event()
+        self.holds: list[float] = []  # arrival to ACK (sent), real-time audio
+        self._arrived = asyncio.Event()
+        self._feeder: asyncio.Task[None] | None = None
+        if realtime:
+            self._feeder = asyncio.create_task(self._feed(msgs))
+        else:
+            self.pending = msgs
+
+    async def _feed(self, msgs: list[_Msg]) -> None:
+        for msg in msgs:
+            await asyncio.sleep(_CHUNK_S)
+            msg.arrived = time.perf_counter()
+            self.pending.append(msg)
+            self._arrived.set()
+
+    def acked(self, msg: _Msg) -> None:
+        now = time.perf_counter()
+        if self.first_ack is None:
+            self.first_ack = now
+        if msg.arrived is not None and not msg.headers:
+            self.holds.append(now - msg.arrived)
+        if msg.headers:
+            self.eos_ack = now
+            self.done.set()
+
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[_Msg]:
+        await asyncio.sleep(self.rtt_s)
+        deadline = time.perf_counter() + timeout
+        if not self.pending:
+            # A waiting pull request: returns once the batch fills or expires
+            while len(self.pending) < batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._arrived.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._arrived.wait(), remaining)
+            if not self.pending:
+                raise TimeoutError
+        msgs = self.pending[:batch]
+        del self.pending[:batch]
+        for left, msg in enumerate(reversed(msgs), start=len(self.pending)):
+            msg.metadata.num_pending = left
+        return msgs
+
+    async def consumer_info(self) -> Any:
+        raise RuntimeError("not simulated")
+
+
+class _Deepgram:
+    """Transcriber whose sends are paced by the uplink bandwidth."""
+
+    bytes_per_s = 2.5e6
+
+    def __init__(self) -> None:
+        self._events: asyncio.Queue[TranscriptionEvent | None] = asyncio.Queue()
+        self._sent_until = 0.0  # when the uplink has sent everything queued
+
+    async def connect(self, **kwargs: Any) -> None:
+        pass
+
+    async def send_audio(self, audio: bytes) -> None:
+        now = time.perf_counter()
+        self._sent_until = max(self._sent_until, now) + len(audio) / self.bytes_per_s
+        backlog_s = self._sent_until - now - _SEND_BUFFER_BYTES / self.bytes_per_s
+        if backlog_s > 0:
+            await asyncio.sleep(backlog_s)
+
+    async def finalize(self) -> None:
+        await self._events.put(TranscriptionEvent("", True, 0.0))
+
+    async def keep_alive(self) -> None:
+        pass
+
+    async def finish(self) -> None:
+        await self._events.put(None)
+
+    async def get_events(self) -> AsyncIterator[TranscriptionEvent]:
+        while (event := await self._events.get()) is not None:
+            yield event
+
+
+async def _run_session(
+    backfill_s: float, live_s: float, rtt_s: float, realtime: bool = False
+) -> tuple[float, _Sub, _Sub]:
+    """One session through the service; returns its start time and both subs."""
+    backfill = _Sub("backfill", backfill_s, rtt_s)
+    live = _Sub("live", live_s, rtt_s, realtime=realtime)
+    js = mock.AsyncMock()
+    js.pull_subscribe.side_effect = lambda subject, durable: (
+        backfill if subject.startswith("audio.backfill") else live
+    )
+    service = STTProviderService(transcriber_factory=_Deepgram)
+    service.nc = mock.AsyncMock()
+    stop_event = asyncio.Event()
+
+    started = time.perf_counter()
+    task = asyncio.create_task(service._run_session_loop(js, stop_event))
+    await asyncio.gather(backfill.done.wait(), live.done.wait())
+    stop_event.set()
+    await task
+    return started, backfill, live
+
+
+class _OnePerFetch(prefetch.Prefetcher):
+    def __init__(
+        self,
+        sub: Any,
+        source_tag: str,
+        logger: logging.Logger,
+        stop_event: asyncio.Event,
+    ) -> None:
+        super().__init__(sub, source_tag, logger, stop_event, batch_max=1)
+
+
+async def _drain_rate(backlog_s: float, rtt_s: float) -> float:
+    started, backfill, _ = await _run_session(backlog_s, 0.0, rtt_s)
+    return backlog_s / (backfill.eos_ack - started)
+
+
+async def _live_lag(preroll_s: float, rtt_s: float) -> float:
+    started, _, live = await _run_session(preroll_s, 1.0, rtt_s)
+    assert live.first_ack is not None
+    return live.first_ack - started
+
+
+async def _live_hold(live_s: float, rtt_s: float) -> list[float]:
+    _, _, live = await _run_session(0.0, live_s, rtt_s, realtime=True)
+    return live.holds
+
+
+async def _main(args: argparse.Namespace) -> int:
+    rtt_s = args.rtt_ms / 1000
+    _Deepgram.bytes_per_s = args.uplink_mbps * 1e6 / 8
+    print(
+        f"Scenario C: {args.backlog:.0f} s backlog, fetch RTT {args.rtt_ms} ms, "
+        f"uplink {args.uplink_mbps} Mbit/s"
+    )
+    rates = {}
+    for label, prefetcher in (
+        ("1 message per fetch", _OnePerFetch),
+        ("adaptive batches", prefetch.Prefetcher),
+    ):
+        with mock.patch.object(stt_main, "Prefetcher", prefetcher):
+            rate = await _drain_rate(args.backlog, rtt_s)
+        rates[label] = rate
+        # Catch-up while live audio keeps arriving at 1x
+        catch_up = args.backlog / (rate - 1) if rate > 1 else float("inf")
+        print(
+            f"  {label:<22} {rate:6.1f}x realtime  "
+            f"(caught up with live after {catch_up:5.1f} s)"
+        )
+    passed = rates["adaptive batches"] > _TARGET_X
+    print(f"  target > {_TARGET_X:.0f}x realtime: {'PASS' if passed else 'FAIL'}")
+
+    print(f"Live caption lag behind a {args.preroll:.0f} s pre-roll backfill:")
+    for label, parallel in (("serial", False), ("parallel lanes", True)):
+        with mock.patch.object(stt_main, "_PARALLEL_LANES", parallel):
+            lag = await _live_lag(args.preroll, rtt_s)
+        print(f"  {label:<22} first live audio sent after {lag * 1000:8.1f} ms")
+
+    holds = sorted(await _live_hold(args.live, rtt_s))
+    held_ok = holds[-1] < _MAX_HOLD_S
+    print(
+        f"Caught-up live audio ({args.live:.0f} s in real time): held "
+        f"p50 {holds[len(holds) // 2] * 1000:.1f} ms, max {holds[-1] * 1000:.1f} ms "
+        f"(limit {_MAX_HOLD_S * 1000:.0f} ms): {'PASS' if held_ok else 'FAIL'}"
+    )
+    return 0 if passed and held_ok else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backlog", type=float, default=300.0, help="outage seconds")
+    parser.add_argument("--preroll", type=float, default=360.0, help="backfill seconds")
+    parser.add_argument("--live", type=float, default=5.0, help="real-time seconds")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="broker round trip")
+    parser.add_argument("--uplink-mbps", type=float, default=20.0, help="upload Mbit/s")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: size and CPU cost of the audio transport codecs.
+
+Encodes/decodes packed frames (``--periods`` x 1536-sample periods) of a
+synthetic speech-like signal — voiced bursts separated by low-level room
+noise — with every codec registered in ``messaging.codec``.
+
+Usage: uv run python scripts/bench_codec.py [--seconds N] [--periods N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+from messaging.codec import _CODECS
+
+_PERIOD = 1536
+
+
+def _signal(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    n = int(seconds * 16000)
+    t = np.arange(n) / 16000
+    voiced = (np.sin(2 * np.pi * 1.3 * t) > 0.2).astype(np.float64)
+    harmonics = sum(
+        np.sin(2 * np.pi * f * t) / k for k, f in enumerate((180, 360, 540), 1)
+    )
+    speech = harmonics * 6000 * voiced * (1 + 0.3 * np.sin(2 * np.pi * 4 * t))
+    noise = rng.standard_normal(n) * 40
+    return np.clip(speech + noise, -32768, 32767).astype(np.int16)
+
+
+def _best(fn: Callable[[bytes], bytes], items: list[bytes]) -> float:
+    return min(timeit.repeat(lambda: [fn(x) for x in items], number=1, repeat=3))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--periods", type=int, default=1, help="periods per frame")
+    args = parser.parse_args()
+
+    pcm = _signal(args.seconds)
+    step = _PERIOD * args.periods
+    frames = [pcm[i : i + step].tobytes() for i in range(0, len(pcm) - step + 1, step)]
+    raw_bytes = sum(len(f) for f in frames)
+    frame_ms = step / 16
+    print(f"{len(frames)} frames x {args.periods} periods ({frame_ms:.0f} ms each)")
+
+    for name, codec in _CODECS.items():
+        encoded = [codec.encode(f) for f in frames]
+        ratio = raw_bytes / sum(len(e) for e in encoded)
+        enc_s = _best(codec.encode, frames)
+        dec_s = _best(codec.decode, encoded)
+        print(
+            f"  {name:<11} ratio {ratio:5.2f}x  "
+            f"encode {enc_s / len(frames) * 1e6:7.1f} us/frame  "
+            f"decode {dec_s / len(frames) * 1e6:7.1f} us/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Benchmark: concurrent stt-provider sessions against a local mock Deepgram.
+
+Starts ``scripts/mock_deepgram.py`` in-process and runs ``--sessions``
+``STTProviderService`` session loops side by side, each with the real
+``DeepgramTranscriber`` (WebSocket path included) and an in-process
+JetStream stand-in. Every session gets an empty backfill (EOS only, which
+exercises Finalize) and ``--seconds`` of live audio published at ``--speed``
+times real time, each message carrying capture/publish latency headers.
+
+Reports throughput (audio seconds and results per wall second) and result
+latency from the transcripts' traces:
+
+- ``send->result``: audio sent to Deepgram until its result came back
+  (the mock's latency distribution plus client overhead)
+- ``capture->result``: message captured until its result came back (adds
+  waiting for the rest of the utterance and any send-loop queueing)
+
+Exits non-zero if a session finished without a final transcript.
+
+Usage: uv run python scripts/bench_deepgram.py [--sessions N] [--seconds S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any
+from unittest import mock
+
+from messaging.latency import HEADER_CAPTURE_TS, HEADER_PUBLISH_TS, format_ts
+from mock_deepgram import MockConfig, MockDeepgramServer
+from stt_provider.main import STTProviderService
+
+_CHUNK = b"\x00" * 3072  # one 96 ms period of 16 kHz int16
+_CHUNK_S = 0.096
+
+
+class _Msg:
+    def __init__(self, subject: str, data: bytes, headers: dict[str, str]) -> None:
+        self.subject = subject
+        self.data = data
+        self.headers = headers
+
+    async def ack(self) -> None:
+        pass
+
+    async def nak(self) -> None:
+        pass
+
+
+class _Feed:
+    """Pull subscription fed by the session's publisher."""
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[_Msg] = asyncio.Queue()
+        self.ended = False  # EOS handed out
+        self.idle = asyncio.Event()  # fetched again after EOS: session over
+
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[_Msg]:
+        if self.ended and self.queue.empty():
+            self.idle.set()
+            await asyncio.sleep(0.05)
+            raise TimeoutError
+        msgs = [await asyncio.wait_for(self.queue.get(), timeout)]
+        while len(msgs) < batch and not self.queue.empty():
+            msgs.append(self.queue.get_nowait())
+        self.ended = any("LiveSTT-EOS" in m.headers for m in msgs) or self.ended
+        return msgs
+
+    async def consumer_info(self) -> Any:
+        raise RuntimeError("not simulated")
+
+
+class _Session:
+    """One service instance with its audio feeds and transcript sink."""
+
+    def __init__(self, index: int) -> None:
+        self.sid = f"bench{index}"
+        self.backfill, self.live = _Feed(), _Feed()
+        self.send_to_result: list[float] = []
+        self.capture_to_result: list[float] = []
+        self.results = 0
+        self.finals = 0
+        js = mock.AsyncMock()
+        js.pull_subscribe.side_effect = lambda subject, durable: (
+            self.backfill if subject.startswith("audio.backfill") else self.live
+        )
+        js.publish.side_effect = self._on_publish
+        self.js = js
+        self.service = STTProviderService()
+        self.service.nc = mock.AsyncMock()
+        self.service.nc.publish.side_effect = self._on_publish
+
+    async def _on_publish(self, subject: str, data: bytes) -> None:
+        if not subject.startswith("transcript."):
+            return
+        payload = json.loads(data)
+        self.results += 1
+        self.finals += payload["is_final"]
+        trace = payload.get("trace")
+        if trace and "stt_send" in trace:
+            self.send_to_result.append(trace["stt_result"] - trace["stt_send"])
+            self.capture_to_result.append(trace["stt_result"] - trace["capture"])
+
+    async def _publish(self, seconds: float, speed: float) -> None:
+        eos = {"LiveSTT-EOS": "true"}
+        self.backfill.queue.put_nowait(_Msg(f"audio.backfill.{self.sid}", b"", eos))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(round(seconds / _CHUNK_S)):
+            # Paced on a fixed schedule so a slow iteration does not drift
+            await asyncio.sleep(max(0.0, started + i * _CHUNK_S / speed - loop.time()))
+            now = format_ts(time.time())
+            headers = {HEADER_CAPTURE_TS: now, HEADER_PUBLISH_TS: now}
+            self.live.queue.put_nowait(_Msg(f"audio.live.{self.sid}", _CHUNK, headers))
+        self.live.queue.put_nowait(_Msg(f"audio.live.{self.sid}", b"", eos))
+
+    async def run(self, seconds: float, speed: float) -> None:
+        stop_event = asyncio.Event()
+        loop = asyncio.create_task(self.service._run_session_loop(self.js, stop_event))
+        await self._publish(seconds, speed)
+        await self.backfill.idle.wait()  # session closed; waiting for the next
+        stop_event.set()
+        await loop
+
+
+def _pct(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def _latency_line(label: str, values: list[float]) -> str:
+    return (
+        f"  {label:<16} p50 {_pct(values, 50) * 1000:7.1f} ms   "
+        f"p99 {_pct(values, 99) * 1000:7.1f} ms   (n={len(values)})"
+    )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    config = MockConfig(
+        interim_s=args.interim_s,
+        final_s=args.final_s,
+        latency_median_ms=args.latency_ms,
+        latency_p99_ms=args.p99_ms,
+        seed=0,
+    )
+    async with MockDeepgramServer(config) as server:
+        os.environ["DEEPGRAM_URL"] = server.url
+        os.environ.setdefault("DEEPGRAM_API_KEY", "mock")
+        sessions = [_Session(i) for i in range(args.sessions)]
+        started = time.perf_counter()
+        await asyncio.gather(*(s.run(args.seconds, args.speed) for s in sessions))
+        wall_s = time.perf_counter() - started
+
+    audio_s = server.stats.audio_s
+    results = sum(s.results for s in sessions)
+    print(
+        f"{args.sessions} sessions x {args.seconds:.0f} s of audio at "
+        f"{args.speed:g}x, mock latency p50 {args.latency_ms:.0f} ms / "
+        f"p99 {args.p99_ms:.0f} ms"
+    )
+    print(
+        f"  throughput       {audio_s / wall_s:7.1f} audio s/s "
+        f"({audio_s:.0f} s in {wall_s:.1f} s), {results / wall_s:.1f} results/s"
+    )
+    print(_latency_line("mock delay", server.stats.latencies_s))
+    print(_latency_line("send->result", [v for s in sessions for v in s.send_to_result]))
+    print(
+        _latency_line(
+            "capture->result", [v for s in sessions for v in s.capture_to_result]
+        )
+    )
+    missing = [s.sid for s in sessions if s.finals == 0]
+    if missing:
+        print(f"  no final transcript for: {', '.join(missing)}")
+    return 1 if missing else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--seconds", type=float, default=10.0, help="audio per session")
+    parser.add_argument("--speed", type=float, default=1.0, help="x real time")
+    parser.add_argument("--interim-s", type=float, default=0.5, help="audio/interim")
+    parser.add_argument("--final-s", type=float, default=2.0, help="audio/final")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="mock p50")
+    parser.add_argument("--p99-ms", type=float, default=400.0, help="mock p99")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
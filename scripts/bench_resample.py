@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: throughput of the capture resample/downmix front end.
+
+Feeds device-sized periods (one 96 ms output chunk each) of int16 noise
+through ``PeriodNormalizer`` for common USB interface formats and reports
+the per-period cost and the throughput as a multiple of real time.
+
+Usage: uv run python scripts/bench_resample.py [--seconds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from audio_producer.resample import PeriodNormalizer
+
+_FORMATS = (
+    (48000, 2, 2),
+    (48000, 1, 2),
+    (44100, 2, 2),
+    (44100, 2, 3),
+    (96000, 2, 4),
+    (8000, 1, 2),
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per format")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.seconds:.0f} s of audio per format, 1536-sample output periods")
+    for rate, channels, width in _FORMATS:
+        normalizer = PeriodNormalizer(rate, channels, width)
+        frames = normalizer.device_frames()
+        period = rng.integers(-(2**15), 2**15, frames * channels * width // 2)
+        data = period.astype("<i2").tobytes()
+        periods = int(args.seconds * rate / frames)
+
+        started = time.perf_counter()
+        out = 0
+        for _ in range(periods):
+            out += len(normalizer.convert(data))
+        elapsed = time.perf_counter() - started
+
+        audio_s = out / 2 / 16000
+        print(
+            f"  {rate:>6} Hz x{channels} {width * 8}-bit  "
+            f"taps={normalizer.resampler.taps:<4} "
+            f"{elapsed / periods * 1e6:7.1f} us/period  "
+            f"{audio_s / elapsed:7.0f}x realtime"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-chunk cost of the audio-producer silence gate.
+
+Compares the original array/generator RMS with the NumPy ``SilenceDetector``
+on 1536-sample int16 chunks (one 96 ms capture period).
+
+Usage: uv run python scripts/bench_silence.py [--chunks N] [--samples N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import array
+import math
+import timeit
+
+import numpy as np
+from messaging.levels import SilenceDetector
+
+
+def _legacy_rms(data: bytes) -> float:
+    """The pre-NumPy implementation, kept here as the baseline."""
+    n = len(data) // 2
+    if n == 0:
+        return -math.inf
+    samples = array.array("h", data)
+    sum_sq = sum(s * s for s in samples)
+    rms = math.sqrt(sum_sq / n)
+    if rms == 0.0:
+        return -math.inf
+    return 20.0 * math.log10(rms / 32768.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000, help="chunks per run")
+    parser.add_argument("--samples", type=int, default=1536, help="samples per chunk")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    chunks = [
+        (rng.standard_normal(args.samples) * 3000).astype(np.int16).tobytes()
+        for _ in range(64)
+    ]
+    detector = SilenceDetector(max_chunk_samples=args.samples)
+
+    def run_legacy() -> None:
+        for i in range(args.chunks):
+            _legacy_rms(chunks[i & 63])
+
+    def run_detector() -> None:
+        for i in range(args.chunks):
+            detector.update(chunks[i & 63])
+
+    period_us = args.samples / 16000 * 1e6
+    print(f"{args.chunks} chunks x {args.samples} samples ({period_us:.0f} us period)")
+    results: dict[str, float] = {}
+    for name, fn in (("legacy array", run_legacy), ("SilenceDetector", run_detector)):
+        best = min(timeit.repeat(fn, number=1, repeat=5))
+        per_chunk_us = best / args.chunks * 1e6
+        results[name] = per_chunk_us
+        print(
+            f"  {name:<16} {per_chunk_us:8.2f} us/chunk  "
+            f"({per_chunk_us / period_us * 100:.3f}% of one period)"
+        )
+    speedup = results["legacy array"] / results["SilenceDetector"]
+    print(f"  speed-up: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Local stand-in for Deepgram's Listen v1 streaming API.
+
+Speaks enough of the ``/v1/listen`` WebSocket protocol for the Deepgram SDK
+(and so ``DeepgramTranscriber``) to run against it without an account:
+
+- accepts ``encoding=linear16`` at any ``sample_rate``/``channels``; other
+  encodings are rejected with HTTP 400, like the real API
+- emits an interim result every ``--interim-s`` seconds of received audio
+  (when ``interim_results=true``) and a final every ``--final-s`` seconds
+- delays each result by a latency drawn from a log-normal distribution with
+  the given median and p99, keeping results in order
+- handles ``Finalize`` (flush a final, ``from_finalize``), ``KeepAlive`` and
+  ``CloseStream`` (flush, send ``Metadata``, close), and closes streams that
+  see neither audio nor a control message for ``--idle-timeout-s``
+
+Transcripts are placeholder words (``w0 w1 ...``), a few per second of audio.
+
+Point stt-provider at it with ``DEEPGRAM_URL=ws://localhost:<port>`` (any
+``DEEPGRAM_API_KEY``). ``MockDeepgramServer`` can also be started in-process.
+
+Usage: uv run python scripts/mock_deepgram.py [--port 8765] [--latency-ms 150]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import random
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+from websockets.http11 import Request, Response
+
+logger = logging.getLogger("mock-deepgram")
+
+# z-score of the 99th percentile of a standard normal
+_Z99 = 2.326
+
+
+@dataclass
+class MockConfig:
+    """Result cadence and latency of the mock server."""
+
+    interim_s: float = 0.5  # audio between interim results
+    final_s: float = 2.0  # audio between final results
+    latency_median_ms: float = 150.0
+    latency_p99_ms: float = 400.0
+    words_per_s: float = 2.5
+    idle_timeout_s: float = 10.0
+    seed: int | None = None
+
+    def latency_s(self, rng: random.Random) -> float:
+        """One result delay from the log-normal latency distribution."""
+        median = self.latency_median_ms / 1000
+        if self.latency_p99_ms <= self.latency_median_ms:
+            return median
+        sigma = math.log(self.latency_p99_ms / self.latency_median_ms) / _Z99
+        return median * math.exp(rng.gauss(0.0, sigma))
+
+
+@dataclass
+class MockStats:
+    """Totals across all connections since the server started."""
+
+    connections: int = 0
+    rejected: int = 0
+    audio_s: float = 0.0
+    results: int = 0
+    finals: int = 0
+    finalizes: int = 0
+    keepalives: int = 0
+    idle_closes: int = 0
+    latencies_s: list[float] = field(default_factory=list)
+
+
+class _Stream:
+    """One Listen v1 connection: audio clock, result schedule, outbox."""
+
+    def __init__(
+        self,
+        ws: ServerConnection,
+        params: dict[str, str],
+        config: MockConfig,
+        stats: MockStats,
+        rng: random.Random,
+    ) -> None:
+        self._ws = ws
+        self._config = config
+        self._stats = stats
+        self._rng = rng
+        rate = int(params.get("sample_rate", "16000"))
+        channels = int(params.get("channels", "1"))
+        self._bytes_per_s = rate * channels * 2
+        self._interims = params.get("interim_results", "false").lower() == "true"
+        self._model = params.get("model", "nova-3")
+        self._request_id = str(uuid.uuid4())
+        self._audio_s = 0.0
+        self._final_start = 0.0  # start of the audio no final has covered
+        self._next_interim = config.interim_s
+        self._words = 0
+        self._outbox: asyncio.Queue[tuple[float, dict[str, Any]] | None] = asyncio.Queue()
+        self._last_due = 0.0
+
+    async def run(self) -> None:
+        sender = asyncio.create_task(self._send_loop())
+        try:
+            await self._receive_loop()
+        finally:
+            await self._outbox.put(None)
+            with contextlib.suppress(ConnectionClosed):
+                await sender
+            await self._ws.close()
+
+    async def _receive_loop(self) -> None:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    self._ws.recv(), timeout=self._config.idle_timeout_s
+                )
+            except TimeoutError:
+                self._stats.idle_closes += 1
+                await self._ws.close(1011, "NET-0001: no audio or KeepAlive received")
+                return
+            except ConnectionClosed:
+                return
+            if isinstance(message, bytes):
+                self._on_audio(message)
+                continue
+            control = json.loads(message).get("type")
+            if control == "KeepAlive":
+                self._stats.keepalives += 1
+            elif control == "Finalize":
+                self._stats.finalizes += 1
+                self._emit_final(from_finalize=True)
+            elif control == "CloseStream":
+                self._emit_final()
+                await self._schedule(self._metadata())
+                return
+
+    def _on_audio(self, audio: bytes) -> None:
+        seconds = len(audio) / self._bytes_per_s
+        self._audio_s += seconds
+        self._stats.audio_s += seconds
+        if self._audio_s - self._final_start >= self._config.final_s:
+            self._emit_final()
+        elif self._interims and self._audio_s >= self._next_interim:
+            self._next_interim = self._audio_s + self._config.interim_s
+            self._emit(is_final=False)
+
+    def _emit_final(self, from_finalize: bool = False) -> None:
+        self._emit(is_final=True, from_finalize=from_finalize)
+        self._final_start = self._audio_s
+        self._next_interim = self._audio_s + self._config.interim_s
+
+    def _emit(self, is_final: bool, from_finalize: bool = False) -> None:
+        start, duration = self._final_start, self._audio_s - self._final_start
+        count = round(duration * self._config.words_per_s)
+        words = [f"w{self._words + i}" for i in range(count)]
+        if is_final:
+            self._words += count
+        result = {
+            "type": "Results",
+            "channel_index": [0, 1],
+            "duration": round(duration, 3),
+            "start": round(start, 3),
+            "is_final": is_final,
+            "speech_final": is_final,
+            "from_finalize": from_finalize,
+            "channel": {
+                "alternatives": [
+                    {
+                        "transcript": " ".join(words),
+                        "confidence": 0.99 if words else 0.0,
+                        "words": [
+                            {
+                                "word": word,
+                                "start": round(start + i / len(words) * duration, 3),
+                                "end": round(start + (i + 1) / len(words) * duration, 3),
+                                "confidence": 0.99,
+                            }
+                            for i, word in enumerate(words)
+                        ],
+                    }
+                ]
+            },
+            "metadata": {
+                "request_id": self._request_id,
+                "model_info": {"name": self._model, "version": "mock", "arch": "mock"},
+                "model_uuid": "00000000-0000-0000-0000-000000000000",
+            },
+        }
+        self._stats.results += 1
+        self._stats.finals += is_final
+        self._outbox.put_nowait((self._due(), result))
+
+    def _due(self) -> float:
+        """Send time for the next result; never before the previous one."""
+        latency = self._config.latency_s(self._rng)
+        self._stats.latencies_s.append(latency)
+        due = max(asyncio.get_running_loop().time() + latency, self._last_due)
+        self._last_due = due
+        return due
+
+    async def _schedule(self, message: dict[str, Any]) -> None:
+        await self._outbox.put((self._last_due, message))
+
+    def _metadata(self) -> dict[str, Any]:
+        return {
+            "type": "Metadata",
+            "transaction_key": "deprecated",
+            "request_id": self._request_id,
+            "sha256": "0" * 64,
+            "created": "1970-01-01T00:00:00.000Z",
+            "duration": round(self._audio_s, 3),
+            "channels": 1,
+        }
+
+    async def _send_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (item := await self._outbox.get()) is not None:
+            due, message = item
+            await asyncio.sleep(max(0.0, due - loop.time()))
+            await self._ws.send(json.dumps(message))
+
+
+class MockDeepgramServer:
+    """In-process Listen v1 server; ``url`` is valid once started."""
+
+    def __init__(self, config: MockConfig | None = None) -> None:
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self._rng = random.Random(self.config.seed)
+        self._server: Server | None = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await serve(
+            self._handle, host, port, process_request=self._check_request
+        )
+        bound_port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://{host}:{bound_port}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> MockDeepgramServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    def _check_request(
+        self, connection: ServerConnection, request: Request
+    ) -> Response | None:
+        url = urlsplit(request.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        error = None
+        if url.path != "/v1/listen":
+            error = f"unknown path {url.path}"
+        elif "authorization" not in request.headers:
+            error = "missing Authorization header"
+        elif params.get("encoding", "linear16") != "linear16":
+            error = f"unsupported encoding {params['encoding']}"
+        if error is None:
+            return None
+        self.stats.rejected += 1
+        return connection.respond(HTTPStatus.BAD_REQUEST, f"{error}\n")
+
+    async def _handle(self, ws: ServerConnection) -> None:
+        assert ws.request is not None
+        query = urlsplit(ws.request.path).query
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        self.stats.connections += 1
+        logger.info(f"Stream opened: {query}")
+        await _Stream(ws, params, self.config, self.stats, self._rng).run()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    config = MockConfig(
+        interim_s=args.interim_s,
+        final_s=args.final_s,
+        latency_median_ms=args.latency_ms,
+        latency_p99_ms=args.p99_ms,
+        idle_timeout_s=args.idle_timeout_s,
+        seed=args.seed,
+    )
+    server = MockDeepgramServer(config)
+    url = await server.start(args.host, args.port)
+    print(f"Mock Deepgram listening: DEEPGRAM_URL={url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interim-s", type=float, default=0.5, help="audio/interim")
+    parser.add_argument("--final-s", type=float, default=2.0, help="audio/final")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="median delay")
+    parser.add_argument("--p99-ms", type=float, default=400.0, help="p99 delay")
+    parser.add_argument("--idle-timeout-s", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""Re-transcribe finished sessions and store the result as a transcript version.
+
+For each session id, reads the session's audio (backfill, then live) from:
+
+- ``--archive DIR``: ``<session_id>.backfill.wav`` / ``<session_id>.live.wav``
+  (16 kHz mono 16-bit), when present
+- otherwise ``AUDIO_STREAM`` on NATS (kept for one hour). With ``--archive``
+  the audio read from the stream is saved there first, so running the job
+  right after a session keeps its audio for later re-runs
+
+The audio is sent to Deepgram as fast as the connection accepts it, with up to
+``--concurrency`` sessions in flight. The final results become a new
+``transcript_versions`` row and its segments in the gateway database; the
+live transcript is left untouched. Speakers are not re-identified.
+
+Prints per-session and overall throughput as x real time (seconds of audio
+per wall second) and exits non-zero if any session failed.
+
+Usage: uv run python scripts/retranscribe.py SESSION_ID [...] [--model nova-3]
+           [--keyterm TERM] [--archive DIR] [--concurrency 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+import time
+import wave
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from api_gateway.db import Base, SessionModel, TranscriptVersion, VersionSegment
+from messaging.audio import BYTES_PER_SAMPLE, SAMPLE_RATE, AudioFrame
+from messaging.streams import (
+    AUDIO_STREAM_CONFIG,
+    SUBJECT_PREFIX_AUDIO_BACKFILL,
+    SUBJECT_PREFIX_AUDIO_LIVE,
+    room_scoped,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from stt_provider.interfaces import Transcriber, TranscriptionEvent
+
+LANES = (("backfill", SUBJECT_PREFIX_AUDIO_BACKFILL), ("live", SUBJECT_PREFIX_AUDIO_LIVE))
+
+# Archive files are read in chunks of this much audio
+_CHUNK_S = 0.5
+# Messages per fetch when reading a session from the stream
+_FETCH_BATCH = 256
+_FETCH_TIMEOUT_S = 2.0
+# Longest wait for the final flush once all audio is sent
+_FLUSH_TIMEOUT_S = 15.0
+
+# (lane, int16 PCM) in audio order
+Audio = AsyncIterator[tuple[str, bytes]]
+
+
+@dataclass
+class Segment:
+    start_s: float  # offset in the session's audio
+    text: str
+    confidence: float
+    source: str
+
+
+@dataclass
+class JobResult:
+    session_id: str
+    audio_s: float = 0.0
+    backfill_s: float = 0.0  # audio before the live lane
+    wall_s: float = 0.0
+    segments: list[Segment] = field(default_factory=list)
+    version_id: int | None = None
+    error: str | None = None
+
+    @property
+    def x_realtime(self) -> float:
+        return self.audio_s / self.wall_s if self.wall_s > 0 else 0.0
+
+
+def _seconds(pcm: bytes) -> float:
+    return len(pcm) / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+
+
+def archive_paths(archive: Path, session_id: str) -> dict[str, Path]:
+    return {lane: archive / f"{session_id}.{lane}.wav" for lane, _ in LANES}
+
+
+async def archive_audio(archive: Path, session_id: str) -> Audio:
+    """A session's archived audio, backfill then live."""
+    chunk_frames = int(SAMPLE_RATE * _CHUNK_S)
+    for lane, path in archive_paths(archive, session_id).items():
+        if not path.exists():
+            continue
+        with wave.open(str(path), "rb") as wav:
+            shape = (wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+            if shape != (SAMPLE_RATE, 1, BYTES_PER_SAMPLE):
+                raise ValueError(f"{path}: expected 16 kHz mono 16-bit, got {shape}")
+            while pcm := wav.readframes(chunk_frames):
+                yield lane, pcm
+
+
+async def stream_audio(js: Any, session_id: str, room: str = "") -> Audio:
+    """A session's audio still retained in AUDIO_STREAM, backfill then live."""
+    from nats.js.api import AckPolicy, ConsumerConfig, DeliverPolicy
+
+    config = ConsumerConfig(deliver_policy=DeliverPolicy.ALL, ack_policy=AckPolicy.NONE)
+    for lane, prefix in LANES:
+        subject = f"{room_scoped(prefix, room)}.{session_id}"
+        sub = await js.pull_subscribe(
+            subject, durable=None, stream=AUDIO_STREAM_CONFIG["name"], config=config
+        )
+        try:
+            while True:
+                try:
+                    msgs = await sub.fetch(_FETCH_BATCH, timeout=_FETCH_TIMEOUT_S)
+                except TimeoutError:
+                    break
+                for msg in msgs:
+                    pcm = AudioFrame.from_msg(msg).data
+                    if pcm:  # EOS markers carry no audio
+                        yield lane, pcm
+                if msgs[-1].metadata.num_pending == 0:
+                    break
+        finally:
+            with contextlib.suppress(Exception):
+                await sub.unsubscribe()
+
+
+async def archived(audio: Audio, archive: Path, session_id: str) -> Audio:
+    """Pass ``audio`` through, saving each lane to the archive as it goes.
+
+    Lanes are written to ``.part`` files and only take their archive names
+    once all of ``audio`` has been read, so a failed run leaves nothing for
+    the next one to mistake for a complete archive.
+    """
+    archive.mkdir(parents=True, exist_ok=True)
+    paths = archive_paths(archive, session_id)
+    writers: dict[str, wave.Wave_write] = {}
+    complete = False
+    try:
+        async for lane, pcm in audio:
+            if lane not in writers:
+                writer = wave.open(str(_part(paths[lane])), "wb")  # noqa: SIM115 - closed below
+                writer.setnchannels(1)
+                writer.setsampwidth(BYTES_PER_SAMPLE)
+                writer.setframerate(SAMPLE_RATE)
+                writers[lane] = writer
+            writers[lane].writeframes(pcm)
+            yield lane, pcm
+        complete = True
+    finally:
+        for lane, writer in writers.items():
+            writer.close()
+            if complete:
+                _part(paths[lane]).replace(paths[lane])
+            else:
+                _part(paths[lane]).unlink(missing_ok=True)
+
+
+def _part(path: Path) -> Path:
+    return path.with_name(f"{path.name}.part")
+
+
+async def transcribe(
+    session_id: str, audio: Audio, transcriber: Transcriber, **options: Any
+) -> JobResult:
+    """Send a session's audio unpaced and collect its final results.
+
+    After the last chunk a Finalize flushes Deepgram; the flush is complete
+    when a final result reaches the end of the audio sent.
+    """
+    result = JobResult(session_id)
+    started = time.perf_counter()
+    await transcriber.connect(**options)
+    finals: list[TranscriptionEvent] = []
+    covered = asyncio.Event()
+    sent_s = backfill_s = 0.0
+    done_sending = False
+
+    async def collect() -> None:
+        async for event in transcriber.get_events():
+            if not event.is_final:
+                continue
+            finals.append(event)
+            end = (event.start or 0.0) + (event.duration or 0.0)
+            if done_sending and end >= sent_s - 0.01:
+                covered.set()
+
+    events = asyncio.create_task(collect())
+    try:
+        async for lane, pcm in audio:
+            await transcriber.send_audio(pcm)
+            sent_s += _seconds(pcm)
+            if lane == "backfill":
+                backfill_s = sent_s
+        done_sending = True
+        await transcriber.finalize()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(covered.wait(), timeout=_FLUSH_TIMEOUT_S)
+    finally:
+        await transcriber.finish()
+        events.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await events
+
+    result.wall_s = time.perf_counter() - started
+    result.audio_s = sent_s
+    result.backfill_s = backfill_s
+    result.segments = [
+        Segment(
+            start_s=event.start or 0.0,
+            text=event.text,
+            confidence=event.confidence,
+            source="backfill" if (event.start or 0.0) < backfill_s else "live",
+        )
+        for event in finals
+        if event.text
+    ]
+    return result
+
+
+def _segment_timestamp(started_at: str, offset_s: float) -> str:
+    """Wall-clock time of a segment ``offset_s`` after live audio started.
+
+    Backfill segments have negative offsets: their audio precedes the start.
+    """
+    try:
+        start = datetime.fromisoformat(started_at)
+    except ValueError:
+        return started_at
+    return (start + timedelta(seconds=offset_s)).isoformat()
+
+
+async def save_version(
+    db_factory: Any, result: JobResult, model: str, label: str = ""
+) -> int:
+    """Store ``result`` as a new transcript version of its session."""
+    async with db_factory() as db:
+        session = (
+            await db.execute(
+                select(SessionModel).where(SessionModel.id == result.session_id)
+            )
+        ).scalar_one_or_none()
+        if session is None:
+            raise LookupError(f"session {result.session_id} not in the database")
+        version = TranscriptVersion(
+            session_id=result.session_id,
+            created_at=datetime.now(UTC).isoformat(),
+            model=model,
+            label=label,
+            audio_s=round(result.audio_s, 3),
+        )
+        db.add(version)
+        await db.flush()
+        version_id: int = version.id
+        db.add_all(
+            VersionSegment(
+                version_id=version_id,
+                timestamp=_segment_timestamp(
+                    session.started_at, segment.start_s - result.backfill_s
+                ),
+                text=segment.text,
+                confidence=segment.confidence,
+                source=segment.source,
+            )
+            for segment in result.segments
+        )
+        await db.commit()
+        return version_id
+
+
+async def run_jobs(
+    session_ids: list[str],
+    audio_for: Callable[[str], Audio],
+    transcriber_factory: Callable[[], Transcriber],
+    db_factory: Any,
+    concurrency: int,
+    options: dict[str, Any],
+    label: str = "",
+) -> list[JobResult]:
+    """Re-transcribe sessions, at most ``concurrency`` at a time."""
+    slots = asyncio.Semaphore(max(concurrency, 1))
+    db_lock = asyncio.Lock()  # SQLite takes one writer at a time
+    model = str(options.get("model", ""))
+
+    async def one(session_id: str) -> JobResult:
+        async with slots:
+            try:
+                result = await transcribe(
+                    session_id, audio_for(session_id), transcriber_factory(), **options
+                )
+                if not result.audio_s:
+                    raise LookupError("no audio found")
+                async with db_lock:
+                    result.version_id = await save_version(
+                        db_factory, result, model, label
+                    )
+            except Exception as e:
+                result = JobResult(session_id, error=f"{type(e).__name__}: {e}")
+            return result
+
+    return list(await asyncio.gather(*(one(sid) for sid in session_ids)))
+
+
+def report(results: list[JobResult], wall_s: float) -> None:
+    for r in results:
+        if r.error:
+            print(f"  {r.session_id:<24} FAILED {r.error}")
+            continue
+        print(
+            f"  {r.session_id:<24} {r.audio_s:8.1f} s audio in {r.wall_s:6.1f} s "
+            f"({r.x_realtime:6.1f}x real time), {len(r.segments)} segments, "
+            f"version {r.version_id}"
+        )
+    audio_s = sum(r.audio_s for r in results)
+    x_realtime = audio_s / wall_s if wall_s > 0 else 0.0
+    print(
+        f"  total: {audio_s:.1f} s audio in {wall_s:.1f} s ({x_realtime:.1f}x real time)"
+    )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    import nats
+    from stt_provider.deepgram_adapter import DeepgramTranscriber
+
+    archive = Path(args.archive) if args.archive else None
+    nc = await nats.connect(args.nats_url)
+    js = nc.jetstream()
+
+    def audio_for(session_id: str) -> Audio:
+        if archive is None:
+            return stream_audio(js, session_id, args.room)
+        if any(p.exists() for p in archive_paths(archive, session_id).values()):
+            return archive_audio(archive, session_id)
+        return archived(stream_audio(js, session_id, args.room), archive, session_id)
+
+    options: dict[str, Any] = {"model": args.model}
+    if args.keyterm:
+        options["keyterm"] = args.keyterm
+    engine = create_async_engine(f"sqlite+aiosqlite:///{args.db}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    db_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        started = time.perf_counter()
+        results = await run_jobs(
+            args.session_ids,
+            audio_for,
+            DeepgramTranscriber,
+            db_factory,
+            args.concurrency,
+            options,
+            args.label,
+        )
+        report(results, time.perf_counter() - started)
+    finally:
+        await engine.dispose()
+        await nc.close()
+    return 1 if any(r.error for r in results) else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("session_ids", nargs="+", metavar="SESSION_ID")
+    parser.add_argument("--model", default=os.getenv("DEEPGRAM_MODEL", "nova-3"))
+    parser.add_argument("--keyterm", help="Deepgram keyterm prompt (nova-3)")
+    parser.add_argument("--label", default="", help="note stored with the version")
+    parser.add_argument("--archive", help="directory of archived session audio")
+    parser.add_argument("--room", default="", help="room of room-scoped audio")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--nats-url", default=os.getenv("NATS_URL", "nats://localhost:4222")
+    )
+    parser.add_argument(
+        "--db", default=os.getenv("DB_PATH", "/data/db/livestt.db"), help="gateway DB"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import os
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import ForeignKey, Index
+from sqlalchemy import ForeignKey, Index, case
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -49,6 +49,47 @@ class TranscriptSegment(Base):
     __table_args__: Any = (Index("idx_segments_session", "session_id"),)
 
 
+# Reading order of a session's segments. Backfill audio always precedes live
+# audio, but with parallel STT lanes their segments are written interleaved.
+SEGMENT_ORDER = (
+    case((TranscriptSegment.source == "backfill", 0), else_=1),
+    TranscriptSegment.id,
+)
+
+
+class TranscriptVersion(Base):
+    """A later transcription of a session's audio (``scripts/retranscribe.py``).
+
+    The segments written live stay in ``transcript_segments``; each version
+    keeps its own segments, in audio order.
+    """
+
+    __tablename__ = "transcript_versions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    session_id: Mapped[str] = mapped_column(ForeignKey("sessions.id"))
+    created_at: Mapped[str] = mapped_column()  # ISO 8601
+    model: Mapped[str] = mapped_column(default="")
+    label: Mapped[str] = mapped_column(default="")
+    audio_s: Mapped[float] = mapped_column(default=0.0)
+
+    __table_args__: Any = (Index("idx_versions_session", "session_id"),)
+
+
+class VersionSegment(Base):
+    __tablename__ = "transcript_version_segments"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    version_id: Mapped[int] = mapped_column(ForeignKey("transcript_versions.id"))
+    timestamp: Mapped[str] = mapped_column()
+    speaker: Mapped[str] = mapped_column(default="Unknown")
+    text: Mapped[str] = mapped_column()
+    confidence: Mapped[float] = mapped_column(default=0.0)
+    source: Mapped[str] = mapped_column(default="live")
+
+    __table_args__: Any = (Index("idx_version_segments_version", "version_id"),)
+
+
 class Schedule(Base):
     __tablename__ = "schedules"
 
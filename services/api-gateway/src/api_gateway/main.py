@@ -5,6 +5,7 @@ import json
 import logging
 import os
 import secrets
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -14,7 +15,14 @@ from fastapi import Depends, FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from messaging.streams import SESSION_KV_BUCKET
+from messaging.lag import LagMonitor
+from messaging.latency import TRACE_FIELD, LatencyStats
+from messaging.streams import (
+    SESSION_KV_BUCKET,
+    SESSION_KV_KEY,
+    SUBJECT_SESSION_CONTROL,
+    room_scoped,
+)
 from nats.aio.client import Client as NATS
 from nats.js.api import ConsumerConfig, DeliverPolicy
 from pydantic import BaseModel
@@ -29,11 +37,14 @@ from api_gateway.auth import (
     verify_password,
 )
 from api_gateway.db import (
+    SEGMENT_ORDER,
     AppConfig,
     LogEntry,
     Schedule,
     SessionModel,
     TranscriptSegment,
+    TranscriptVersion,
+    VersionSegment,
     create_engine_and_tables,
 )
 
@@ -57,8 +68,16 @@ logger = logging.getLogger("api-gateway")
 NATS_URL = os.getenv("NATS_URL", "nats://localhost:4222")
 MAX_WS_CONNECTIONS = int(os.getenv("MAX_WS_CONNECTIONS", "50"))
 SITE_URL = os.getenv("SITE_URL", "")
-TRANSCRIPT_TOPIC = "transcript.raw.>"
-CONSUMER_DURABLE = "api_gateway"
+# Room served by this gateway ("" = single-room setup). With multi-room
+# capture, run one gateway per room; it only sees that room's transcripts,
+# session events and session state.
+ROOM = os.getenv("GATEWAY_ROOM", "")
+TRANSCRIPT_TOPIC = f"transcript.raw.*.{ROOM}" if ROOM else "transcript.raw.>"
+# Speaker-tagged transcripts, read only for identity-manager's ``fuse`` stage
+FINAL_TOPIC = f"transcript.final.*.{ROOM}" if ROOM else "transcript.final.>"
+CONSUMER_DURABLE = f"api_gateway_{ROOM}" if ROOM else "api_gateway"
+_SESSION_KEY = room_scoped(SESSION_KV_KEY, ROOM)
+_SESSION_CONTROL_SUBJECT = room_scoped(SUBJECT_SESSION_CONTROL, ROOM)
 
 # --- Session retention ---
 # Keep the last N completed sessions (0 = unlimited).
@@ -66,6 +85,9 @@ _SESSION_RETENTION_COUNT = int(os.getenv("SESSION_RETENTION_COUNT", "30"))
 # Or purge sessions older than N days (0 = disabled).
 _SESSION_RETENTION_DAYS = int(os.getenv("SESSION_RETENTION_DAYS", "0"))
 
+# Seconds between consumer lag samples (LagMonitor)
+_LAG_INTERVAL_S = float(os.getenv("LAG_INTERVAL_S", "5.0"))
+
 # --- NATS Setup ---
 nats_client = NATS()
 
@@ -73,6 +95,9 @@ nats_client = NATS()
 # Updated by the KV watcher and session event handler.
 _active_session_id: str | None = None
 
+# Per-stage latency histograms from transcript traces (capture → broadcast)
+_latency_stats = LatencyStats()
+
 
 class ConnectionManager:
     def __init__(self) -> None:
@@ -119,6 +144,7 @@ async def _pull_loop(sub: Any, stop_event: asyncio.Event, db_factory: Any) -> No
             for msg in msgs:
                 try:
                     data = json.loads(msg.data.decode("utf-8"))
+                    _observe_latency(data)
                     await manager.broadcast(data)
                     if data.get("is_final") and _active_session_id:
                         await _persist_segment(db_factory, _active_session_id, data)
@@ -133,6 +159,30 @@ async def _pull_loop(sub: Any, stop_event: asyncio.Event, db_factory: Any) -> No
             logger.error(f"Pull consumer error: {e}")
 
 
+def _observe_latency(data: dict[str, Any]) -> None:
+    """Stamp ``broadcast`` on a transcript's trace and record its stages."""
+    trace = data.get(TRACE_FIELD)
+    if isinstance(trace, dict):
+        trace["broadcast"] = time.time()
+        _latency_stats.observe(trace, group=str(data.get("source", "live")))
+
+
+async def _on_final_transcript(msg: Any) -> None:
+    """Record the ``fuse`` stage from identity-manager's transcript.final.
+
+    Clients are served from transcript.raw, so the broadcast trace never
+    passes identity-manager; its hop is measured on this side path.
+    """
+    try:
+        data = json.loads(msg.data.decode())
+    except Exception:
+        return
+    trace = data.get(TRACE_FIELD)
+    if data.get("is_final") and isinstance(trace, dict):
+        group = str(data.get("source", "live"))
+        _latency_stats.observe(trace, group=group, stages=("fuse",))
+
+
 async def _build_status_payload(
     session_kv: Any,
     config_kv: Any,
@@ -141,7 +191,7 @@ async def _build_status_payload(
     state_data: dict[str, Any] = {"state": "idle"}
 
     try:
-        e = await session_kv.get("current")
+        e = await session_kv.get(_SESSION_KEY)
         state_data = json.loads(e.value.decode())
     except Exception:  # nosec B110
         pass
@@ -236,7 +286,7 @@ async def _kv_connect(
             app.state.config_kv = config_kv
             # Recover active session ID from KV
             try:
-                entry = await session_kv.get("current")
+                entry = await session_kv.get(_SESSION_KEY)
                 kv_data = json.loads(entry.value.decode())
                 if kv_data.get("state") == "active":
                     _active_session_id = kv_data.get("session_id")
@@ -260,6 +310,8 @@ async def _on_session_event(msg: Any) -> None:
     """
     try:
         data = json.loads(msg.data.decode())
+        if data.get("room", "") != ROOM:
+            return  # another room's session
         db_factory = _lifespan_db_factory
         if db_factory is not None:
             await _handle_session_db(db_factory, data)
@@ -292,6 +344,8 @@ async def _on_stt_status(msg: Any) -> None:
     """Forward STT status changes to WebSocket clients."""
     try:
         data = json.loads(msg.data.decode())
+        if data.get("room", "") != ROOM:
+            return
         await manager.broadcast_message({"type": "stt_status", "payload": data})
     except Exception as exc:
         logger.warning(f"stt_status handler error: {exc}")
@@ -384,12 +438,23 @@ async def _run_session_retention(db_factory: Any) -> int:
             if not ids_to_delete:
                 return 0
 
-            # Delete segments first, then sessions
+            # Delete segments and transcript versions first, then sessions
             await db.execute(
                 delete(TranscriptSegment).where(
                     TranscriptSegment.session_id.in_(ids_to_delete)
                 )
             )
+            version_ids = select(TranscriptVersion.id).where(
+                TranscriptVersion.session_id.in_(ids_to_delete)
+            )
+            await db.execute(
+                delete(VersionSegment).where(VersionSegment.version_id.in_(version_ids))
+            )
+            await db.execute(
+                delete(TranscriptVersion).where(
+                    TranscriptVersion.session_id.in_(ids_to_delete)
+                )
+            )
             await db.execute(
                 delete(SessionModel).where(SessionModel.id.in_(ids_to_delete))
             )
@@ -437,6 +502,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     kv_task: asyncio.Task[None] | None = None
     log_cleanup_task: asyncio.Task[None] | None = None
     session_cleanup_task: asyncio.Task[None] | None = None
+    lag_task: asyncio.Task[None] | None = None
 
     # Initialize database
     db_engine, db_factory = await create_engine_and_tables()
@@ -467,6 +533,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
         await nats_client.subscribe("system.session", cb=_on_session_event)
         await nats_client.subscribe("system.stt_status", cb=_on_stt_status)
+        await nats_client.subscribe(FINAL_TOPIC, cb=_on_final_transcript)
 
         # Global log subscription: ring buffer + persistent storage
         await nats_client.subscribe("logs.>", cb=_on_global_log)
@@ -479,6 +546,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             _session_retention_loop(db_factory, stop_event)
         )
 
+        # Backlog of every durable consumer, for /admin/status and system.lag
+        lag_monitor = LagMonitor(js, nats_client, interval_s=_LAG_INTERVAL_S)
+        app.state.lag_monitor = lag_monitor
+        lag_task = asyncio.create_task(lag_monitor.run(stop_event))
+
         # session_kv / config_kv start as None; _kv_connect updates them
         app.state.nats = nats_client
         app.state.js = js
@@ -490,7 +562,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     finally:
         logger.info("Shutting down... closing NATS connection.")
         stop_event.set()
-        for task in (pull_task, kv_task, log_cleanup_task, session_cleanup_task):
+        for task in (
+            pull_task,
+            kv_task,
+            log_cleanup_task,
+            session_cleanup_task,
+            lag_task,
+        ):
             if task is not None:
                 task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
@@ -581,7 +659,7 @@ async def session_start(
     # Check for an already-active session
     if session_kv is not None:
         try:
-            entry = await session_kv.get("current")
+            entry = await session_kv.get(_SESSION_KEY)
             data = json.loads(entry.value.decode())
             if data.get("state") == "active":
                 return JSONResponse(
@@ -597,7 +675,7 @@ async def session_start(
     label = body.label if body else ""
     command = json.dumps({"command": "start", "label": label}).encode()
     js = request.app.state.js
-    await js.publish("session.control", command)
+    await js.publish(_SESSION_CONTROL_SUBJECT, command)
     return JSONResponse(content={"status": "ok"})
 
 
@@ -677,7 +755,7 @@ async def session_stop(
     """Stop the active session. Requires admin JWT."""
     js = request.app.state.js
     command = json.dumps({"command": "stop"}).encode()
-    await js.publish("session.control", command)
+    await js.publish(_SESSION_CONTROL_SUBJECT, command)
     return JSONResponse(content={"status": "ok"})
 
 
@@ -698,11 +776,21 @@ async def session_status(request: Request) -> dict[str, Any]:
 
 @app.get("/admin/status")
 async def admin_status(request: Request) -> dict[str, Any]:
-    """System status: service health, NATS streams, disk usage. No auth."""
+    """System status: service health, NATS streams, consumer lag, disk usage.
+
+    No auth.
+    """
     from api_gateway.status import get_system_status
 
     js = request.app.state.js
-    return await get_system_status(js)
+    lag_monitor = getattr(request.app.state, "lag_monitor", None)
+    return await get_system_status(js, lag_monitor)
+
+
+@app.get("/admin/latency")
+async def admin_latency() -> dict[str, Any]:
+    """Per-stage transcript latency histograms, by source (live/backfill)."""
+    return _latency_stats.as_dict()
 
 
 @app.get("/admin/sessions")
@@ -759,9 +847,16 @@ async def list_sessions(
 
 @app.get("/admin/sessions/{session_id}")
 async def get_session(
-    request: Request, session_id: str, _: None = Depends(require_admin)
+    request: Request,
+    session_id: str,
+    version: int | None = None,
+    _: None = Depends(require_admin),
 ) -> JSONResponse:
-    """Get session details with all transcript segments."""
+    """Get session details with all transcript segments.
+
+    Segments are the live transcript, or those of transcript ``version``
+    (see ``scripts/retranscribe.py``) when given.
+    """
     db_factory = request.app.state.db_factory
     async with db_factory() as db:
         result = await db.execute(
@@ -774,12 +869,33 @@ async def get_session(
                 content={"error": "session_not_found"},
             )
 
-        seg_result = await db.execute(
-            select(TranscriptSegment)
-            .where(TranscriptSegment.session_id == session_id)
-            .order_by(TranscriptSegment.id)
+        ver_result = await db.execute(
+            select(TranscriptVersion)
+            .where(TranscriptVersion.session_id == session_id)
+            .order_by(TranscriptVersion.id)
         )
-        segments = list(seg_result.scalars().all())
+        versions = list(ver_result.scalars().all())
+
+        segments: list[TranscriptSegment] | list[VersionSegment]
+        if version is None:
+            seg_result = await db.execute(
+                select(TranscriptSegment)
+                .where(TranscriptSegment.session_id == session_id)
+                .order_by(*SEGMENT_ORDER)
+            )
+            segments = list(seg_result.scalars().all())
+        elif any(v.id == version for v in versions):
+            ver_seg_result = await db.execute(
+                select(VersionSegment)
+                .where(VersionSegment.version_id == version)
+                .order_by(VersionSegment.id)
+            )
+            segments = list(ver_seg_result.scalars().all())
+        else:
+            return JSONResponse(
+                status_code=404,
+                content={"error": "version_not_found"},
+            )
 
     return JSONResponse(
         content={
@@ -789,6 +905,17 @@ async def get_session(
                 "started_at": session.started_at,
                 "stopped_at": session.stopped_at,
             },
+            "version": version,
+            "versions": [
+                {
+                    "id": v.id,
+                    "created_at": v.created_at,
+                    "model": v.model,
+                    "label": v.label,
+                    "audio_s": v.audio_s,
+                }
+                for v in versions
+            ],
             "segments": [
                 {
                     "id": seg.id,
@@ -843,10 +970,10 @@ async def rename_session(
         session_kv = getattr(request.app.state, "session_kv", None)
         if session_kv is not None:
             try:
-                entry = await session_kv.get("current")
+                entry = await session_kv.get(_SESSION_KEY)
                 kv_data = json.loads(entry.value.decode())
                 kv_data["label"] = new_label
-                await session_kv.put("current", json.dumps(kv_data).encode())
+                await session_kv.put(_SESSION_KEY, json.dumps(kv_data).encode())
             except Exception as e:
                 logger.warning(f"KV label update failed: {e}")
 
@@ -878,7 +1005,7 @@ async def export_session(
         seg_result = await db.execute(
             select(TranscriptSegment)
             .where(TranscriptSegment.session_id == session_id)
-            .order_by(TranscriptSegment.id)
+            .order_by(*SEGMENT_ORDER)
         )
         segments = list(seg_result.scalars().all())
 
@@ -1354,7 +1481,7 @@ async def _replay_session_transcript(websocket: WebSocket, session_id: str) -> N
             result = await db.execute(
                 select(TranscriptSegment)
                 .where(TranscriptSegment.session_id == session_id)
-                .order_by(TranscriptSegment.id)
+                .order_by(*SEGMENT_ORDER)
             )
             segments = result.scalars().all()
             for seg in segments:
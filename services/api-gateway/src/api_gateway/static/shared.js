@@ -46,6 +46,7 @@ window.LiveSTT = (() => {
   let reconnectTimer = null;
   let backfillRendered = false;
   let separatorInserted = false;
+  let liveStartEl = null;  // first live row (or the separator above it)
   let _firstTranscriptFired = false;
   let dgLaneStates = {};  // per-lane Deepgram status
   let userScrolledUp = false;
@@ -182,7 +183,7 @@ window.LiveSTT = (() => {
 
   // ── DOM helpers ──────────────────────────────────────────────────────
   function appendFinalLine(text, speaker, isBackfill) {
-    if (!text.trim() || !cfg.containerEl) return;
+    if (!text.trim() || !cfg.containerEl) return null;
 
     const row = document.createElement("div");
     row.className = "line-enter py-0.5";
@@ -205,15 +206,35 @@ window.LiveSTT = (() => {
 
     body.appendChild(document.createTextNode(text));
     row.appendChild(body);
+    // With parallel STT lanes, backfill can still arrive after live has
+    // started: keep it above the live section, where it belongs in time
+    if (isBackfill && liveStartEl) {
+      cfg.containerEl.insertBefore(row, liveStartEl);
+      return row;
+    }
     cfg.containerEl.appendChild(row);
 
     scrollToBottom();
+    return row;
+  }
+
+  function insertSeparator() {
+    separatorInserted = true;
+    const sep = document.createElement("div");
+    sep.className = "my-2 border-t border-white/10";
+    if (liveStartEl) {
+      cfg.containerEl.insertBefore(sep, liveStartEl);
+    } else {
+      cfg.containerEl.appendChild(sep);
+    }
+    liveStartEl = sep;
   }
 
   function clearTranscript() {
     if (cfg.containerEl) cfg.containerEl.innerHTML = "";
     backfillRendered = false;
     separatorInserted = false;
+    liveStartEl = null;
     userScrolledUp = false;
   }
 
@@ -252,13 +273,10 @@ window.LiveSTT = (() => {
         const text = (p.text || "").trim();
         const speaker = p.speaker || null;
 
-        if (isLive && backfillRendered && !separatorInserted) {
-          separatorInserted = true;
-          const sep = document.createElement("div");
-          sep.className = "my-2 border-t border-white/10";
-          cfg.containerEl.appendChild(sep);
-        }
-        appendFinalLine(text, speaker, isBackfill);
+        if (isLive && backfillRendered && !separatorInserted) insertSeparator();
+        if (isBackfill && liveStartEl && !separatorInserted && text) insertSeparator();
+        const row = appendFinalLine(text, speaker, isBackfill);
+        if (isLive && row && !liveStartEl) liveStartEl = row;
         if (isBackfill) backfillRendered = true;
         if (!_firstTranscriptFired && cfg.onFirstTranscript) {
           _firstTranscriptFired = true;
@@ -1,4 +1,4 @@
-"""System status: service heartbeats, NATS stream stats, disk usage."""
+"""System status: service heartbeats, NATS stream stats, consumer lag, disk usage."""
 
 import json
 import logging
@@ -22,11 +22,17 @@ _STREAM_NAMES = [
 _DB_PATH = Path(os.getenv("DB_PATH", "/data/db/livestt.db")).parent
 
 
-async def get_system_status(js: Any) -> dict[str, Any]:
-    """Gather system status from NATS KV, streams, and disk."""
+async def get_system_status(js: Any, lag_monitor: Any = None) -> dict[str, Any]:
+    """Gather system status from NATS KV, streams, and disk.
+
+    ``consumers`` is the latest sample of ``lag_monitor`` (a
+    ``messaging.lag.LagMonitor``): backlog, drain rate and catch-up ETA per
+    durable. Empty until the first sample, or without a monitor.
+    """
     return {
         "services": await _get_service_heartbeats(js),
         "streams": await _get_stream_stats(js),
+        "consumers": _get_consumer_lag(lag_monitor),
         "disk": _get_disk_usage(),
     }
 
@@ -90,6 +96,12 @@ async def _get_stream_stats(js: Any) -> list[dict[str, Any]]:
     return stats
 
 
+def _get_consumer_lag(lag_monitor: Any) -> list[dict[str, Any]]:
+    if lag_monitor is None:
+        return []
+    return [lag.as_dict() for lag in lag_monitor.latest]
+
+
 def _get_disk_usage() -> dict[str, Any]:
     """Return disk usage for the data directory."""
     db_path = _DB_PATH
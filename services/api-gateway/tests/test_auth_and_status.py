@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from api_gateway.auth import create_token
+from messaging.lag import ConsumerLag
 
 # ---------------------------------------------------------------------------
 # Shared fixtures / helpers
@@ -252,6 +253,9 @@ async def test_admin_status_returns_expected_structure() -> None:
     async with _patched_app(kv, _make_idle_kv()) as (app, mock_js):
         mock_js.key_value.return_value = service_health_kv
         mock_js.stream_info.return_value = fake_info
+        app.state.lag_monitor = MagicMock(
+            latest=[ConsumerLag(stream="AUDIO_STREAM", durable="stt_live", pending=3)]
+        )
 
         async with AsyncClient(
             transport=ASGITransport(app=app), base_url="http://test"
@@ -278,6 +282,11 @@ async def test_admin_status_returns_expected_structure() -> None:
     assert "bytes" in stream
     assert "consumers" in stream
 
+    # Consumer lag from the monitor's latest sample
+    assert body["consumers"][0]["durable"] == "stt_live"
+    assert body["consumers"][0]["pending"] == 3
+    assert body["consumers"][0]["eta_s"] is None
+
     # Disk has expected keys
     disk = body["disk"]
     assert "total_bytes" in disk
@@ -55,3 +55,69 @@ async def test_connection_manager_disconnect_silences_failed_send() -> None:
 
     # Should not raise
     await manager.broadcast({"text": "test"})
+
+
+@pytest.mark.asyncio
+async def test_session_event_for_other_room_is_ignored(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A room-scoped gateway only reacts to its own room's session events."""
+    import json
+    from unittest.mock import AsyncMock, MagicMock
+
+    from api_gateway import main
+
+    broadcast = AsyncMock()
+    monkeypatch.setattr(main.manager, "broadcast_message", broadcast)
+    monkeypatch.setattr(main, "_lifespan_db_factory", None)
+    monkeypatch.setattr(main, "ROOM", "hall")
+
+    msg = MagicMock()
+    msg.data = json.dumps(
+        {"event": "started", "session_id": "s1", "room": "lobby"}
+    ).encode()
+    await main._on_session_event(msg)
+    broadcast.assert_not_called()
+
+    msg.data = json.dumps({"event": "started", "room": "hall"}).encode()
+    await main._on_session_event(msg)
+    broadcast.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_admin_latency_aggregates_transcript_traces(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Broadcast transcripts with a trace feed the per-stage histograms."""
+    import json
+    from unittest.mock import MagicMock
+
+    from api_gateway import main
+    from messaging.latency import LatencyStats
+
+    monkeypatch.setattr(main, "_latency_stats", LatencyStats())
+    main._observe_latency({"text": "hi", "source": "live"})  # untraced: ignored
+    assert await main.admin_latency() == {}
+
+    trace = {"capture": 1.0, "publish": 1.01, "stt_send": 1.02, "stt_result": 1.3}
+    main._observe_latency({"text": "hi", "source": "backfill", "trace": trace})
+
+    stats = await main.admin_latency()
+    assert list(stats) == ["backfill"]
+    assert list(stats["backfill"]) == [
+        "publish",
+        "stt_send",
+        "stt_result",
+        "broadcast",
+        "total",
+    ]
+    assert stats["backfill"]["stt_result"]["p50_ms"] == 300
+
+    final = {"is_final": True, "source": "backfill", "trace": {**trace, "fuse": 1.34}}
+    msg = MagicMock()
+    msg.data = json.dumps(final).encode()
+    await main._on_final_transcript(msg)
+
+    fused = (await main.admin_latency())["backfill"]
+    assert fused["fuse"]["count"] == 1 and fused["fuse"]["p50_ms"] == 50
+    assert fused["total"]["count"] == 1  # the side path only records fuse
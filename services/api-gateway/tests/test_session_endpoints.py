@@ -410,3 +410,48 @@ async def test_rename_session_requires_auth() -> None:
         )
 
     assert resp.status_code == 401
+
+
+# ---------------------------------------------------------------------------
+# GET /admin/sessions/{session_id}?version= (re-transcriptions)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_session_lists_and_returns_transcript_versions() -> None:
+    from api_gateway.db import (
+        SessionModel,
+        TranscriptSegment,
+        TranscriptVersion,
+        VersionSegment,
+    )
+    from httpx import ASGITransport, AsyncClient
+
+    async with (
+        _nats_patched_app(_make_session_kv(active=False), _make_config_kv()) as (app, _),
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client,
+    ):
+        async with app.state.db_factory() as db:
+            db.add(SessionModel(id="s1", started_at="2026-01-01T10:00:00+00:00"))
+            db.add(TranscriptSegment(session_id="s1", timestamp="t", text="live text"))
+            version = TranscriptVersion(
+                session_id="s1", created_at="2026-01-02T00:00:00+00:00", model="nova-3"
+            )
+            db.add(version)
+            await db.flush()
+            db.add(VersionSegment(version_id=version.id, timestamp="t", text="redone"))
+            await db.commit()
+
+        live = await client.get("/admin/sessions/s1", headers=_auth_header())
+        redone = await client.get(
+            f"/admin/sessions/s1?version={version.id}", headers=_auth_header()
+        )
+        missing = await client.get(
+            "/admin/sessions/s1?version=99", headers=_auth_header()
+        )
+
+    assert [s["text"] for s in live.json()["segments"]] == ["live text"]
+    assert [v["model"] for v in live.json()["versions"]] == ["nova-3"]
+    assert [s["text"] for s in redone.json()["segments"]] == ["redone"]
+    assert redone.json()["version"] == version.id
+    assert missing.status_code == 404
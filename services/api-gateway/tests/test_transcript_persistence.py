@@ -8,7 +8,7 @@ from contextlib import asynccontextmanager
 from typing import Any
 
 import pytest
-from api_gateway.db import Base, SessionModel, TranscriptSegment
+from api_gateway.db import SEGMENT_ORDER, Base, SessionModel, TranscriptSegment
 from api_gateway.main import _handle_session_db, _persist_segment
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
@@ -75,6 +75,30 @@ async def test_persist_segment_writes_row() -> None:
             assert seg.source == "live"
 
 
+@pytest.mark.asyncio
+async def test_segment_order_puts_backfill_first() -> None:
+    """Parallel STT lanes interleave writes; reads restore backfill → live."""
+    async with _db_factory() as factory:
+        await _seed_session(factory)
+        for text, source in (
+            ("live 1", "live"),
+            ("backfill 1", "backfill"),
+            ("live 2", "live"),
+            ("backfill 2", "backfill"),
+        ):
+            await _persist_segment(
+                factory, "20260409-1000", {"text": text, "source": source}
+            )
+
+        async with factory() as db:
+            rows = (
+                (await db.execute(select(TranscriptSegment).order_by(*SEGMENT_ORDER)))
+                .scalars()
+                .all()
+            )
+        assert [r.text for r in rows] == ["backfill 1", "backfill 2", "live 1", "live 2"]
+
+
 @pytest.mark.asyncio
 async def test_persist_segment_defaults() -> None:
     async with _db_factory() as factory:
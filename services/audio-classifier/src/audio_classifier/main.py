@@ -3,6 +3,7 @@ import json
 from dataclasses import asdict
 from typing import Any
 
+from messaging.audio import AudioFrame
 from messaging.service import BaseService
 from messaging.streams import (
     CLASSIFICATION_STREAM_CONFIG,
@@ -45,15 +46,13 @@ class AudioClassifierService(BaseService):
             return
 
         try:
-            audio_data = msg.data
-            # Classify
-            result = self.classifier.classify(audio_data)
-
-            # Publish result
-            payload = asdict(result)
             topic = f"{SUBJECT_PREFIX_CLASSIFICATION}.live"
+            # The VAD model runs on single capture periods — classify each one
+            for audio_data in AudioFrame.from_msg(msg).iter_periods():
+                result = self.classifier.classify(audio_data)
 
-            await self.js.publish(topic, json.dumps(payload).encode("utf-8"))
+                payload = asdict(result)
+                await self.js.publish(topic, json.dumps(payload).encode("utf-8"))
 
         except Exception as e:
             self.logger.error(f"Error processing audio chunk: {e}")
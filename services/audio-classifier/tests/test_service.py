@@ -70,3 +70,29 @@ async def _async_test_handle_audio(service: AudioClassifierService) -> None:
     call_args = service.js.publish.call_args  # type: ignore
     assert call_args[0][0] == "classification.live"
     assert b"test_label" in call_args[0][1]
+
+
+def test_handle_audio_unpacks_periods(service: AudioClassifierService) -> None:
+    asyncio.run(_async_test_handle_audio_unpacks_periods(service))
+
+
+async def _async_test_handle_audio_unpacks_periods(
+    service: AudioClassifierService,
+) -> None:
+    msg = MagicMock()
+    msg.data = b"\x01\x00" * 8 + b"\x02\x00" * 8
+    msg.headers = {"LiveSTT-Periods": "2", "LiveSTT-Sample-Offset": "0"}
+
+    service.classifier = MagicMock()
+    service.classifier.classify.return_value = ClassificationResult(
+        label="speech", confidence=0.9, timestamp=1.0
+    )
+
+    await service._handle_audio(msg)
+
+    assert [c.args[0] for c in service.classifier.classify.call_args_list] == [
+        b"\x01\x00" * 8,
+        b"\x02\x00" * 8,
+    ]
+    assert service.js
+    assert service.js.publish.call_count == 2  # type: ignore
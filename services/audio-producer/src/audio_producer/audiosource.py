@@ -1,5 +1,5 @@
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterator
 from types import TracebackType
 from typing import TYPE_CHECKING, Self, override
 
@@ -17,51 +17,132 @@ else:
         import pyaudio as _pyaudio
     except ImportError:
         _pyaudio = None
+import errno
 import logging
-import wave
+import math
+import time
+from pathlib import Path
 
+from .capture import SKIP, CaptureRing, CaptureStats
 from .interfaces import AudioSource
+from .resample import PeriodNormalizer
+from .wavfile import MappedWav, resolve_playlist
 
 _logger = logging.getLogger(__name__)
 
+# Capture ring depth in periods (64 x 96 ms ≈ 6 s of slack for loop stalls)
+_CAPTURE_SLOTS = 64
+
+
+def _normalizer(
+    sample_rate: int, channels: int, sample_width: int, chunk_size: int
+) -> PeriodNormalizer | None:
+    """Resampler/downmixer for a capture format, or None if already 16 kHz mono."""
+    normalizer = PeriodNormalizer(sample_rate, channels, sample_width, chunk_size)
+    return None if normalizer.identity else normalizer
+
+
+def _log_format(sample_rate: int, channels: int, sample_width: int) -> None:
+    _logger.info(
+        f"Capture format {sample_rate} Hz x{channels} ({sample_width * 8}-bit), "
+        "resampled to 16 kHz mono in process"
+    )
+
 
 class FileSource(AudioSource):
-    """Audio source that reads from a WAV file."""
+    """Audio source that replays WAV files (a file, a directory or a playlist).
+
+    ``speed`` paces playback: 1.0 is real time, N plays N times faster and
+    0 (or ``inf``) is unthrottled. Files are memory-mapped and chunks are
+    zero-copy ``memoryview`` slices of the mapping; files that are not
+    16 kHz mono int16 are resampled and downmixed on the fly instead.
+    """
 
     file_path: str
     chunk_size: int
     loop: bool
-    wf: wave.Wave_read
+    speed: float
 
     def __init__(
-        self, file_path: str, chunk_size: int = 1536, loop: bool = False
+        self,
+        file_path: str,
+        chunk_size: int = 1536,
+        loop: bool = False,
+        speed: float = 1.0,
     ) -> None:
+        if speed < 0:
+            raise ValueError("speed must be >= 0")
         self.file_path = file_path
         self.chunk_size = chunk_size
         self.loop = loop
+        self.speed = speed
         self.running = True
+        self.files: list[Path] = []
+        self._wav: MappedWav | None = None
+
+    def _open(self, path: Path) -> MappedWav:
+        if self._wav is not None:
+            self._wav.close()
+        self._wav = MappedWav(path)
+        return self._wav
+
+    def _chunks(self, wav: MappedWav) -> Iterator[bytes]:
+        """Split one file into 16 kHz mono chunks of ``chunk_size`` samples."""
+        step = self.chunk_size * 2
+        normalizer = _normalizer(
+            wav.sample_rate, wav.channels, wav.sample_width, self.chunk_size
+        )
+        if normalizer is None:
+            pcm = wav.pcm
+            for offset in range(0, len(pcm), step):
+                yield pcm[offset : offset + step]  # type: ignore[misc]  # bytes-like view
+            return
+        frame = wav.channels * wav.sample_width
+        in_step = normalizer.device_frames(self.chunk_size) * frame
+        for offset in range(0, len(wav.pcm), in_step):
+            out = normalizer.convert(wav.pcm[offset : offset + in_step])
+            for start in range(0, len(out), step):
+                yield out[start : start + step]
+        if tail := normalizer.flush():
+            yield tail
 
     @override
     async def stream(self) -> AsyncIterator[bytes]:
-        """Yields chunks of raw PCM audio bytes from the file."""
-        while self.running:
-            data = self.wf.readframes(self.chunk_size)
-            if not data:
-                if self.loop:
-                    self.wf.rewind()
-                    continue
+        """Yields chunks of raw PCM audio from the files, paced by ``speed``."""
+        throttled = 0 < self.speed < math.inf
+        started = time.monotonic()
+        samples = 0
+        while True:
+            pass_start = samples
+            for path in self.files:
+                for chunk in self._chunks(self._open(path)):
+                    if not self.running:
+                        return
+                    yield chunk
+                    samples += len(chunk) // 2
+                    if throttled:
+                        # Pace against the schedule, not per chunk, so
+                        # consumer time does not accumulate as drift
+                        due = started + samples / 16000 / self.speed
+                        await asyncio.sleep(max(0.0, due - time.monotonic()))
+                    else:
+                        await asyncio.sleep(0)
+            if not self.loop or samples == pass_start or not self.running:
                 break
-            yield data
-            # Simulate real-time streaming
-            await asyncio.sleep(self.chunk_size / 16000)
+        elapsed = time.monotonic() - started
+        audio_s = samples / 16000
+        if elapsed > 0:
+            _logger.info(
+                f"File replay: {audio_s:.1f}s of audio in {elapsed:.1f}s "
+                f"({audio_s / elapsed:.1f}x realtime)"
+            )
 
     @override
     async def __aenter__(self) -> Self:
-        self.wf = wave.open(self.file_path, "rb")  # noqa: SIM115
-        if self.wf.getnchannels() != 1:
-            raise ValueError("Audio file must be mono")
-        if self.wf.getsampwidth() != 2:
-            raise ValueError("Audio file must be 16-bit PCM")
+        self.files = resolve_playlist(self.file_path)
+        # Validate every file up front rather than mid-replay
+        for path in self.files:
+            MappedWav(path).close()
         self.running = True
         return self
 
@@ -72,7 +153,9 @@ class FileSource(AudioSource):
         exc_tb: TracebackType | None,
     ) -> None:
         self.running = False
-        self.wf.close()
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
 
 
 if _pyaudio:
@@ -85,38 +168,80 @@ if _pyaudio:
         chunk_size: int
         sample_rate: int
 
-        def __init__(self, sample_rate: int = 16000, chunk_size: int = 1536) -> None:
+        def __init__(
+            self,
+            sample_rate: int = 16000,
+            chunk_size: int = 1536,
+            device_index: int | None = None,
+            channels: int = 1,
+            sample_width: int = 2,
+        ) -> None:
             self.chunk_size = chunk_size
             self.sample_rate = sample_rate
+            self.device_index = device_index  # None = default input device
+            self.channels = channels
+            self.sample_width = sample_width
             self.running = True
+            self._ring: CaptureRing | None = None
+            self._normalizer = _normalizer(
+                sample_rate, channels, sample_width, chunk_size
+            )
+
+        @property
+        def capture_stats(self) -> CaptureStats | None:
+            return self._ring.stats if self._ring else None
+
+        @property
+        def capture_time(self) -> float | None:
+            """Wall-clock time the chunk last yielded was read from the device."""
+            return self._ring.last_timestamp if self._ring else None
+
+        def _read_period(self) -> bytes | None:
+            """Blocking read, run on the capture thread."""
+            frames = (
+                self._normalizer.device_frames(self.chunk_size)
+                if self._normalizer
+                else self.chunk_size
+            )
+            try:
+                data: bytes = self.stream_obj.read(frames, exception_on_overflow=False)
+            except OSError as e:
+                _logger.error("Error reading from audio device: %s", e)
+                return None
+            return self._normalizer.convert(data) if self._normalizer else data
 
         @override
         async def stream(self) -> AsyncIterator[bytes]:
             """Yields chunks of raw PCM audio bytes."""
-            while self.running:
-                try:
-                    data = await asyncio.to_thread(
-                        self.stream_obj.read,
-                        self.chunk_size,
-                        exception_on_overflow=False,
-                    )
-                    yield data
-                except OSError as e:
-                    _logger.error("Error reading from audio device: %s", e)
+            assert self._ring is not None
+            async for data in self._ring.chunks():
+                if not self.running:
                     break
+                yield data
 
         @override
         async def __aenter__(self) -> Self:
             """Enter the runtime context related to this object."""
             self.pyaudio_instance = _pyaudio.PyAudio()
+            if self._normalizer:
+                _log_format(self.sample_rate, self.channels, self.sample_width)
             self.stream_obj = self.pyaudio_instance.open(
-                format=_pyaudio.paInt16,
-                channels=1,
+                format=self.pyaudio_instance.get_format_from_width(self.sample_width),
+                channels=self.channels,
                 rate=self.sample_rate,
                 input=True,
-                frames_per_buffer=self.chunk_size,
+                input_device_index=self.device_index,
+                frames_per_buffer=(
+                    self._normalizer.device_frames(self.chunk_size)
+                    if self._normalizer
+                    else self.chunk_size
+                ),
             )
             self.running = True
+            self._ring = CaptureRing(
+                self._read_period, self.chunk_size * 2, _CAPTURE_SLOTS, "pyaudio-capture"
+            )
+            self._ring.start()
             return self
 
         @override
@@ -128,6 +253,10 @@ if _pyaudio:
         ) -> None:
             """Exit the runtime context related to this object."""
             self.running = False
+            if self._ring is not None:
+                # The device must outlive the read in progress on the thread
+                self._ring.stop()
+                await asyncio.to_thread(self._ring.join)
             self.stream_obj.stop_stream()
             self.stream_obj.close()
             self.pyaudio_instance.terminate()
@@ -138,34 +267,92 @@ if _alsaaudio:
     class LinuxSource(AudioSource):
         """Audio source for Linux."""
 
-        def __init__(self, sample_rate: int, chunk_size: int) -> None:
+        def __init__(
+            self,
+            sample_rate: int,
+            chunk_size: int,
+            device: str | None = None,
+            channels: int = 1,
+            sample_width: int = 2,
+        ) -> None:
             self.sample_rate = sample_rate
             self.chunk_size = chunk_size
+            self.device = device  # ALSA PCM name (e.g. "hw:1"); None = "default"
+            self.channels = channels
+            self.sample_width = sample_width
             self.running = True
+            self._ring: CaptureRing | None = None
+            # Devices that only do e.g. 48 kHz stereo are opened natively and
+            # converted here rather than through ALSA's plug resampler
+            self._normalizer = _normalizer(
+                sample_rate, channels, sample_width, chunk_size
+            )
+
+        @property
+        def capture_stats(self) -> CaptureStats | None:
+            return self._ring.stats if self._ring else None
+
+        @property
+        def capture_time(self) -> float | None:
+            """Wall-clock time the chunk last yielded was read from the device."""
+            return self._ring.last_timestamp if self._ring else None
+
+        def _read_period(self) -> bytes | None:
+            """Blocking read, run on the capture thread."""
+            try:
+                length, data = self.inp.read()
+            except OSError as e:
+                _logger.error("Error reading from ALSA device: %s", e)
+                return None
+            if length > 0:
+                if self._normalizer:
+                    return self._normalizer.convert(data)
+                return bytes(data)
+            if length == -errno.EPIPE:
+                # Overrun: pyalsaaudio has already re-prepared the device
+                assert self._ring is not None
+                self._ring.note_device_overrun()
+                return SKIP
+            if length < 0:
+                _logger.error("ALSA Error: %s", length)
+                return None
+            return SKIP
 
         @override
         async def stream(self) -> AsyncIterator[bytes]:
-            while self.running:
-                try:
-                    length, data = await asyncio.to_thread(self.inp.read)
-                    if length > 0:
-                        yield data
-                    elif length < 0:
-                        _logger.error("ALSA Error: %s", length)
-                        break
-                except OSError as e:
-                    _logger.error("Error reading from ALSA device: %s", e)
+            assert self._ring is not None
+            async for data in self._ring.chunks():
+                if not self.running:
                     break
+                yield data
 
         @override
         async def __aenter__(self) -> Self:
             """Enter the runtime context related to this object."""
-            self.inp = _alsaaudio.PCM(_alsaaudio.PCM_CAPTURE, _alsaaudio.PCM_NORMAL)
-            self.inp.setchannels(1)
+            self.inp = _alsaaudio.PCM(
+                _alsaaudio.PCM_CAPTURE,
+                _alsaaudio.PCM_NORMAL,
+                device=self.device or "default",
+            )
+            self.inp.setchannels(self.channels)
             self.inp.setrate(self.sample_rate)
-            self.inp.setformat(_alsaaudio.PCM_FORMAT_S16_LE)
-            self.inp.setperiodsize(self.chunk_size)
+            self.inp.setformat(
+                {
+                    2: _alsaaudio.PCM_FORMAT_S16_LE,
+                    3: _alsaaudio.PCM_FORMAT_S24_3LE,
+                    4: _alsaaudio.PCM_FORMAT_S32_LE,
+                }[self.sample_width]
+            )
+            if self._normalizer:
+                _log_format(self.sample_rate, self.channels, self.sample_width)
+                self.inp.setperiodsize(self._normalizer.device_frames(self.chunk_size))
+            else:
+                self.inp.setperiodsize(self.chunk_size)
             self.running = True
+            self._ring = CaptureRing(
+                self._read_period, self.chunk_size * 2, _CAPTURE_SLOTS, "alsa-capture"
+            )
+            self._ring.start()
             return self
 
         @override
@@ -177,6 +364,10 @@ if _alsaaudio:
         ) -> None:
             """Exit the runtime context related to this object."""
             self.running = False
+            if self._ring is not None:
+                # The device must outlive the read in progress on the thread
+                self._ring.stop()
+                await asyncio.to_thread(self._ring.join)
             if hasattr(self.inp, "close"):
                 self.inp.close()
             elif hasattr(self.inp, "stop"):
@@ -0,0 +1,177 @@
+"""Dedicated capture thread feeding a preallocated single-producer ring.
+
+Calling ``asyncio.to_thread(read)`` once per period costs a thread-pool hop
+and a Future per chunk, and an event-loop stall delays the next device read.
+``CaptureRing`` instead runs the blocking read in one long-lived thread that
+copies each period into a fixed ring of slots and stamps it with its capture
+time. The async side wakes once per chunk and never blocks the device.
+
+The ring is lock-free for its single writer and single reader. Slot indices
+are monotonically increasing ints (atomic to publish under the GIL). When the
+reader falls a full ring behind, the writer overwrites the oldest slot; the
+reader detects the lap seqlock-style (re-checking the write index after its
+copy, discarding any slot the writer may be filling) and counts the lost
+periods as overruns.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict, dataclass
+
+_logger = logging.getLogger(__name__)
+
+# Return value of a read function that means "no data this time, keep going"
+SKIP = b""
+
+
+@dataclass
+class CaptureStats:
+    """Counters for one capture thread (monotonic since start)."""
+
+    chunks: int = 0
+    overruns: int = 0  # periods lost because the reader fell a ring behind
+    device_overruns: int = 0  # xruns reported by the driver
+    max_interval_s: float = 0.0  # longest gap between consecutive reads
+    last_capture_ts: float = 0.0  # wall-clock time of the newest period
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class CaptureRing:
+    """Ring of ``slots`` fixed-size chunk buffers filled by a capture thread.
+
+    ``read`` blocks until one period is available and returns its bytes,
+    ``SKIP`` to try again (e.g. after a device xrun) or ``None`` at end of
+    stream / unrecoverable error.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[], bytes | None],
+        chunk_bytes: int,
+        slots: int = 64,
+        name: str = "audio-capture",
+    ) -> None:
+        if slots < 2:
+            raise ValueError("slots must be >= 2")
+        self._read_fn = read
+        self._slot_bytes = chunk_bytes
+        self._slots = slots
+        self._buf = bytearray(chunk_bytes * slots)
+        self._view = memoryview(self._buf)
+        self._lengths = [0] * slots
+        self._stamps = [0.0] * slots
+        self._write = 0  # next slot index to fill (monotonic)
+        self._read = 0  # next slot index to hand out (monotonic)
+        self._done = False
+        self._running = False
+        self._waiting = False
+        self._wake = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.stats = CaptureStats()
+        self.last_timestamp = 0.0  # capture time of the chunk last returned
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._running = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the thread to exit; it finishes the read in progress first."""
+        self._running = False
+
+    def join(self, timeout: float = 1.0) -> None:
+        """Wait for the thread to exit (blocking — call via ``to_thread``)."""
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def note_device_overrun(self) -> None:
+        """Called from the read function when the driver reports an xrun."""
+        self.stats.device_overruns += 1
+
+    # --- capture thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        last = time.monotonic()
+        try:
+            while self._running:
+                data = self._read_fn()
+                if data is None:
+                    break
+                if not data:
+                    continue
+                now = time.monotonic()
+                self.stats.max_interval_s = max(self.stats.max_interval_s, now - last)
+                last = now
+                self._put(data, time.time())
+        except Exception as e:
+            _logger.error(f"Capture thread failed: {e}")
+        finally:
+            self._done = True
+            self._notify()
+
+    def _put(self, data: bytes, stamp: float) -> None:
+        for start in range(0, len(data), self._slot_bytes):
+            piece = data[start : start + self._slot_bytes]
+            slot = self._write % self._slots
+            offset = slot * self._slot_bytes
+            self._view[offset : offset + len(piece)] = piece
+            self._lengths[slot] = len(piece)
+            self._stamps[slot] = stamp
+            self._write += 1  # publish the slot
+            self.stats.chunks += 1
+        self.stats.last_capture_ts = stamp
+        self._notify()
+
+    def _notify(self) -> None:
+        if self._waiting and self._loop is not None:
+            self._waiting = False
+            # RuntimeError: loop already closed during shutdown
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._wake.set)
+
+    # --- event loop side --------------------------------------------------
+
+    def _take(self) -> bytes | None:
+        """Copy out the oldest unread chunk, or None if the ring is empty."""
+        while self._read < self._write:
+            behind = self._write - self._read
+            if behind >= self._slots:
+                # The writer has wrapped onto our slot (or is filling it now)
+                lost = behind - self._slots + 1
+                self.stats.overruns += lost
+                self._read += lost
+                continue
+            slot = self._read % self._slots
+            offset = slot * self._slot_bytes
+            chunk = bytes(self._view[offset : offset + self._lengths[slot]])
+            stamp = self._stamps[slot]
+            if self._write - self._read >= self._slots:
+                continue  # overwritten while copying — counted as lost above
+            self._read += 1
+            self.last_timestamp = stamp
+            return chunk
+        return None
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield captured chunks in order until the capture thread stops."""
+        while True:
+            chunk = self._take()
+            if chunk is not None:
+                yield chunk
+                continue
+            if self._done:
+                return
+            self._wake.clear()
+            self._waiting = True
+            # Re-check after publishing the flag so a concurrent write is seen
+            if self._read < self._write or self._done:
+                self._waiting = False
+                continue
+            await self._wake.wait()
@@ -1,77 +1,194 @@
-import array
 import asyncio
 import contextlib
 import json
-import math
 import os
+import re
+import time
 from datetime import UTC, datetime
 from typing import Any
+from uuid import uuid4
 
+from messaging.audio import AudioFrame
+from messaging.codec import PcmCodec, get_codec
+from messaging.latency import HEADER_PUBLISH_TS, format_ts
+from messaging.levels import SilenceDetector
 from messaging.service import BaseService
 from messaging.streams import (
     AUDIO_STREAM_CONFIG,
     PREROLL_STREAM_CONFIG,
     SESSION_KV_BUCKET,
+    SESSION_KV_KEY,
     SESSION_STREAM_CONFIG,
     SUBJECT_PREFIX_AUDIO_BACKFILL,
     SUBJECT_PREFIX_AUDIO_LIVE,
     SUBJECT_PREFIX_PREROLL,
+    SUBJECT_SESSION_CONTROL,
+    room_scoped,
 )
 from nats.js.api import ConsumerConfig, DeliverPolicy, KeyValueConfig
 
 # Import the module itself so we can safely check for platform-specific classes
 from . import audiosource
 from .interfaces import AudioSource
+from .packer import ChunkPacker
+from .publisher import PublishPipeline
+from .spool import AudioSpool
+
+
+def _parse_speed(value: str) -> float:
+    return 0.0 if value.strip().lower() in ("max", "inf", "unthrottled") else float(value)
+
+
+_ROOM_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def _parse_rooms(value: str) -> dict[str, str]:
+    """Parse ``AUDIO_ROOMS`` (``room=source,...``) into an ordered room map.
+
+    A source is a WAV file / directory / playlist, ``mic`` for the default
+    capture device or ``mic:<device>`` (ALSA device name, PyAudio index).
+    """
+    rooms: dict[str, str] = {}
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+        name, sep, source = (part.strip() for part in entry.partition("="))
+        if not sep or not source:
+            raise ValueError(f"AUDIO_ROOMS entry {entry!r} is not room=source")
+        if not _ROOM_NAME.fullmatch(name):
+            raise ValueError(f"Room name {name!r} must match {_ROOM_NAME.pattern}")
+        if name in rooms:
+            raise ValueError(f"Room {name!r} listed twice in AUDIO_ROOMS")
+        rooms[name] = source
+    return rooms
+
 
 SILENCE_THRESHOLD_DBFS: float = -50.0
+# Level must rise this far above the threshold to leave the silent state
+SILENCE_HYSTERESIS_DB: float = 6.0
+# Rolling window for the silence gate (8 x 96 ms ≈ 0.75 s)
+_SILENCE_WINDOW_CHUNKS: int = 8
 _DEFAULT_SILENCE_TIMEOUT_S: int = 300
 
-
-def _compute_rms(data: bytes) -> float:
-    """Compute RMS level of int16 PCM data in dBFS. Returns -inf for silence."""
-    n = len(data) // 2
-    if n == 0:
-        return -math.inf
-    samples = array.array("h", data)
-    sum_sq = sum(s * s for s in samples)
-    rms = math.sqrt(sum_sq / n)
-    if rms == 0.0:
-        return -math.inf
-    return 20.0 * math.log10(rms / 32768.0)
+# Publish pipeline: outstanding PubAcks before chunks spill/drop (32 ≈ 3 s)
+_PUBLISH_WINDOW: int = int(os.getenv("AUDIO_PUBLISH_WINDOW", "32"))
+# "spill" queues overflow in order behind the window; "drop" discards it
+_PUBLISH_POLICY: str = os.getenv("AUDIO_PUBLISH_POLICY", "spill")
+# Max chunks held in the spill backlog (625 ≈ 60 s)
+_PUBLISH_BACKLOG: int = int(os.getenv("AUDIO_PUBLISH_BACKLOG", "625"))
+# How long shutdown / EOS waits for in-flight publishes to settle
+_PUBLISH_DRAIN_TIMEOUT_S: float = 5.0
+# Interval for publishing pipeline counters on system.audio_stats
+_STATS_INTERVAL_S: float = 30.0
+# Chunk packing: capture periods per NATS message (1 = one message per period)
+_PACK_PERIODS: int = int(os.getenv("AUDIO_PACK_PERIODS", "1"))
+# Packed frames must fit PRE_BUFFER's max_msg_size: 1536-sample int16 capture
+# periods (ADR-0012), leaving 1 KB for the frame headers
+_PACK_PERIODS_MAX: int = (PREROLL_STREAM_CONFIG["max_msg_size"] - 1024) // (1536 * 2)
+# Upper bound on the delay packing may add to the first period of a message
+_PACK_MAX_LATENCY_S: float = float(os.getenv("AUDIO_PACK_MAX_LATENCY_MS", "500")) / 1000
+# AUDIO_FILE replay pace: 1 = real time, N = N x faster, 0 / "max" = unthrottled
+_FILE_SPEED: float = _parse_speed(os.getenv("AUDIO_FILE_SPEED", "1"))
+# Restart AUDIO_FILE playback at the end; "false" ends the run (benchmarks)
+_FILE_LOOP: bool = os.getenv("AUDIO_FILE_LOOP", "true").lower() != "false"
+# Transport codec for audio messages: pcm | mulaw | mulaw-zlib | zlib-delta
+_AUDIO_CODEC: str = os.getenv("AUDIO_CODEC", PcmCodec.name)
+# On-disk spool for audio published while NATS is unreachable (unset = disabled)
+_SPOOL_PATH: str | None = os.getenv("AUDIO_SPOOL_PATH")
+# Spool ring size; 64 MB ≈ 35 min of 16 kHz mono int16
+_SPOOL_MB: int = int(os.getenv("AUDIO_SPOOL_MB", "64"))
+# Stamp capture / publish times on audio for end-to-end latency tracing
+_TRACE_LATENCY: bool = os.getenv("AUDIO_TRACE_LATENCY", "false").lower() == "true"
+# Native capture format of microphones; anything but 16000 Hz / 1 channel /
+# 2 bytes is resampled and downmixed in process (see resample.py)
+_DEVICE_RATE: int = int(os.getenv("AUDIO_DEVICE_RATE", "16000"))
+_DEVICE_CHANNELS: int = int(os.getenv("AUDIO_DEVICE_CHANNELS", "1"))
+_DEVICE_SAMPLE_WIDTH: int = int(os.getenv("AUDIO_DEVICE_SAMPLE_WIDTH", "2"))
+# Multi-room capture: "room=source,..." runs one session per room (unset = one
+# unscoped room fed by AUDIO_FILE or the default microphone)
+_ROOMS: str = os.getenv("AUDIO_ROOMS", "")
 
 
 class AudioProducerService(BaseService):
-    def __init__(self) -> None:
+    """Capture audio and publish it per session.
+
+    Each instance runs the session state machine for one room. With
+    ``AUDIO_ROOMS`` set, the service started by ``main()`` instead spawns one
+    room instance per entry on its NATS connection and runs them concurrently.
+    """
+
+    def __init__(
+        self,
+        room: str = "",
+        source_spec: str | None = None,
+        rooms: dict[str, str] | None = None,
+    ) -> None:
         super().__init__("audio-producer")
+        self.room = room
+        self.source_spec = source_spec
+        self.rooms: dict[str, str] = _parse_rooms(_ROOMS) if rooms is None else rooms
+        if room:
+            self.logger = self.logger.getChild(room)
+        self._live_prefix = room_scoped(SUBJECT_PREFIX_AUDIO_LIVE, room)
+        self._backfill_prefix = room_scoped(SUBJECT_PREFIX_AUDIO_BACKFILL, room)
+        self._preroll_subject = room_scoped(SUBJECT_PREFIX_PREROLL, room)
+        self._control_subject = room_scoped(SUBJECT_SESSION_CONTROL, room)
+        self._kv_key = room_scoped(SESSION_KV_KEY, room)
         self.session_id: str | None = None
         self.is_active = False
         self.silence_samples: int = 0
         self.silence_timeout_s: int = _DEFAULT_SILENCE_TIMEOUT_S
+        self._silence = SilenceDetector(
+            threshold_dbfs=SILENCE_THRESHOLD_DBFS,
+            hysteresis_db=SILENCE_HYSTERESIS_DB,
+            window_chunks=_SILENCE_WINDOW_CHUNKS,
+        )
         self._label: str = ""
         self._session_kv: Any | None = None
         self._config_kv: Any | None = None
         self._background_tasks: set[asyncio.Task[None]] = set()
+        self._publisher: PublishPipeline | None = None
+        self._packer: ChunkPacker | None = None
+        self._codec: str = PcmCodec.name
+        self._source: AudioSource | None = None
 
     def _get_audio_source(self) -> AudioSource:
         """
         Factory method to select the correct Audio Source based on
         Env Vars and Platform availability.
         """
+        if self.source_spec is not None:
+            return self._source_from_spec(self.source_spec)
+
         # 1. High Priority: File Override (for Testing/Simulation)
         audio_file = os.getenv("AUDIO_FILE")
         if audio_file:
             self.logger.info(f"Source: File ({audio_file})")
-            return audiosource.FileSource(audio_file, chunk_size=1536, loop=True)
+            return audiosource.FileSource(
+                audio_file,
+                chunk_size=1536,
+                loop=_FILE_LOOP,
+                speed=_FILE_SPEED,
+            )
 
         # 2. Windows Microphone
         if hasattr(audiosource, "WindowsSource"):
             self.logger.info("Source: Windows Microphone (PyAudio)")
-            return audiosource.WindowsSource()
+            return audiosource.WindowsSource(
+                sample_rate=_DEVICE_RATE,
+                channels=_DEVICE_CHANNELS,
+                sample_width=_DEVICE_SAMPLE_WIDTH,
+            )
 
         # 3. Linux Microphone
         if hasattr(audiosource, "LinuxSource"):
             self.logger.info("Source: Linux Microphone (ALSA)")
-            return audiosource.LinuxSource(sample_rate=16000, chunk_size=1536)
+            return audiosource.LinuxSource(
+                sample_rate=_DEVICE_RATE,
+                chunk_size=1536,
+                channels=_DEVICE_CHANNELS,
+                sample_width=_DEVICE_SAMPLE_WIDTH,
+            )
 
         # 4. Fallback / Error
         raise RuntimeError(
@@ -79,6 +196,33 @@ class AudioProducerService(BaseService):
             "Set AUDIO_FILE env var or ensure PyAudio/ALSA is installed."
         )
 
+    def _source_from_spec(self, spec: str) -> AudioSource:
+        """Build a room's source from its ``AUDIO_ROOMS`` entry."""
+        kind, _, device = spec.partition(":")
+        if kind != "mic":
+            self.logger.info(f"Source: File ({spec})")
+            return audiosource.FileSource(
+                spec, chunk_size=1536, loop=_FILE_LOOP, speed=_FILE_SPEED
+            )
+        if hasattr(audiosource, "WindowsSource"):
+            self.logger.info(f"Source: Windows Microphone (PyAudio) {device}")
+            return audiosource.WindowsSource(
+                sample_rate=_DEVICE_RATE,
+                device_index=int(device) if device else None,
+                channels=_DEVICE_CHANNELS,
+                sample_width=_DEVICE_SAMPLE_WIDTH,
+            )
+        if hasattr(audiosource, "LinuxSource"):
+            self.logger.info(f"Source: Linux Microphone (ALSA) {device}")
+            return audiosource.LinuxSource(
+                sample_rate=_DEVICE_RATE,
+                chunk_size=1536,
+                device=device or None,
+                channels=_DEVICE_CHANNELS,
+                sample_width=_DEVICE_SAMPLE_WIDTH,
+            )
+        raise RuntimeError(f"Room source {spec!r} needs PyAudio or ALSA installed")
+
     async def run_business_logic(self, js: Any, stop_event: asyncio.Event) -> None:
         # 1. Ensure Streams Exist
         try:
@@ -102,10 +246,51 @@ class AudioProducerService(BaseService):
         except Exception as e:
             self.logger.warning(f"KV setup failed (non-fatal): {e}")
 
-        # 2b. Recover session state from KV on restart
+        if self.rooms:
+            await self._run_rooms(js, stop_event)
+        else:
+            await self._run_room(js, stop_event)
+
+    async def _run_rooms(self, js: Any, stop_event: asyncio.Event) -> None:
+        """Run one room instance per ``AUDIO_ROOMS`` entry on this connection.
+
+        Rooms stop together on shutdown; a room whose source ends stops alone
+        and the service exits once every room has finished.
+        """
+        rooms = []
+        for name, spec in self.rooms.items():
+            room = AudioProducerService(room=name, source_spec=spec, rooms={})
+            room.nc, room.js = self.nc, self.js
+            room._session_kv, room._config_kv = self._session_kv, self._config_kv
+            rooms.append(room)
+        self.logger.info(f"Capturing {len(rooms)} rooms: {', '.join(self.rooms)}")
+
+        async def forward_stop() -> None:
+            await stop_event.wait()
+            for room in rooms:
+                room.stop_event.set()
+
+        forwarder = asyncio.create_task(forward_stop())
+        try:
+            results = await asyncio.gather(
+                *(room._run_room(js, room.stop_event) for room in rooms),
+                return_exceptions=True,
+            )
+        finally:
+            forwarder.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await forwarder
+        for room, result in zip(rooms, results, strict=True):
+            if isinstance(result, Exception):
+                self.logger.error(f"Room {room.room} failed: {result}")
+        stop_event.set()
+
+    async def _run_room(self, js: Any, stop_event: asyncio.Event) -> None:
+        """Session state machine and capture loop for this instance's room."""
+        # Recover session state from KV on restart
         await self._recover_session()
 
-        # 3. Initialize the appropriate audio source
+        # Initialize the appropriate audio source
         try:
             source = self._get_audio_source()
         except Exception as e:
@@ -114,7 +299,7 @@ class AudioProducerService(BaseService):
 
         self.logger.info("Audio Stream Started")
 
-        # 4. Run session control listener as a background task
+        # Run session control listener as a background task
         ctrl_task: asyncio.Task[None] | None = None
         ctrl_task = asyncio.create_task(self._session_control_loop(js, stop_event))
 
@@ -131,7 +316,7 @@ class AudioProducerService(BaseService):
         if self._session_kv is None:
             return
         try:
-            entry = await self._session_kv.get("current")
+            entry = await self._session_kv.get(self._kv_key)
             data = json.loads(entry.value.decode())
             if data.get("state") == "active":
                 self.session_id = data["session_id"]
@@ -160,12 +345,10 @@ class AudioProducerService(BaseService):
         await msg.ack()
 
     async def _session_control_loop(self, js: Any, stop_event: asyncio.Event) -> None:
-        """Durable pull consumer for session.control commands."""
+        """Durable pull consumer for this room's session.control commands."""
+        durable = "audio_producer_ctrl" + (f"_{self.room}" if self.room else "")
         try:
-            sub = await js.pull_subscribe(
-                "session.control",
-                durable="audio_producer_ctrl",
-            )
+            sub = await js.pull_subscribe(self._control_subject, durable=durable)
             self.logger.info("Session control subscriber ready")
         except Exception as e:
             self.logger.critical(f"Session control subscribe failed: {e}")
@@ -187,7 +370,10 @@ class AudioProducerService(BaseService):
                 await self._handle_control_message(js, msg)
 
     async def _start_session(self, js: Any, label: str = "") -> None:
-        session_id = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+        # Rooms start sessions together: the room and a random suffix keep
+        # their ids apart, since every consumer keys its state on the id
+        stamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
+        session_id = "-".join(filter(None, (stamp, self.room, uuid4().hex[:6])))
         started_at = datetime.now(UTC).isoformat()
 
         if self._session_kv is not None:
@@ -198,12 +384,15 @@ class AudioProducerService(BaseService):
                         "started_at": started_at,
                         "state": "active",
                         "label": label,
+                        **self._room_field(),
                     }
                 ).encode()
-                await self._session_kv.put("current", kv_data)
+                await self._session_kv.put(self._kv_key, kv_data)
             except Exception as e:
                 self.logger.warning(f"KV write failed: {e}")
 
+        # Close out the pending pre-roll frame before the backfill flush starts
+        self._flush_packer()
         self.session_id = session_id
         self.is_active = True
         self._label = label
@@ -218,6 +407,7 @@ class AudioProducerService(BaseService):
                 pass
 
         self.silence_samples = 0
+        self._silence.reset()
 
         # Spawn pre-roll flush as concurrent background task
         task = asyncio.create_task(self._flush_preroll(js, session_id))
@@ -232,6 +422,7 @@ class AudioProducerService(BaseService):
                     "session_id": session_id,
                     "started_at": started_at,
                     "label": label,
+                    **self._room_field(),
                 }
             ).encode()
             try:
@@ -245,26 +436,38 @@ class AudioProducerService(BaseService):
         session_id = self.session_id
         stopped_at = datetime.now(UTC).isoformat()
 
-        # 1. Publish EOS marker to live audio stream
-        if session_id:
+        # 1. Transition to IDLE — the capture loop routes new chunks to pre-roll
+        self.is_active = False
+        self.session_id = None
+        self._label = ""
+
+        # 2. Publish EOS marker to live audio stream, behind any in-flight audio
+        self._flush_packer()
+        if self._publisher is not None and not await self._publisher.drain(
+            _PUBLISH_DRAIN_TIMEOUT_S
+        ):
+            self.logger.warning("In-flight audio not acked before EOS")
+        if session_id and self._publisher is not None and self._publisher.spooling:
+            # Broker unreachable — queue EOS behind the spooled audio
+            self._publisher.submit(
+                f"{self._live_prefix}.{session_id}",
+                b"",
+                headers={"LiveSTT-EOS": "true"},
+            )
+        elif session_id:
             try:
                 await js.publish(
-                    f"{SUBJECT_PREFIX_AUDIO_LIVE}.{session_id}",
+                    f"{self._live_prefix}.{session_id}",
                     b"",
                     headers={"LiveSTT-EOS": "true"},
                 )
             except Exception as e:
                 self.logger.warning(f"Failed to publish EOS marker: {e}")
 
-        # 2. Transition to IDLE
-        self.is_active = False
-        self.session_id = None
-        self._label = ""
-
         # 3. Clear session KV
         if self._session_kv is not None:
             try:
-                await self._session_kv.delete("current")
+                await self._session_kv.delete(self._kv_key)
             except Exception as e:
                 self.logger.warning(f"KV delete failed: {e}")
 
@@ -275,6 +478,7 @@ class AudioProducerService(BaseService):
                     "event": "stopped",
                     "session_id": session_id,
                     "stopped_at": stopped_at,
+                    **self._room_field(),
                 }
             ).encode()
             try:
@@ -285,13 +489,14 @@ class AudioProducerService(BaseService):
         self.logger.info(f"Session stopped: {session_id}")
 
     async def _flush_preroll(self, js: Any, session_id: str) -> None:
-        """Backfill pre-roll ring buffer into audio.backfill.<session_id>."""
+        """Backfill this room's pre-roll ring into audio.backfill.[<room>.]<sid>."""
+        subject = f"{self._backfill_prefix}.{session_id}"
         try:
             sub = await js.pull_subscribe(
-                SUBJECT_PREFIX_PREROLL,
+                self._preroll_subject,
                 config=ConsumerConfig(
                     deliver_policy=DeliverPolicy.ALL,
-                    filter_subject=SUBJECT_PREFIX_PREROLL,
+                    filter_subject=self._preroll_subject,
                 ),
             )
         except Exception as e:
@@ -305,10 +510,11 @@ class AudioProducerService(BaseService):
                 if not msgs:
                     break
                 for msg in msgs:
-                    await js.publish(
-                        f"{SUBJECT_PREFIX_AUDIO_BACKFILL}.{session_id}",
-                        msg.data,
-                    )
+                    # Forward packing headers so consumers can unpack backfill
+                    if msg.headers:
+                        await js.publish(subject, msg.data, headers=msg.headers)
+                    else:
+                        await js.publish(subject, msg.data)
                     await msg.ack()
                     count += 1
             except TimeoutError:
@@ -319,51 +525,162 @@ class AudioProducerService(BaseService):
 
         # Signal end of backfill stream
         try:
-            await js.publish(
-                f"{SUBJECT_PREFIX_AUDIO_BACKFILL}.{session_id}",
-                b"",
-                headers={"LiveSTT-EOS": "true"},
-            )
+            await js.publish(subject, b"", headers={"LiveSTT-EOS": "true"})
         except Exception as e:
             self.logger.warning(f"Failed to publish backfill EOS: {e}")
 
-        self.logger.info(
-            f"Pre-roll flush complete: {count} chunks → audio.backfill.{session_id}"
-        )
+        self.logger.info(f"Pre-roll flush complete: {count} chunks → {subject}")
+
+    def _room_field(self) -> dict[str, str]:
+        """``{"room": ...}`` for room-scoped payloads; empty for the default room."""
+        return {"room": self.room} if self.room else {}
+
+    def _open_spool(self) -> AudioSpool | None:
+        if not _SPOOL_PATH:
+            return None
+        path = f"{_SPOOL_PATH}.{self.room}" if self.room else _SPOOL_PATH
+        try:
+            return AudioSpool(path, capacity_bytes=_SPOOL_MB * 1024 * 1024)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Audio spool unavailable, outages will drop audio: {e}")
+            return None
 
     async def _audio_loop(
         self, js: Any, stop_event: asyncio.Event, source: AudioSource
     ) -> None:
-        async with source as stream:
-            async for chunk in stream.stream():
-                if stop_event.is_set():
-                    break
-
-                if self.is_active and self.session_id:
-                    try:
-                        await js.publish(
-                            f"{SUBJECT_PREFIX_AUDIO_LIVE}.{self.session_id}",
-                            chunk,
+        spool = self._open_spool()
+        publisher = PublishPipeline(
+            js,
+            window=_PUBLISH_WINDOW,
+            policy=_PUBLISH_POLICY,
+            backlog=_PUBLISH_BACKLOG,
+            spool=spool,
+        )
+        self._publisher = publisher
+        self._source = source
+        self._configure_framing()
+        next_report = time.monotonic() + _STATS_INTERVAL_S
+        try:
+            async with source as stream:
+                async for chunk in stream.stream():
+                    if stop_event.is_set():
+                        break
+
+                    # Device read time when the source knows it (capture ring)
+                    capture_ts = (
+                        (getattr(source, "capture_time", None) or time.time())
+                        if _TRACE_LATENCY
+                        else None
+                    )
+                    # submit() never waits on the broker — capture keeps pace
+                    if self.is_active and self.session_id:
+                        self._publish_chunk(
+                            f"{self._live_prefix}.{self.session_id}", chunk, capture_ts
                         )
                         await self._check_silence(js, chunk)
-                    except Exception as e:
-                        self.logger.error(f"Publish failed (chunk dropped): {e}")
-                        continue
-                else:
-                    try:
-                        await js.publish(SUBJECT_PREFIX_PREROLL, chunk)
-                    except Exception as e:
-                        self.logger.error(f"Publish failed (chunk dropped): {e}")
-                        continue
+                    else:
+                        self._publish_chunk(self._preroll_subject, chunk, capture_ts)
+
+                    if time.monotonic() >= next_report:
+                        next_report += _STATS_INTERVAL_S
+                        await self._report_stats()
+        finally:
+            self._flush_packer()
+            self._packer = None
+            if not await publisher.drain(_PUBLISH_DRAIN_TIMEOUT_S):
+                self.logger.warning(
+                    f"Shutdown with {publisher.in_flight + publisher.backlog} "
+                    "chunks unacked"
+                )
+            await publisher.close()
+            self._publisher = None
+            self._source = None
+            if spool is not None:
+                if len(spool):
+                    self.logger.warning(
+                        f"{len(spool)} spooled chunks left for replay on next start"
+                    )
+                spool.close()
+            self.logger.info(f"Publish pipeline: {publisher.stats.as_dict()}")
 
         # Audio source exhausted — signal stop so control loop exits too
         if not stop_event.is_set():
             stop_event.set()
 
+    def _configure_framing(self) -> None:
+        """Set up chunk packing and the transport codec from config."""
+        try:
+            self._codec = get_codec(_AUDIO_CODEC).name
+        except ValueError as e:
+            self.logger.error(f"{e}; publishing raw PCM")
+            self._codec = PcmCodec.name
+        if _PACK_PERIODS > 1:
+            periods = min(_PACK_PERIODS, _PACK_PERIODS_MAX)
+            if periods < _PACK_PERIODS:
+                self.logger.warning(
+                    f"AUDIO_PACK_PERIODS={_PACK_PERIODS} exceeds the "
+                    f"{PREROLL_STREAM_CONFIG['max_msg_size'] // 1024} KB message "
+                    f"limit; packing {periods} periods per message"
+                )
+            else:
+                self.logger.info(f"Packing {periods} periods per message")
+            self._packer = ChunkPacker(periods, _PACK_MAX_LATENCY_S)
+
+    def _publish_chunk(
+        self, subject: str, chunk: bytes, capture_ts: float | None = None
+    ) -> None:
+        """Hand one capture period to the publisher, packing it if enabled."""
+        assert self._publisher is not None
+        if self._packer is None:
+            if self._codec == PcmCodec.name and capture_ts is None:
+                self._publisher.submit(subject, chunk)
+            else:
+                self._submit_frame(subject, AudioFrame(chunk, capture_ts=capture_ts))
+            return
+        for packed in self._packer.add(subject, chunk, capture_ts):
+            self._submit_frame(packed.subject, packed.frame)
+
+    def _submit_frame(self, subject: str, frame: AudioFrame) -> None:
+        """Encode a frame with the configured codec and queue it with its headers."""
+        assert self._publisher is not None
+        if self._codec != PcmCodec.name:
+            frame = frame.encoded(self._codec)
+        headers = frame.headers()
+        if frame.capture_ts is not None:
+            headers[HEADER_PUBLISH_TS] = format_ts(time.time())
+        self._publisher.submit(subject, frame.data, headers=headers)
+
+    def _flush_packer(self) -> None:
+        """Publish a partially filled frame (subject switch, EOS, shutdown)."""
+        if self._packer is None or self._publisher is None:
+            return
+        packed = self._packer.flush()
+        if packed is not None:
+            self._submit_frame(packed.subject, packed.frame)
+
+    async def _report_stats(self) -> None:
+        """Publish capture pipeline counters on core NATS (fire-and-forget)."""
+        if self._publisher is None or self.nc is None:
+            return
+        stats: dict[str, Any] = {
+            **self._publisher.stats.as_dict(),
+            "in_flight": self._publisher.in_flight,
+            "backlog": self._publisher.backlog,
+            "spool_depth": self._publisher.spool_depth,
+            "replay_rate": round(self._publisher.replay_rate, 1),
+            **self._room_field(),
+        }
+        capture = getattr(self._source, "capture_stats", None)
+        if capture is not None:
+            stats["capture"] = capture.as_dict()
+        try:
+            await self.nc.publish("system.audio_stats", json.dumps(stats).encode())
+        except Exception as e:
+            self.logger.debug(f"audio_stats publish failed: {e}")
+
     async def _check_silence(self, js: Any, chunk: bytes) -> None:
         """Track cumulative silence; auto-stop session when threshold is reached."""
-        rms = _compute_rms(chunk)
-        if rms < SILENCE_THRESHOLD_DBFS:
+        if self._silence.update(chunk):
             self.silence_samples += len(chunk) // 2
         else:
             self.silence_samples = 0
@@ -0,0 +1,87 @@
+"""Chunk packing: frame several capture periods into one NATS message.
+
+Each 96 ms period published on its own costs a JetStream message in the
+producer, in every durable consumer and in the stream's file store. The
+packer concatenates up to ``periods`` consecutive chunks bound for the same
+subject and emits them as one ``AudioFrame`` (see ``messaging.audio``).
+
+Packing delays the first period of a frame until the frame is full, so the
+number of periods per frame is also capped by ``max_latency_s``: a frame of
+N periods holds its first period back by (N - 1) period durations.
+"""
+
+from dataclasses import dataclass
+
+from messaging.audio import BYTES_PER_SAMPLE, SAMPLE_RATE, AudioFrame
+
+
+@dataclass
+class PackedFrame:
+    subject: str
+    frame: AudioFrame
+
+
+class ChunkPacker:
+    """Accumulates same-subject, same-size chunks into packed frames."""
+
+    def __init__(self, periods: int, max_latency_s: float) -> None:
+        if periods < 1:
+            raise ValueError("periods must be >= 1")
+        self.periods = periods
+        self.max_latency_s = max_latency_s
+        self._subject: str | None = None
+        self._chunks: list[bytes] = []
+        self._chunk_len = 0
+        self._limit = periods
+        self._first_sample = 0
+        self._first_capture_ts: float | None = None
+        # Samples seen since capture start (the next chunk's sample offset)
+        self._sample_pos = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._chunks)
+
+    def _limit_for(self, chunk_len: int) -> int:
+        period_s = chunk_len / BYTES_PER_SAMPLE / SAMPLE_RATE
+        if period_s <= 0:
+            return 1
+        by_latency = 1 + int(self.max_latency_s / period_s + 1e-9)
+        return max(1, min(self.periods, by_latency))
+
+    def add(
+        self, subject: str, chunk: bytes, capture_ts: float | None = None
+    ) -> list[PackedFrame]:
+        """Add one capture period; return frames that are ready to publish."""
+        ready: list[PackedFrame] = []
+        if self._chunks and (subject != self._subject or len(chunk) != self._chunk_len):
+            # Frames hold equal-sized periods for one subject only
+            frame = self.flush()
+            if frame is not None:
+                ready.append(frame)
+        if not self._chunks:
+            self._subject = subject
+            self._chunk_len = len(chunk)
+            self._limit = self._limit_for(len(chunk))
+            self._first_sample = self._sample_pos
+            self._first_capture_ts = capture_ts
+        self._chunks.append(chunk)
+        self._sample_pos += len(chunk) // BYTES_PER_SAMPLE
+        if len(self._chunks) >= self._limit:
+            frame = self.flush()
+            if frame is not None:
+                ready.append(frame)
+        return ready
+
+    def flush(self) -> PackedFrame | None:
+        """Emit whatever is buffered as a (possibly short) frame."""
+        if not self._chunks or self._subject is None:
+            return None
+        frame = AudioFrame(
+            data=b"".join(self._chunks),
+            periods=len(self._chunks),
+            sample_offset=self._first_sample,
+            capture_ts=self._first_capture_ts,
+        )
+        self._chunks.clear()
+        return PackedFrame(self._subject, frame)
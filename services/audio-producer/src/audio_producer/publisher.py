@@ -0,0 +1,307 @@
+"""Pipelined JetStream publishing for the capture loop.
+
+``js.publish`` waits for a PubAck round trip. Awaiting it inline means any
+broker hiccup stalls the next ALSA read, so the capture loop hands chunks to
+``PublishPipeline.submit`` instead — a synchronous call that never waits on
+the network. Up to ``window`` publishes are outstanding at once; acks are
+collected by done-callbacks. When the window is full, chunks either spill
+into a bounded in-order backlog (``spill``) or are dropped (``drop``).
+
+With an ``AudioSpool`` attached, a failed publish switches the pipeline into
+outage mode: the failed chunk and everything submitted after it go to the
+on-disk spool in submission order, and a replay task drains the spool back
+into JetStream once the broker answers again.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .spool import AudioSpool
+
+_logger = logging.getLogger(__name__)
+
+POLICY_SPILL = "spill"
+POLICY_DROP = "drop"
+_POLICIES = (POLICY_SPILL, POLICY_DROP)
+
+_REPLAY_INITIAL_DELAY_S = 1.0
+_REPLAY_MAX_DELAY_S = 30.0
+# JetStream drops re-sent records carrying an already-seen Nats-Msg-Id
+_MSG_ID_HEADER = "Nats-Msg-Id"
+
+
+@dataclass
+class PublishStats:
+    """Counters for the publish pipeline (monotonic since creation)."""
+
+    submitted: int = 0
+    acked: int = 0
+    failed: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    max_in_flight: int = 0
+    spooled: int = 0
+    replayed: int = 0
+    spool_evicted: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Pending:
+    seq: int
+    subject: str
+    payload: bytes
+    headers: dict[str, str] | None
+
+
+class PublishPipeline:
+    """Bounded window of outstanding JetStream publishes.
+
+    Publish order is preserved: tasks start in submission order and nats-py
+    writes each message to the socket before its first suspension point;
+    chunks that cannot start immediately queue behind the backlog rather
+    than overtaking it.
+    """
+
+    def __init__(
+        self,
+        js: Any,
+        window: int = 32,
+        policy: str = POLICY_SPILL,
+        backlog: int = 625,
+        spool: AudioSpool | None = None,
+    ) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        if policy not in _POLICIES:
+            raise ValueError(f"policy must be one of {_POLICIES}, got {policy!r}")
+        self._js = js
+        self._window = window
+        self._policy = policy
+        self._backlog_max = backlog
+        self._backlog: deque[_Pending] = deque()
+        self._in_flight: set[asyncio.Task[None]] = set()
+        # Accepted-but-unsettled sequence numbers, in submission order
+        self._unsettled: dict[int, None] = {}
+        self._seq = 0
+        self._progress = asyncio.Event()
+        self.stats = PublishStats()
+
+        self._spool = spool
+        self._epoch = secrets.token_hex(4)
+        self._outage = False
+        self._failed: list[_Pending] = []
+        self._replay_task: asyncio.Task[None] | None = None
+        self.replay_rate = 0.0  # records/s over the last replay run
+        if spool is not None and len(spool):
+            # Records left over from a previous run: replay before live audio
+            self._outage = True
+            self._start_replay()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def backlog(self) -> int:
+        return len(self._backlog)
+
+    @property
+    def spool_depth(self) -> int:
+        return len(self._spool) if self._spool is not None else 0
+
+    @property
+    def spooling(self) -> bool:
+        """True while chunks are routed to the spool instead of the broker."""
+        return self._outage
+
+    def submit(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> bool:
+        """Queue a publish without waiting. Returns False if the chunk was dropped."""
+        self.stats.submitted += 1
+        if self._outage:
+            item = _Pending(self._next_seq(), subject, payload, headers)
+            if self._in_flight:
+                # Earlier chunks are still settling — keep order in memory
+                self._backlog.append(item)
+            else:
+                self._to_spool(item)
+            return True
+
+        if self._backlog or len(self._in_flight) >= self._window:
+            if self._policy == POLICY_DROP:
+                self.stats.dropped += 1
+                return False
+            if len(self._backlog) >= self._backlog_max:
+                # Oldest spilled chunk loses
+                self._settle(self._backlog.popleft().seq)
+                self.stats.dropped += 1
+
+        item = _Pending(self._next_seq(), subject, payload, headers)
+        if not self._backlog and len(self._in_flight) < self._window:
+            self._start(item)
+            return True
+        self._backlog.append(item)
+        self.stats.spilled += 1
+        return True
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        self._unsettled[self._seq] = None
+        return self._seq
+
+    def _start(self, item: _Pending) -> None:
+        task = asyncio.create_task(self._publish(item))
+        self._in_flight.add(task)
+        self.stats.max_in_flight = max(self.stats.max_in_flight, len(self._in_flight))
+        task.add_done_callback(self._on_done)
+
+    async def _publish(self, item: _Pending) -> None:
+        try:
+            if item.headers:
+                await self._js.publish(item.subject, item.payload, headers=item.headers)
+            else:
+                await self._js.publish(item.subject, item.payload)
+        except Exception as e:
+            if self._spool is not None:
+                if not self._outage:
+                    _logger.warning(f"Publish failed ({e}); spooling audio to disk")
+                self._outage = True
+                self._failed.append(item)
+                return
+            self.stats.failed += 1
+            _logger.error(f"Publish failed (chunk dropped): {e}")
+        else:
+            self.stats.acked += 1
+        self._settle(item.seq)
+
+    def _settle(self, seq: int) -> None:
+        self._unsettled.pop(seq, None)
+        self._progress.set()
+
+    def _on_done(self, task: asyncio.Task[None]) -> None:
+        self._in_flight.discard(task)
+        if self._outage:
+            if not self._in_flight:
+                # Everything outstanding has failed or landed: spool the
+                # failures (oldest first), then what queued behind them.
+                for item in sorted(self._failed, key=lambda p: p.seq):
+                    self._to_spool(item)
+                self._failed.clear()
+                while self._backlog:
+                    self._to_spool(self._backlog.popleft())
+                self._start_replay()
+            return
+        while self._backlog and len(self._in_flight) < self._window:
+            self._start(self._backlog.popleft())
+
+    def _to_spool(self, item: _Pending) -> None:
+        assert self._spool is not None
+        headers = dict(item.headers or {})
+        headers.setdefault(_MSG_ID_HEADER, f"{self._epoch}-{item.seq}")
+        evicted = self._spool.evicted
+        if self._spool.append(item.subject, item.payload, headers):
+            self.stats.spooled += 1
+        else:
+            self.stats.dropped += 1
+        self.stats.spool_evicted += self._spool.evicted - evicted
+        self._settle(item.seq)
+
+    def _start_replay(self) -> None:
+        if self._replay_task is None or self._replay_task.done():
+            self._replay_task = asyncio.create_task(self._replay())
+
+    async def _replay(self) -> None:
+        """Drain the spool into JetStream in order, backing off while it fails."""
+        assert self._spool is not None
+        spool = self._spool
+        delay = _REPLAY_INITIAL_DELAY_S
+        replayed = 0
+        started = time.monotonic()
+        while len(spool):
+            batch = spool.peek(self._window)
+            popped = spool.popped
+            publishes = [
+                self._js.publish(r.subject, r.payload, headers=r.headers) for r in batch
+            ]
+            results = await asyncio.gather(
+                *publishes,
+                return_exceptions=True,
+            )
+            ok = 0
+            for result in results:
+                if isinstance(result, BaseException):
+                    break
+                ok += 1
+            # Only the acked prefix leaves the spool; re-sent successes after
+            # a failure are de-duplicated by JetStream via Nats-Msg-Id.
+            # Appends during the publishes may have evicted part of the batch
+            # already, and popping those again would drop unsent records.
+            spool.pop(max(0, ok - (spool.popped - popped)))
+            replayed += ok
+            self.stats.replayed += ok
+            elapsed = time.monotonic() - started
+            self.replay_rate = replayed / elapsed if elapsed > 0 else 0.0
+            if ok < len(batch):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _REPLAY_MAX_DELAY_S)
+            else:
+                delay = _REPLAY_INITIAL_DELAY_S
+
+        self._outage = False
+        if replayed:
+            _logger.info(
+                f"Spool drained: {replayed} chunks replayed "
+                f"in {time.monotonic() - started:.1f}s ({self.replay_rate:.0f} chunks/s)"
+            )
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every chunk submitted so far is acked, failed or dropped.
+
+        Spooled chunks count as settled — they are safe on disk. Chunks
+        submitted after the call do not extend the wait, so a live capture
+        stream cannot starve it. Returns False on timeout.
+        """
+        target = self._seq
+
+        async def _barrier() -> None:
+            while self._unsettled and next(iter(self._unsettled)) <= target:
+                self._progress.clear()
+                await self._progress.wait()
+
+        try:
+            await asyncio.wait_for(_barrier(), timeout=timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Cancel outstanding publishes; keep spooled chunks for the next run."""
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+        tasks = list(self._in_flight)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        leftover = sorted(self._failed, key=lambda p: p.seq) + list(self._backlog)
+        self._failed.clear()
+        self._backlog.clear()
+        if self._spool is not None:
+            for item in leftover:
+                self._to_spool(item)
+        else:
+            self.stats.dropped += len(leftover)
+        self._unsettled.clear()
+        self._progress.set()
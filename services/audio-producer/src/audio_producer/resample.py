@@ -0,0 +1,191 @@
+"""Downmix and rational-ratio resampling to the pipeline's 16 kHz mono int16.
+
+``Resampler`` is a streaming polyphase FIR: the Kaiser-windowed sinc
+low-pass is designed once at construction and split into ``up`` phase
+filters, so each output sample costs one ``taps``-long dot product. A chunk
+is converted in one vectorized pass (a strided window view of the input
+times a precomputed block matrix of the phase filters). Unconsumed input
+carries over between chunks, so a stream cut into arbitrary chunks
+resamples exactly like the whole signal.
+
+``PeriodNormalizer`` wraps it for capture devices: device periods in, fixed
+96 ms output chunks out.
+"""
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+
+TARGET_RATE = 16000
+# Supported integer PCM sample widths (bytes): S16_LE, S24_3LE, S32_LE
+SAMPLE_WIDTHS = (2, 3, 4)
+_FULL_SCALE = {2: 32768.0, 3: 8388608.0, 4: 2147483648.0}
+# Filter half-width in zero crossings of the narrower band's sinc
+_ZERO_CROSSINGS = 16
+# Passband edge as a fraction of the output Nyquist (leaves a transition band)
+_ROLLOFF = 0.92
+# Kaiser beta ≈ 80 dB stopband attenuation
+_KAISER_BETA = 8.0
+# Cap on the block filter matrix (float32 coefficients); common rates need < 100k
+_MAX_BLOCK_COEFFS = 4 * 1024 * 1024
+
+
+def pcm_to_mono(
+    data: bytes | memoryview, channels: int, sample_width: int
+) -> npt.NDArray[np.float32]:
+    """Decode interleaved little-endian integer PCM to mono float32 in [-1, 1)."""
+    if sample_width not in SAMPLE_WIDTHS:
+        raise ValueError(f"Unsupported sample width {sample_width} bytes")
+    frame = channels * sample_width
+    usable = len(data) - len(data) % frame
+    if sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8, count=usable).reshape(-1, 3)
+        # Sign-extend the 24-bit sample held in the top three bytes of an int32
+        wide = np.zeros((len(raw), 4), dtype=np.uint8)
+        wide[:, 1:] = raw
+        ints = wide.view("<i4").ravel() >> 8
+    else:
+        dtype = "<i2" if sample_width == 2 else "<i4"
+        ints = np.frombuffer(data, dtype=dtype, count=usable // sample_width)
+    samples = ints.astype(np.float32) * np.float32(1.0 / _FULL_SCALE[sample_width])
+    if channels > 1:
+        return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def float_to_int16(samples: npt.NDArray[np.float32]) -> bytes:
+    """Round and clip float samples in [-1, 1) to int16 PCM bytes."""
+    scaled = np.rint(samples * np.float32(32768.0))
+    return np.clip(scaled, -32768, 32767).astype("<i2").tobytes()
+
+
+class Resampler:
+    """Streaming polyphase resampler from ``in_rate`` to ``out_rate`` (mono).
+
+    Outputs are produced in blocks of ``up`` samples, which consume exactly
+    ``down`` inputs. Within a block, output ``i`` always uses phase filter
+    ``(i * down) % up`` at input offset ``(i * down) // up``, so all phase
+    filters are laid out once in a ``(block_span, up)`` matrix and a whole
+    chunk resamples as one matrix product of strided input windows.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        out_rate: int = TARGET_RATE,
+        zero_crossings: int = _ZERO_CROSSINGS,
+    ) -> None:
+        if in_rate <= 0 or out_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        g = math.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.passthrough = self.up == self.down
+        self.taps = 0
+        self._block = np.zeros((0, 0), dtype=np.float32)
+        if not self.passthrough:
+            self._design(zero_crossings)
+        # Unconsumed input, starting at the first window of the next block
+        self._history = np.zeros(max(self.taps - 1, 0), dtype=np.float32)
+
+    def _design(self, zero_crossings: int) -> None:
+        up, down = self.up, self.down
+        ratio = max(up, down)
+        # Low-pass at the narrower of the two Nyquists, on the upsampled grid
+        cutoff = _ROLLOFF * 0.5 / ratio
+        self.taps = math.ceil(2 * zero_crossings * ratio / up)
+        n_total = self.taps * up
+        t = np.arange(n_total) - (n_total - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n_total, _KAISER_BETA)
+        h *= up / h.sum()  # unity DC gain after zero-stuffing by ``up``
+        # Phase p uses taps h[p], h[p + up], ...; reversed so that a window of
+        # input ordered oldest → newest dots directly with it
+        phases = h.reshape(self.taps, up).T[:, ::-1]
+        offsets = np.arange(up) * down // up
+        span = int(offsets[-1]) + self.taps
+        if span * up > _MAX_BLOCK_COEFFS:
+            raise ValueError(f"Rate ratio {up}/{down} is too fine to resample")
+        block = np.zeros((span, up), dtype=np.float32)
+        for i, offset in enumerate(offsets):
+            block[offset : offset + self.taps, i] = phases[(i * down) % up]
+        self._block = block
+
+    @property
+    def delay_s(self) -> float:
+        """Group delay added by the filter."""
+        return (self.taps * self.up - 1) / 2 / (self.in_rate * self.up)
+
+    def process(self, samples: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        """Resample the next block of the stream; returns the outputs it completes."""
+        if self.passthrough:
+            return samples
+        buf = np.concatenate((self._history, samples.astype(np.float32, copy=False)))
+        span = len(self._block)
+        n_blocks = max(0, (len(buf) - span) // self.down + 1)
+        if n_blocks == 0:
+            self._history = buf
+            return np.zeros(0, dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(buf, span)
+        out = windows[: n_blocks * self.down : self.down] @ self._block
+        self._history = buf[n_blocks * self.down :].copy()
+        return out.ravel()
+
+    def reset(self) -> None:
+        self._history = np.zeros(max(self.taps - 1, 0), dtype=np.float32)
+
+
+class PeriodNormalizer:
+    """Convert device periods of any rate/channel count to 16 kHz mono chunks.
+
+    ``convert`` returns a whole number of ``chunk_samples``-sample int16
+    chunks (usually exactly one), or ``b""`` while the next chunk is still
+    filling. Resampled period lengths drift by a sample either way; the
+    remainder carries over to the next call.
+    """
+
+    def __init__(
+        self,
+        in_rate: int,
+        channels: int = 1,
+        sample_width: int = 2,
+        chunk_samples: int = 1536,
+    ) -> None:
+        if channels < 1:
+            raise ValueError("channels must be >= 1")
+        if sample_width not in SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported sample width {sample_width} bytes")
+        self.channels = channels
+        self.sample_width = sample_width
+        self.chunk_bytes = chunk_samples * 2
+        self.resampler = Resampler(in_rate)
+        self._pending = bytearray()
+
+    @property
+    def identity(self) -> bool:
+        """True when the input is already 16 kHz mono int16."""
+        return (
+            self.resampler.passthrough and self.channels == 1 and self.sample_width == 2
+        )
+
+    def device_frames(self, chunk_samples: int = 1536) -> int:
+        """Device period (frames) that yields ``chunk_samples`` output samples."""
+        return math.ceil(chunk_samples * self.resampler.in_rate / TARGET_RATE)
+
+    def convert(self, data: bytes | memoryview) -> bytes:
+        mono = pcm_to_mono(data, self.channels, self.sample_width)
+        self._pending += float_to_int16(self.resampler.process(mono))
+        ready = len(self._pending) - len(self._pending) % self.chunk_bytes
+        if not ready:
+            return b""
+        out = bytes(self._pending[:ready])
+        del self._pending[:ready]
+        return out
+
+    def flush(self) -> bytes:
+        """Return the partial chunk still pending (end of a file)."""
+        out = bytes(self._pending)
+        self._pending.clear()
+        return out
@@ -0,0 +1,183 @@
+"""Fixed-size, memory-mapped on-disk ring spool for audio during broker outages.
+
+Layout::
+
+    [header 64 B][record][record]...[wrap marker][free]...
+
+Header: magic, capacity, head offset, tail offset, record count.
+Record: u32 total length, u16 subject length, u16 header-JSON length,
+subject, header JSON, payload. A zero length (or too few bytes left
+for a record header) marks a wrap back to the first record slot.
+
+The header is rewritten after every append/pop, so a producer restart
+resumes replay from where it stopped. When the ring is full the oldest
+records are evicted — during a long outage the most recent audio wins.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+_MAGIC = b"LSTTSPL1"
+_HEADER = struct.Struct("<8sQQQQ")  # magic, capacity, head, tail, count
+_DATA_START = 64
+_REC = struct.Struct("<IHH")  # total length, subject length, headers length
+
+
+@dataclass
+class SpoolRecord:
+    subject: str
+    payload: bytes
+    headers: dict[str, str] | None
+
+
+class AudioSpool:
+    """Append/peek/pop ring of publish records backed by a memory-mapped file."""
+
+    def __init__(self, path: str | Path, capacity_bytes: int = 64 * 1024 * 1024) -> None:
+        if capacity_bytes < _DATA_START + 1024:
+            raise ValueError("spool capacity too small")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity_bytes
+        self.evicted = 0
+        # Records removed from the head since open (popped or evicted)
+        self.popped = 0
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != capacity_bytes:
+                os.ftruncate(fd, capacity_bytes)
+            self._mm = mmap.mmap(fd, capacity_bytes)
+        finally:
+            os.close(fd)
+
+        magic, capacity, head, tail, count = _HEADER.unpack_from(self._mm, 0)
+        self._head: int
+        self._tail: int
+        self._count: int
+        if magic == _MAGIC and capacity == capacity_bytes:
+            self._head, self._tail, self._count = int(head), int(tail), int(count)
+            if count:
+                _logger.info(f"Spool {self.path}: resuming with {count} records")
+        else:
+            self._head = self._tail = _DATA_START
+            self._count = 0
+            self._write_header()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def bytes_used(self) -> int:
+        if self._count == 0:
+            return 0
+        if self._tail > self._head:
+            return self._tail - self._head
+        return (self.capacity - self._head) + (self._tail - _DATA_START)
+
+    def _write_header(self) -> None:
+        _HEADER.pack_into(
+            self._mm, 0, _MAGIC, self.capacity, self._head, self._tail, self._count
+        )
+
+    def _write_offset(self, size: int) -> int | None:
+        """Return where a record of ``size`` bytes fits without eviction."""
+        if self._count == 0:
+            return _DATA_START if size <= self.capacity - _DATA_START else None
+        if self._tail > self._head:
+            if self.capacity - self._tail >= size:
+                return self._tail
+            if self._head - _DATA_START >= size:
+                return _DATA_START
+            return None
+        # Wrapped: free space is between tail and head
+        return self._tail if self._head - self._tail >= size else None
+
+    def append(
+        self,
+        subject: str,
+        payload: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> bool:
+        """Store a record, evicting the oldest ones if needed.
+
+        Returns False only if the record can never fit in the spool.
+        """
+        subj = subject.encode()
+        hdrs = json.dumps(headers).encode() if headers else b""
+        size = _REC.size + len(subj) + len(hdrs) + len(payload)
+        if size > self.capacity - _DATA_START:
+            return False
+
+        offset = self._write_offset(size)
+        while offset is None:
+            self.pop()
+            self.evicted += 1
+            offset = self._write_offset(size)
+
+        if offset != self._tail and self.capacity - self._tail >= _REC.size:
+            struct.pack_into("<I", self._mm, self._tail, 0)  # wrap marker
+        _REC.pack_into(self._mm, offset, size, len(subj), len(hdrs))
+        pos = offset + _REC.size
+        self._mm[pos : pos + len(subj)] = subj
+        pos += len(subj)
+        self._mm[pos : pos + len(hdrs)] = hdrs
+        pos += len(hdrs)
+        self._mm[pos : pos + len(payload)] = payload
+        self._tail = offset + size
+        self._count += 1
+        self._write_header()
+        return True
+
+    def _record_offset(self, offset: int) -> int:
+        """Follow a wrap marker at ``offset`` if there is one."""
+        if self.capacity - offset < _REC.size:
+            return _DATA_START
+        (size,) = struct.unpack_from("<I", self._mm, offset)
+        return _DATA_START if size == 0 else offset
+
+    def peek(self, limit: int = 1) -> list[SpoolRecord]:
+        """Return up to ``limit`` oldest records without removing them."""
+        records: list[SpoolRecord] = []
+        offset = self._head
+        for _ in range(min(limit, self._count)):
+            offset = self._record_offset(offset)
+            size, subj_len, hdr_len = _REC.unpack_from(self._mm, offset)
+            pos = offset + _REC.size
+            subject = self._mm[pos : pos + subj_len].decode()
+            pos += subj_len
+            raw_headers = self._mm[pos : pos + hdr_len]
+            pos += hdr_len
+            payload = self._mm[pos : offset + size]
+            records.append(
+                SpoolRecord(
+                    subject=subject,
+                    payload=payload,
+                    headers=json.loads(raw_headers) if raw_headers else None,
+                )
+            )
+            offset += size
+        return records
+
+    def pop(self, n: int = 1) -> None:
+        """Remove the ``n`` oldest records."""
+        for _ in range(min(n, self._count)):
+            offset = self._record_offset(self._head)
+            (size,) = struct.unpack_from("<I", self._mm, offset)
+            self._head = offset + size
+            self._count -= 1
+            self.popped += 1
+        if self._count == 0:
+            self._head = self._tail = _DATA_START
+        self._write_header()
+
+    def close(self) -> None:
+        self._mm.flush()
+        self._mm.close()
@@ -1,9 +1,11 @@
 import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from audio_producer.audiosource import FileSource
-from audio_producer.main import AudioProducerService
+from audio_producer.main import AudioProducerService, _parse_rooms
+from messaging.streams import PREROLL_STREAM_CONFIG
 from mocks import MockAudioSource
 
 
@@ -75,3 +77,123 @@ async def test_run_business_logic_live() -> None:
 
     # Verify
     mock_js.publish.assert_called_with("audio.live.test-session-123", b"\x00" * 1600)
+
+
+@pytest.mark.asyncio
+async def test_run_business_logic_packed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With packing enabled, periods are framed N per message with headers."""
+    monkeypatch.setattr("audio_producer.main._PACK_PERIODS", 4)
+    service = AudioProducerService()
+    service.nats_manager = MagicMock()
+    service.nats_manager.ensure_stream = AsyncMock()
+    service.is_active = True
+    service.session_id = "s1"
+
+    mock_source = MockAudioSource(limit=6)
+    service._get_audio_source = MagicMock(return_value=mock_source)  # type: ignore
+    service._session_control_loop = AsyncMock()  # type: ignore[method-assign]
+
+    mock_js = AsyncMock()
+    await service.run_business_logic(mock_js, asyncio.Event())
+
+    calls = mock_js.publish.call_args_list
+    assert [len(c.args[1]) for c in calls] == [1600 * 4, 1600 * 2]
+    assert calls[0].kwargs["headers"] == {
+        "LiveSTT-Periods": "4",
+        "LiveSTT-Sample-Offset": "0",
+    }
+    assert calls[1].kwargs["headers"]["LiveSTT-Sample-Offset"] == str(4 * 800)
+
+
+def test_pack_periods_clamped_to_the_message_size_limit(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("audio_producer.main._PACK_PERIODS", 100)
+    service = AudioProducerService()
+    service._configure_framing()
+
+    assert service._packer is not None
+    assert service._packer.periods == 21
+    packed_bytes = 21 * 1536 * 2 + 1024
+    assert packed_bytes <= PREROLL_STREAM_CONFIG["max_msg_size"]
+
+
+@pytest.mark.asyncio
+async def test_run_business_logic_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With a codec configured, chunks are encoded and the codec is declared."""
+    monkeypatch.setattr("audio_producer.main._AUDIO_CODEC", "mulaw")
+    service = AudioProducerService()
+    service.nats_manager = MagicMock()
+    service.nats_manager.ensure_stream = AsyncMock()
+
+    mock_source = MockAudioSource(limit=1)
+    service._get_audio_source = MagicMock(return_value=mock_source)  # type: ignore
+    service._session_control_loop = AsyncMock()  # type: ignore[method-assign]
+
+    mock_js = AsyncMock()
+    await service.run_business_logic(mock_js, asyncio.Event())
+
+    (call,) = mock_js.publish.call_args_list
+    assert call.args == ("preroll.audio", b"\xff" * 800)  # µ-law silence
+    assert call.kwargs["headers"]["LiveSTT-Codec"] == "mulaw"
+
+
+@pytest.mark.asyncio
+async def test_run_business_logic_trace_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With latency tracing, each message carries capture and publish times."""
+    monkeypatch.setattr("audio_producer.main._TRACE_LATENCY", True)
+    service = AudioProducerService()
+    service.nats_manager = MagicMock()
+    service.nats_manager.ensure_stream = AsyncMock()
+
+    mock_source = MockAudioSource(limit=1)
+    service._get_audio_source = MagicMock(return_value=mock_source)  # type: ignore
+    service._session_control_loop = AsyncMock()  # type: ignore[method-assign]
+
+    mock_js = AsyncMock()
+    await service.run_business_logic(mock_js, asyncio.Event())
+
+    (call,) = mock_js.publish.call_args_list
+    assert call.args == ("preroll.audio", b"\x00" * 1600)
+    headers = call.kwargs["headers"]
+    capture_ts = float(headers["LiveSTT-Capture-Ts"])
+    assert capture_ts <= float(headers["LiveSTT-Publish-Ts"])
+
+
+def test_parse_rooms() -> None:
+    rooms = _parse_rooms("lobby=/data/lobby.wav, hall=mic:hw:1,")
+    assert rooms == {"lobby": "/data/lobby.wav", "hall": "mic:hw:1"}
+    assert _parse_rooms("") == {}
+    for bad in ("lobby", "lo.bby=x.wav", "a=x.wav,a=y.wav"):
+        with pytest.raises(ValueError):
+            _parse_rooms(bad)
+
+
+@pytest.mark.asyncio
+async def test_run_business_logic_rooms(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each room runs its own session state and publishes on room subjects."""
+    monkeypatch.setattr(
+        AudioProducerService,
+        "_get_audio_source",
+        lambda self: MockAudioSource(limit=2),
+    )
+    monkeypatch.setattr(AudioProducerService, "_session_control_loop", AsyncMock())
+    service = AudioProducerService(rooms={"lobby": "a.wav", "hall": "mic"})
+    service.nats_manager = MagicMock()
+    service.nats_manager.ensure_stream = AsyncMock()
+
+    async def kv_get(key: str) -> MagicMock:
+        if key != "current.lobby":
+            raise KeyError(key)
+        entry = MagicMock()
+        entry.value = json.dumps({"state": "active", "session_id": "s1"}).encode()
+        return entry
+
+    mock_js = AsyncMock()
+    mock_js.create_key_value.return_value.get.side_effect = kv_get
+    stop_event = asyncio.Event()
+    await service.run_business_logic(mock_js, stop_event)
+
+    subjects = [c.args[0] for c in mock_js.publish.call_args_list]
+    assert sorted(subjects) == ["audio.live.lobby.s1"] * 2 + ["preroll.audio.hall"] * 2
+    assert stop_event.is_set()
@@ -1,6 +1,10 @@
+import struct
 import time
+import wave
+from pathlib import Path
 
 import pytest
+from audio_producer.audiosource import FileSource
 from audio_producer.interfaces import AudioSource
 from mocks import MockAudioSource
 
@@ -34,3 +38,87 @@ async def test_mock_data_format() -> None:
 def test_mock_producer_interface_compliance() -> None:
     source = MockAudioSource()
     assert isinstance(source, AudioSource)
+
+
+def _write_wav(path: Path, samples: int, value: int = 0) -> None:
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(struct.pack("<h", value) * samples)
+
+
+@pytest.mark.asyncio
+async def test_file_source_yields_memoryview_chunks(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, 1536 * 2 + 100, value=7)
+
+    async with FileSource(str(wav), chunk_size=1536, speed=0) as src:
+        chunks = [c async for c in src.stream()]
+
+    assert all(isinstance(c, memoryview) for c in chunks)
+    assert [len(c) for c in chunks] == [3072, 3072, 200]
+    assert bytes(chunks[0][:2]) == struct.pack("<h", 7)
+
+
+@pytest.mark.asyncio
+async def test_file_source_speed_factor(tmp_path: Path) -> None:
+    wav = tmp_path / "a.wav"
+    _write_wav(wav, 16000)  # 1 s of audio
+
+    started = time.monotonic()
+    async with FileSource(str(wav), chunk_size=1600, speed=10) as src:
+        count = len([c async for c in src.stream()])
+    elapsed = time.monotonic() - started
+
+    assert count == 10
+    assert 0.08 <= elapsed < 0.5  # ~0.1 s at 10x
+
+
+@pytest.mark.asyncio
+async def test_file_source_directory_and_playlist(tmp_path: Path) -> None:
+    for name, value in (("b.wav", 2), ("a.wav", 1)):
+        _write_wav(tmp_path / name, 1536, value=value)
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    async with FileSource(str(tmp_path), chunk_size=1536, speed=0) as src:
+        firsts = [bytes(c[:2]) async for c in src.stream()]
+    assert firsts == [struct.pack("<h", 1), struct.pack("<h", 2)]
+
+    playlist = tmp_path / "list.m3u"
+    playlist.write_text("# replay order\nb.wav\n\na.wav\nb.wav\n")
+    async with FileSource(str(playlist), chunk_size=1536, speed=0) as src:
+        firsts = [bytes(c[:2]) async for c in src.stream()]
+    assert firsts == [struct.pack("<h", v) for v in (2, 1, 2)]
+
+
+@pytest.mark.asyncio
+async def test_file_source_resamples_stereo_48k(tmp_path: Path) -> None:
+    """Non-16 kHz / stereo files are normalized to 16 kHz mono chunks."""
+    wav = tmp_path / "stereo.wav"
+    with wave.open(str(wav), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(48000)
+        wf.writeframes(struct.pack("<hh", 1000, 3000) * 48000)  # 1 s
+
+    async with FileSource(str(wav), chunk_size=1600, speed=0) as src:
+        chunks = [bytes(c) async for c in src.stream()]
+
+    assert [len(c) for c in chunks[:-1]] == [3200] * (len(chunks) - 1)
+    assert sum(len(c) for c in chunks) // 2 == pytest.approx(16000, abs=64)
+    assert struct.unpack_from("<h", chunks[1], 0)[0] == pytest.approx(2000, abs=2)
+
+
+@pytest.mark.asyncio
+async def test_file_source_rejects_8_bit(tmp_path: Path) -> None:
+    wav = tmp_path / "u8.wav"
+    with wave.open(str(wav), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(1)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x80" * 400)
+
+    with pytest.raises(ValueError, match="PCM"):
+        async with FileSource(str(wav)):
+            pass
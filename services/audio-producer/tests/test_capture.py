@@ -0,0 +1,89 @@
+"""Unit tests for the capture thread ring buffer."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+from audio_producer.capture import SKIP, CaptureRing
+
+
+def _reader(chunks: list[bytes], delay: float = 0.0) -> Callable[[], bytes | None]:
+    it = iter(chunks)
+
+    def read() -> bytes | None:
+        if delay:
+            time.sleep(delay)
+        return next(it, None)
+
+    return read
+
+
+@pytest.mark.asyncio
+async def test_chunks_delivered_in_order() -> None:
+    chunks = [bytes([i]) * 8 for i in range(50)]
+    ring = CaptureRing(_reader(chunks, delay=0.001), chunk_bytes=8, slots=8)
+    ring.start()
+
+    received = [c async for c in ring.chunks()]
+
+    assert received == chunks
+    assert ring.stats.chunks == 50
+    assert ring.stats.overruns == 0
+    assert ring.last_timestamp > 0
+
+
+@pytest.mark.asyncio
+async def test_stalled_reader_counts_overruns() -> None:
+    release = threading.Event()
+    chunks = [bytes([i]) * 4 for i in range(20)]
+    read = _reader(chunks)
+
+    def gated_read() -> bytes | None:
+        data = read()
+        if data is None:
+            release.set()
+        return data
+
+    ring = CaptureRing(gated_read, chunk_bytes=4, slots=4)
+    ring.start()
+    await asyncio.to_thread(release.wait, 2.0)  # loop "stalls" until capture ends
+
+    received = [c async for c in ring.chunks()]
+
+    # Only the newest slots - 1 periods survive; the rest are counted
+    assert received == chunks[-3:]
+    assert ring.stats.overruns == 17
+
+
+@pytest.mark.asyncio
+async def test_skip_and_oversized_reads() -> None:
+    results = iter([SKIP, b"abcdef", None])
+    ring = CaptureRing(lambda: next(results), chunk_bytes=4, slots=4)
+    ring.start()
+
+    assert [c async for c in ring.chunks()] == [b"abcd", b"ef"]
+
+
+@pytest.mark.asyncio
+async def test_stop_ends_stream() -> None:
+    def read() -> bytes:
+        time.sleep(0.005)
+        return b"xx"
+
+    ring = CaptureRing(read, chunk_bytes=2, slots=4)
+    ring.start()
+    got = 0
+    async for _ in ring.chunks():
+        got += 1
+        if got == 3:
+            ring.stop()
+    await asyncio.to_thread(ring.join)
+    assert got >= 3
+    assert not ring._thread.is_alive()
+
+
+def test_ring_needs_two_slots() -> None:
+    with pytest.raises(ValueError):
+        CaptureRing(lambda: None, chunk_bytes=2, slots=1)
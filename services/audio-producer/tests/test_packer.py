@@ -0,0 +1,73 @@
+"""Unit tests for capture-period packing."""
+
+import pytest
+from audio_producer.packer import ChunkPacker
+from messaging.audio import HEADER_PERIODS, HEADER_SAMPLE_OFFSET, AudioFrame
+
+_PERIOD = b"\x01\x00" * 1536  # 96 ms at 16 kHz
+
+
+def test_packs_n_periods_per_frame() -> None:
+    packer = ChunkPacker(periods=4, max_latency_s=1.0)
+    frames = [f for _ in range(8) for f in packer.add("audio.live.s1", _PERIOD)]
+
+    assert len(frames) == 2
+    assert frames[0].frame.periods == 4
+    assert frames[0].frame.data == _PERIOD * 4
+    assert frames[0].frame.sample_offset == 0
+    assert frames[1].frame.sample_offset == 4 * 1536
+    assert packer.pending == 0
+
+
+def test_latency_bound_caps_periods() -> None:
+    # 0.2 s allows the first period to wait for two more (2 x 96 ms)
+    packer = ChunkPacker(periods=10, max_latency_s=0.2)
+    frames = [f for _ in range(6) for f in packer.add("a", _PERIOD)]
+    assert [f.frame.periods for f in frames] == [3, 3]
+
+
+def test_subject_change_flushes_partial_frame() -> None:
+    packer = ChunkPacker(periods=4, max_latency_s=1.0)
+    packer.add("preroll.audio", _PERIOD)
+    frames = packer.add("audio.live.s1", _PERIOD)
+
+    assert [(f.subject, f.frame.periods) for f in frames] == [("preroll.audio", 1)]
+    flushed = packer.flush()
+    assert flushed is not None
+    assert flushed.subject == "audio.live.s1"
+    assert flushed.frame.sample_offset == 1536
+    assert packer.flush() is None
+
+
+def test_short_chunk_starts_new_frame() -> None:
+    packer = ChunkPacker(periods=4, max_latency_s=1.0)
+    packer.add("a", _PERIOD)
+    frames = packer.add("a", _PERIOD[:100])
+    assert frames[0].frame.data == _PERIOD
+
+
+def test_frame_round_trip_through_headers() -> None:
+    packer = ChunkPacker(periods=3, max_latency_s=1.0)
+    chunks = [bytes([i]) * 3072 for i in range(3)]
+    (packed,) = [f for c in chunks for f in packer.add("a", c)]
+
+    class _Msg:
+        data = packed.frame.data
+        headers = packed.frame.headers()
+
+    assert _Msg.headers == {HEADER_PERIODS: "3", HEADER_SAMPLE_OFFSET: "0"}
+    frame = AudioFrame.from_msg(_Msg())
+    assert list(frame.iter_periods()) == chunks
+
+
+def test_unpacked_message_is_one_period() -> None:
+    class _Msg:
+        data = _PERIOD
+        headers = None
+
+    assert list(AudioFrame.from_msg(_Msg()).iter_periods()) == [_PERIOD]
+
+
+def test_invalid_periods_rejected() -> None:
+    with pytest.raises(ValueError):
+        ChunkPacker(periods=0, max_latency_s=0.5)
@@ -0,0 +1,233 @@
+"""Unit tests for the pipelined JetStream publisher."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from audio_producer.main import AudioProducerService
+from audio_producer.publisher import POLICY_DROP, POLICY_SPILL, PublishPipeline
+from audio_producer.spool import AudioSpool
+from mocks import MockAudioSource
+
+
+class _GatedJS:
+    """JetStream stand-in whose publishes block until released."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.published: list[tuple[str, bytes]] = []
+
+    async def publish(self, subject: str, payload: bytes, **kwargs: Any) -> None:
+        await self.gate.wait()
+        self.published.append((subject, payload))
+
+
+@pytest.mark.asyncio
+async def test_window_bounds_outstanding_publishes() -> None:
+    js = _GatedJS()
+    pipe = PublishPipeline(js, window=3, policy=POLICY_SPILL)
+    for i in range(10):
+        assert pipe.submit("preroll.audio", bytes([i])) is True
+    await asyncio.sleep(0)
+
+    assert pipe.in_flight == 3
+    assert pipe.backlog == 7
+    assert pipe.stats.spilled == 7
+
+    js.gate.set()
+    assert await pipe.drain(timeout=1.0)
+    assert [p for _, p in js.published] == [bytes([i]) for i in range(10)]
+    assert pipe.stats.acked == 10
+    assert pipe.stats.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_overflow() -> None:
+    js = _GatedJS()
+    pipe = PublishPipeline(js, window=2, policy=POLICY_DROP)
+    results = [pipe.submit("preroll.audio", b"x") for _ in range(5)]
+
+    assert results == [True, True, False, False, False]
+    assert pipe.stats.dropped == 3
+    js.gate.set()
+    assert await pipe.drain(timeout=1.0)
+    assert len(js.published) == 2
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_drops_oldest() -> None:
+    js = _GatedJS()
+    pipe = PublishPipeline(js, window=1, policy=POLICY_SPILL, backlog=2)
+    for i in range(5):
+        pipe.submit("preroll.audio", bytes([i]))
+
+    assert pipe.stats.dropped == 2
+    js.gate.set()
+    assert await pipe.drain(timeout=1.0)
+    assert [p for _, p in js.published] == [b"\x00", b"\x03", b"\x04"]
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_is_counted() -> None:
+    js = AsyncMock()
+    js.publish.side_effect = Exception("no responders")
+    pipe = PublishPipeline(js, window=4)
+    pipe.submit("preroll.audio", b"x")
+
+    assert await pipe.drain(timeout=1.0)
+    assert pipe.stats.failed == 1
+    assert pipe.stats.acked == 0
+
+
+@pytest.mark.asyncio
+async def test_drain_ignores_later_submissions() -> None:
+    js = _GatedJS()
+    pipe = PublishPipeline(js, window=8)
+    pipe.submit("a", b"1")
+    drain = asyncio.create_task(pipe.drain(timeout=1.0))
+    await asyncio.sleep(0)
+    js.gate.set()
+    pipe.submit("a", b"2")  # arrives after the barrier was taken
+    assert await drain
+
+
+@pytest.mark.asyncio
+async def test_drain_times_out_on_stuck_broker() -> None:
+    pipe = PublishPipeline(_GatedJS(), window=2)
+    pipe.submit("a", b"1")
+    assert await pipe.drain(timeout=0.05) is False
+    await pipe.close()
+
+
+@pytest.mark.asyncio
+async def test_headers_forwarded() -> None:
+    js = AsyncMock()
+    pipe = PublishPipeline(js)
+    pipe.submit("audio.live.s1", b"", headers={"LiveSTT-EOS": "true"})
+    await pipe.drain(timeout=1.0)
+    js.publish.assert_called_once_with(
+        "audio.live.s1", b"", headers={"LiveSTT-EOS": "true"}
+    )
+
+
+def test_invalid_policy_rejected() -> None:
+    with pytest.raises(ValueError):
+        PublishPipeline(AsyncMock(), policy="block")
+
+
+@pytest.mark.asyncio
+async def test_capture_not_blocked_by_stalled_broker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """All chunks are read from the source even when no PubAck ever arrives."""
+    monkeypatch.setattr("audio_producer.main._PUBLISH_DRAIN_TIMEOUT_S", 0.05)
+    svc = AudioProducerService()
+    svc.nats_manager = MagicMock()
+    source = MockAudioSource(limit=20, chunk_size=16, sample_rate=160000)
+
+    consumed = 0
+    original_stream = source.stream
+
+    async def counting_stream() -> Any:
+        nonlocal consumed
+        async for chunk in original_stream():
+            consumed += 1
+            yield chunk
+
+    source.stream = counting_stream  # type: ignore[method-assign]
+
+    await asyncio.wait_for(svc._audio_loop(_GatedJS(), asyncio.Event(), source), 2.0)
+
+    assert consumed == 20
+
+
+class _FlakyJS:
+    """JetStream stand-in that fails every publish while ``down`` is set."""
+
+    def __init__(self) -> None:
+        self.down = True
+        self.published: list[tuple[str, bytes, dict[str, str] | None]] = []
+
+    async def publish(
+        self, subject: str, payload: bytes, headers: dict[str, str] | None = None
+    ) -> None:
+        await asyncio.sleep(0)
+        if self.down:
+            raise Exception("no responders")
+        self.published.append((subject, payload, headers))
+
+
+async def _replayed(pipe: PublishPipeline, polls: int) -> bool:
+    """Wait for the pipeline to leave outage mode (spool fully replayed)."""
+    for _ in range(polls):
+        if not pipe.spooling:
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+@pytest.mark.asyncio
+async def test_outage_spools_and_replays_in_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("audio_producer.publisher._REPLAY_INITIAL_DELAY_S", 0.01)
+    js = _FlakyJS()
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=1024 * 1024)
+    pipe = PublishPipeline(js, window=4, spool=spool)
+
+    for i in range(10):
+        pipe.submit("audio.live.s1", bytes([i]))
+    assert await pipe.drain(timeout=1.0)
+    assert pipe.spooling
+    assert pipe.stats.failed == 0
+    assert pipe.stats.spooled == 10
+
+    js.down = False
+    pipe.submit("audio.live.s1", b"\x0a")  # outage mode: straight to spool
+    assert await _replayed(pipe, polls=200)
+    assert [p for _, p, _ in js.published] == [bytes([i]) for i in range(11)]
+    assert all(h and "Nats-Msg-Id" in h for _, _, h in js.published)
+    assert pipe.stats.replayed == 11
+    assert pipe.spool_depth == 0
+    await pipe.close()
+
+
+@pytest.mark.asyncio
+async def test_leftover_spool_replayed_on_start(tmp_path: Path) -> None:
+    path = tmp_path / "a.spool"
+    spool = AudioSpool(path, capacity_bytes=1024 * 1024)
+    spool.append("audio.live.s1", b"old", {"Nats-Msg-Id": "x-1"})
+    js = _FlakyJS()
+    js.down = False
+
+    pipe = PublishPipeline(js, spool=spool)
+    assert pipe.spooling
+    assert await _replayed(pipe, polls=100)
+    assert js.published == [("audio.live.s1", b"old", {"Nats-Msg-Id": "x-1"})]
+    await pipe.close()
+
+
+@pytest.mark.asyncio
+async def test_spool_overflow_during_replay_loses_only_evicted_records(
+    tmp_path: Path,
+) -> None:
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=2048)
+    for i in range(8):
+        spool.append("audio.live.s1", bytes([i]) * 100, {"Nats-Msg-Id": f"x-{i}"})
+    js = _GatedJS()
+    pipe = PublishPipeline(js, window=4, spool=spool)
+    await asyncio.sleep(0)  # replay of records 0-3 is waiting on the broker
+
+    # Outage-mode appends overflow the spool and evict the batch and beyond
+    for i in range(8, 20):
+        pipe.submit("audio.live.s1", bytes([i]) * 100)
+    evicted = spool.evicted
+    assert evicted > 4
+
+    js.gate.set()
+    assert await _replayed(pipe, polls=100)
+    sent = [p[0] for _, p in js.published]
+    assert sent == [0, 1, 2, 3, *range(evicted, 20)]
+    await pipe.close()
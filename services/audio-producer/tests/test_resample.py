@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+import pytest
+from audio_producer.resample import (
+    PeriodNormalizer,
+    Resampler,
+    float_to_int16,
+    pcm_to_mono,
+)
+
+
+def _tone(rate: int, seconds: float, freq: float = 1000.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("rate", [48000, 44100, 8000])
+def test_resampler_matches_ideal_tone(rate: int) -> None:
+    resampler = Resampler(rate)
+    out = resampler.process(_tone(rate, 1.0))
+
+    assert abs(len(out) - 16000) <= resampler.taps
+    n = np.arange(len(out))
+    ideal = 0.5 * np.sin(2 * np.pi * 1000 * (n / 16000 - resampler.delay_s))
+    settled = slice(resampler.taps * 2, -resampler.taps)
+    assert np.max(np.abs(out[settled] - ideal[settled])) < 1e-3
+
+
+def test_resampler_is_chunking_invariant() -> None:
+    """State carried between calls makes chunked output equal one-shot output."""
+    signal = np.random.default_rng(0).uniform(-0.5, 0.5, 44100).astype(np.float32)
+    whole = Resampler(44100).process(signal)
+
+    streaming = Resampler(44100)
+    bounds = [0, 1, 7, 100, 4410, 9000, 30000, 44100]
+    parts = [streaming.process(signal[a:b]) for a, b in itertools.pairwise(bounds)]
+
+    np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-6)
+
+
+def test_resampler_rejects_aliases() -> None:
+    """A 9 kHz tone is above the 8 kHz output Nyquist and must be filtered out."""
+    out = Resampler(48000).process(_tone(48000, 0.5, freq=9000))
+    assert np.max(np.abs(out[200:])) < 1e-3
+
+
+def test_pcm_to_mono_downmixes_and_decodes_24_bit() -> None:
+    stereo = np.array([[1000, 3000], [-2000, -2000]], dtype="<i2").tobytes()
+    np.testing.assert_allclose(pcm_to_mono(stereo, 2, 2) * 32768, [2000, -2000])
+
+    s24 = bytes([0x00, 0x00, 0x40, 0x00, 0x00, 0xC0])  # +0.5, -0.5
+    np.testing.assert_allclose(pcm_to_mono(s24, 1, 3), [0.5, -0.5])
+    assert float_to_int16(np.array([0.5, -1.5], dtype=np.float32)) == (
+        np.array([16384, -32768], dtype="<i2").tobytes()
+    )
+
+
+def test_period_normalizer_emits_fixed_chunks() -> None:
+    normalizer = PeriodNormalizer(44100, channels=2, chunk_samples=1536)
+    frames = normalizer.device_frames(1536)
+    stereo = np.zeros((frames, 2), dtype="<i2").tobytes()
+
+    sizes = [len(normalizer.convert(stereo)) for _ in range(20)]
+
+    # Whole 96 ms chunks only; the remainder waits for the next period
+    assert all(size % 3072 == 0 for size in sizes)
+    assert 18 <= sum(sizes) // 3072 <= 20
+    assert PeriodNormalizer(16000).identity
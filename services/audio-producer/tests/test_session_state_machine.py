@@ -1,11 +1,15 @@
 """Unit tests for the audio-producer session state machine (Milestone 4.5)."""
 
+import asyncio
 import json
 import math
+import re
+from datetime import datetime, tzinfo
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from audio_producer.main import AudioProducerService, _compute_rms
+from audio_producer.main import AudioProducerService
+from messaging.levels import SilenceDetector
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -66,30 +70,36 @@ def _loud_chunk(n_samples: int = 1536) -> bytes:
 
 
 # ---------------------------------------------------------------------------
-# _compute_rms
+# Chunk level (the silence detector's per-chunk dBFS)
 # ---------------------------------------------------------------------------
 
 
-def test_compute_rms_silence_returns_minus_inf() -> None:
-    assert _compute_rms(_silence_chunk()) == -math.inf
+def _chunk_dbfs(data: bytes) -> float:
+    detector = SilenceDetector()
+    detector.update(data)
+    return detector.chunk_dbfs
 
 
-def test_compute_rms_loud_chunk_above_threshold() -> None:
-    rms = _compute_rms(_loud_chunk())
+def test_chunk_dbfs_silence_returns_minus_inf() -> None:
+    assert _chunk_dbfs(_silence_chunk()) == -math.inf
+
+
+def test_chunk_dbfs_loud_chunk_above_threshold() -> None:
+    rms = _chunk_dbfs(_loud_chunk())
     assert rms > -50.0, f"Expected > -50 dBFS, got {rms:.1f}"
 
 
-def test_compute_rms_full_scale_near_zero_dbfs() -> None:
+def test_chunk_dbfs_full_scale_near_zero_dbfs() -> None:
     import struct
 
     n = 1536
     chunk = struct.pack(f"<{n}h", *([32767] * n))
-    rms = _compute_rms(chunk)
+    rms = _chunk_dbfs(chunk)
     assert rms > -1.0, "Full-scale signal should be close to 0 dBFS"
 
 
-def test_compute_rms_empty_returns_minus_inf() -> None:
-    assert _compute_rms(b"") == -math.inf
+def test_chunk_dbfs_empty_returns_minus_inf() -> None:
+    assert _chunk_dbfs(b"") == -math.inf
 
 
 # ---------------------------------------------------------------------------
@@ -111,11 +121,35 @@ async def test_start_session_sets_active_state() -> None:
 
     assert svc.is_active is True
     assert svc.session_id is not None
-    # Format: YYYYMMDD-HHMMSS
-    assert len(svc.session_id) == 15
+    # Format: YYYYMMDD-HHMMSS-<suffix>
+    assert re.fullmatch(r"\d{8}-\d{6}-[0-9a-f]{6}", svc.session_id)
     assert svc._label == "Sunday Morning"
 
 
+@pytest.mark.asyncio
+async def test_rooms_starting_in_the_same_second_get_distinct_session_ids(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _FrozenClock(datetime):
+        @classmethod
+        def now(cls, tz: tzinfo | None = None) -> "_FrozenClock":
+            return cls(2026, 1, 1, 10, 0, 0, tzinfo=tz)
+
+    monkeypatch.setattr("audio_producer.main.datetime", _FrozenClock)
+    session_ids = []
+    for room in ("hall", "hall", "chapel"):
+        svc = AudioProducerService(room=room)
+        svc.nats_manager = MagicMock()
+        svc.nats_manager.ensure_stream = AsyncMock()
+        svc.nc = AsyncMock()
+        await svc._start_session(_make_js())
+        assert svc.session_id is not None
+        session_ids.append(svc.session_id)
+
+    assert len(set(session_ids)) == 3
+    assert [sid.split("-")[2] for sid in session_ids] == ["hall", "hall", "chapel"]
+
+
 @pytest.mark.asyncio
 async def test_start_session_writes_kv() -> None:
     svc = _make_service()
@@ -460,3 +494,32 @@ async def test_stop_session_publishes_lifecycle_event() -> None:
     data = json.loads(payload.decode())
     assert data["event"] == "stopped"
     assert data["session_id"] == "20260101-1000"
+
+
+@pytest.mark.asyncio
+async def test_room_session_uses_room_subjects() -> None:
+    """A room instance scopes its KV key, events and EOS to the room."""
+    svc = AudioProducerService(room="hall", rooms={})
+    kv = _make_kv(active=False)
+    svc._session_kv = kv
+    svc._config_kv = AsyncMock()
+    svc._config_kv.get.side_effect = Exception("not found")
+    svc.nc = AsyncMock()
+    mock_js = _make_js()
+
+    await svc._start_session(mock_js, label="Hall")
+    key, raw = kv.put.call_args[0]
+    assert key == "current.hall"
+    assert json.loads(raw.decode())["room"] == "hall"
+    await asyncio.gather(*svc._background_tasks)  # pre-roll flush
+    assert mock_js.pull_subscribe.call_args.args[0] == "preroll.audio.hall"
+
+    session_id = svc.session_id
+    await svc._stop_session(mock_js)
+    kv.delete.assert_called_once_with("current.hall")
+    mock_js.publish.assert_any_call(
+        f"audio.live.hall.{session_id}", b"", headers={"LiveSTT-EOS": "true"}
+    )
+    event = json.loads(svc.nc.publish.call_args.args[1].decode())
+    assert event["event"] == "stopped"
+    assert event["room"] == "hall"
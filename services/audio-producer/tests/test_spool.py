@@ -0,0 +1,72 @@
+"""Unit tests for the memory-mapped audio spool."""
+
+from pathlib import Path
+
+import pytest
+from audio_producer.spool import AudioSpool
+
+_CAPACITY = 64 + 4096
+
+
+def test_append_peek_pop_round_trip(tmp_path: Path) -> None:
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=_CAPACITY)
+    spool.append("audio.live.s1", b"\x01\x02", {"Nats-Msg-Id": "e-1"})
+    spool.append("preroll.audio", b"\x03")
+
+    records = spool.peek(10)
+    assert [(r.subject, r.payload, r.headers) for r in records] == [
+        ("audio.live.s1", b"\x01\x02", {"Nats-Msg-Id": "e-1"}),
+        ("preroll.audio", b"\x03", None),
+    ]
+    spool.pop(1)
+    assert len(spool) == 1
+    assert spool.peek(10)[0].payload == b"\x03"
+    spool.pop(1)
+    assert len(spool) == 0
+    assert spool.bytes_used == 0
+
+
+def test_full_spool_evicts_oldest(tmp_path: Path) -> None:
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=_CAPACITY)
+    for i in range(20):
+        assert spool.append("a", bytes([i]) * 500)
+
+    assert spool.evicted > 0
+    payloads = [r.payload[0] for r in spool.peek(100)]
+    # Survivors are the newest records, still in order
+    assert payloads == list(range(20 - len(payloads), 20))
+
+
+def test_wraparound_preserves_order(tmp_path: Path) -> None:
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=_CAPACITY)
+    expected: list[int] = []
+    for i in range(200):
+        spool.append("a", bytes([i % 256]) * 300)
+        expected.append(i % 256)
+        if len(spool) > 5:
+            spool.pop(2)
+            expected = expected[2:]
+        assert [r.payload[0] for r in spool.peek(100)] == expected[-len(spool) :]
+
+
+def test_oversized_record_rejected(tmp_path: Path) -> None:
+    spool = AudioSpool(tmp_path / "a.spool", capacity_bytes=_CAPACITY)
+    assert spool.append("a", b"x" * _CAPACITY) is False
+    assert len(spool) == 0
+
+
+def test_resumes_after_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "a.spool"
+    spool = AudioSpool(path, capacity_bytes=_CAPACITY)
+    for i in range(3):
+        spool.append("a", bytes([i]))
+    spool.pop(1)
+    spool.close()
+
+    reopened = AudioSpool(path, capacity_bytes=_CAPACITY)
+    assert [r.payload for r in reopened.peek(10)] == [b"\x01", b"\x02"]
+
+
+def test_capacity_too_small(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        AudioSpool(tmp_path / "a.spool", capacity_bytes=128)
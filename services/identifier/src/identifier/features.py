@@ -0,0 +1,122 @@
+"""NumPy-only log mel-filterbank front end (no librosa / scipy required).
+
+pre-emphasis → 25 ms Hamming frames every 10 ms → power spectrum →
+80-band log mel → per-band CMVN, shape [1, T, 80] float32.
+
+The identifier runs this on every 1.5 s window, so everything that does not
+depend on the audio (mel filterbank, window) is built once per front end.
+Frames are a strided view of the signal, not a gathered copy, and the
+signal, frame and power buffers are float32 scratch kept per thread (the
+lanes embed concurrently via ``asyncio.to_thread``); steady state allocates
+only the FFT output and the returned features.
+"""
+
+import threading
+
+import numpy as np
+
+_SAMPLE_RATE = 16000
+_N_MELS = 80
+_WIN_LENGTH = 400  # 25 ms at 16 kHz
+_HOP_LENGTH = 160  # 10 ms at 16 kHz
+_N_FFT = 512
+_PRE_EMPHASIS = 0.97
+
+
+def mel_filterbank(
+    n_fft: int = _N_FFT, n_mels: int = _N_MELS, sample_rate: int = _SAMPLE_RATE
+) -> np.ndarray:
+    """Build an [n_fft//2+1, n_mels] triangular mel filterbank matrix."""
+    high_mel = 2595.0 * np.log10(1.0 + (sample_rate / 2) / 700.0)
+    hz_pts = 700.0 * (10.0 ** (np.linspace(0.0, high_mel, n_mels + 2) / 2595.0) - 1.0)
+    bins = np.floor((n_fft + 1) * hz_pts / sample_rate).astype(int)
+    left, center, right = bins[:-2], bins[1:-1], bins[2:]
+
+    k = np.arange(n_fft // 2 + 1)[:, None]
+    rising = (k - left) / np.maximum(center - left, 1)
+    falling = (right - k) / np.maximum(right - center, 1)
+    fb = np.where(
+        (k >= left) & (k < center),
+        rising,
+        np.where((k >= center) & (k < right), falling, 0.0),
+    )
+    return fb.astype(np.float32)
+
+
+class _Scratch(threading.local):
+    signal = np.empty(0, dtype=np.float32)  # pre-emphasised samples
+    lagged = np.empty(0, dtype=np.float32)
+    frames = np.zeros((0, _N_FFT), dtype=np.float32)  # zero-padded to n_fft
+    power = np.empty((0, _N_FFT // 2 + 1), dtype=np.float32)
+    imag = np.empty((0, _N_FFT // 2 + 1), dtype=np.float32)
+
+
+class LogMelFrontEnd:
+    """Callable feature extractor; one instance can be shared across threads."""
+
+    def __init__(self) -> None:
+        self.filterbank = mel_filterbank()
+        self._window = np.hamming(_WIN_LENGTH).astype(np.float32)
+        self._scratch = _Scratch()
+
+    def from_pcm(self, pcm: bytes) -> np.ndarray:
+        """Features of raw int16 PCM, scaled to [-1, 1) without a float copy."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        return self._features(samples, 1.0 / 32768.0)
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """Features of float samples in [-1, 1]."""
+        return self._features(audio, 1.0)
+
+    def _features(self, samples: np.ndarray, scale: float) -> np.ndarray:
+        signal = self._emphasize(samples, scale)
+        n_frames = 1 + (len(signal) - _WIN_LENGTH) // _HOP_LENGTH
+        scratch = self._scratch
+        if len(scratch.frames) < n_frames:
+            # Longer window than before: grow once and keep the buffers
+            scratch.frames = np.zeros((n_frames, _N_FFT), dtype=np.float32)
+            scratch.power = np.empty((n_frames, _N_FFT // 2 + 1), dtype=np.float32)
+            scratch.imag = np.empty_like(scratch.power)
+        frames = scratch.frames[:n_frames]
+        power = scratch.power[:n_frames]
+        imag = scratch.imag[:n_frames]
+
+        # Strided view: frame t starts at t * hop; columns past the window stay 0
+        view = np.lib.stride_tricks.sliding_window_view(signal, _WIN_LENGTH)
+        np.multiply(view[::_HOP_LENGTH], self._window, out=frames[:, :_WIN_LENGTH])
+
+        spectrum = np.fft.rfft(frames, n=_N_FFT)  # [T, n_fft//2+1]
+        np.square(spectrum.real, out=power)
+        np.square(spectrum.imag, out=imag)
+        power += imag
+
+        features = np.empty((1, n_frames, _N_MELS), dtype=np.float32)
+        log_mel = features[0]
+        np.matmul(power, self.filterbank, out=log_mel)
+        log_mel += 1e-10
+        np.log(log_mel, out=log_mel)
+
+        # CMVN; statistics accumulated in float64 so flat bands stay exactly 0
+        log_mel -= log_mel.mean(axis=0, dtype=np.float64)
+        log_mel /= log_mel.std(axis=0, dtype=np.float64) + 1e-8
+        return features
+
+    def _emphasize(self, samples: np.ndarray, scale: float) -> np.ndarray:
+        """Scaled, pre-emphasised copy of ``samples`` in the signal scratch.
+
+        Shorter than one frame: padded with the last value to a full frame.
+        """
+        n = len(samples)
+        size = max(n, _WIN_LENGTH)
+        scratch = self._scratch
+        if len(scratch.signal) < size:
+            scratch.signal = np.empty(size, dtype=np.float32)
+            scratch.lagged = np.empty(size, dtype=np.float32)
+        signal = scratch.signal[:size]
+        lagged = scratch.lagged[: n - 1]
+        np.multiply(samples, scale, out=signal[:n], casting="unsafe")
+        # y[i] = x[i] - a * x[i-1]
+        np.multiply(signal[: n - 1], _PRE_EMPHASIS, out=lagged)
+        signal[1:n] -= lagged
+        signal[n:] = signal[n - 1]
+        return signal
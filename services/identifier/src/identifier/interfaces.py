@@ -13,6 +13,14 @@ class Embedder(ABC):
         """
         pass
 
+    def embed_many(self, audio_pcms: list[bytes]) -> list[np.ndarray | None]:
+        """Embed several windows, results in input order.
+
+        Implementations may run them as one batch; by default each is embedded
+        in turn.
+        """
+        return [self.embed(audio_pcm) for audio_pcm in audio_pcms]
+
 
 class VoiceprintStore(ABC):
     @abstractmethod
@@ -30,6 +38,12 @@ class VoiceprintStore(ABC):
         """
         pass
 
+    def identify_many(
+        self, embeddings: list[np.ndarray], threshold: float = 0.25
+    ) -> list[tuple[str, float] | None]:
+        """identify() for several embeddings at once, results in input order."""
+        return [self.identify(embedding, threshold) for embedding in embeddings]
+
     @abstractmethod
     def delete(self, name: str) -> None:
         """Remove a speaker's voiceprint (right-to-erasure / crypto-shred support)."""
@@ -2,16 +2,21 @@ import asyncio
 import json
 import logging
 import os
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+from messaging.audio import AudioFrame
 from messaging.service import BaseService
-from messaging.streams import SUBJECT_AUDIO_BACKFILL, SUBJECT_AUDIO_LIVE
+from messaging.streams import SUBJECT_AUDIO_BACKFILL, SUBJECT_AUDIO_LIVE, room_scoped
 
 from .embedder import OpenVinoEmbedder
 from .interfaces import Embedder, VoiceprintStore
+from .scheduler import InferenceScheduler
+from .speech import SpeechWindower, WindowStats
 from .store import LanceDBVoiceprintStore, StubVoiceprintStore
+from .workers import ProcessEmbedder
 
 logger = logging.getLogger("identifier")
 
@@ -19,6 +24,20 @@ logger = logging.getLogger("identifier")
 _WINDOW_SAMPLES: int = 24576
 # Cosine distance threshold for accepting a speaker match
 _MATCH_THRESHOLD: float = float(os.getenv("IDENTIFIER_THRESHOLD", "0.25"))
+# OpenVINO infer requests run in parallel (1 = latency-optimised, one at a time)
+_INFER_STREAMS: int = int(os.getenv("IDENTIFIER_STREAMS", "1"))
+# Windows embedded per batch, across lanes and sessions
+_MAX_BATCH: int = int(os.getenv("IDENTIFIER_MAX_BATCH", "16"))
+# Messages pulled per fetch; their windows are embedded together. A live
+# worker that has caught up fetches one at a time, since a larger fetch
+# waits for enough messages to fill it
+_FETCH_BATCH = 64
+# Embedding worker processes (0 = embed in this process, on threads)
+_WORKERS: int = int(os.getenv("IDENTIFIER_WORKERS", "0"))
+# Embed only windows cut around speech (energy check per capture period)
+_VAD: bool = os.getenv("IDENTIFIER_VAD", "false").lower() == "true"
+# Period level (dBFS) that counts as speech when IDENTIFIER_VAD is on
+_SPEECH_DBFS: float = float(os.getenv("IDENTIFIER_SPEECH_DBFS", "-50"))
 
 
 @dataclass
@@ -39,6 +58,26 @@ class _AudioBuffer:
         self.sample_count = 0
         return data
 
+    def push(self, chunk: bytes) -> bytes | None:
+        """Add a chunk; returns the window once it is full."""
+        self.add(chunk)
+        return self.consume() if self.ready() else None
+
+
+def _num_pending(msg: Any) -> int | None:
+    """Messages left in the consumer after ``msg`` (JetStream metadata)."""
+    try:
+        pending = msg.metadata.num_pending
+    except Exception:
+        return None
+    return pending if isinstance(pending, int) else None
+
+
+def _build_embedder() -> Embedder:
+    if _WORKERS > 0:
+        return ProcessEmbedder(_WORKERS, slots=_MAX_BATCH)
+    return OpenVinoEmbedder(streams=_INFER_STREAMS)
+
 
 def _build_store() -> VoiceprintStore:
     try:
@@ -55,17 +94,70 @@ class IdentifierService(BaseService):
         store: VoiceprintStore | None = None,
     ) -> None:
         super().__init__("identifier")
-        self._embedder: Embedder = embedder or OpenVinoEmbedder()
+        self._embedder: Embedder = embedder or _build_embedder()
         self._store: VoiceprintStore = store or _build_store()
+        self._scheduler = InferenceScheduler(self._embedder, _MAX_BATCH)
+        self.window_stats = {"live": WindowStats(), "backfill": WindowStats()}
 
     async def run_business_logic(self, js: Any, stop_event: asyncio.Event) -> None:
         self.logger.info("Identifier starting dual-lane pipeline...")
+        if isinstance(self._embedder, ProcessEmbedder):
+            await self._start_workers(self._embedder)
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._worker(js, stop_event, SUBJECT_AUDIO_LIVE, "live"))
+                tg.create_task(
+                    self._worker(js, stop_event, SUBJECT_AUDIO_BACKFILL, "backfill")
+                )
+        finally:
+            await self._scheduler.close()
+            stats = self._scheduler.stats
+            self.logger.info(
+                f"Embedded {stats.windows} windows in {stats.batches} batches "
+                f"(largest {stats.largest_batch})"
+            )
+            if _VAD:
+                for source, windows in self.window_stats.items():
+                    self._log_window_stats(source, windows)
+            if isinstance(self._embedder, ProcessEmbedder):
+                await asyncio.to_thread(self._embedder.close)
+                self.logger.info(
+                    f"Embedding workers stopped ({self._embedder.restarts} restarts)"
+                )
+
+    def _log_window_stats(self, source: str, stats: WindowStats) -> None:
+        audio_s = stats.embedded_s + stats.skipped_s
+        if not audio_s:
+            return
+        self.logger.info(
+            f"{source}: embedded {stats.embedded} windows, skipped {stats.skipped}; "
+            f"{stats.skipped_s:.0f}s of {audio_s:.0f}s audio not embedded "
+            f"({stats.skipped_s / audio_s:.0%})"
+        )
+
+    def _new_buffer(self, source: str) -> _AudioBuffer | SpeechWindower:
+        if _VAD:
+            return SpeechWindower(
+                _WINDOW_SAMPLES, self.window_stats[source], threshold_dbfs=_SPEECH_DBFS
+            )
+        return _AudioBuffer()
 
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(self._worker(js, stop_event, SUBJECT_AUDIO_LIVE, "live"))
-            tg.create_task(
-                self._worker(js, stop_event, SUBJECT_AUDIO_BACKFILL, "backfill")
+    async def _start_workers(self, embedder: ProcessEmbedder) -> None:
+        """Spawn and warm up the embedding workers, or embed in-process."""
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(embedder.start)
+        except Exception as e:
+            self.logger.error(
+                f"Embedding workers failed to start ({e}); embedding in-process"
             )
+            await asyncio.to_thread(embedder.close)
+            self._embedder = OpenVinoEmbedder(streams=_INFER_STREAMS)
+            self._scheduler = InferenceScheduler(self._embedder, _MAX_BATCH)
+            return
+        elapsed = time.monotonic() - started
+        self.logger.info(f"{embedder.workers} embedding workers ready in {elapsed:.1f}s")
 
     async def _worker(
         self,
@@ -82,11 +174,13 @@ class IdentifierService(BaseService):
             self.logger.critical(f"{source} worker failed to subscribe: {e}")
             return
 
-        buffers: dict[str, _AudioBuffer] = {}
+        # Keyed by (room, session id): rooms may reuse a session id
+        buffers: dict[tuple[str, str], _AudioBuffer | SpeechWindower] = {}
+        batch = 1 if source == "live" else _FETCH_BATCH
 
         while not stop_event.is_set():
             try:
-                msgs = await sub.fetch(1, timeout=1)
+                msgs = await sub.fetch(batch, timeout=1)
             except TimeoutError:
                 continue
             except Exception as e:
@@ -94,49 +188,76 @@ class IdentifierService(BaseService):
                 await asyncio.sleep(1)
                 continue
 
+            # Windows of the whole fetch are identified together, then acked
+            rooms = self._cut_windows(msgs, buffers, source)
+            await asyncio.gather(
+                *(
+                    self._identify_windows(js, windows, source, room)
+                    for room, windows in rooms.items()
+                )
+            )
             for msg in msgs:
-                if msg.headers and msg.headers.get("LiveSTT-EOS") == "true":
-                    self.logger.info(f"{source} worker: EOS received — flushing buffer")
-                    session_id = msg.subject.split(".")[-1]
-                    # Discard any partial window — not enough audio to embed
-                    buffers.pop(session_id, None)
-                    await msg.ack()
-                    continue
-
-                session_id = msg.subject.split(".")[-1]
-                buf = buffers.setdefault(session_id, _AudioBuffer())
-                buf.add(msg.data)
-
-                if buf.ready():
-                    audio = buf.consume()
-                    await self._identify_and_publish(js, audio, session_id, source)
-
                 await msg.ack()
+            if source == "live":
+                batch = _FETCH_BATCH if _num_pending(msgs[-1]) else 1
 
-    async def _identify_and_publish(
+    def _cut_windows(
         self,
-        js: Any,
-        audio_pcm: bytes,
-        session_id: str,
+        msgs: list[Any],
+        buffers: dict[tuple[str, str], _AudioBuffer | SpeechWindower],
         source: str,
+    ) -> dict[str, list[bytes]]:
+        """Buffer the messages' audio per session; return full windows by room."""
+        windows: dict[str, list[bytes]] = {}
+        for msg in msgs:
+            # audio.<lane>.[<room>.]<sid>
+            parts = msg.subject.split(".")
+            session_id = parts[-1]
+            room = parts[2] if len(parts) >= 4 else ""
+            if msg.headers and msg.headers.get("LiveSTT-EOS") == "true":
+                self.logger.info(f"{source} worker: EOS received — flushing buffer")
+                # Discard any partial window — not enough audio to embed
+                buffers.pop((room, session_id), None)
+                continue
+
+            buf = buffers.get((room, session_id))
+            if buf is None:
+                buf = buffers[room, session_id] = self._new_buffer(source)
+            # Unpack so windows still close on period boundaries
+            periods = AudioFrame.from_msg(msg).iter_periods()
+            full = [w for w in map(buf.push, periods) if w is not None]
+            if full:
+                windows.setdefault(room, []).extend(full)
+        return windows
+
+    async def _identify_windows(
+        self, js: Any, windows: list[bytes], source: str, room: str = ""
     ) -> None:
-        embedding = await asyncio.to_thread(self._embedder.embed, audio_pcm)
-        if embedding is None:
-            return  # No embedding — identity-manager will time out to Unknown
+        embeddings = await asyncio.gather(*map(self._scheduler.embed, windows))
+        # No embedding — identity-manager will time out to Unknown
+        found = [embedding for embedding in embeddings if embedding is not None]
+        if not found:
+            return
 
-        result = await asyncio.to_thread(
-            self._store.identify, embedding, _MATCH_THRESHOLD
-        )
-        if result is None:
-            return  # No match — Unknown handled by identity-manager timeout
+        # In-memory voiceprint matrix: one product for all windows, no thread hop
+        for result in self._store.identify_many(found, _MATCH_THRESHOLD):
+            if result is not None:  # No match — Unknown handled by the timeout
+                await self._publish_identity(js, result, source, room)
 
+    async def _publish_identity(
+        self, js: Any, result: tuple[str, float], source: str, room: str = ""
+    ) -> None:
         speaker, confidence = result
-        payload = {
+        payload: dict[str, Any] = {
             "speaker": speaker,
             "confidence": confidence,
             "timestamp": datetime.now(UTC).isoformat(),
+            "source": source,
         }
-        subject = f"transcript.identity.{source}"
+        # Room-scoped identities: transcript.identity.<source>.<room>
+        if room:
+            payload["room"] = room
+        subject = f"transcript.identity.{room_scoped(source, room)}"
         try:
             await js.publish(subject, json.dumps(payload).encode())
             self.logger.debug(f"Identified '{speaker}' ({confidence:.2f}) → {subject}")
@@ -0,0 +1,105 @@
+"""Shared inference scheduler for the identifier's speaker embeddings.
+
+Both lane workers, for every session, submit their ready 1.5 s windows here
+instead of each running its own batch-of-one ``embed`` in a thread. One
+dispatcher takes everything queued (up to ``max_batch`` windows) and runs it
+as a single ``Embedder.embed_many`` call in a worker thread; the OpenVINO
+embedder spreads that batch over its infer-request streams. Windows that
+arrive meanwhile form the next batch, so batches grow with the backlog
+(backfill floods) and stay at one window when the identifier keeps up (live
+only), adding no latency.
+
+The dispatcher task only exists while windows are queued or in flight.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .interfaces import Embedder
+
+logger = logging.getLogger(__name__)
+
+# Windows per embed_many call
+_MAX_BATCH = 16
+
+
+@dataclass
+class SchedulerStats:
+    windows: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "windows": self.windows,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+        }
+
+
+class InferenceScheduler:
+    """Batches concurrent ``embed`` calls into ``embed_many`` calls."""
+
+    def __init__(self, embedder: Embedder, max_batch: int = _MAX_BATCH) -> None:
+        self._embedder = embedder
+        self._max_batch = max(1, max_batch)
+        self._waiting: deque[tuple[bytes, asyncio.Future[np.ndarray | None]]] = deque()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self.stats = SchedulerStats()
+
+    async def embed(self, audio_pcm: bytes) -> np.ndarray | None:
+        """Embedding of one window, computed in the next batch."""
+        future: asyncio.Future[np.ndarray | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiting.append((audio_pcm, future))
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        return await future
+
+    async def _dispatch(self) -> None:
+        try:
+            while self._waiting:
+                batch = [
+                    self._waiting.popleft()
+                    for _ in range(min(self._max_batch, len(self._waiting)))
+                ]
+                await self._run(batch)
+        finally:
+            self._dispatcher = None
+            # Cancelled (shutdown): nobody will serve the rest
+            for _, future in self._waiting:
+                future.cancel()
+            self._waiting.clear()
+
+    async def _run(
+        self, batch: list[tuple[bytes, asyncio.Future[np.ndarray | None]]]
+    ) -> None:
+        self.stats.windows += len(batch)
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        try:
+            embeddings = await asyncio.to_thread(
+                self._embedder.embed_many, [audio_pcm for audio_pcm, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+            embeddings = [None] * len(batch)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        for (_, future), embedding in zip(batch, embeddings, strict=True):
+            if not future.done():  # its caller may have been cancelled
+                future.set_result(embedding)
+
+    async def close(self) -> None:
+        """Stop the dispatcher; pending ``embed`` calls are cancelled."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
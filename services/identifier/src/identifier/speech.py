@@ -0,0 +1,120 @@
+"""Speech-gated embedding windows for the identifier (``IDENTIFIER_VAD``).
+
+Without gating, every 1.5 s window is embedded whether it holds speech,
+music or silence, and the non-speech ones cost a full model pass only to
+produce junk matches. ``SpeechWindower`` replaces the fixed window buffer
+with a per-period energy check (the shared ``SilenceDetector`` energy, one
+capture period at a time):
+
+- non-speech periods before a window's first speech period are dropped, so
+  windows start at a speech onset
+- ``gap_periods`` non-speech periods in a row end the speech segment: the
+  window is cut there, without the trailing pause
+- a window is embedded only if it is at least ``min_samples`` long and at
+  least ``min_speech_ratio`` of its periods are speech; otherwise it is
+  skipped
+
+Energy is a cheap stand-in for a VAD: loud music passes as speech. The
+audio-classifier's ``classification.live`` results cannot be used here;
+they carry no session id or sample offset and cover the live lane only.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from messaging.levels import SilenceDetector, energy_to_dbfs
+
+_SAMPLE_RATE = 16000
+# Level above which a period counts as speech (the silence gate's floor)
+_SPEECH_DBFS = -50.0
+# Share of speech periods a window needs to be embedded
+_MIN_SPEECH_RATIO = 0.6
+# Non-speech periods in a row that end a speech segment (~0.4 s)
+_GAP_PERIODS = 4
+# Shortest window cut at a speech boundary worth embedding (0.75 s)
+_MIN_SAMPLES = 12000
+
+
+@dataclass
+class WindowStats:
+    embedded: int = 0  # windows handed out for embedding
+    skipped: int = 0  # windows cut but below the length or speech-ratio bar
+    embedded_s: float = 0.0
+    skipped_s: float = 0.0  # audio never embedded: skipped windows and pauses
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "embedded": self.embedded,
+            "skipped": self.skipped,
+            "embedded_s": round(self.embedded_s, 1),
+            "skipped_s": round(self.skipped_s, 1),
+        }
+
+
+class SpeechWindower:
+    """One session's window buffer that only closes windows over speech."""
+
+    def __init__(
+        self,
+        window_samples: int,
+        stats: WindowStats,
+        threshold_dbfs: float = _SPEECH_DBFS,
+        min_speech_ratio: float = _MIN_SPEECH_RATIO,
+        gap_periods: int = _GAP_PERIODS,
+        min_samples: int = _MIN_SAMPLES,
+    ) -> None:
+        self._window_samples = window_samples
+        self.stats = stats
+        self._threshold_dbfs = threshold_dbfs
+        self._min_speech_ratio = min_speech_ratio
+        self._gap_periods = gap_periods
+        self._min_samples = min_samples
+        self._energy = SilenceDetector(window_chunks=1)
+        self._periods: list[bytes] = []
+        self._samples = 0
+        self._speech_periods = 0
+        self._gap: list[bytes] = []  # trailing non-speech periods
+
+    def push(self, period: bytes) -> bytes | None:
+        """Feed one capture period; returns a window to embed when one closes."""
+        sum_sq, n = self._energy.chunk_energy(period)
+        if energy_to_dbfs(sum_sq, n) > self._threshold_dbfs:
+            # Speech resumed within the gap: the pause stays in the window,
+            # unless the window filled up meanwhile (windows start on speech)
+            for pause in self._gap:
+                if self._periods:
+                    self._append(pause, speech=False)
+                else:
+                    self.stats.skipped_s += len(pause) / 2 / _SAMPLE_RATE
+            self._gap.clear()
+            self._append(period, speech=True)
+        elif not self._periods:
+            self.stats.skipped_s += n / _SAMPLE_RATE  # no speech yet
+        else:
+            self._gap.append(period)
+            if len(self._gap) >= self._gap_periods:
+                self.stats.skipped_s += sum(len(p) for p in self._gap) / 2 / _SAMPLE_RATE
+                self._gap.clear()
+                return self._close()
+        if self._samples >= self._window_samples:
+            return self._close()
+        return None
+
+    def _append(self, period: bytes, speech: bool) -> None:
+        self._periods.append(period)
+        self._samples += len(period) // 2
+        self._speech_periods += speech
+
+    def _close(self) -> bytes | None:
+        window = b"".join(self._periods)
+        samples, ratio = self._samples, self._speech_periods / len(self._periods)
+        self._periods.clear()
+        self._samples = 0
+        self._speech_periods = 0
+        if samples < self._min_samples or ratio < self._min_speech_ratio:
+            self.stats.skipped += 1
+            self.stats.skipped_s += samples / _SAMPLE_RATE
+            return None
+        self.stats.embedded += 1
+        self.stats.embedded_s += samples / _SAMPLE_RATE
+        return window
@@ -1,5 +1,7 @@
 import contextlib
 import logging
+import threading
+from collections.abc import Sequence
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -35,6 +37,81 @@ def _schema() -> "pa.Schema":  # pyright: ignore[reportInvalidTypeForm]
     )
 
 
+class VoiceprintMatrix:
+    """Immutable snapshot of enrolled voiceprints as one float32 matrix.
+
+    Rows are L2-normalised and contiguous, so the cosine similarity of a
+    window to every speaker is one matrix-vector product (matrix-matrix for
+    several windows). Stores replace the whole snapshot on enroll/delete;
+    a lookup already running keeps the snapshot it started with.
+    """
+
+    def __init__(
+        self, names: Sequence[str] = (), vectors: np.ndarray | None = None
+    ) -> None:
+        self.names = tuple(names)
+        if vectors is None:
+            vectors = np.empty((0, _EMBEDDING_DIM), dtype=np.float32)
+        matrix = np.array(vectors, dtype=np.float32, order="C", ndmin=2)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-10)
+        matrix.flags.writeable = False
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def with_voiceprint(self, name: str, embedding: np.ndarray) -> "VoiceprintMatrix":
+        """Copy with ``name`` enrolled (replacing any previous voiceprint)."""
+        keep = [i for i, other in enumerate(self.names) if other != name]
+        return VoiceprintMatrix(
+            [self.names[i] for i in keep] + [name],
+            np.vstack([self.matrix[keep], embedding.reshape(1, -1)]),
+        )
+
+    def without(self, name: str) -> "VoiceprintMatrix":
+        keep = [i for i, other in enumerate(self.names) if other != name]
+        return VoiceprintMatrix([self.names[i] for i in keep], self.matrix[keep])
+
+    def top_k(self, embeddings: np.ndarray, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Indices and cosine similarities of the k closest speakers per row.
+
+        ``embeddings`` is [M, dim]; both results are [M, min(k, len)], best
+        first.
+        """
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(-1, _EMBEDDING_DIM)
+        norms = np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-10)
+        similarities = (queries / norms) @ self.matrix.T  # [M, N]
+        k = min(k, len(self.names))
+        if k == 0:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(np.intp), empty.astype(np.float32)
+        if k < len(self.names):
+            part = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(k), (len(queries), k))
+        scores = np.take_along_axis(similarities, part, axis=1)
+        order = np.argsort(-scores, axis=1)
+        return (
+            np.take_along_axis(part, order, axis=1),
+            np.take_along_axis(scores, order, axis=1),
+        )
+
+    def identify_many(
+        self, embeddings: np.ndarray, threshold: float = 0.25
+    ) -> list[tuple[str, float] | None]:
+        """Closest speaker per row if within ``threshold`` cosine distance."""
+        indices, similarities = self.top_k(embeddings, k=1)
+        if not self.names:
+            return [None] * len(indices)
+        matches: list[tuple[str, float] | None] = []
+        for index, similarity in zip(indices[:, 0], similarities[:, 0], strict=True):
+            if 1.0 - float(similarity) > threshold:
+                matches.append(None)
+            else:
+                matches.append((self.names[index], round(float(similarity), 4)))
+        return matches
+
+
 class StubVoiceprintStore(VoiceprintStore):
     """No-op store — never matches; enroll/delete are no-ops."""
 
@@ -57,6 +134,11 @@ class LanceDBVoiceprintStore(VoiceprintStore):
     Embeddings are 256-dim float32 vectors (WeSpeaker ResNet34, L2-normalised).
     Identification uses cosine distance; threshold is maximum accepted distance
     (default 0.25 ≈ cosine similarity > 0.75).
+
+    LanceDB is the durable copy. Lookups run against a ``VoiceprintMatrix``
+    mirrored from it at start-up and swapped atomically by enroll/delete
+    (call ``refresh`` after writes from another process), so they never touch
+    the table.
     """
 
     def __init__(self, db_path: str = "/data/lancedb") -> None:
@@ -69,54 +151,67 @@ class LanceDBVoiceprintStore(VoiceprintStore):
         Path(db_path).mkdir(parents=True, exist_ok=True)
         self._db = lancedb.connect(db_path)
         self._table = self._open_or_create_table()
-        logger.info(f"LanceDB voiceprint store ready at {db_path}")
+        self._write_lock = threading.Lock()
+        self._voiceprints = self._load()
+        logger.info(
+            f"LanceDB voiceprint store ready at {db_path} "
+            f"({len(self._voiceprints)} voiceprints)"
+        )
 
     def _open_or_create_table(self) -> "lancedb.table.Table":  # pyright: ignore[reportInvalidTypeForm]
         if _TABLE_NAME in self._db.table_names():
             return self._db.open_table(_TABLE_NAME)
         return self._db.create_table(_TABLE_NAME, schema=_schema())
 
-    def enroll(self, name: str, embedding: np.ndarray) -> None:
-        # Remove existing entry before inserting (upsert)
-        with contextlib.suppress(Exception):
-            self._table.delete(f"id = '{name}'")
-        self._table.add(
-            [
-                {
-                    "id": name,
-                    "vector": embedding.astype(np.float32).tolist(),
-                    "enrolled_at": datetime.now(UTC).isoformat(),
-                }
-            ]
+    def _load(self) -> VoiceprintMatrix:
+        rows = self._table.to_arrow().select(["id", "vector"])
+        if rows.num_rows == 0:
+            return VoiceprintMatrix()
+        vectors = rows.column("vector").combine_chunks().flatten().to_numpy()
+        return VoiceprintMatrix(
+            rows.column("id").to_pylist(), vectors.reshape(-1, _EMBEDDING_DIM)
         )
+
+    def refresh(self) -> None:
+        """Re-read the voiceprints from LanceDB."""
+        with self._write_lock:
+            self._table = self._open_or_create_table()  # latest version
+            self._voiceprints = self._load()
+
+    def enroll(self, name: str, embedding: np.ndarray) -> None:
+        with self._write_lock:
+            # Remove existing entry before inserting (upsert)
+            with contextlib.suppress(Exception):
+                self._table.delete(f"id = '{name}'")
+            self._table.add(
+                [
+                    {
+                        "id": name,
+                        "vector": embedding.astype(np.float32).tolist(),
+                        "enrolled_at": datetime.now(UTC).isoformat(),
+                    }
+                ]
+            )
+            self._voiceprints = self._voiceprints.with_voiceprint(name, embedding)
         logger.info(f"Enrolled voiceprint for '{name}'")
 
     def identify(
         self, embedding: np.ndarray, threshold: float = 0.25
     ) -> tuple[str, float] | None:
-        try:
-            results = (
-                self._table.search(embedding.astype(np.float32))
-                .metric("cosine")
-                .limit(1)
-                .to_list()
-            )
-        except Exception as e:
-            logger.error(f"LanceDB search failed: {e}")
-            return None
-
-        if not results:
-            return None
+        return self._voiceprints.identify_many(embedding, threshold)[0]
 
-        distance = float(results[0].get("_distance", 1.0))
-        if distance > threshold:
-            return None
-
-        return (results[0]["id"], round(1.0 - distance, 4))
+    def identify_many(
+        self, embeddings: list[np.ndarray], threshold: float = 0.25
+    ) -> list[tuple[str, float] | None]:
+        if not embeddings:
+            return []
+        return self._voiceprints.identify_many(np.stack(embeddings), threshold)
 
     def delete(self, name: str) -> None:
-        self._table.delete(f"id = '{name}'")
-        # Compact to physically remove the row (crypto-shred support)
-        with contextlib.suppress(Exception):
-            self._table.compact_files()
+        with self._write_lock:
+            self._table.delete(f"id = '{name}'")
+            self._voiceprints = self._voiceprints.without(name)
+            # Compact to physically remove the row (crypto-shred support)
+            with contextlib.suppress(Exception):
+                self._table.compact_files()
         logger.info(f"Deleted voiceprint for '{name}'")
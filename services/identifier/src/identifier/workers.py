@@ -0,0 +1,160 @@
+"""Process-pool speaker embedding for the identifier (``IDENTIFIER_WORKERS``).
+
+Feature extraction and inference hold the GIL for long stretches, which
+stalls the NATS fetch loops sharing the process. ``ProcessEmbedder`` runs
+them in worker processes instead:
+
+- each worker loads the model once, in the pool initializer
+- windows travel through shared memory: the parent copies a window's PCM
+  into a slot and submits only (slot, length); the worker writes the
+  embedding into the slot's output row and returns its length. Neither the
+  audio nor the embedding is pickled.
+- ``start`` spawns every worker and runs a warm-up window through the pool,
+  so the first real window does not pay for process start and model
+  compilation
+- a worker that dies breaks the pool; it is replaced and the unfinished
+  windows are retried once
+"""
+
+import logging
+import multiprocessing as mp
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, cast
+
+import numpy as np
+
+from .embedder import OpenVinoEmbedder
+from .interfaces import Embedder
+
+logger = logging.getLogger(__name__)
+
+# One 1.5 s window of int16 PCM (see main._WINDOW_SAMPLES)
+_SLOT_BYTES = 24576 * 2
+# Widest embedding returned through shared memory (WeSpeaker: 256)
+_MAX_DIM = 256
+# Windows in flight at once; larger batches are embedded in turns
+_SLOTS = 16
+
+# Worker-process state, set by _init_worker
+_worker_embedder: Embedder | None = None
+_worker_pcm: memoryview | None = None
+_worker_out: np.ndarray | None = None
+
+
+def _init_worker(model_path: str, pcm: Any, out: Any, slots: int) -> None:
+    global _worker_embedder, _worker_pcm, _worker_out
+    _worker_embedder = OpenVinoEmbedder(model_path)
+    _worker_pcm = memoryview(pcm).cast("B")
+    _worker_out = np.frombuffer(out, dtype=np.float32).reshape(slots, _MAX_DIM)
+
+
+def _embed_slot(slot: int, n_bytes: int) -> int:
+    """Embed the PCM in ``slot``; returns the embedding length (0 for none)."""
+    assert _worker_embedder is not None and _worker_pcm is not None
+    assert _worker_out is not None
+    start = slot * _SLOT_BYTES
+    # embed() only reads the window through the buffer protocol
+    window = cast(bytes, _worker_pcm[start : start + n_bytes])
+    embedding = _worker_embedder.embed(window)
+    if embedding is None:
+        return 0
+    _worker_out[slot, : len(embedding)] = embedding
+    return len(embedding)
+
+
+def _embed_bytes(audio_pcm: bytes) -> np.ndarray | None:
+    """Fallback for windows too long for a slot (pickled both ways)."""
+    assert _worker_embedder is not None
+    return _worker_embedder.embed(audio_pcm)
+
+
+class ProcessEmbedder(Embedder):
+    """``OpenVinoEmbedder`` running in a pool of ``workers`` processes."""
+
+    def __init__(
+        self,
+        workers: int,
+        model_path: str = "models/wespeaker.xml",
+        slots: int = _SLOTS,
+    ) -> None:
+        self.workers = max(1, workers)
+        self._model_path = model_path
+        self._slots = max(1, slots)
+        self._context = mp.get_context("spawn")
+        self._pcm = self._context.RawArray("B", self._slots * _SLOT_BYTES)
+        self._out_raw = self._context.RawArray("f", self._slots * _MAX_DIM)
+        self._pcm_view = np.frombuffer(self._pcm, dtype=np.uint8)
+        self._out = np.frombuffer(self._out_raw, dtype=np.float32).reshape(
+            self._slots, _MAX_DIM
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Spawn the workers (each loads the model) and warm the pool up."""
+        self._executor = ProcessPoolExecutor(
+            self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._model_path, self._pcm, self._out_raw, self._slots),
+        )
+        rng = np.random.default_rng(0)
+        noise = (rng.standard_normal(_SLOT_BYTES // 2) * 1000).astype(np.int16)
+        self._run([noise.tobytes()] * min(self.workers, self._slots))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def embed(self, audio_pcm: bytes) -> np.ndarray | None:
+        return self.embed_many([audio_pcm])[0]
+
+    def embed_many(self, audio_pcms: list[bytes]) -> list[np.ndarray | None]:
+        results: list[np.ndarray | None] = [None] * len(audio_pcms)
+        with self._lock:
+            if self._executor is None:
+                self.start()
+            for offset in range(0, len(audio_pcms), self._slots):
+                turn = audio_pcms[offset : offset + self._slots]
+                for attempt in range(2):
+                    try:
+                        results[offset : offset + len(turn)] = self._run(turn)
+                        break
+                    except BrokenProcessPool as e:
+                        logger.error(f"Embedding worker died ({e}); restarting the pool")
+                        self._restart()
+                        if attempt:
+                            logger.error(f"Dropped {len(turn)} windows after a retry")
+        return results
+
+    def _run(self, audio_pcms: list[bytes]) -> list[np.ndarray | None]:
+        """Embed up to ``slots`` windows, one slot each, across the workers."""
+        assert self._executor is not None
+        futures: list[Future[Any]] = []
+        for slot, audio_pcm in enumerate(audio_pcms):
+            n_bytes = len(audio_pcm)
+            if n_bytes > _SLOT_BYTES:
+                futures.append(self._executor.submit(_embed_bytes, audio_pcm))
+                continue
+            start = slot * _SLOT_BYTES
+            self._pcm_view[start : start + n_bytes] = np.frombuffer(audio_pcm, np.uint8)
+            futures.append(self._executor.submit(_embed_slot, slot, n_bytes))
+        results: list[np.ndarray | None] = []
+        for slot, future in enumerate(futures):
+            result = future.result()
+            if isinstance(result, int):
+                results.append(self._out[slot, :result].copy() if result else None)
+            else:
+                results.append(result)
+        return results
+
+    def _restart(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        self.start()
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def tiny_model(tmp_path: Path) -> str:
+    """Path of an OpenVINO stand-in for WeSpeaker.
+
+    Takes the max over time of the features and projects it to 16 dims, so
+    embeddings are deterministic and differ between windows.
+    """
+    ov = pytest.importorskip("openvino")
+    ops = pytest.importorskip("openvino.opset13")
+    feats = ops.parameter([1, -1, 80], np.float32, name="feats")
+    weights = np.random.default_rng(0).standard_normal((80, 16)).astype(np.float32)
+    pooled = ops.reduce_max(feats, [1], False)
+    output = ops.matmul(pooled, ops.constant(weights), False, False)
+    model_path = tmp_path / "tiny.xml"
+    ov.save_model(ov.Model([output], [feats], "tiny"), str(model_path))
+    return str(model_path)
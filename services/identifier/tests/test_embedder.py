@@ -3,7 +3,7 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
-from identifier.embedder import OpenVinoEmbedder, StubEmbedder, _log_mel_features
+from identifier.embedder import OpenVinoEmbedder, StubEmbedder
 
 
 def _pcm(seconds: float = 1.5, sr: int = 16000) -> bytes:
@@ -91,21 +91,23 @@ def test_openvino_returns_none_for_short_audio(
     assert e.embed(_pcm(seconds=0.1)) is None
 
 
-# --- Mel feature extraction ---
+# --- Batched inference ---
 
 
-def test_log_mel_features_shape() -> None:
-    audio = np.zeros(24000, dtype=np.float32)
-    features = _log_mel_features(audio)
-    assert features.ndim == 3
-    assert features.shape[0] == 1  # batch
-    assert features.shape[2] == 80  # mel bins
+def test_embed_many_runs_windows_on_several_streams(tiny_model: str) -> None:
+    e = OpenVinoEmbedder(model_path=tiny_model, streams=2)
+    windows = [_noise_pcm(seconds=1.5 + i / 10) for i in range(5)]
 
+    results = e.embed_many([*windows, _pcm(seconds=0.1)])
 
-def test_log_mel_features_normalised() -> None:
-    rng = np.random.default_rng(1)
-    audio = rng.standard_normal(24000).astype(np.float32)
-    features = _log_mel_features(audio)
-    # CMVN should produce approx zero mean / unit variance per bin
-    mean = features[0].mean(axis=0)
-    assert np.abs(mean).max() < 0.1
+    assert results[-1] is None  # too short
+    for window, result in zip(windows, results, strict=False):
+        expected = e.embed(window)
+        assert result is not None and expected is not None
+        np.testing.assert_allclose(result, expected, atol=1e-5)
+
+
+def test_embed_many_falls_back_to_the_stub() -> None:
+    with patch("identifier.embedder.OPENVINO_AVAILABLE", False):
+        e = OpenVinoEmbedder()
+    assert e.embed_many([_noise_pcm(), _noise_pcm()]) == [None, None]
@@ -0,0 +1,96 @@
+import threading
+
+import numpy as np
+import pytest
+from identifier.features import LogMelFrontEnd, mel_filterbank
+
+
+def _reference_features(audio: np.ndarray) -> np.ndarray:
+    """The original float64 implementation: gathered frames, looped filterbank."""
+    audio = np.concatenate(([audio[0]], audio[1:] - 0.97 * audio[:-1]))
+    n_frames = max(1, 1 + (len(audio) - 400) // 160)
+    idx = np.arange(400)[None, :] + 160 * np.arange(n_frames)[:, None]
+    frames = audio[np.clip(idx, 0, len(audio) - 1)] * np.hamming(400)
+    power = np.abs(np.fft.rfft(frames, n=512)) ** 2
+    log_mel = np.log(power @ _reference_filterbank() + 1e-10)
+    mean = log_mel.mean(axis=0, keepdims=True)
+    std = log_mel.std(axis=0, keepdims=True) + 1e-8
+    return np.asarray(((log_mel - mean) / std)[np.newaxis], dtype=np.float64)
+
+
+def _reference_filterbank() -> np.ndarray:
+    high_mel = 2595.0 * np.log10(1.0 + 8000 / 700.0)
+    hz_pts = 700.0 * (10.0 ** (np.linspace(0.0, high_mel, 82) / 2595.0) - 1.0)
+    bins = np.floor(513 * hz_pts / 16000).astype(int)
+    fb = np.zeros((257, 80), dtype=np.float32)
+    for m in range(1, 81):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        for k in range(left, center):
+            fb[k, m - 1] = (k - left) / max(center - left, 1)
+        for k in range(center, right):
+            fb[k, m - 1] = (right - k) / max(right - center, 1)
+    return fb
+
+
+def _speechlike(samples: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / 16000
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return np.asarray(tone + 0.05 * rng.standard_normal(samples), dtype=np.float32)
+
+
+def test_filterbank_matches_the_looped_construction() -> None:
+    np.testing.assert_array_equal(mel_filterbank(), _reference_filterbank())
+
+
+@pytest.mark.parametrize("samples", [24576, 24000, 4000, 401, 120])
+def test_features_match_the_reference(samples: int) -> None:
+    audio = _speechlike(samples)
+    features = LogMelFrontEnd()(audio)
+    expected = _reference_features(audio.astype(np.float64))
+    assert features.dtype == np.float32
+    assert features.shape == expected.shape
+    np.testing.assert_allclose(features, expected, atol=2e-3)
+
+
+def test_pcm_input_matches_float_input() -> None:
+    pcm = (_speechlike(24576) * 32767).astype(np.int16)
+    front_end = LogMelFrontEnd()
+    np.testing.assert_allclose(
+        front_end.from_pcm(pcm.tobytes()), front_end(pcm / 32768.0), atol=1e-4
+    )
+
+
+def test_log_mel_features_shape() -> None:
+    features = LogMelFrontEnd()(np.zeros(24000, dtype=np.float32))
+    assert features.shape == (1, 148, 80)  # batch, frames, mel bins
+    assert not features.any()  # flat bands normalise to exactly 0
+
+
+def test_log_mel_features_normalised() -> None:
+    rng = np.random.default_rng(1)
+    audio = rng.standard_normal(24000).astype(np.float32)
+    features = LogMelFrontEnd()(audio)
+    # CMVN should produce approx zero mean / unit variance per bin
+    mean = features[0].mean(axis=0)
+    assert np.abs(mean).max() < 0.1
+
+
+def test_results_do_not_alias_scratch_across_calls_or_threads() -> None:
+    front_end = LogMelFrontEnd()
+    inputs = [_speechlike(24576, seed) for seed in range(4)]
+    expected = [front_end(audio).copy() for audio in inputs]
+
+    results: dict[int, list[np.ndarray]] = {}
+
+    def run(i: int) -> None:
+        results[i] = [front_end(inputs[i]) for _ in range(20)]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i, outputs in results.items():
+        for output in outputs:
+            np.testing.assert_array_equal(output, expected[i])
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from identifier.interfaces import Embedder
+from identifier.scheduler import InferenceScheduler
+
+
+class _GatedEmbedder(Embedder):
+    """Embeds each window as [its first byte]; each batch waits for ``gate``."""
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.batches: list[int] = []
+
+    def embed(self, audio_pcm: bytes) -> np.ndarray:
+        return np.array([audio_pcm[0]], dtype=np.float32)
+
+    def embed_many(self, audio_pcms: list[bytes]) -> list[np.ndarray | None]:
+        self.batches.append(len(audio_pcms))
+        self.gate.wait(timeout=5)
+        if audio_pcms[0][0] == 255:
+            raise RuntimeError("inference failed")
+        return [self.embed(audio_pcm) for audio_pcm in audio_pcms]
+
+
+async def _wait_for_batches(embedder: _GatedEmbedder, n: int) -> None:
+    async with asyncio.timeout(2):
+        while len(embedder.batches) < n:
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_windows_queued_during_a_batch_form_the_next_batch() -> None:
+    embedder = _GatedEmbedder()
+    scheduler = InferenceScheduler(embedder, max_batch=4)
+
+    first = asyncio.create_task(scheduler.embed(bytes([0])))
+    await _wait_for_batches(embedder, 1)
+    rest = [asyncio.create_task(scheduler.embed(bytes([i]))) for i in range(1, 7)]
+    await asyncio.sleep(0.01)
+    embedder.gate.set()
+
+    results = await asyncio.gather(first, *rest)
+    assert [int(r[0]) for r in results if r is not None] == list(range(7))
+    assert embedder.batches == [1, 4, 2]
+    assert scheduler.stats.as_dict() == {"windows": 7, "batches": 3, "largest_batch": 4}
+    assert scheduler._dispatcher is None  # idle: no task left running
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_resolves_its_windows_to_none() -> None:
+    embedder = _GatedEmbedder()
+    embedder.gate.set()
+    scheduler = InferenceScheduler(embedder)
+
+    assert await scheduler.embed(bytes([255])) is None
+    result = await scheduler.embed(bytes([3]))
+    assert result is not None and result[0] == 3
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_pending_windows() -> None:
+    embedder = _GatedEmbedder()
+    scheduler = InferenceScheduler(embedder, max_batch=1)
+    pending = [asyncio.create_task(scheduler.embed(bytes([i]))) for i in range(3)]
+    await _wait_for_batches(embedder, 1)
+
+    await scheduler.close()
+    embedder.gate.set()
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
@@ -1,13 +1,19 @@
 import asyncio
 import json
 import struct
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import numpy as np
 import pytest
 from identifier.embedder import StubEmbedder
 from identifier.interfaces import Embedder, VoiceprintStore
-from identifier.main import _WINDOW_SAMPLES, IdentifierService, _AudioBuffer
+from identifier.main import (
+    _FETCH_BATCH,
+    _WINDOW_SAMPLES,
+    IdentifierService,
+    _AudioBuffer,
+)
 from identifier.store import StubVoiceprintStore
 
 # ---------------------------------------------------------------------------
@@ -99,7 +105,7 @@ async def test_no_publish_when_stub_embedder() -> None:
     svc = _make_service(embedder=StubEmbedder(), store=_MatchingStore())
     mock_js = AsyncMock()
 
-    await svc._identify_and_publish(mock_js, _chunk(_WINDOW_SAMPLES), "sess1", "live")
+    await svc._identify_windows(mock_js, [_chunk(_WINDOW_SAMPLES)], "live")
 
     mock_js.publish.assert_not_called()
 
@@ -110,7 +116,7 @@ async def test_no_publish_when_no_store_match() -> None:
     svc = _make_service(embedder=_FixedEmbedder(), store=StubVoiceprintStore())
     mock_js = AsyncMock()
 
-    await svc._identify_and_publish(mock_js, _chunk(_WINDOW_SAMPLES), "sess1", "live")
+    await svc._identify_windows(mock_js, [_chunk(_WINDOW_SAMPLES)], "live")
 
     mock_js.publish.assert_not_called()
 
@@ -124,7 +130,7 @@ async def test_publishes_identity_event_on_match() -> None:
     )
     mock_js = AsyncMock()
 
-    await svc._identify_and_publish(mock_js, _chunk(_WINDOW_SAMPLES), "sess1", "live")
+    await svc._identify_windows(mock_js, [_chunk(_WINDOW_SAMPLES)], "live")
 
     mock_js.publish.assert_called_once()
     subject, raw = mock_js.publish.call_args[0]
@@ -143,7 +149,7 @@ async def test_publishes_to_backfill_subject() -> None:
     )
     mock_js = AsyncMock()
 
-    await svc._identify_and_publish(mock_js, _chunk(_WINDOW_SAMPLES), "sess1", "backfill")
+    await svc._identify_windows(mock_js, [_chunk(_WINDOW_SAMPLES)], "backfill")
 
     subject, _ = mock_js.publish.call_args[0]
     assert subject == "transcript.identity.backfill"
@@ -191,3 +197,229 @@ async def test_worker_buffers_chunks_until_window_full() -> None:
     await svc._worker(mock_js, stop_event, "audio.live.>", "live")
 
     mock_js.publish.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_worker_unpacks_packed_frames() -> None:
+    """Packed frames are split into periods so windows keep their size."""
+    embedded: list[int] = []
+
+    class _RecordingEmbedder(_FixedEmbedder):
+        def embed(self, audio_pcm: bytes) -> np.ndarray:
+            embedded.append(len(audio_pcm) // 2)
+            return super().embed(audio_pcm)
+
+    svc = _make_service(embedder=_RecordingEmbedder(), store=_MatchingStore())
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+
+    # Two frames of 10 periods each = 20 periods; one 16-period window closes
+    msgs = []
+    for i in range(2):
+        m = MagicMock()
+        m.subject = "audio.live.session1"
+        m.data = _chunk(1536) * 10
+        m.headers = {"LiveSTT-Periods": "10", "LiveSTT-Sample-Offset": str(i * 15360)}
+        m.ack = AsyncMock()
+        msgs.append(m)
+
+    async def fake_fetch(n: int, timeout: float) -> list[object]:
+        if msgs:
+            return [msgs.pop(0)]
+        stop_event.set()
+        raise TimeoutError
+
+    mock_sub = MagicMock()
+    mock_sub.fetch = fake_fetch
+    mock_js.pull_subscribe = AsyncMock(return_value=mock_sub)
+
+    await svc._worker(mock_js, stop_event, "audio.live.>", "live")
+
+    assert embedded == [_WINDOW_SAMPLES]
+
+
+@pytest.mark.asyncio
+async def test_worker_embeds_the_windows_of_a_fetch_as_one_batch() -> None:
+    batches: list[int] = []
+
+    class _BatchRecordingEmbedder(_FixedEmbedder):
+        def embed_many(self, audio_pcms: list[bytes]) -> list[np.ndarray | None]:
+            batches.append(len(audio_pcms))
+            embeddings: list[np.ndarray | None] = super().embed_many(audio_pcms)
+            return embeddings
+
+    svc = _make_service(embedder=_BatchRecordingEmbedder(), store=_MatchingStore())
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+
+    # One full window for each of three sessions, fetched together
+    msgs: list[object] = []
+    for sid in ("s1", "s2", "s3"):
+        m = MagicMock()
+        m.subject = f"audio.backfill.{sid}"
+        m.data = _chunk(1536) * 16
+        m.headers = {"LiveSTT-Periods": "16", "LiveSTT-Sample-Offset": "0"}
+        m.ack = AsyncMock()
+        msgs.append(m)
+
+    async def fake_fetch(n: int, timeout: float) -> list[object]:
+        if msgs:
+            batch = msgs[:n]
+            del msgs[:n]
+            return batch
+        stop_event.set()
+        raise TimeoutError
+
+    mock_sub = MagicMock()
+    mock_sub.fetch = fake_fetch
+    mock_js.pull_subscribe = AsyncMock(return_value=mock_sub)
+
+    await svc._worker(mock_js, stop_event, "audio.backfill.>", "backfill")
+
+    assert batches == [3]
+    assert mock_js.publish.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_publishes_identities_per_room() -> None:
+    """Windows from room-scoped subjects yield room-scoped identity events."""
+    svc = _make_service(embedder=_FixedEmbedder(), store=_MatchingStore())
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+
+    msgs = []
+    for room in ("hall", "chapel"):
+        m = MagicMock()
+        m.subject = f"audio.live.{room}.s-{room}"
+        m.data = _chunk(1536) * 16
+        m.headers = {"LiveSTT-Periods": "16", "LiveSTT-Sample-Offset": "0"}
+        m.ack = AsyncMock()
+        msgs.append(m)
+
+    async def fake_fetch(n: int, timeout: float) -> list[MagicMock]:
+        if msgs:
+            batch = msgs[:n]
+            del msgs[:n]
+            return batch
+        stop_event.set()
+        raise TimeoutError
+
+    mock_sub = MagicMock()
+    mock_sub.fetch = fake_fetch
+    mock_js.pull_subscribe = AsyncMock(return_value=mock_sub)
+
+    await svc._worker(mock_js, stop_event, "audio.live.>", "live")
+
+    published = {
+        call.args[0]: json.loads(call.args[1].decode())["room"]
+        for call in mock_js.publish.await_args_list
+    }
+    assert published == {
+        "transcript.identity.live.hall": "hall",
+        "transcript.identity.live.chapel": "chapel",
+    }
+
+
+def test_rooms_reusing_a_session_id_keep_separate_windows() -> None:
+    svc = _make_service(embedder=_FixedEmbedder(), store=_MatchingStore())
+    buffers: dict[tuple[str, str], Any] = {}
+
+    def msg(room: str, eos: bool = False) -> MagicMock:
+        m = MagicMock()
+        m.subject = f"audio.live.{room}.s1"
+        m.data = b"" if eos else _chunk(1536) * 8  # half a window
+        m.headers = (
+            {"LiveSTT-EOS": "true"}
+            if eos
+            else {"LiveSTT-Periods": "8", "LiveSTT-Sample-Offset": "0"}
+        )
+        return m
+
+    # Neither room has a full window yet, and hall's EOS leaves chapel's alone
+    assert svc._cut_windows([msg("hall"), msg("chapel")], buffers, "live") == {}
+    assert svc._cut_windows([msg("hall", eos=True)], buffers, "live") == {}
+    windows = svc._cut_windows([msg("chapel")], buffers, "live")
+    assert list(windows) == ["chapel"]
+    assert len(windows["chapel"]) == 1
+
+
+@pytest.mark.parametrize(
+    ("source", "sizes"),
+    [("live", [1, _FETCH_BATCH, 1]), ("backfill", [_FETCH_BATCH] * 3)],
+)
+@pytest.mark.asyncio
+async def test_live_worker_fetches_one_message_once_caught_up(
+    source: str, sizes: list[int]
+) -> None:
+    """A fetch larger than the backlog waits to fill up, holding live audio."""
+    svc = _make_service(embedder=_FixedEmbedder(), store=_MatchingStore())
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+    pending = [3, 0, 0]
+    fetched: list[int] = []
+
+    async def fake_fetch(n: int, timeout: float) -> list[MagicMock]:
+        fetched.append(n)
+        if len(fetched) == len(pending):
+            stop_event.set()
+        m = MagicMock()
+        m.subject = f"audio.{source}.s1"
+        m.data = _chunk(1536)
+        m.headers = {"LiveSTT-Periods": "1", "LiveSTT-Sample-Offset": "0"}
+        m.metadata.num_pending = pending[len(fetched) - 1]
+        m.ack = AsyncMock()
+        return [m]
+
+    mock_sub = MagicMock()
+    mock_sub.fetch = fake_fetch
+    mock_js.pull_subscribe = AsyncMock(return_value=mock_sub)
+
+    await svc._worker(mock_js, stop_event, f"audio.{source}.>", source)
+
+    assert fetched == sizes
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_non_speech_windows_when_vad_is_on(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("identifier.main._VAD", True)
+    embedded: list[int] = []
+
+    class _RecordingEmbedder(_FixedEmbedder):
+        def embed(self, audio_pcm: bytes) -> np.ndarray:
+            embedded.append(len(audio_pcm) // 2)
+            return super().embed(audio_pcm)
+
+    svc = _make_service(embedder=_RecordingEmbedder(), store=_MatchingStore())
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+
+    loud = np.random.default_rng(0).standard_normal(1536) * 3000
+    speech = loud.astype(np.int16).tobytes()
+    silence = _chunk(1536)  # constant 100: below -50 dBFS
+    msgs = []
+    for data in (silence * 16, speech * 16, silence * 16):
+        m = MagicMock()
+        m.subject = "audio.live.session1"
+        m.data = data
+        m.headers = {"LiveSTT-Periods": "16", "LiveSTT-Sample-Offset": "0"}
+        m.ack = AsyncMock()
+        msgs.append(m)
+
+    async def fake_fetch(n: int, timeout: float) -> list[object]:
+        if msgs:
+            return [msgs.pop(0)]
+        stop_event.set()
+        raise TimeoutError
+
+    mock_sub = MagicMock()
+    mock_sub.fetch = fake_fetch
+    mock_js.pull_subscribe = AsyncMock(return_value=mock_sub)
+
+    await svc._worker(mock_js, stop_event, "audio.live.>", "live")
+
+    assert embedded == [_WINDOW_SAMPLES]
+    stats = svc.window_stats["live"]
+    assert (stats.embedded, stats.skipped) == (1, 0)
+    assert stats.skipped_s == pytest.approx(2 * _WINDOW_SAMPLES / 16000)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from identifier.speech import SpeechWindower, WindowStats
+
+_PERIOD = 1536
+_WINDOW = 16 * _PERIOD
+
+
+def _speech(seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(_PERIOD) * 3000).astype(np.int16).tobytes()  # ~-21 dBFS
+
+
+def _quiet() -> bytes:
+    return np.full(_PERIOD, 30, dtype=np.int16).tobytes()  # ~-61 dBFS
+
+
+def _feed(windower: SpeechWindower, periods: list[bytes]) -> list[bytes]:
+    return [w for w in map(windower.push, periods) if w is not None]
+
+
+def test_continuous_speech_fills_whole_windows() -> None:
+    stats = WindowStats()
+    windows = _feed(SpeechWindower(_WINDOW, stats), [_speech(i) for i in range(40)])
+    assert [len(w) // 2 for w in windows] == [_WINDOW, _WINDOW]
+    assert stats.embedded == 2 and stats.skipped == 0 and stats.skipped_s == 0
+
+
+def test_silence_is_never_embedded() -> None:
+    stats = WindowStats()
+    assert _feed(SpeechWindower(_WINDOW, stats), [_quiet()] * 100) == []
+    assert stats.embedded == 0
+    assert stats.skipped_s == pytest.approx(100 * _PERIOD / 16000)
+
+
+def test_windows_are_cut_at_speech_boundaries() -> None:
+    stats = WindowStats()
+    speech = [_speech(i) for i in range(10)]
+    periods = [_quiet()] * 3 + speech[:5] + [_quiet()] * 2 + speech[5:] + [_quiet()] * 6
+
+    windows = _feed(SpeechWindower(_WINDOW, stats), periods)
+
+    # Leading and trailing pauses dropped; the short pause inside kept
+    assert windows == [b"".join(speech[:5] + [_quiet()] * 2 + speech[5:])]
+    assert stats.skipped_s == pytest.approx(9 * _PERIOD / 16000)
+
+
+def test_short_or_sparse_speech_is_skipped() -> None:
+    stats = WindowStats()
+    blip = [_speech()] * 3 + [_quiet()] * 4  # 0.29 s of speech, then a pause
+    sparse = ([_speech()] + [_quiet()] * 3) * 8  # 25 % speech, never a full gap
+    periods = blip + sparse + [_quiet()] * 4
+
+    assert _feed(SpeechWindower(_WINDOW, stats), periods) == []
+    # The blip, a full sparse window and the sparse rest
+    assert stats.embedded == 0 and stats.skipped == 3
+    assert stats.skipped_s == pytest.approx(len(periods) * _PERIOD / 16000)
@@ -1,8 +1,13 @@
-from unittest.mock import MagicMock, patch
+from pathlib import Path
+from unittest.mock import patch
 
 import numpy as np
 import pytest
-from identifier.store import LanceDBVoiceprintStore, StubVoiceprintStore
+from identifier.store import (
+    LanceDBVoiceprintStore,
+    StubVoiceprintStore,
+    VoiceprintMatrix,
+)
 
 
 def _vec(seed: int = 0) -> np.ndarray:
@@ -32,89 +37,102 @@ def test_lancedb_raises_when_unavailable() -> None:
         LanceDBVoiceprintStore()
 
 
-@patch("identifier.store.LANCEDB_AVAILABLE", True)
-@patch("identifier.store.lancedb")
-@patch("pathlib.Path.mkdir")
-def test_lancedb_enroll_and_identify(
-    mock_mkdir: MagicMock, mock_lancedb: MagicMock
-) -> None:
-    mock_table = MagicMock()
-    mock_table.name = "voiceprints"
-    mock_db = MagicMock()
-    mock_db.table_names.return_value = ["voiceprints"]
-    mock_db.open_table.return_value = mock_table
-    mock_lancedb.connect.return_value = mock_db
-
-    alice = _vec(0)
-    store = LanceDBVoiceprintStore(db_path="/fake/db")
-    store.enroll("Alice", alice)
-
-    mock_table.delete.assert_called_with("id = 'Alice'")
-    mock_table.add.assert_called_once()
-    added = mock_table.add.call_args[0][0][0]
-    assert added["id"] == "Alice"
-    assert len(added["vector"]) == 256
-
-
-@patch("identifier.store.LANCEDB_AVAILABLE", True)
-@patch("identifier.store.lancedb")
-@patch("pathlib.Path.mkdir")
-def test_lancedb_identify_match(mock_mkdir: MagicMock, mock_lancedb: MagicMock) -> None:
-    mock_table = MagicMock()
-    mock_db = MagicMock()
-    mock_db.table_names.return_value = ["voiceprints"]
-    mock_db.open_table.return_value = mock_table
-    mock_lancedb.connect.return_value = mock_db
-
-    search_result = mock_table.search.return_value
-    search_result.metric.return_value.limit.return_value.to_list.return_value = [
-        {"id": "Alice", "vector": _vec(0).tolist(), "_distance": 0.1}
-    ]
-
-    store = LanceDBVoiceprintStore(db_path="/fake/db")
-    result = store.identify(_vec(0))
+def _store(path: Path) -> LanceDBVoiceprintStore:
+    pytest.importorskip("lancedb")
+    return LanceDBVoiceprintStore(db_path=str(path / "lancedb"))
 
+
+def _near(v: np.ndarray, seed: int, noise: float) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return v + noise * rng.standard_normal(v.shape).astype(np.float32) / 16
+
+
+def test_lancedb_enroll_and_identify(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.enroll("Alice", _vec(0))
+    store.enroll("Bob", _vec(1))
+
+    result = store.identify(_near(_vec(0), seed=5, noise=0.5))
     assert result is not None
     speaker, confidence = result
     assert speaker == "Alice"
-    assert confidence == pytest.approx(0.9, abs=1e-3)
-
-
-@patch("identifier.store.LANCEDB_AVAILABLE", True)
-@patch("identifier.store.lancedb")
-@patch("pathlib.Path.mkdir")
-def test_lancedb_identify_no_match_above_threshold(
-    mock_mkdir: MagicMock, mock_lancedb: MagicMock
-) -> None:
-    mock_table = MagicMock()
-    mock_db = MagicMock()
-    mock_db.table_names.return_value = ["voiceprints"]
-    mock_db.open_table.return_value = mock_table
-    mock_lancedb.connect.return_value = mock_db
-
-    search_result = mock_table.search.return_value
-    search_result.metric.return_value.limit.return_value.to_list.return_value = [
-        {"id": "Bob", "_distance": 0.6}  # above default threshold of 0.25
-    ]
-
-    store = LanceDBVoiceprintStore(db_path="/fake/db")
-    assert store.identify(_vec()) is None
+    assert 0.75 < confidence < 1.0
+
+    # Same answer as LanceDB's own cosine search
+    table = store._table
+    hit = table.search(_vec(1)).metric("cosine").limit(1).to_list()[0]
+    assert store.identify(_vec(1)) == (hit["id"], round(1.0 - hit["_distance"], 4))
 
 
-@patch("identifier.store.LANCEDB_AVAILABLE", True)
-@patch("identifier.store.lancedb")
-@patch("pathlib.Path.mkdir")
-def test_lancedb_identify_empty_store(
-    mock_mkdir: MagicMock, mock_lancedb: MagicMock
-) -> None:
-    mock_table = MagicMock()
-    mock_db = MagicMock()
-    mock_db.table_names.return_value = ["voiceprints"]
-    mock_db.open_table.return_value = mock_table
-    mock_lancedb.connect.return_value = mock_db
+def test_lancedb_identify_no_match_above_threshold(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.enroll("Bob", _vec(1))
+    assert store.identify(_vec(2)) is None  # unrelated voice
 
-    search_result = mock_table.search.return_value
-    search_result.metric.return_value.limit.return_value.to_list.return_value = []
 
-    store = LanceDBVoiceprintStore(db_path="/fake/db")
+def test_lancedb_identify_empty_store(tmp_path: Path) -> None:
+    store = _store(tmp_path)
     assert store.identify(_vec()) is None
+    assert store.identify_many([_vec(0), _vec(1)]) == [None, None]
+
+
+def test_lancedb_enroll_overwrites_and_delete_forgets(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.enroll("Alice", _vec(0))
+    store.enroll("Alice", _vec(3))  # re-enrolled
+    assert store.identify(_vec(0)) is None
+    assert store.identify(_vec(3)) == ("Alice", pytest.approx(1.0, abs=1e-4))
+
+    store.delete("Alice")
+    assert store.identify(_vec(3)) is None
+    assert store._table.count_rows() == 0
+
+
+def test_lancedb_voiceprints_are_mirrored_at_start_up(tmp_path: Path) -> None:
+    _store(tmp_path).enroll("Alice", _vec(0))
+
+    reopened = _store(tmp_path)
+    assert reopened.identify(_vec(0)) == ("Alice", pytest.approx(1.0, abs=1e-4))
+
+    _store(tmp_path).enroll("Bob", _vec(1))  # another process
+    assert reopened.identify(_vec(1)) is None
+    reopened.refresh()
+    assert reopened.identify(_vec(1)) == ("Bob", pytest.approx(1.0, abs=1e-4))
+
+
+def test_lancedb_identify_many_matches_identify(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    for i, name in enumerate(("Alice", "Bob", "Carol")):
+        store.enroll(name, _vec(i))
+    windows = [_near(_vec(i % 3), seed=i, noise=0.5) for i in range(6)] + [_vec(9)]
+
+    assert store.identify_many(windows) == [store.identify(w) for w in windows]
+    assert [m[0] if m else None for m in store.identify_many(windows)] == [
+        "Alice",
+        "Bob",
+        "Carol",
+    ] * 2 + [None]
+
+
+# --- VoiceprintMatrix ---
+
+
+def test_matrix_top_k_ranks_speakers_by_similarity() -> None:
+    names = [f"s{i}" for i in range(40)]
+    matrix = VoiceprintMatrix(names, np.stack([_vec(i) for i in range(40)]) * 3.0)
+    assert matrix.matrix.flags.c_contiguous and not matrix.matrix.flags.writeable
+    np.testing.assert_allclose(np.linalg.norm(matrix.matrix, axis=1), 1.0, rtol=1e-5)
+
+    queries = np.stack([_vec(7), _vec(21)])
+    indices, similarities = matrix.top_k(queries, k=3)
+    assert indices.shape == similarities.shape == (2, 3)
+    assert list(indices[:, 0]) == [7, 21]
+    expected = np.sort(queries @ matrix.matrix.T, axis=1)[:, ::-1][:, :3]
+    np.testing.assert_allclose(similarities, expected, rtol=1e-5)
+
+
+def test_matrix_updates_leave_existing_snapshots_untouched() -> None:
+    before = VoiceprintMatrix(["Alice"], _vec(0)[None])
+    after = before.with_voiceprint("Bob", _vec(1)).without("Alice")
+    assert before.names == ("Alice",) and after.names == ("Bob",)
+    assert before.identify_many(_vec(0)[None]) == [("Alice", pytest.approx(1.0))]
@@ -0,0 +1,58 @@
+import os
+import signal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from identifier.embedder import OpenVinoEmbedder
+from identifier.main import IdentifierService
+from identifier.store import StubVoiceprintStore
+from identifier.workers import ProcessEmbedder
+
+
+def _window(seed: int, samples: int = 24576) -> bytes:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(samples) * 3000).astype(np.int16).tobytes()
+
+
+def test_workers_embed_through_shared_memory_and_recover_from_a_crash(
+    tiny_model: str,
+) -> None:
+    reference = OpenVinoEmbedder(tiny_model)
+    embedder = ProcessEmbedder(2, model_path=tiny_model, slots=4)
+    embedder.start()
+    try:
+        # Six windows over four slots; one short, one too long for a slot
+        windows = [_window(i) for i in range(4)] + [b"\x00" * 100, _window(9, 30000)]
+        results = embedder.embed_many(windows)
+
+        assert results[4] is None
+        for window, result in zip(windows, results, strict=True):
+            if result is not None:
+                expected = reference.embed(window)
+                assert expected is not None
+                np.testing.assert_allclose(result, expected, atol=1e-5)
+        assert sum(result is not None for result in results) == 5
+
+        assert embedder._executor is not None
+        for pid in list(embedder._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        result = embedder.embed(windows[0])
+        assert embedder.restarts == 1
+        assert result is not None and np.allclose(result, results[0], atol=1e-5)
+    finally:
+        embedder.close()
+
+
+@pytest.mark.asyncio
+async def test_service_embeds_in_process_when_workers_fail_to_start() -> None:
+    svc = IdentifierService(
+        embedder=ProcessEmbedder(2, model_path="missing/model.xml"),
+        store=StubVoiceprintStore(),
+    )
+    assert isinstance(svc._embedder, ProcessEmbedder)
+    with patch.object(ProcessEmbedder, "start", side_effect=OSError("no fork")):
+        await svc._start_workers(svc._embedder)
+
+    assert isinstance(svc._embedder, OpenVinoEmbedder)
+    assert svc._scheduler._embedder is svc._embedder
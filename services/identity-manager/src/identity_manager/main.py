@@ -1,13 +1,15 @@
 import asyncio
 import json
 import logging
+import time
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from messaging.latency import TRACE_FIELD
 from messaging.service import BaseService
-from messaging.streams import TRANSCRIPTION_STREAM_CONFIG
+from messaging.streams import TRANSCRIPTION_STREAM_CONFIG, room_scoped
 
 logger = logging.getLogger("identity-manager")
 
@@ -26,6 +28,12 @@ class _Pending:
     msg: Any  # raw NATS message — acked after successful publish
 
 
+def _subject_room(subject: Any) -> str:
+    """Room token of ``transcript.<kind>.<source>.<room>`` ("" if unscoped)."""
+    parts = subject.split(".") if isinstance(subject, str) else []
+    return parts[3] if len(parts) >= 4 else ""
+
+
 def _parse_ts(iso_str: str | None) -> float | None:
     """Parse an ISO 8601 timestamp string to a POSIX float. Returns None on failure."""
     if not iso_str:
@@ -39,7 +47,7 @@ def _parse_ts(iso_str: str | None) -> float | None:
 class IdentityManager(BaseService):
     """
     Time Zipper: fuses transcript.raw.* with transcript.identity.* and
-    publishes to transcript.final.{source}.
+    publishes to transcript.final.{source}[.{room}].
 
     Interim transcripts are forwarded immediately (no identity wait needed).
     Final transcripts wait up to PUBLISH_TIMEOUT_S for a matching identity
@@ -47,6 +55,9 @@ class IdentityManager(BaseService):
 
     When the identifier service is offline, all transcripts flow through
     with speaker="Unknown" so the rest of the pipeline continues to work.
+
+    With several rooms (AUDIO_ROOMS), transcripts and identities carry their
+    room; an identity only matches transcripts of the same room.
     """
 
     def __init__(self) -> None:
@@ -84,6 +95,8 @@ class IdentityManager(BaseService):
                 msgs = await sub.fetch(1, timeout=1)
                 for msg in msgs:
                     data = json.loads(msg.data.decode())
+                    if room := _subject_room(msg.subject):
+                        data["room"] = room
                     if data.get("is_final"):
                         self._pending.append(
                             _Pending(
@@ -119,6 +132,8 @@ class IdentityManager(BaseService):
                 msgs = await sub.fetch(1, timeout=1)
                 for msg in msgs:
                     data = json.loads(msg.data.decode())
+                    if room := _subject_room(msg.subject):
+                        data.setdefault("room", room)
                     source = data.get("source", "live")
                     if source == "backfill":
                         self._backfill_identities.append(data)
@@ -133,12 +148,13 @@ class IdentityManager(BaseService):
     # --- Fusion ---
 
     def _find_identity(
-        self, transcript_ts: str | None, source: str = "live"
+        self, transcript_ts: str | None, source: str = "live", room: str = ""
     ) -> dict[str, Any] | None:
         """Return the closest identity event within MATCH_WINDOW_S, or None.
 
         Searches only the pool matching `source` to prevent backfill identity
-        events from contaminating live transcript attribution and vice versa.
+        events from contaminating live transcript attribution and vice versa,
+        and only identities from the transcript's `room`.
         """
         ts = _parse_ts(transcript_ts)
         if ts is None:
@@ -152,6 +168,8 @@ class IdentityManager(BaseService):
         best_diff = MATCH_WINDOW_S
 
         for identity in pool:
+            if identity.get("room", "") != room:
+                continue
             id_ts = _parse_ts(identity.get("timestamp"))
             if id_ts is None:
                 continue
@@ -174,7 +192,9 @@ class IdentityManager(BaseService):
                 age = now - pending.received_at
                 source = pending.data.get("source", "live")
                 identity = self._find_identity(
-                    pending.data.get("timestamp"), source=source
+                    pending.data.get("timestamp"),
+                    source=source,
+                    room=pending.data.get("room", ""),
                 )
 
                 if identity is not None or age >= PUBLISH_TIMEOUT_S:
@@ -196,8 +216,10 @@ class IdentityManager(BaseService):
 
     async def _publish(self, js: Any, data: dict[str, Any], speaker: str | None) -> None:
         source = data.get("source", "live")
-        subject = f"transcript.final.{source}"
+        subject = f"transcript.final.{room_scoped(source, data.get('room', ''))}"
         payload = {**data, "speaker": speaker}
+        if isinstance(trace := data.get(TRACE_FIELD), dict):
+            payload[TRACE_FIELD] = {**trace, "fuse": time.time()}
         await js.publish(subject, json.dumps(payload).encode())
 
 
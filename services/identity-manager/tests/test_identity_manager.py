@@ -102,6 +102,19 @@ def test_find_identity_ignores_cross_source_pool() -> None:
     assert result is None
 
 
+def test_find_identity_matches_only_the_transcripts_room() -> None:
+    service = _make_service()
+    service._live_identities = deque(
+        [
+            {**_identity("Alice", ts_offset=0.0), "room": "hall"},
+            {**_identity("Bob", ts_offset=-1.0), "room": "chapel"},
+        ]
+    )
+    chapel = service._find_identity(_ts(0.0), room="chapel")
+    assert chapel is not None and chapel["speaker"] == "Bob"
+    assert service._find_identity(_ts(0.0)) is None  # unscoped transcript
+
+
 # --- Integration-style tests for the fusion loop ---
 
 
@@ -180,6 +193,70 @@ async def test_backfill_publishes_to_correct_subject() -> None:
     assert subject == "transcript.final.backfill"
 
 
+@pytest.mark.asyncio
+async def test_room_scoped_transcript_fused_with_same_room_identity() -> None:
+    """Room comes from the subjects; the final transcript keeps its room."""
+    service = _make_service()
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+
+    def _msg(subject: str, data: dict[str, Any]) -> MagicMock:
+        msg = MagicMock()
+        msg.subject = subject
+        msg.data = json.dumps(data).encode()
+        msg.ack = AsyncMock()
+        return msg
+
+    identities = [
+        _msg("transcript.identity.live.hall", _identity("Alice")),
+        _msg("transcript.identity.live.chapel", _identity("Bob")),
+    ]
+    transcripts = [_msg("transcript.raw.live.chapel", _transcript())]
+
+    async def fetch(msgs: list[MagicMock], n: int, timeout: float) -> list[MagicMock]:
+        if msgs:
+            return [msgs.pop(0)]
+        await asyncio.sleep(timeout)
+        raise TimeoutError
+
+    identity_sub, transcript_sub = MagicMock(), MagicMock()
+    identity_sub.fetch = lambda n, timeout: fetch(identities, n, timeout)
+    transcript_sub.fetch = lambda n, timeout: fetch(transcripts, n, timeout)
+
+    async def subscribe(subject: str, durable: str) -> MagicMock:
+        return (
+            identity_sub if subject.startswith("transcript.identity") else transcript_sub
+        )
+
+    mock_js.pull_subscribe.side_effect = subscribe
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(service._identity_subscriber(mock_js, stop_event))
+        await asyncio.sleep(0.05)
+        tg.create_task(service._transcript_subscriber(mock_js, stop_event))
+        tg.create_task(service._fusion_loop(mock_js, stop_event))
+        await asyncio.sleep(0.3)
+        stop_event.set()
+
+    subject, raw = mock_js.publish.call_args[0]
+    payload = json.loads(raw.decode())
+    assert subject == "transcript.final.live.chapel"
+    assert (payload["speaker"], payload["room"]) == ("Bob", "chapel")
+
+
+@pytest.mark.asyncio
+async def test_publish_stamps_fuse_on_latency_trace() -> None:
+    service = _make_service()
+    mock_js = AsyncMock()
+    t = {**_transcript(), "trace": {"capture": 1.0, "stt_result": 1.2}}
+    await service._publish(mock_js, t, speaker="Alice")
+
+    payload = json.loads(mock_js.publish.call_args[0][1].decode())
+    assert payload["trace"]["capture"] == 1.0
+    assert payload["trace"]["fuse"] >= payload["trace"]["stt_result"]
+    assert "fuse" not in t["trace"]  # the buffered transcript is not mutated
+
+
 @pytest.mark.asyncio
 async def test_buffer_capped_at_max_buffer() -> None:
     """Buffers don't grow beyond MAX_BUFFER."""
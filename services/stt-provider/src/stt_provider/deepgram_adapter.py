@@ -4,15 +4,20 @@ import os
 from collections.abc import AsyncIterator
 from typing import Any
 
-from deepgram import AsyncDeepgramClient
+from deepgram import AsyncDeepgramClient, DeepgramClientEnvironment
 from deepgram.core.events import EventType
 from deepgram.extensions.types.sockets import ListenV1ControlMessage, ListenV1MediaMessage
 
+from .events import EventQueue, EventQueueStats
 from .interfaces import Transcriber, TranscriptionEvent
 
 logger = logging.getLogger(__name__)
 
 
+def _seconds(value: Any) -> float | None:
+    return float(value) if isinstance(value, int | float) else None
+
+
 class DeepgramTranscriber(Transcriber):
     """
     Implementation of Transcriber using Deepgram SDK
@@ -24,11 +29,21 @@ class DeepgramTranscriber(Transcriber):
         if not self.api_key:
             raise ValueError("DEEPGRAM_API_KEY is required")
 
-        self.client = AsyncDeepgramClient(api_key=self.api_key)
+        # Alternative Listen endpoint, e.g. scripts/mock_deepgram.py for benchmarks
+        url = os.getenv("DEEPGRAM_URL")
+        environment = DeepgramClientEnvironment.PRODUCTION
+        if url:
+            environment = DeepgramClientEnvironment(
+                base=url.replace("ws", "http", 1), production=url, agent=url
+            )
+        self.client = AsyncDeepgramClient(api_key=self.api_key, environment=environment)
         self.connection: Any = None
         self._connection_cm: Any = None
         self._listening_task: asyncio.Task[Any] | None = None
-        self._event_queue: asyncio.Queue[TranscriptionEvent | None] = asyncio.Queue()
+        # Bounded; coalesces interims when publishing falls behind
+        self._event_queue = EventQueue()
+        # Set once the socket closes or errors; a pool skips closed standbys
+        self.closed = False
 
     async def connect(self, **kwargs: Any) -> None:
         """Establishes WebSocket connection to Deepgram."""
@@ -77,16 +92,20 @@ class DeepgramTranscriber(Transcriber):
             text=transcript,
             is_final=getattr(result, "is_final", False),
             confidence=alternatives[0].confidence,
+            start=_seconds(getattr(result, "start", None)),
+            duration=_seconds(getattr(result, "duration", None)),
         )
         await self._event_queue.put(event)
 
     async def _on_close(self, *args: Any, **kwargs: Any) -> None:
         logger.info("Deepgram Connection Closed")
-        await self._event_queue.put(None)
+        self.closed = True
+        await self._event_queue.close()
 
     async def _on_error(self, error: Any, **kwargs: Any) -> None:
         logger.error(f"Deepgram Error: {error}")
-        await self._event_queue.put(None)
+        self.closed = True
+        await self._event_queue.close()
 
     async def send_audio(self, audio: bytes) -> None:
         if self.connection:
@@ -96,11 +115,20 @@ class DeepgramTranscriber(Transcriber):
         if self.connection:
             await self.connection.send_control(ListenV1ControlMessage(type="Finalize"))
 
+    async def keep_alive(self) -> None:
+        if self.connection:
+            await self.connection.send_control(ListenV1ControlMessage(type="KeepAlive"))
+
     async def finish(self) -> None:
         if self.connection:
             await self.connection.send_control(ListenV1ControlMessage(type="Finalize"))
             await self._connection_cm.__aexit__(None, None, None)
             self.connection = None
+        await self._event_queue.close()
+
+    @property
+    def event_stats(self) -> EventQueueStats:
+        return self._event_queue.stats
 
     async def get_events(self) -> AsyncIterator[TranscriptionEvent]:
         while True:
@@ -0,0 +1,99 @@
+"""Bounded queue between a Deepgram connection and the transcript publisher.
+
+Deepgram revises an utterance with interim results until its final result
+arrives, and each revision replaces the previous one on screen. So when
+publishing falls behind (``js.publish`` slowed by the broker), queued
+interims are coalesced instead of piling up:
+
+- at most one interim is queued, always the newest; a new interim replaces
+  it, and a final replaces it too (the final supersedes the interims of
+  its utterance)
+- finals are never dropped. Past ``max_finals`` queued finals, ``put``
+  waits, which stalls the socket reader and pushes back on Deepgram
+  instead of growing memory
+
+Memory is bounded by ``max_finals`` + 1 events however slow the consumer.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from .interfaces import TranscriptionEvent
+
+# Queued finals before put() waits for the consumer
+_MAX_FINALS = 256
+
+
+@dataclass
+class EventQueueStats:
+    coalesced: int = 0  # interims replaced before they were consumed
+    waits: int = 0  # puts that waited for space (backpressure)
+    depth_max: int = 0  # most events queued at once
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "coalesced": self.coalesced,
+            "waits": self.waits,
+            "depth_max": self.depth_max,
+        }
+
+
+class EventQueue:
+    """FIFO of transcription events that keeps only the newest interim."""
+
+    def __init__(self, max_finals: int = _MAX_FINALS) -> None:
+        self._events: deque[TranscriptionEvent] = deque()
+        self._max_finals = max_finals
+        self._finals = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+        self.stats = EventQueueStats()
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def _drop_queued_interim(self) -> None:
+        # The one queued interim, if any, is always last
+        if self._events and not self._events[-1].is_final:
+            self._events.pop()
+            self.stats.coalesced += 1
+
+    async def put(self, event: TranscriptionEvent) -> None:
+        async with self._changed:
+            self._drop_queued_interim()
+            newer: TranscriptionEvent | None = None
+            if event.is_final:
+                if self._finals >= self._max_finals and not self._closed:
+                    self.stats.waits += 1
+                    await self._changed.wait_for(
+                        lambda: self._finals < self._max_finals or self._closed
+                    )
+                    # An interim queued while waiting is newer: keep it after
+                    if self._events and not self._events[-1].is_final:
+                        newer = self._events.pop()
+                self._finals += 1
+            self._events.append(event)
+            if newer is not None:
+                self._events.append(newer)
+            self.stats.depth_max = max(self.stats.depth_max, len(self._events))
+            self._changed.notify_all()
+
+    async def get(self) -> TranscriptionEvent | None:
+        """Next event; None once closed and empty."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: bool(self._events) or self._closed)
+            if not self._events:
+                return None
+            event = self._events.popleft()
+            if event.is_final:
+                self._finals -= 1
+            self._changed.notify_all()
+            return event
+
+    async def close(self) -> None:
+        """End the stream after the queued events; releases waiting puts."""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
@@ -0,0 +1,135 @@
+"""Hold back silence from Deepgram without closing the stream.
+
+Deepgram bills every second of audio streamed to it, speech or not, and
+closes a stream that sees no data for ~10 s. ``SilenceGate`` runs the shared
+``SilenceDetector`` over each capture period of a message's PCM, so its
+window and hangover mean the same time whether or not messages are packed:
+
+- once the detector confirms silence, audio keeps flowing for
+  ``hangover_s`` so trailing words and endpointing still see the pause
+- after that, messages are held back; only the last ``preroll_s`` of them is
+  kept and sent ahead of the message where speech resumes, so word onsets
+  are not clipped
+- while holding, ``keepalive_due`` asks the caller for a KeepAlive every
+  ``keepalive_s``, which keeps the connection open without billed audio
+
+Held-back audio is not sent at all, so Deepgram's result offsets count only
+the audio it received (as does the session's ``AudioTimeline``).
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from messaging.levels import SilenceDetector
+
+# Audio still sent after silence is confirmed (~0.75 s window + this)
+_HANGOVER_S = 1.0
+# Held audio sent ahead of resumed speech
+_PREROLL_S = 0.3
+# KeepAlive interval while holding (Deepgram closes after ~10 s)
+_KEEPALIVE_S = 5.0
+
+
+@dataclass
+class GateStats:
+    sent_s: float = 0.0
+    saved_s: float = 0.0  # held back and never sent: billed seconds saved
+    keepalives: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "sent_s": round(self.sent_s, 2),
+            "saved_s": round(self.saved_s, 2),
+            "keepalives": self.keepalives,
+        }
+
+
+class SilenceGate:
+    """Per-connection silence gate; ``admit`` says what to send for a message."""
+
+    def __init__(
+        self,
+        threshold_dbfs: float = -50.0,
+        hysteresis_db: float = 6.0,
+        window_chunks: int = 8,
+        hangover_s: float = _HANGOVER_S,
+        preroll_s: float = _PREROLL_S,
+        keepalive_s: float = _KEEPALIVE_S,
+    ) -> None:
+        self._detector = SilenceDetector(
+            threshold_dbfs=threshold_dbfs,
+            hysteresis_db=hysteresis_db,
+            window_chunks=window_chunks,
+        )
+        self._hangover_s = hangover_s
+        self._preroll_s = preroll_s
+        self._keepalive_s = keepalive_s
+        self._quiet_s = 0.0  # audio since silence was confirmed
+        self._held: deque[tuple[bytes, float]] = deque()
+        self._held_s = 0.0
+        self._last_activity = time.monotonic()  # last send or KeepAlive
+        self.stats = GateStats()
+
+    @property
+    def holding(self) -> bool:
+        return self._quiet_s > self._hangover_s
+
+    def admit(
+        self, pcm: bytes | memoryview, data: bytes, duration_s: float, periods: int = 1
+    ) -> list[tuple[bytes, float]]:
+        """Audio to send for one message, as (data, seconds) pairs.
+
+        ``pcm`` is the message's audio as int16 PCM for the level check, made
+        of ``periods`` equal capture periods; ``data`` is what would be sent
+        (it may be encoded). Returns ``[]`` while holding silence, and the
+        held pre-roll followed by this message once speech resumes.
+        """
+        periods = max(periods, 1)
+        period_len = len(pcm) // periods
+        period_s = duration_s / periods
+        speech = False
+        for i in range(periods):
+            if self._detector.update(pcm[i * period_len : (i + 1) * period_len]):
+                self._quiet_s += period_s
+            else:
+                self._quiet_s = 0.0
+                speech = True
+        if speech:
+            out = [*self._held, (data, duration_s)]
+            self._held.clear()
+            self._held_s = 0.0
+            return self._sent(out)
+        if not self.holding:
+            return self._sent([(data, duration_s)])
+        self._held.append((data, duration_s))
+        self._held_s += duration_s
+        while self._held and self._held_s - self._held[0][1] >= self._preroll_s:
+            _, dropped_s = self._held.popleft()
+            self._held_s -= dropped_s
+            self.stats.saved_s += dropped_s
+        return []
+
+    def _sent(self, chunks: list[tuple[bytes, float]]) -> list[tuple[bytes, float]]:
+        self.stats.sent_s += sum(seconds for _, seconds in chunks)
+        self._last_activity = time.monotonic()
+        return chunks
+
+    def keepalive_due(self) -> bool:
+        """True (and the clock reset) when a held stream needs a KeepAlive."""
+        if not self.holding:
+            return False
+        now = time.monotonic()
+        if now - self._last_activity < self._keepalive_s:
+            return False
+        self._last_activity = now
+        self.stats.keepalives += 1
+        return True
+
+    def close(self) -> GateStats:
+        """Final stats; audio still held is never sent."""
+        self.stats.saved_s += self._held_s
+        self._held.clear()
+        self._held_s = 0.0
+        return self.stats
@@ -10,6 +10,9 @@ class TranscriptionEvent:
     text: str
     is_final: bool
     confidence: float
+    # Position of the result in the audio sent so far (seconds), if known
+    start: float | None = None
+    duration: float | None = None
 
 
 @runtime_checkable
@@ -28,6 +31,10 @@ class Transcriber(Protocol):
         """Flush buffered audio — forces a final transcript without closing."""
         ...
 
+    async def keep_alive(self) -> None:
+        """Keeps an idle connection open without sending audio."""
+        ...
+
     async def finish(self) -> None:
         """Signals end of stream and closes the connection."""
         ...
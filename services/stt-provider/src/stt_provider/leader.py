@@ -0,0 +1,162 @@
+"""Leader election for stt-provider replicas over a JetStream KV lease.
+
+Replicas share one key in the ``stt_leader`` bucket (one key per room). The
+leader writes the key every ``lease_s / 3`` with a compare-and-set on its
+last revision; standbys poll it every ``poll_s``.
+
+- A standby takes the key over (again by compare-and-set, so only one
+  standby wins) once its revision has not changed for ``lease_s``, or at
+  once when the key is missing or deleted.
+- A leader that shuts down deletes the key, so a restart hands over
+  within one poll instead of one lease.
+- A leader that sees another revision, or cannot renew for ``lease_s / 2``
+  (e.g. cut off from NATS), steps down. That is well before a standby
+  can take the key over.
+
+Staleness is measured on each standby's own monotonic clock, never by
+comparing wall-clock stamps across hosts.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import socket
+import time
+import uuid
+from typing import Any
+
+from nats.js.errors import KeyNotFoundError, KeyWrongLastSequenceError
+
+LEASE_BUCKET = "stt_leader"
+# Seconds without a renewal before a standby takes over
+_LEASE_S = 3.0
+# Standby check interval
+_POLL_S = 0.25
+
+
+def instance_id() -> str:
+    """Holder name of this process: hostname plus a random suffix."""
+    return f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaderLease:
+    """One replica's view of the shared lease key."""
+
+    def __init__(
+        self,
+        kv: Any,
+        key: str,
+        holder: str,
+        logger: logging.Logger,
+        lease_s: float = _LEASE_S,
+        poll_s: float = _POLL_S,
+    ) -> None:
+        self._kv = kv
+        self.key = key
+        self.holder = holder
+        self._logger = logger
+        self.lease_s = lease_s
+        self._poll_s = poll_s
+        self._revision: int | None = None  # ours, while leading
+        # Last revision seen and when (monotonic) it was first seen
+        self._seen: tuple[int | None, float] | None = None
+        self.previous_holder: str | None = None
+        # When the previous leader was last seen alive (monotonic)
+        self.vacant_since: float | None = None
+
+    def _value(self) -> bytes:
+        return json.dumps({"holder": self.holder, "renewed": time.time()}).encode()
+
+    async def try_acquire(self) -> bool:
+        """Take the lease if it is free, expired or already ours."""
+        now = time.monotonic()
+        try:
+            entry = await self._kv.get(self.key)
+        except KeyNotFoundError:  # never taken, or released
+            if self._seen is None or self._seen[0] is not None:
+                self._seen = (None, now)
+            return await self._take(None)
+        holder = json.loads(entry.value or b"{}").get("holder")
+        if holder == self.holder:
+            return await self._take(entry.revision)
+        if self._seen is None or self._seen[0] != entry.revision:
+            self._seen = (entry.revision, now)
+            self.previous_holder = holder
+        if now - self._seen[1] < self.lease_s:
+            return False
+        return await self._take(entry.revision)
+
+    async def _take(self, revision: int | None) -> bool:
+        try:
+            if revision is None:
+                self._revision = await self._kv.create(self.key, self._value())
+            else:
+                self._revision = await self._kv.update(
+                    self.key, self._value(), last=revision
+                )
+        except KeyWrongLastSequenceError:
+            return False  # another replica got there first
+        self.vacant_since = self._seen[1] if self._seen is not None else time.monotonic()
+        self._seen = None
+        return True
+
+    async def wait_for_leadership(self, stop_event: asyncio.Event) -> bool:
+        """Poll until the lease is ours (True) or stop_event fires (False)."""
+        while not stop_event.is_set():
+            try:
+                if await self.try_acquire():
+                    return True
+            except Exception as e:
+                self._logger.warning(f"Leader lease check failed: {e}")
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=self._poll_s)
+        return False
+
+    async def renew(self) -> bool:
+        """Extend our lease; False if another replica holds it now.
+
+        Raises on NATS errors; ``hold`` retries them until the lease would be
+        in doubt.
+        """
+        try:
+            self._revision = await self._kv.update(
+                self.key, self._value(), last=self._revision
+            )
+        except KeyWrongLastSequenceError:
+            return False
+        return True
+
+    async def hold(self, done: asyncio.Event) -> bool:
+        """Renew until ``done`` is set (True, lease released) or it is lost."""
+        renewed = time.monotonic()
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(done.wait(), timeout=self.lease_s / 3)
+            if done.is_set():
+                await self.release()
+                return True
+            try:
+                renewed_now = await asyncio.wait_for(
+                    self.renew(), timeout=self.lease_s / 3
+                )
+                if not renewed_now:
+                    self._logger.warning("Leader lease taken over by another replica")
+                    self._revision = None
+                    return False
+                renewed = time.monotonic()
+            except Exception as e:
+                if time.monotonic() - renewed >= self.lease_s / 2:
+                    self._logger.warning(f"Leader lease not renewed in time: {e}")
+                    self._revision = None
+                    return False
+
+    async def release(self) -> None:
+        """Give the lease up so a standby takes over without waiting it out."""
+        if self._revision is None:
+            return
+        try:
+            await self._kv.delete(self.key, last=self._revision)
+        except Exception as e:
+            self._logger.debug(f"Leader lease release failed: {e}")
+        self._revision = None
@@ -4,22 +4,36 @@ import dataclasses
 import json
 import logging
 import os
+import time
+import zlib
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from dotenv import load_dotenv
+from messaging.audio import AudioFrame
+from messaging.codec import PcmCodec, codec_for_deepgram
+from messaging.latency import TRACE_FIELD, trace_from_headers
 from messaging.service import BaseService
 from messaging.streams import (
-    SUBJECT_AUDIO_BACKFILL,
-    SUBJECT_AUDIO_LIVE,
+    SUBJECT_PREFIX_AUDIO_BACKFILL,
+    SUBJECT_PREFIX_AUDIO_LIVE,
     SUBJECT_PREFIX_TRANSCRIPT_INTERIM,
     SUBJECT_PREFIX_TRANSCRIPT_RAW,
     TRANSCRIPTION_STREAM_CONFIG,
+    room_scoped,
 )
+from nats.js.api import KeyValueConfig
 
 from .deepgram_adapter import DeepgramTranscriber
-from .interfaces import Transcriber
+from .events import EventQueueStats
+from .gate import GateStats, SilenceGate
+from .interfaces import Transcriber, TranscriptionEvent
+from .leader import LEASE_BUCKET, LeaderLease, instance_id
+from .pool import FailoverTranscriber, TranscriberPool
+from .prefetch import DrainStats, Prefetcher, nak_all
+from .scheduler import SessionFeed, SessionScheduler, session_key
+from .timeline import AudioTimeline
 
 TranscriberFactory = type[Transcriber]
 
@@ -28,6 +42,33 @@ _RECONNECT_MAX_DELAY_S: float = 60.0
 _DRAIN_TIMEOUT_S: float = 5.0
 _DURABLE_LIVE = "stt_live"
 _DURABLE_BACKFILL = "stt_backfill"
+# Audio per message before any packed frame has been seen (one 96 ms period)
+_DEFAULT_MSG_DURATION_S: float = 0.096
+# Transcribe backfill and live on separate, concurrent Deepgram connections
+# (two connections per session) instead of backfill-then-live on one
+_PARALLEL_LANES: bool = os.getenv("STT_PARALLEL_LANES", "false").lower() == "true"
+# Hold back confirmed silence from Deepgram (sending KeepAlive instead)
+_SILENCE_GATE: bool = os.getenv("STT_SILENCE_GATE", "false").lower() == "true"
+# Silence still sent after the gate confirms it, for endpointing
+_SILENCE_HANGOVER_S: float = float(os.getenv("STT_SILENCE_HANGOVER_S", "1.0"))
+# Sessions transcribed at once, each on its own connection(s); above 1 a
+# scheduler fans the shared durables out to per-session workers
+_MAX_SESSIONS: int = int(os.getenv("STT_MAX_SESSIONS", "1"))
+# Seconds a scheduled session waits for backfill audio before starting on live
+_BACKFILL_WAIT_S = 5.0
+# Deepgram connections kept open ahead of need, with failover and replay of
+# unconfirmed audio when a session's connection drops (0 = connect on demand)
+_POOL_SIZE: int = int(os.getenv("STT_POOL_SIZE", "0"))
+# KeepAlive interval for idle standbys (Deepgram closes after ~10 s of silence)
+_POOL_KEEPALIVE_S: float = float(os.getenv("STT_POOL_KEEPALIVE_S", "5"))
+# Recycle standbys idle longer than this (0 = keep until they drop)
+_POOL_MAX_IDLE_S: float = float(os.getenv("STT_POOL_MAX_IDLE_S", "600"))
+
+# Run as one of several replicas: only the holder of a KV lease transcribes,
+# the others keep a warm Deepgram connection and take over when it lapses
+_REPLICA: bool = os.getenv("STT_REPLICA", "false").lower() == "true"
+# Seconds without a lease renewal before a standby replica takes over
+_LEASE_S: float = float(os.getenv("STT_LEASE_S", "3.0"))
 
 # --- Config ---
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +89,29 @@ class STTProviderService(BaseService):
         self._transcriber_factory: TranscriberFactory = (
             transcriber_factory or DeepgramTranscriber
         )
+        # Deepgram input encoding; audio is transcoded to it only when needed
+        self._dg_encoding: str = os.getenv("DEEPGRAM_ENCODING", "linear16")
+        # Audio carried by the most recent message; sizes the lag estimate
+        self._msg_duration_s: float = _DEFAULT_MSG_DURATION_S
+        # Room this instance transcribes ("" = every room / single-room setup).
+        # Run one instance per room to spread rooms across processes.
+        self._room: str = os.getenv("STT_ROOM", "")
+        # Latency traces of the audio sent on each open Deepgram connection
+        self._timelines: dict[Transcriber, AudioTimeline] = {}
+        # Silence gates of the open connections (STT_SILENCE_GATE)
+        self._gates: dict[Transcriber, SilenceGate] = {}
+        self._billed_s_saved: float = 0.0
+        # Hot-standby connections (STT_POOL_SIZE); None connects per session
+        self._pool: TranscriberPool | None = None
+        if _POOL_SIZE > 0 or _REPLICA:
+            # Standby replicas keep at least one connection warm
+            self._pool = TranscriberPool(
+                self._transcriber_factory,
+                max(_POOL_SIZE, 1),
+                self.logger,
+                keepalive_s=_POOL_KEEPALIVE_S,
+                max_idle_s=_POOL_MAX_IDLE_S,
+            )
 
     async def run_business_logic(self, js: Any, stop_event: asyncio.Event) -> None:
         try:
@@ -57,7 +121,85 @@ class STTProviderService(BaseService):
             self.logger.critical(f"Stream verification failed: {e}")
             return
 
-        await self._run_session_loop(js, stop_event)
+        run = self._run_replica if _REPLICA else self._run_session_loop
+        if self._pool is None:
+            await run(js, stop_event)
+            return
+        dg_model = os.getenv("DEEPGRAM_MODEL", "nova-3")
+        self._pool.start(model=dg_model, encoding=self._dg_encoding)
+        try:
+            await run(js, stop_event)
+        finally:
+            await self._pool.close()
+
+    async def _run_replica(self, js: Any, stop_event: asyncio.Event) -> None:
+        """Transcribe while holding the leader lease; stand by otherwise."""
+        try:
+            kv = await js.create_key_value(
+                config=KeyValueConfig(bucket=LEASE_BUCKET, history=1)
+            )
+        except Exception as e:
+            self.logger.critical(f"Leader lease bucket unavailable: {e}")
+            return
+        lease = LeaderLease(
+            kv, room_scoped("leader", self._room), instance_id(), self.logger, _LEASE_S
+        )
+        self.logger.info(f"Replica {lease.holder} standing by for the leader lease")
+        while await lease.wait_for_leadership(stop_event):
+            if not await self._lead(js, lease, stop_event):
+                # Subscribe failed and the lease was given up; let another
+                # replica try before competing for it again
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        stop_event.wait(), timeout=_RECONNECT_INITIAL_DELAY_S
+                    )
+
+    async def _lead(self, js: Any, lease: LeaderLease, stop_event: asyncio.Event) -> bool:
+        """Serve the durables for one leadership term.
+
+        The term ends on shutdown or when the lease is lost. Returns False
+        if the durables could not be subscribed.
+        """
+        term = asyncio.Event()
+        stopping = asyncio.create_task(stop_event.wait())
+        stopping.add_done_callback(lambda _: term.set())
+        holding = asyncio.create_task(lease.hold(term))
+        holding.add_done_callback(lambda _: term.set())
+        subs = await self._subscribe(js)
+        if subs is not None:
+            await self._report_takeover(lease)
+            await self._serve_sessions(js, *subs, term)
+            for sub in subs:
+                with contextlib.suppress(Exception):
+                    await sub.unsubscribe()
+        term.set()
+        stopping.cancel()
+        if not await holding:
+            self.logger.warning(f"Replica {lease.holder} stepped down")
+        return subs is not None
+
+    async def _report_takeover(self, lease: LeaderLease) -> None:
+        """Log and publish how long the durables went without a leader."""
+        assert lease.vacant_since is not None  # set when the lease is taken
+        failover_s = time.monotonic() - lease.vacant_since
+        previous = lease.previous_holder
+        self.logger.info(
+            f"Replica {lease.holder} is leader"
+            + (f", took over from {previous} in {failover_s:.2f}s" if previous else "")
+        )
+        if self.nc is None or previous is None:
+            return
+        report: dict[str, Any] = {
+            "replica": lease.holder,
+            "previous": previous,
+            "failover_s": round(failover_s, 3),
+        }
+        if self._room:
+            report["room"] = self._room
+        try:
+            await self.nc.publish("system.stt_stats", json.dumps(report).encode())
+        except Exception as e:
+            self.logger.debug(f"Takeover report publish failed: {e}")
 
     async def _connect_with_retry(
         self,
@@ -72,12 +214,16 @@ class STTProviderService(BaseService):
         unreachable and are replayed from the last ACKed position on reconnect.
         """
         dg_model = os.getenv("DEEPGRAM_MODEL", "nova-3")
-        dg_encoding = os.getenv("DEEPGRAM_ENCODING", "linear16")
+        dg_encoding = self._dg_encoding
         delay = _RECONNECT_INITIAL_DELAY_S
 
         while not stop_event.is_set():
             try:
-                transcriber = self._transcriber_factory()
+                transcriber: Transcriber = (
+                    FailoverTranscriber(self._pool, self.logger)
+                    if self._pool is not None
+                    else self._transcriber_factory()
+                )
                 await transcriber.connect(model=dg_model, encoding=dg_encoding)
                 self.logger.info(f"[{source_tag}] Connected to Deepgram")
                 return transcriber
@@ -100,17 +246,14 @@ class STTProviderService(BaseService):
         if self.nc is None:
             return
         try:
-            payload = json.dumps({"state": state, "lane": source_tag}).encode()
+            status = {"state": state, "lane": source_tag}
+            if self._room:
+                status["room"] = self._room
+            payload = json.dumps(status).encode()
             await self.nc.publish("system.stt_status", payload)
         except Exception as e:
             self.logger.warning(f"[{source_tag}] stt_status publish failed: {e}")
 
-    @staticmethod
-    def _session_id_from_subject(subject: str) -> str | None:
-        """Extract session ID from 'audio.{backfill|live}.<sid>'."""
-        parts = subject.rsplit(".", 1)
-        return parts[-1] if len(parts) >= 2 else None
-
     async def _send_msgs(
         self,
         msgs: list[Any],
@@ -119,36 +262,133 @@ class STTProviderService(BaseService):
         dg_closed: asyncio.Event,
         close_on_eos: bool = True,
         session_id: str | None = None,
+        stats: DrainStats | None = None,
+        room: str | None = None,
     ) -> bool:
         """Send fetched messages to Deepgram; return True if EOS was received.
 
         When close_on_eos is False the Deepgram connection is kept open after
         the EOS marker — the caller switches the audio phase instead.
-        Messages from a different session are ACKed and skipped.
+        Messages from a different session (or, given ``room``, the same
+        session id in another room) are ACKed and skipped. ACKs are
+        batched: everything handled in this call is acknowledged together
+        once sending stops, and messages left after an EOS or a failed send
+        are NAKed for immediate redelivery.
         """
-        for msg in msgs:
-            # Skip stale messages from a previous session
-            if session_id and hasattr(msg, "subject"):
-                msg_sid = self._session_id_from_subject(msg.subject)
-                if msg_sid and msg_sid != session_id:
-                    await msg.ack()
+        done: list[Any] = []
+        try:
+            for i, msg in enumerate(msgs):
+                # Skip stale messages from a previous session
+                if self._is_stale(msg, session_id, room):
+                    done.append(msg)
                     continue
-
-            if msg.headers and msg.headers.get("LiveSTT-EOS") == "true":
-                self.logger.info(f"[{source_tag}] EOS received")
-                await msg.ack()
-                if close_on_eos:
+                if msg.headers and msg.headers.get("LiveSTT-EOS") == "true":
+                    self.logger.info(f"[{source_tag}] EOS received")
+                    done.append(msg)
+                    await nak_all(msgs[i + 1 :])
+                    if close_on_eos:
+                        dg_closed.set()
+                    return True
+                if not await self._send_frame(msg, transcriber, source_tag, stats):
+                    await nak_all(msgs[i:])
                     dg_closed.set()
-                return True
-            try:
-                await transcriber.send_audio(msg.data)
-                await msg.ack()
-            except Exception as e:
-                self.logger.warning(f"[{source_tag}] send_audio failed: {e}")
-                await self._publish_stt_status("reconnecting", source_tag)
-                dg_closed.set()
-                return False
-        return False
+                    return False
+                done.append(msg)
+            return False
+        finally:
+            await self._ack_all(done, source_tag)
+            if stats is not None:
+                stats.batches += 1
+
+    def _is_stale(self, msg: Any, session_id: str | None, room: str | None) -> bool:
+        if not session_id or not hasattr(msg, "subject"):
+            return False
+        msg_sid, msg_room = session_key(msg.subject)
+        if not msg_sid:
+            return False
+        return msg_sid != session_id or (room is not None and msg_room != room)
+
+    async def _send_frame(
+        self,
+        msg: Any,
+        transcriber: Transcriber,
+        source_tag: str,
+        stats: DrainStats | None,
+    ) -> bool:
+        """Send one message's audio; False (and status published) on failure.
+
+        A message whose payload cannot be decoded is logged and skipped (it
+        is still ACKed, since redelivery would fail the same way).
+        """
+        try:
+            # Packed frames are contiguous audio — forward them whole
+            frame = self._deepgram_frame(AudioFrame.from_msg(msg, decode=False))
+            chunks = self._gate_chunks(frame, transcriber)
+        except (ValueError, zlib.error) as e:
+            self.logger.warning(f"[{source_tag}] Skipping undecodable audio: {e}")
+            return True
+        if frame.samples:
+            self._msg_duration_s = frame.duration_s
+        trace = trace_from_headers(msg.headers)
+        try:
+            for data, _ in chunks:
+                await transcriber.send_audio(data)
+            gate = self._gates.get(transcriber)
+            if not chunks and gate is not None and gate.keepalive_due():
+                await transcriber.keep_alive()
+        except Exception as e:
+            self.logger.warning(f"[{source_tag}] send_audio failed: {e}")
+            await self._publish_stt_status("reconnecting", source_tag)
+            return False
+        if trace and chunks:
+            trace["stt_send"] = time.time()
+        timeline = self._timelines.setdefault(transcriber, AudioTimeline())
+        for i, (_, seconds) in enumerate(chunks):
+            # Held pre-roll goes first; the trace belongs to this message
+            timeline.record(seconds, trace if i == len(chunks) - 1 else None)
+        if stats is not None:
+            stats.audio_s += frame.duration_s
+            stats.messages += 1
+        return True
+
+    def _gate_chunks(
+        self, frame: AudioFrame, transcriber: Transcriber
+    ) -> list[tuple[bytes, float]]:
+        """Audio to send for one frame, after the silence gate (if enabled)."""
+        if not _SILENCE_GATE:
+            return [(frame.data, frame.duration_s)]
+        gate = self._gates.get(transcriber)
+        if gate is None:
+            gate = self._gates[transcriber] = SilenceGate(hangover_s=_SILENCE_HANGOVER_S)
+        pcm = frame.data if frame.codec == PcmCodec.name else frame.decoded().data
+        return gate.admit(pcm, frame.data, frame.duration_s, frame.periods)
+
+    async def _ack_all(self, msgs: list[Any], source_tag: str) -> None:
+        """ACK a batch of handled messages concurrently."""
+        if not msgs:
+            return
+        results = await asyncio.gather(
+            *(msg.ack() for msg in msgs), return_exceptions=True
+        )
+        failed = sum(isinstance(r, Exception) for r in results)
+        if failed:
+            self.logger.warning(
+                f"[{source_tag}] {failed}/{len(msgs)} ACKs failed; "
+                "those messages will be redelivered"
+            )
+
+    def _deepgram_frame(self, frame: AudioFrame) -> AudioFrame:
+        """Convert a frame to DEEPGRAM_ENCODING.
+
+        Audio already in that encoding (e.g. a mulaw stream with
+        DEEPGRAM_ENCODING=mulaw) is forwarded without decoding.
+        """
+        target = codec_for_deepgram(self._dg_encoding)
+        if target is None:
+            return frame.decoded()
+        if frame.codec == target.name:
+            return frame
+        return frame.encoded(target.name)
 
     async def _wait_for_audio(
         self,
@@ -181,45 +421,72 @@ class STTProviderService(BaseService):
         first_msgs: list[Any],
         close_on_eos: bool,
         session_id: str | None = None,
+        room: str | None = None,
     ) -> bool:
         """Drain one NATS subject into the open Deepgram connection.
 
-        Returns True when EOS is received, False when the connection drops or
-        stop_event fires.
+        The next batch is fetched while the current one is being sent (see
+        ``Prefetcher``). Returns True when EOS is received, False when the
+        connection drops or stop_event fires.
         """
-        eos = await self._send_msgs(
-            first_msgs,
-            transcriber,
-            source_tag,
-            dg_closed,
-            close_on_eos,
-            session_id,
-        )
-        if eos or dg_closed.is_set():
-            return eos
-
-        while not stop_event.is_set() and not dg_closed.is_set():
-            try:
-                msgs = list(await sub.fetch(1, timeout=1))
-            except TimeoutError:
-                continue
-            except Exception as e:
-                self.logger.error(f"[{source_tag}] fetch error: {e}")
-                await asyncio.sleep(1)
-                continue
-
+        stats = DrainStats()
+        prefetcher: Prefetcher | None = None
+        try:
             eos = await self._send_msgs(
-                msgs,
+                first_msgs,
                 transcriber,
                 source_tag,
                 dg_closed,
                 close_on_eos,
                 session_id,
+                stats,
+                room,
             )
             if eos or dg_closed.is_set():
                 return eos
 
-        return False
+            prefetcher = Prefetcher(sub, source_tag, self.logger, stop_event)
+            prefetcher.start()
+            while not stop_event.is_set() and not dg_closed.is_set():
+                msgs = await prefetcher.get()
+                if not msgs:
+                    continue
+                eos = await self._send_msgs(
+                    msgs,
+                    transcriber,
+                    source_tag,
+                    dg_closed,
+                    close_on_eos,
+                    session_id,
+                    stats,
+                    room,
+                )
+                if eos or dg_closed.is_set():
+                    return eos
+            return False
+        finally:
+            if prefetcher is not None:
+                await prefetcher.close()
+            await self._report_drain(source_tag, stats)
+
+    async def _report_drain(self, source_tag: str, stats: DrainStats) -> None:
+        """Log and publish (core NATS) how fast a phase fed Deepgram."""
+        if not stats.messages:
+            return
+        self.logger.info(
+            f"[{source_tag}] Sent {stats.audio_s:.1f}s of audio in "
+            f"{stats.elapsed_s:.1f}s ({stats.realtime_factor:.1f}x realtime, "
+            f"{stats.messages} msgs in {stats.batches} batches)"
+        )
+        if self.nc is None:
+            return
+        report: dict[str, Any] = {"lane": source_tag, **stats.as_dict()}
+        if self._room:
+            report["room"] = self._room
+        try:
+            await self.nc.publish("system.stt_stats", json.dumps(report).encode())
+        except Exception as e:
+            self.logger.debug(f"[{source_tag}] stt_stats publish failed: {e}")
 
     async def _run_session_loop(
         self,
@@ -231,98 +498,287 @@ class STTProviderService(BaseService):
         Each session: drain backfill → switch to live on the same Deepgram
         connection → close when live EOS or disconnect.
         """
+        subs = await self._subscribe(js)
+        if subs is not None:
+            await self._serve_sessions(js, *subs, stop_event)
+
+    async def _subscribe(self, js: Any) -> tuple[Any, Any] | None:
+        """Pull subscriptions on the backfill and live durables."""
+        backfill_subject = f"{room_scoped(SUBJECT_PREFIX_AUDIO_BACKFILL, self._room)}.>"
+        live_subject = f"{room_scoped(SUBJECT_PREFIX_AUDIO_LIVE, self._room)}.>"
+        # Each room keeps its own read positions
+        suffix = f"_{self._room}" if self._room else ""
+        backfill_durable = _DURABLE_BACKFILL + suffix
+        live_durable = _DURABLE_LIVE + suffix
         try:
             backfill_sub = await js.pull_subscribe(
-                SUBJECT_AUDIO_BACKFILL, durable=_DURABLE_BACKFILL
+                backfill_subject, durable=backfill_durable
+            )
+            self.logger.info(
+                f"Subscribed to {backfill_subject} (durable={backfill_durable})"
             )
-            self.logger.info(f"Subscribed to backfill (durable={_DURABLE_BACKFILL})")
-            live_sub = await js.pull_subscribe(SUBJECT_AUDIO_LIVE, durable=_DURABLE_LIVE)
-            self.logger.info(f"Subscribed to live (durable={_DURABLE_LIVE})")
+            live_sub = await js.pull_subscribe(live_subject, durable=live_durable)
+            self.logger.info(f"Subscribed to {live_subject} (durable={live_durable})")
         except Exception as e:
             self.logger.critical(f"Subscribe failed: {e}")
+            return None
+        return backfill_sub, live_sub
+
+    async def _serve_sessions(
+        self, js: Any, backfill_sub: Any, live_sub: Any, stop_event: asyncio.Event
+    ) -> None:
+
+        if _MAX_SESSIONS > 1:
+            scheduler = SessionScheduler(
+                lambda sid, room, backfill, live, stop: self._run_scheduled_session(
+                    js, sid, room, backfill, live, stop
+                ),
+                _MAX_SESSIONS,
+                self.logger,
+            )
+            await scheduler.run(backfill_sub, live_sub, stop_event)
+            self.logger.info("Session loop stopped.")
             return
 
         while not stop_event.is_set():
-            # Phase 1: wait for the first backfill message (signals a new session)
+            # Wait for the first backfill message (signals a new session)
             first_bf_msgs = await self._wait_for_audio(
                 backfill_sub, stop_event, "backfill"
             )
             if stop_event.is_set():
                 break
 
-            # Extract session ID from the first message's subject
+            # Session ID and room from the first message's subject
             session_id: str | None = None
+            room = self._room
             if first_bf_msgs and hasattr(first_bf_msgs[0], "subject"):
-                session_id = self._session_id_from_subject(first_bf_msgs[0].subject)
+                sid, subject_room = session_key(first_bf_msgs[0].subject)
+                session_id, room = sid or None, subject_room or room
             self.logger.info(f"New session detected: {session_id}")
 
-            transcriber = await self._connect_with_retry("live", stop_event)
-            if transcriber is None:
-                break
-
-            await self._publish_stt_status("connected", "live")
-            await self._check_consumer_lag(backfill_sub, js, "backfill")
-
-            dg_closed = asyncio.Event()
-            finalize_done = asyncio.Event()
-            # tag_holder[0] is read dynamically by _drain_events so that
-            # transcript subjects switch from "backfill" to "live" mid-stream.
-            tag_holder: list[str] = ["backfill"]
-            drain_task = asyncio.create_task(
-                self._drain_events(
-                    transcriber,
-                    tag_holder,
+            if _PARALLEL_LANES:
+                await self._run_parallel_session(
                     js,
+                    backfill_sub,
+                    live_sub,
+                    first_bf_msgs,
+                    session_id,
                     stop_event,
-                    dg_closed,
-                    finalize_done,
+                    room,
                 )
+            elif not await self._run_serial_session(
+                js, backfill_sub, live_sub, first_bf_msgs, session_id, stop_event, room
+            ):
+                break
+
+        self.logger.info("Session loop stopped.")
+
+    async def _run_scheduled_session(
+        self,
+        js: Any,
+        session_id: str,
+        room: str,
+        backfill: SessionFeed,
+        live: SessionFeed,
+        stop_event: asyncio.Event,
+    ) -> None:
+        """One session of the scheduler, on its own feeds and connection(s)."""
+        first_bf_msgs = await self._wait_for_backfill(
+            backfill, live, stop_event, session_id
+        )
+        if stop_event.is_set():
+            return
+        room = room or self._room
+        if not first_bf_msgs:
+            await self._run_lane(js, live, "live", None, session_id, stop_event, room)
+        elif _PARALLEL_LANES:
+            await self._run_parallel_session(
+                js, backfill, live, first_bf_msgs, session_id, stop_event, room
             )
+        else:
+            await self._run_serial_session(
+                js, backfill, live, first_bf_msgs, session_id, stop_event, room
+            )
+
+    async def _wait_for_backfill(
+        self,
+        backfill: SessionFeed,
+        live: SessionFeed,
+        stop_event: asyncio.Event,
+        session_id: str,
+    ) -> list[Any]:
+        """A scheduled session's first backfill message; [] to start on live.
 
+        A session normally starts with its backfill, but after a restart its
+        backfill may already be acked. When only live audio has arrived after
+        _BACKFILL_WAIT_S, the session is transcribed from live instead of
+        holding its slot.
+        """
+        deadline = asyncio.get_running_loop().time() + _BACKFILL_WAIT_S
+        while not stop_event.is_set():
             try:
-                # Phase 2: send backfill audio; keep DG connection open on EOS
-                bf_eos = await self._fetch_phase(
-                    backfill_sub,
+                return await backfill.fetch(1, timeout=0.5)
+            except TimeoutError:
+                pass
+            if not live.empty() and asyncio.get_running_loop().time() >= deadline:
+                self.logger.warning(
+                    f"Session {session_id}: no backfill audio; starting on live"
+                )
+                return []
+        return []
+
+    @staticmethod
+    def _open_feeds(*subs: Any) -> None:
+        """Let scheduler feeds queue audio once their transcriber is connected."""
+        for sub in subs:
+            if isinstance(sub, SessionFeed):
+                sub.open()
+
+    async def _run_serial_session(
+        self,
+        js: Any,
+        backfill_sub: Any,
+        live_sub: Any,
+        first_bf_msgs: list[Any],
+        session_id: str | None,
+        stop_event: asyncio.Event,
+        room: str | None = None,
+    ) -> bool:
+        """Backfill then live on one Deepgram connection.
+
+        Returns False if stop_event fired before a connection was made.
+        """
+        transcriber = await self._connect_with_retry("live", stop_event)
+        if transcriber is None:
+            return False
+        self._open_feeds(backfill_sub, live_sub)
+
+        await self._publish_stt_status("connected", "live")
+        await self._check_consumer_lag(backfill_sub, js, "backfill")
+
+        dg_closed = asyncio.Event()
+        finalize_done = asyncio.Event()
+        # tag_holder[0] is read dynamically by _drain_events so that
+        # transcript subjects switch from "backfill" to "live" mid-stream.
+        tag_holder: list[str] = ["backfill"]
+        drain_task = asyncio.create_task(
+            self._drain_events(
+                transcriber,
+                tag_holder,
+                js,
+                stop_event,
+                dg_closed,
+                finalize_done,
+                room,
+            )
+        )
+
+        try:
+            # Send backfill audio; keep DG connection open on EOS
+            bf_eos = await self._fetch_phase(
+                backfill_sub,
+                transcriber,
+                "backfill",
+                dg_closed,
+                stop_event,
+                first_bf_msgs,
+                close_on_eos=False,
+                session_id=session_id,
+                room=room,
+            )
+
+            # Then live audio on the same DG connection
+            if bf_eos and not dg_closed.is_set() and not stop_event.is_set():
+                await self._flush_backfill(
                     transcriber,
-                    "backfill",
+                    finalize_done,
                     dg_closed,
                     stop_event,
-                    first_bf_msgs,
-                    close_on_eos=False,
-                    session_id=session_id,
+                    tag_holder,
                 )
-
-                # Phase 3: live audio on the same DG connection
-                if bf_eos and not dg_closed.is_set() and not stop_event.is_set():
-                    await self._flush_backfill(
+                first_live_msgs = await self._wait_for_audio(live_sub, stop_event, "live")
+                if not stop_event.is_set():
+                    await self._fetch_phase(
+                        live_sub,
                         transcriber,
-                        finalize_done,
+                        "live",
                         dg_closed,
                         stop_event,
-                        tag_holder,
-                    )
-                    first_live_msgs = await self._wait_for_audio(
-                        live_sub, stop_event, "live"
+                        first_live_msgs,
+                        close_on_eos=True,
+                        session_id=session_id,
+                        room=room,
                     )
-                    if not stop_event.is_set():
-                        await self._fetch_phase(
-                            live_sub,
-                            transcriber,
-                            "live",
-                            dg_closed,
-                            stop_event,
-                            first_live_msgs,
-                            close_on_eos=True,
-                            session_id=session_id,
-                        )
-            finally:
-                await self._close_transcriber(transcriber, drain_task, "live")
-
-            if not stop_event.is_set() and dg_closed.is_set():
-                # Only publish reconnecting if DG closed unexpectedly (not on EOS)
-                pass
+        finally:
+            await self._close_transcriber(transcriber, drain_task, "live")
+        return True
 
-        self.logger.info("Session loop stopped.")
+    async def _run_parallel_session(
+        self,
+        js: Any,
+        backfill_sub: Any,
+        live_sub: Any,
+        first_bf_msgs: list[Any],
+        session_id: str | None,
+        stop_event: asyncio.Event,
+        room: str | None = None,
+    ) -> None:
+        """Backfill and live concurrently, each on its own Deepgram connection.
+
+        Live captions start immediately instead of after the backfill drain.
+        Transcripts keep their lane's source tag; backfill audio always
+        precedes live audio, so consumers order a session's segments
+        backfill-first.
+        """
+        await self._check_consumer_lag(backfill_sub, js, "backfill")
+        await asyncio.gather(
+            self._run_lane(
+                js, backfill_sub, "backfill", first_bf_msgs, session_id, stop_event, room
+            ),
+            self._run_lane(js, live_sub, "live", None, session_id, stop_event, room),
+        )
+
+    async def _run_lane(
+        self,
+        js: Any,
+        sub: Any,
+        source_tag: str,
+        first_msgs: list[Any] | None,
+        session_id: str | None,
+        stop_event: asyncio.Event,
+        room: str | None = None,
+    ) -> None:
+        """Transcribe one subject on a dedicated connection until its EOS."""
+        if first_msgs is None:
+            first_msgs = await self._wait_for_audio(sub, stop_event, source_tag)
+            if stop_event.is_set():
+                return
+        transcriber = await self._connect_with_retry(source_tag, stop_event)
+        if transcriber is None:
+            return
+        self._open_feeds(sub)
+        await self._publish_stt_status("connected", source_tag)
+
+        dg_closed = asyncio.Event()
+        drain_task = asyncio.create_task(
+            self._drain_events(
+                transcriber, [source_tag], js, stop_event, dg_closed, room=room
+            )
+        )
+        try:
+            await self._fetch_phase(
+                sub,
+                transcriber,
+                source_tag,
+                dg_closed,
+                stop_event,
+                first_msgs,
+                close_on_eos=True,
+                session_id=session_id,
+                room=room,
+            )
+        finally:
+            await self._close_transcriber(transcriber, drain_task, source_tag)
 
     async def _flush_backfill(
         self,
@@ -364,6 +820,51 @@ class STTProviderService(BaseService):
             drain_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await drain_task
+        self._timelines.pop(transcriber, None)
+        if (gate := self._gates.pop(transcriber, None)) is not None:
+            await self._report_gate(source_tag, gate.close())
+        events = getattr(transcriber, "event_stats", None)
+        if events is not None:
+            await self._report_events(source_tag, events)
+
+    async def _report_events(self, source_tag: str, stats: EventQueueStats) -> None:
+        """Log and publish (core NATS) how far publishing fell behind Deepgram."""
+        if stats.coalesced or stats.waits:
+            self.logger.info(
+                f"[{source_tag}] Event queue peaked at {stats.depth_max} events; "
+                f"{stats.coalesced} interims coalesced, {stats.waits} finals waited"
+            )
+        if self.nc is None:
+            return
+        report: dict[str, Any] = {"lane": source_tag, "events": stats.as_dict()}
+        if self._room:
+            report["room"] = self._room
+        try:
+            await self.nc.publish("system.stt_stats", json.dumps(report).encode())
+        except Exception as e:
+            self.logger.debug(f"[{source_tag}] stt_stats publish failed: {e}")
+
+    async def _report_gate(self, source_tag: str, stats: GateStats) -> None:
+        """Log and publish (core NATS) the billed audio the silence gate saved."""
+        self._billed_s_saved += stats.saved_s
+        self.logger.info(
+            f"[{source_tag}] Silence gate held back {stats.saved_s:.1f}s of "
+            f"{stats.sent_s + stats.saved_s:.1f}s ({stats.keepalives} KeepAlives); "
+            f"{self._billed_s_saved:.0f}s of billed audio saved since start"
+        )
+        if self.nc is None:
+            return
+        report: dict[str, Any] = {
+            "lane": source_tag,
+            "silence_gate": stats.as_dict(),
+            "billed_s_saved": round(self._billed_s_saved, 1),
+        }
+        if self._room:
+            report["room"] = self._room
+        try:
+            await self.nc.publish("system.stt_stats", json.dumps(report).encode())
+        except Exception as e:
+            self.logger.debug(f"[{source_tag}] stt_stats publish failed: {e}")
 
     async def _check_consumer_lag(self, sub: Any, js: Any, source_tag: str) -> None:
         """Log a warning if the consumer has fallen behind the stream head.
@@ -377,7 +878,7 @@ class STTProviderService(BaseService):
             consumer_seq = info.delivered.stream_seq
             if consumer_seq < first_seq:
                 gap_msgs = first_seq - consumer_seq
-                lost_s = gap_msgs * 0.096
+                lost_s = gap_msgs * self._msg_duration_s
                 self.logger.warning(
                     f"[{source_tag}] Audio gap detected: ~{lost_s:.0f}s of audio "
                     f"aged out during outage (consumer was at seq {consumer_seq}, "
@@ -394,14 +895,18 @@ class STTProviderService(BaseService):
         stop_event: asyncio.Event,
         dg_closed: asyncio.Event,
         finalize_done: asyncio.Event | None = None,
+        room: str | None = None,
     ) -> None:
+        """Publish transcription events; ``room`` defaults to the instance's."""
         assert self.nc is not None  # guaranteed after BaseService.start()
         async for event in transcriber.get_events():
             if stop_event.is_set():
                 break
             source_tag = tag_holder[0]
-            topic = f"{SUBJECT_PREFIX_TRANSCRIPT_RAW}.{source_tag}"
-            interim_topic = f"{SUBJECT_PREFIX_TRANSCRIPT_INTERIM}.{source_tag}"
+            # Room-scoped transcripts: transcript.raw.<source>.<room>
+            scope = room_scoped(source_tag, self._room if room is None else room)
+            topic = f"{SUBJECT_PREFIX_TRANSCRIPT_RAW}.{scope}"
+            interim_topic = f"{SUBJECT_PREFIX_TRANSCRIPT_INTERIM}.{scope}"
             # Signal that finalize flush is complete
             if finalize_done and not finalize_done.is_set() and event.is_final:
                 finalize_done.set()
@@ -412,7 +917,10 @@ class STTProviderService(BaseService):
                 timestamp=datetime.now(UTC).isoformat(),
                 source=source_tag,
             )
-            encoded = json.dumps(dataclasses.asdict(payload_obj)).encode("utf-8")
+            payload = dataclasses.asdict(payload_obj)
+            if trace := self._event_trace(event, transcriber):
+                payload[TRACE_FIELD] = trace
+            encoded = json.dumps(payload).encode("utf-8")
             try:
                 if event.is_final:
                     await js.publish(topic, encoded)
@@ -422,6 +930,21 @@ class STTProviderService(BaseService):
                 self.logger.error(f"[{source_tag}] Failed to publish transcript: {e}")
         dg_closed.set()
 
+    def _event_trace(
+        self, event: TranscriptionEvent, transcriber: Transcriber
+    ) -> dict[str, Any] | None:
+        """Latency trace of the audio a result completes, stamped ``stt_result``."""
+        timeline = self._timelines.get(transcriber)
+        if timeline is None:
+            return None
+        end_s = None
+        if event.start is not None and event.duration is not None:
+            end_s = event.start + event.duration
+        trace = timeline.lookup(end_s)
+        if trace is None:
+            return None
+        return {**trace, "stt_result": time.time()}
+
 
 if __name__ == "__main__":
     load_dotenv()
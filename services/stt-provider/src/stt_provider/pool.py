@@ -0,0 +1,269 @@
+"""Hot-standby Deepgram connections with mid-session failover.
+
+``TranscriberPool`` keeps ``size`` transcribers connected ahead of need and
+sends them a KeepAlive while they idle, so a session starts on an open
+WebSocket instead of paying the TLS/WebSocket handshake. Standbys older than
+``max_idle_s`` are recycled; standbys that drop are replaced.
+
+``FailoverTranscriber`` is the ``Transcriber`` a session actually uses. It
+streams through one pooled connection and, when that connection fails
+(``send_audio`` raises or its event stream ends before ``finish()``),
+switches to a standby and replays the audio the failed connection had not
+yet returned final results for. The session loop only sees the connection
+close (``dg_closed``) when no replacement can be connected.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import replace
+from typing import Any
+
+from .events import EventQueueStats
+from .interfaces import Transcriber, TranscriptionEvent
+
+# Deepgram closes a stream after ~10 s without audio or KeepAlive
+_KEEPALIVE_S = 5.0
+# Recycle standbys after this long (0 = keep until they drop)
+_MAX_IDLE_S = 600.0
+# Audio kept for replay when no final result has covered it yet
+_REPLAY_MAX_S = 30.0
+# Bound on closing a failed connection (its socket may be half-dead)
+_CLOSE_TIMEOUT_S = 2.0
+# Input bytes per second by Deepgram encoding (16 kHz mono)
+_BYTES_PER_S = {"linear16": 32000, "mulaw": 16000, "alaw": 16000}
+
+
+def _is_closed(transcriber: Transcriber) -> bool:
+    return bool(getattr(transcriber, "closed", False))
+
+
+async def _close_quietly(transcriber: Transcriber) -> None:
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(transcriber.finish(), timeout=_CLOSE_TIMEOUT_S)
+
+
+class TranscriberPool:
+    """Pre-connected transcribers, kept alive until a session takes one."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Transcriber],
+        size: int,
+        logger: logging.Logger,
+        keepalive_s: float = _KEEPALIVE_S,
+        max_idle_s: float = _MAX_IDLE_S,
+    ) -> None:
+        self._factory = factory
+        self.size = size
+        self._logger = logger
+        self._keepalive_s = keepalive_s
+        self._max_idle_s = max_idle_s
+        self._standby: deque[tuple[Transcriber, float]] = deque()
+        self._connect_kwargs: dict[str, Any] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def standby(self) -> int:
+        return len(self._standby)
+
+    def start(self, **connect_kwargs: Any) -> None:
+        self._connect_kwargs = connect_kwargs
+        self._task = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while self._standby:
+            await _close_quietly(self._standby.popleft()[0])
+
+    async def connect_new(self, **kwargs: Any) -> Transcriber:
+        transcriber = self._factory()
+        await transcriber.connect(**{**self._connect_kwargs, **kwargs})
+        return transcriber
+
+    async def acquire(self, **kwargs: Any) -> Transcriber:
+        """A warm standby if one is healthy, otherwise a new connection."""
+        while self._standby:
+            transcriber, _ = self._standby.popleft()
+            self._wake.set()  # refill in the background
+            if not _is_closed(transcriber):
+                return transcriber
+            await _close_quietly(transcriber)
+        self._wake.set()
+        return await self.connect_new(**kwargs)
+
+    async def _maintain(self) -> None:
+        while True:
+            try:
+                await self._refill()
+                await self._keep_alive()
+            except Exception as e:
+                self._logger.error(f"Standby maintenance failed: {e}")
+            self._wake.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self._keepalive_s)
+
+    async def _refill(self) -> None:
+        while len(self._standby) < self.size:
+            try:
+                transcriber = await self.connect_new()
+            except Exception as e:
+                self._logger.warning(f"Standby connect failed: {e}")
+                return  # retried on the next keepalive tick
+            self._standby.append((transcriber, time.monotonic()))
+
+    async def _keep_alive(self) -> None:
+        """KeepAlive each standby; drop dead and recycle expired ones.
+
+        Standbys stay in the deque while their KeepAlive is awaited, so
+        acquire() can still take them; a taken one is left alone.
+        """
+        now = time.monotonic()
+        for entry in list(self._standby):
+            transcriber, since = entry
+            expired = self._max_idle_s > 0 and now - since > self._max_idle_s
+            if not expired and not _is_closed(transcriber):
+                try:
+                    await transcriber.keep_alive()
+                    continue
+                except Exception as e:
+                    self._logger.info(f"Standby dropped: {e}")
+            if entry in self._standby:
+                self._standby.remove(entry)
+                await _close_quietly(transcriber)
+
+
+class ReplayBuffer:
+    """Audio sent on a connection but not yet covered by a final result.
+
+    Offsets are seconds of audio since the session's first send, so they
+    survive a switch to another connection.
+    """
+
+    def __init__(self, max_s: float = _REPLAY_MAX_S) -> None:
+        self._chunks: deque[tuple[float, float, bytes]] = deque()  # start, end, audio
+        self._max_s = max_s
+        self.sent_s = 0.0
+
+    def append(self, audio: bytes, duration_s: float) -> None:
+        start = self.sent_s
+        self.sent_s += duration_s
+        self._chunks.append((start, self.sent_s, audio))
+        while self._chunks and self._chunks[0][1] < self.sent_s - self._max_s:
+            self._chunks.popleft()
+
+    def confirm(self, end_s: float) -> None:
+        """Drop audio up to ``end_s`` (a final result covered it)."""
+        while self._chunks and self._chunks[0][1] <= end_s + 1e-3:
+            self._chunks.popleft()
+
+    def pending(self) -> tuple[float, list[bytes]]:
+        """Start offset and chunks of the audio still awaiting a final."""
+        if not self._chunks:
+            return self.sent_s, []
+        return self._chunks[0][0], [audio for _, _, audio in self._chunks]
+
+
+class FailoverTranscriber(Transcriber):
+    """A session's transcriber: one pooled connection, replaced on failure."""
+
+    def __init__(self, pool: TranscriberPool, logger: logging.Logger) -> None:
+        self._pool = pool
+        self._logger = logger
+        self._active: Transcriber | None = None
+        self._base_s = 0.0  # session offset where the active connection starts
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._finished = False
+        self._replay = ReplayBuffer()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._bytes_per_s = _BYTES_PER_S["linear16"]
+        self.failovers = 0
+
+    async def connect(self, **kwargs: Any) -> None:
+        self._bytes_per_s = _BYTES_PER_S.get(kwargs.get("encoding", ""), 32000)
+        self._active = await self._pool.acquire(**kwargs)
+
+    async def send_audio(self, audio: bytes) -> None:
+        self._replay.append(audio, len(audio) / self._bytes_per_s)
+        generation = self._generation
+        try:
+            assert self._active is not None
+            await self._active.send_audio(audio)
+        except Exception as e:
+            self._logger.warning(f"Deepgram send failed ({e}); failing over")
+            # The replay includes this chunk
+            if not await self._failover(generation):
+                raise
+
+    async def finalize(self) -> None:
+        assert self._active is not None
+        await self._active.finalize()
+
+    async def keep_alive(self) -> None:
+        assert self._active is not None
+        await self._active.keep_alive()
+
+    async def finish(self) -> None:
+        self._finished = True
+        if self._active is not None:
+            await self._active.finish()
+
+    @property
+    def event_stats(self) -> EventQueueStats | None:
+        """Event queue counters of the active connection, if it keeps any."""
+        return getattr(self._active, "event_stats", None)
+
+    async def get_events(self) -> AsyncIterator[TranscriptionEvent]:
+        while self._active is not None:
+            active, base, generation = self._active, self._base_s, self._generation
+            async for event in active.get_events():
+                yield self._rebase(event, base)
+            if self._finished or not await self._failover(generation):
+                return
+
+    def _rebase(self, event: TranscriptionEvent, base: float) -> TranscriptionEvent:
+        """Shift offsets to the session timeline; confirm finals for replay."""
+        if event.start is None:
+            return event
+        start = event.start + base
+        if event.is_final and event.duration is not None:
+            self._replay.confirm(start + event.duration)
+        return replace(event, start=start)
+
+    async def _failover(self, generation: int) -> bool:
+        """Replace the connection of ``generation``; False if none could be had."""
+        async with self._lock:
+            if generation != self._generation:
+                return self._active is not None  # already replaced
+            if self._finished:
+                return False
+            old, self._active = self._active, None
+            if old is not None:
+                task = asyncio.create_task(_close_quietly(old))
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+            try:
+                standby = await self._pool.acquire()
+                start_s, chunks = self._replay.pending()
+                for chunk in chunks:
+                    await standby.send_audio(chunk)
+            except Exception as e:
+                self._logger.error(f"Failover failed: {e}")
+                return False
+            self._active, self._base_s = standby, start_s
+            self._generation += 1
+            self.failovers += 1
+            self._logger.warning(
+                f"Failed over to a standby connection; replayed "
+                f"{self._replay.sent_s - start_s:.1f}s of unconfirmed audio"
+            )
+            return True
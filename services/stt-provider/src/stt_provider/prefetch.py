@@ -0,0 +1,155 @@
+"""Pipelined JetStream fetching for the audio send loop.
+
+``Prefetcher`` pulls batches from a pull subscription on a background task
+while the caller is still sending the previous batch to the transcriber, so
+fetch round trips overlap with sends instead of adding to them. The batch
+size adapts: it doubles while fetches come back full and the consumer still
+has messages pending (a backlog, e.g. a pre-roll replay), and drops back to
+one message as soon as the consumer runs dry. A caught-up lane must not ask
+for more than one: when nothing is pending, nats-py's ``fetch(n)`` waits
+until all n messages arrive or the timeout expires, which would hold live
+audio for up to ``_FETCH_TIMEOUT_S``. ``fetch(1)`` returns on the first
+message.
+
+``DrainStats`` measures how fast a phase pushes audio to the transcriber.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Fetch batch bounds (messages); the JetStream default max_ack_pending is 1000
+_BATCH_MIN = 1
+_BATCH_MAX = 256
+# Fetched batches buffered ahead of the sender
+_DEPTH = 2
+# Server-side wait per fetch when nothing is pending
+_FETCH_TIMEOUT_S = 1.0
+
+
+def _num_pending(msg: Any) -> int | None:
+    """Messages left in the consumer after ``msg`` (JetStream metadata)."""
+    try:
+        pending = msg.metadata.num_pending
+    except Exception:
+        return None
+    return pending if isinstance(pending, int) else None
+
+
+async def nak_all(msgs: list[Any]) -> None:
+    """Return messages to the consumer for immediate redelivery (best effort).
+
+    A failed NAK only delays redelivery until the consumer's ack wait expires.
+    """
+    for msg in msgs:
+        with contextlib.suppress(Exception):
+            await msg.nak()
+
+
+class Prefetcher:
+    """Background batch fetcher feeding a bounded queue of message batches."""
+
+    def __init__(
+        self,
+        sub: Any,
+        source_tag: str,
+        logger: logging.Logger,
+        stop_event: asyncio.Event,
+        batch_min: int = _BATCH_MIN,
+        batch_max: int = _BATCH_MAX,
+        depth: int = _DEPTH,
+    ) -> None:
+        self._sub = sub
+        self._tag = source_tag
+        self._logger = logger
+        self._stop = stop_event
+        self._min = batch_min
+        self._max = max(batch_max, batch_min)
+        self.batch = batch_min
+        self._queue: asyncio.Queue[list[Any]] = asyncio.Queue(maxsize=depth)
+        self._held: list[Any] = []  # fetched, waiting for queue space
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def _adapt(self, msgs: list[Any]) -> None:
+        pending = _num_pending(msgs[-1]) if msgs else 0
+        if len(msgs) < self.batch or pending == 0:
+            # Caught up: a larger fetch would wait for messages to fill it
+            self.batch = self._min
+        else:
+            self.batch = min(self.batch * 2, self._max)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                msgs = list(await self._sub.fetch(self.batch, timeout=_FETCH_TIMEOUT_S))
+            except TimeoutError:
+                self._adapt([])
+                continue
+            except Exception as e:
+                self._logger.error(f"[{self._tag}] fetch error: {e}")
+                await asyncio.sleep(1)
+                continue
+            self._adapt(msgs)
+            self._held = msgs
+            await self._queue.put(msgs)
+            self._held = []
+
+    async def get(self, timeout: float = _FETCH_TIMEOUT_S) -> list[Any]:
+        """Next fetched batch, or ``[]`` on timeout or once stop_event is set."""
+        getter = asyncio.ensure_future(self._queue.get())
+        stopper = asyncio.ensure_future(self._stop.wait())
+        await asyncio.wait(
+            {getter, stopper}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        stopper.cancel()
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        return []
+
+    async def close(self) -> None:
+        """Stop fetching and NAK everything fetched but not handed out."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        leftover = list(self._held)
+        self._held = []
+        while not self._queue.empty():
+            leftover.extend(self._queue.get_nowait())
+        await nak_all(leftover)
+
+
+@dataclass
+class DrainStats:
+    """Audio pushed to the transcriber during one phase."""
+
+    audio_s: float = 0.0
+    messages: int = 0
+    batches: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def realtime_factor(self) -> float:
+        elapsed = self.elapsed_s
+        return self.audio_s / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "audio_s": round(self.audio_s, 2),
+            "elapsed_s": round(self.elapsed_s, 2),
+            "realtime_factor": round(self.realtime_factor, 1),
+            "messages": self.messages,
+            "batches": self.batches,
+        }
@@ -0,0 +1,293 @@
+"""Concurrent transcription sessions over the shared audio durables.
+
+``SessionScheduler`` pulls ``audio.backfill.>`` and ``audio.live.>`` and fans
+each message out by room and session id (the last two subject tokens) to a
+per-session worker with its own transcriber. Each worker reads its audio from two
+``SessionFeed`` queues that stand in for pull subscriptions, so the normal
+session code runs unchanged inside it.
+
+- At most ``max_sessions`` workers run at once. Messages of further
+  sessions are NAKed with a delay, so JetStream keeps and redelivers them
+  until a slot frees up.
+- Backpressure is per session. A feed holds a single message until the
+  session's transcriber is connected (enough to start it), then at most
+  ``queue_max``. Messages beyond that are NAKed with a delay, so JetStream
+  keeps them and other sessions on the lane are not held up. Queued messages
+  are unacked, so the cap stays well below JetStream's 30 s AckWait.
+- A feed that deferred a message accepts the deferred messages back in
+  stream-sequence order and defers everything newer until then, so a
+  session's audio is never reordered or dropped.
+- Messages that arrive after a session's worker has finished (e.g. NAKed
+  after its EOS) are ACKed and dropped, as in single-session mode.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .prefetch import Prefetcher, nak_all
+
+# Messages buffered per session and lane (~18 s of 96 ms periods; < AckWait)
+_QUEUE_MAX = 192
+# Redelivery delay for messages of sessions waiting for a free slot
+_DEFER_S = 2.0
+# Finished sessions remembered to drop their late messages
+_FINISHED_MAX = 256
+
+LANES = ("backfill", "live")
+
+# (session_id, room, backfill feed, live feed, stop_event)
+SessionRunner = Callable[
+    [str, str, "SessionFeed", "SessionFeed", asyncio.Event], Awaitable[None]
+]
+
+
+def _name(key: tuple[str, str]) -> str:
+    room, sid = key
+    return f"{room}/{sid}" if room else sid
+
+
+def session_key(subject: str) -> tuple[str, str]:
+    """Session id and room of ``audio.<lane>.[<room>.]<sid>``."""
+    parts = subject.split(".")
+    sid = parts[-1] if len(parts) >= 3 else ""
+    room = parts[2] if len(parts) >= 4 else ""
+    return sid, room
+
+
+def _stream_seq(msg: Any) -> int | None:
+    """JetStream stream sequence of a message (None outside JetStream)."""
+    try:
+        seq = msg.metadata.sequence.stream
+    except Exception:
+        return None
+    return seq if isinstance(seq, int) else None
+
+
+async def _ack_quietly(msg: Any) -> None:
+    with contextlib.suppress(Exception):
+        await msg.ack()
+
+
+class SessionFeed:
+    """One session's messages for one lane, fetched like a pull subscription."""
+
+    def __init__(self, maxsize: int = _QUEUE_MAX) -> None:
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._maxsize = maxsize
+        self._connected = False
+        self._deferred: list[int] = []  # stream sequences NAKed, ascending
+
+    def open(self) -> None:
+        """The session's transcriber is connected: accept up to ``maxsize``."""
+        self._connected = True
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+    @property
+    def deferred(self) -> int:
+        return len(self._deferred)
+
+    def offer(self, msg: Any) -> bool:
+        """Queue ``msg``, or return False: NAK it with a delay and retry later.
+
+        Messages without a stream sequence only get the size limit.
+        """
+        seq = _stream_seq(msg)
+        limit = self._maxsize if self._connected else 1
+        in_order = not self._deferred or (seq is not None and seq <= self._deferred[0])
+        if not in_order or self._queue.qsize() >= limit:
+            if seq is not None and seq not in self._deferred:
+                bisect.insort(self._deferred, seq)
+            return False
+        if self._deferred and seq == self._deferred[0]:
+            self._deferred.pop(0)
+        self._queue.put_nowait(msg)
+        return True
+
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[Any]:
+        """Up to ``batch`` queued messages; TimeoutError if none arrive."""
+        msgs = [await asyncio.wait_for(self._queue.get(), timeout=timeout)]
+        while len(msgs) < batch and not self._queue.empty():
+            msgs.append(self._queue.get_nowait())
+        return msgs
+
+    async def consumer_info(self) -> Any:
+        raise RuntimeError("session feeds have no consumer")
+
+    def drain(self) -> list[Any]:
+        msgs = []
+        while not self._queue.empty():
+            msgs.append(self._queue.get_nowait())
+        return msgs
+
+
+@dataclass
+class _Worker:
+    session_id: str
+    room: str
+    feeds: dict[str, SessionFeed]
+    task: asyncio.Task[None] | None = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.room, self.session_id
+
+
+@dataclass
+class SchedulerStats:
+    started: int = 0
+    finished: int = 0
+    deferred: int = 0  # messages NAKed while every slot was busy
+    backpressured: int = 0  # messages NAKed because their session's feed was full
+    dropped_late: int = 0  # messages of already finished sessions
+    deferred_sessions: set[tuple[str, str]] = field(default_factory=set)
+
+
+class SessionScheduler:
+    """Fan audio out to per-session workers, at most ``max_sessions`` at once."""
+
+    def __init__(
+        self,
+        run_session: SessionRunner,
+        max_sessions: int,
+        logger: logging.Logger,
+        queue_max: int = _QUEUE_MAX,
+        defer_s: float = _DEFER_S,
+    ) -> None:
+        self._run_session = run_session
+        self.max_sessions = max_sessions
+        self._logger = logger
+        self._queue_max = queue_max
+        self._defer_s = defer_s
+        # Keyed by (room, session id): rooms may reuse a session id
+        self._workers: dict[tuple[str, str], _Worker] = {}
+        self._finished: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._stop = asyncio.Event()
+        self.stats = SchedulerStats()
+
+    @property
+    def active(self) -> int:
+        return len(self._workers)
+
+    async def run(
+        self, backfill_sub: Any, live_sub: Any, stop_event: asyncio.Event
+    ) -> None:
+        """Dispatch until stop_event fires, then wait for the workers to stop."""
+        self._stop = stop_event
+        try:
+            await asyncio.gather(
+                self._dispatch(backfill_sub, "backfill"),
+                self._dispatch(live_sub, "live"),
+            )
+        finally:
+            tasks = [w.task for w in self._workers.values() if w.task is not None]
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self, sub: Any, lane: str) -> None:
+        prefetcher = Prefetcher(sub, lane, self._logger, self._stop)
+        prefetcher.start()
+        try:
+            while not self._stop.is_set():
+                msgs = await prefetcher.get()
+                for i, msg in enumerate(msgs):
+                    if self._stop.is_set():
+                        await nak_all(msgs[i:])
+                        break
+                    await self._route(msg, lane)
+        finally:
+            await prefetcher.close()
+
+    async def _route(self, msg: Any, lane: str) -> None:
+        sid, room = session_key(getattr(msg, "subject", ""))
+        key = (room, sid)
+        if key in self._finished:
+            self.stats.dropped_late += 1
+            await _ack_quietly(msg)
+            return
+        worker = self._workers.get(key)
+        if worker is None:
+            if len(self._workers) >= self.max_sessions:
+                await self._defer(msg, key)
+                return
+            worker = self._start(key)
+        await self._enqueue(worker, lane, msg)
+
+    async def _defer(self, msg: Any, key: tuple[str, str]) -> None:
+        self.stats.deferred += 1
+        if key not in self.stats.deferred_sessions:
+            self.stats.deferred_sessions.add(key)
+            self._logger.warning(
+                f"Session {_name(key)} waiting: "
+                f"{self.max_sessions} sessions already active"
+            )
+        with contextlib.suppress(Exception):
+            await msg.nak(delay=self._defer_s)
+
+    def _start(self, key: tuple[str, str]) -> _Worker:
+        room, sid = key
+        feeds = {lane: SessionFeed(self._queue_max) for lane in LANES}
+        worker = _Worker(sid, room, feeds)
+        self._workers[key] = worker
+        self.stats.started += 1
+        self.stats.deferred_sessions.discard(key)
+        worker.task = asyncio.create_task(self._work(worker))
+        self._logger.info(
+            f"Session {_name(key)} started ({self.active}/{self.max_sessions} active)"
+        )
+        return worker
+
+    async def _work(self, worker: _Worker) -> None:
+        try:
+            await self._run_session(
+                worker.session_id,
+                worker.room,
+                worker.feeds["backfill"],
+                worker.feeds["live"],
+                self._stop,
+            )
+        except Exception as e:
+            self._logger.error(f"Session {_name(worker.key)} failed: {e}")
+        finally:
+            await self._retire(worker.key)
+
+    async def _retire(self, key: tuple[str, str]) -> None:
+        """Forget a finished worker and settle the messages it left queued."""
+        worker = self._workers.pop(key)
+        self._finished[key] = None
+        while len(self._finished) > _FINISHED_MAX:
+            self._finished.popitem(last=False)
+        self.stats.finished += 1
+        leftover = [m for feed in worker.feeds.values() for m in feed.drain()]
+        if self._stop.is_set():
+            await nak_all(leftover)  # shutting down: redeliver to the next run
+        else:
+            self.stats.dropped_late += len(leftover)
+            await asyncio.gather(*(_ack_quietly(m) for m in leftover))
+        self._logger.info(
+            f"Session {_name(key)} finished ({self.active}/{self.max_sessions} active)"
+        )
+
+    async def _enqueue(self, worker: _Worker, lane: str, msg: Any) -> None:
+        feed = worker.feeds[lane]
+        was_deferring = feed.deferred > 0
+        if feed.offer(msg):
+            return
+        self.stats.backpressured += 1
+        # Before the transcriber connects, deferring is expected
+        if feed.connected and not was_deferring and feed.deferred:
+            self._logger.warning(
+                f"[{lane}] Session {_name(worker.key)} is behind; deferring its audio"
+            )
+        with contextlib.suppress(Exception):
+            await msg.nak(delay=self._defer_s)
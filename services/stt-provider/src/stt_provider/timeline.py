@@ -0,0 +1,45 @@
+"""Map transcript results back to the audio messages they came from.
+
+Deepgram reports each result's position in the stream it has received
+(``start`` + ``duration`` seconds since the connection opened). The timeline
+records, per message sent, the stream offset where its audio ends and the
+latency trace it carried, so a result can be attributed to the message that
+completed it.
+"""
+
+import bisect
+from collections import deque
+from typing import Any
+
+# Messages remembered per connection (~13 min of 96 ms periods)
+_MAX_ENTRIES = 8192
+
+
+class AudioTimeline:
+    """Stream offsets (seconds) of sent audio, with each message's trace."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES) -> None:
+        self._ends: deque[float] = deque(maxlen=max_entries)
+        self._traces: deque[dict[str, Any]] = deque(maxlen=max_entries)
+        self.sent_s = 0.0
+
+    def record(self, duration_s: float, trace: dict[str, Any] | None) -> None:
+        """Account for a message just sent; only traced messages are kept."""
+        self.sent_s += duration_s
+        if trace:
+            self._ends.append(self.sent_s)
+            self._traces.append(trace)
+
+    def lookup(self, end_s: float | None = None) -> dict[str, Any] | None:
+        """Trace of the message holding stream offset ``end_s``.
+
+        Without an offset (the transcriber does not report one), the most
+        recently sent traced message is used.
+        """
+        if not self._traces:
+            return None
+        if end_s is None:
+            return self._traces[-1]
+        # Small tolerance: result ends are rounded to milliseconds
+        i = bisect.bisect_left(self._ends, end_s - 1e-3)
+        return self._traces[min(i, len(self._traces) - 1)]
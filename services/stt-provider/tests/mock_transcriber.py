@@ -17,6 +17,7 @@ class MockTranscriber(Transcriber):
         self.connected = False
         self.finalized = False
         self.finished = False
+        self.keepalives = 0
         self.sent_audio: list[bytes] = []
         self._queue: asyncio.Queue[TranscriptionEvent | None] = asyncio.Queue()
         self._auto_respond = auto_respond
@@ -57,6 +58,9 @@ class MockTranscriber(Transcriber):
             )
         )
 
+    async def keep_alive(self) -> None:
+        self.keepalives += 1
+
     async def finish(self) -> None:
         self.finished = True
         await self._queue.put(None)
@@ -1,4 +1,3 @@
-import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -66,8 +65,6 @@ async def test_deepgram_adapter_receive_message(monkeypatch: pytest.MonkeyPatch)
 
     with patch("stt_provider.deepgram_adapter.AsyncDeepgramClient"):
         adapter = DeepgramTranscriber()
-        # Initialize queue
-        adapter._event_queue = asyncio.Queue()
 
         # Simulate Message
         mock_result = MagicMock()
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from stt_provider.events import EventQueue
+from stt_provider.interfaces import TranscriptionEvent
+
+
+def _event(text: str, is_final: bool = False) -> TranscriptionEvent:
+    return TranscriptionEvent(text=text, is_final=is_final, confidence=1.0)
+
+
+async def _drain(queue: EventQueue) -> list[str]:
+    await queue.close()
+    texts = []
+    while (event := await queue.get()) is not None:
+        texts.append(event.text)
+    return texts
+
+
+@pytest.mark.asyncio
+async def test_superseded_interims_are_coalesced_and_finals_kept() -> None:
+    queue = EventQueue()
+    for text in ("he", "hel", "hell"):
+        await queue.put(_event(text))
+    await queue.put(_event("hello", is_final=True))  # supersedes "hell"
+    await queue.put(_event("wo"))
+    await queue.put(_event("wor"))
+
+    assert queue.qsize() == 2
+    assert await _drain(queue) == ["hello", "wor"]
+    assert queue.stats.coalesced == 4
+    assert queue.stats.depth_max == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_stays_flat_when_the_consumer_stalls() -> None:
+    queue = EventQueue(max_finals=2)
+    for i in range(1000):
+        await queue.put(_event(f"interim {i}"))
+    assert queue.qsize() == 1
+    assert queue.stats.coalesced == 999
+
+
+@pytest.mark.asyncio
+async def test_full_queue_makes_finals_wait_instead_of_dropping() -> None:
+    queue = EventQueue(max_finals=2)
+    await queue.put(_event("one", is_final=True))
+    await queue.put(_event("two", is_final=True))
+
+    blocked = asyncio.create_task(queue.put(_event("three", is_final=True)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done() and queue.stats.waits == 1
+
+    first = await queue.get()
+    assert first is not None and first.text == "one"
+    await asyncio.wait_for(blocked, timeout=1)
+    assert await _drain(queue) == ["two", "three"]
+
+
+@pytest.mark.asyncio
+async def test_close_releases_waiting_finals_and_ends_the_stream() -> None:
+    queue = EventQueue(max_finals=1)
+    await queue.put(_event("one", is_final=True))
+    blocked = asyncio.create_task(queue.put(_event("two", is_final=True)))
+    await asyncio.sleep(0.01)
+
+    await queue.close()
+    await asyncio.wait_for(blocked, timeout=1)
+    assert await _drain(queue) == ["one", "two"]
+    assert await queue.get() is None
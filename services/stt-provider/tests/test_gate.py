@@ -0,0 +1,90 @@
+import struct
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from stt_provider.gate import SilenceGate
+from stt_provider.main import STTProviderService
+
+_PERIOD_S = 0.096
+
+
+def _chunk(value: int) -> bytes:
+    return struct.pack("<1536h", *([value] * 1536))
+
+
+_SILENT, _SPEECH = _chunk(0), _chunk(3000)
+
+
+def _feed(gate: SilenceGate, chunk: bytes, n: int) -> list[list[tuple[bytes, float]]]:
+    return [gate.admit(chunk, chunk, _PERIOD_S) for _ in range(n)]
+
+
+def test_gate_holds_silence_after_hangover_and_sends_preroll_on_speech() -> None:
+    gate = SilenceGate(window_chunks=2, hangover_s=0.2, preroll_s=0.2)
+    assert all(_feed(gate, _SPEECH, 3))
+
+    quiet = _feed(gate, _SILENT, 10)
+    # Speech is still in the window for one chunk, two more are hangover
+    assert [bool(sent) for sent in quiet] == [True] * 3 + [False] * 7
+    held = gate.holding
+    assert held
+
+    resumed = gate.admit(_SPEECH, b"speech", _PERIOD_S)
+    assert [data for data, _ in resumed] == [_SILENT] * 3 + [b"speech"]
+    assert not gate.holding
+
+    stats = gate.close()
+    assert stats.saved_s == pytest.approx(4 * _PERIOD_S)
+    assert stats.sent_s == pytest.approx(10 * _PERIOD_S)
+
+
+def _silence_sent_s(periods: int) -> float:
+    """Seconds of trailing silence sent before the gate holds."""
+    gate = SilenceGate(window_chunks=8, hangover_s=1.0, preroll_s=0.0)
+    period_s = periods * _PERIOD_S
+    gate.admit(_SPEECH * periods, b"", period_s, periods)
+    sent = [gate.admit(_SILENT * periods, b"", period_s, periods) for _ in range(60)]
+    return sum(seconds for chunks in sent for _, seconds in chunks)
+
+
+def test_gate_timing_does_not_scale_with_packing() -> None:
+    unpacked = _silence_sent_s(1)
+    assert unpacked == pytest.approx(17 * _PERIOD_S)  # window drains, then 1 s
+    assert _silence_sent_s(4) == pytest.approx(unpacked, abs=4 * _PERIOD_S)
+
+
+def test_gate_asks_for_keepalive_only_while_holding() -> None:
+    gate = SilenceGate(window_chunks=1, hangover_s=0.0, keepalive_s=0.0)
+    assert not gate.keepalive_due()
+    _feed(gate, _SILENT, 3)
+    assert gate.keepalive_due()
+    assert gate.stats.keepalives == 1
+
+
+@pytest.mark.asyncio
+async def test_send_frame_holds_silence_and_keeps_connection_alive(
+    monkeypatch: pytest.MonkeyPatch, mock_transcriber_factory: Any
+) -> None:
+    monkeypatch.setattr("stt_provider.main._SILENCE_GATE", True)
+    monkeypatch.setattr("stt_provider.main._SILENCE_HANGOVER_S", 0.0)
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    service.nc = AsyncMock()
+    transcriber = mock_transcriber_factory()
+    await transcriber.connect()
+
+    for _ in range(20):
+        msg = MagicMock(data=_SILENT, headers=None)
+        assert await service._send_frame(msg, transcriber, "live", None)
+    sent_while_quiet = len(transcriber.sent_audio)
+    assert sent_while_quiet < 20
+    monkeypatch.setattr(service._gates[transcriber], "_keepalive_s", 0.0)
+    msg = MagicMock(data=_SILENT, headers=None)
+    await service._send_frame(msg, transcriber, "live", None)
+    assert transcriber.keepalives == 1
+    assert len(transcriber.sent_audio) == sent_while_quiet
+
+    await service._close_transcriber(transcriber, AsyncMock()(), "live")
+    report = service.nc.publish.call_args.args
+    assert report[0] == "system.stt_stats"
+    assert service._billed_s_saved > 0
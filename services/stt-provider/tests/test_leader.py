@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from nats.js.errors import KeyNotFoundError, KeyWrongLastSequenceError
+from stt_provider.leader import LeaderLease
+from stt_provider.main import STTProviderService
+
+_LOG = logging.getLogger("test")
+
+
+class _KV:
+    """In-memory KV bucket with JetStream's compare-and-set semantics."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, tuple[int, bytes]] = {}
+        self.seq = 0
+        self.down = False  # NATS unreachable
+
+    def _put(self, key: str, value: bytes) -> int:
+        self.seq += 1
+        self.entries[key] = (self.seq, value)
+        return self.seq
+
+    async def get(self, key: str) -> Any:
+        if key not in self.entries:
+            raise KeyNotFoundError
+        revision, value = self.entries[key]
+        return SimpleNamespace(value=value, revision=revision)
+
+    async def create(self, key: str, value: bytes) -> int:
+        if key in self.entries:
+            raise KeyWrongLastSequenceError
+        return self._put(key, value)
+
+    async def update(self, key: str, value: bytes, last: int | None = None) -> int:
+        if self.down:
+            raise ConnectionError("no responders")
+        if key not in self.entries or self.entries[key][0] != last:
+            raise KeyWrongLastSequenceError
+        return self._put(key, value)
+
+    async def delete(self, key: str, last: int | None = None) -> bool:
+        if self.entries.get(key, (None,))[0] != last:
+            raise KeyWrongLastSequenceError
+        del self.entries[key]
+        return True
+
+    def holder(self, key: str = "leader") -> str | None:
+        if key not in self.entries:
+            return None
+        holder: str = json.loads(self.entries[key][1])["holder"]
+        return holder
+
+
+@pytest.mark.asyncio
+async def test_standby_takes_over_only_after_the_lease_lapses() -> None:
+    kv = _KV()
+    leader = LeaderLease(kv, "leader", "a", _LOG, lease_s=0.3, poll_s=0.02)
+    standby = LeaderLease(kv, "leader", "b", _LOG, lease_s=0.3, poll_s=0.02)
+    assert await leader.try_acquire()
+    assert not await standby.try_acquire()
+
+    done = asyncio.Event()
+    holding = asyncio.create_task(leader.hold(done))
+    await asyncio.sleep(0.5)  # renewals keep the standby out
+    assert not await standby.try_acquire()
+
+    kv.down = True  # the leader can no longer renew and steps down
+    assert await asyncio.wait_for(holding, timeout=1) is False
+    kv.down = False
+    async with asyncio.timeout(1):
+        assert await standby.wait_for_leadership(asyncio.Event())
+    assert kv.holder() == "b" and standby.previous_holder == "a"
+
+
+@pytest.mark.asyncio
+async def test_released_lease_is_taken_without_waiting_it_out() -> None:
+    kv = _KV()
+    leader = LeaderLease(kv, "leader", "a", _LOG, lease_s=10.0)
+    standby = LeaderLease(kv, "leader", "b", _LOG, lease_s=10.0)
+    assert await leader.try_acquire()
+    assert not await standby.try_acquire()
+
+    done = asyncio.Event()
+    done.set()
+    assert await leader.hold(done) is True  # shutdown releases
+    assert await standby.try_acquire()
+    assert kv.holder() == "b"
+
+
+class _Sub:
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[Any]:
+        await asyncio.sleep(0.01)
+        raise TimeoutError
+
+    async def unsubscribe(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_replica_takes_over_durables_when_the_leader_stops(
+    monkeypatch: pytest.MonkeyPatch, mock_transcriber_factory: Any
+) -> None:
+    monkeypatch.setattr("stt_provider.main._REPLICA", True)
+    monkeypatch.setattr("stt_provider.main._LEASE_S", 0.5)
+    kv = _KV()
+    replicas = []
+    for _ in range(2):
+        service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+        service.nc = AsyncMock()
+        js = AsyncMock()
+        js.create_key_value.return_value = kv
+        js.pull_subscribe.side_effect = lambda subject, durable: _Sub()
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(service._run_replica(js, stop_event))
+        replicas.append((service, js, stop_event, task))
+        await asyncio.sleep(0.05)
+
+    (_, first_js, first_stop, first_task), (second, second_js, *_) = replicas
+    await asyncio.sleep(0.3)
+    assert first_js.pull_subscribe.await_count == 2  # backfill and live
+    assert second_js.pull_subscribe.await_count == 0
+
+    leader = kv.holder()
+    first_stop.set()  # e.g. restart_service
+    await asyncio.wait_for(first_task, timeout=2)
+    async with asyncio.timeout(2):
+        while second_js.pull_subscribe.await_count < 2:
+            await asyncio.sleep(0.01)
+
+    assert isinstance(second.nc, AsyncMock)
+    subject, data = second.nc.publish.call_args.args
+    report = json.loads(data)
+    assert subject == "system.stt_stats"
+    assert report["previous"] == leader
+    assert report["failover_s"] < 0.5  # handed over well within one lease
+
+    replicas[1][2].set()
+    await asyncio.wait_for(replicas[1][3], timeout=2)
+    assert kv.holder() is None
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from mock_transcriber import MockTranscriber
+from stt_provider.interfaces import TranscriptionEvent
+from stt_provider.pool import FailoverTranscriber, ReplayBuffer, TranscriberPool
+
+_LOG = logging.getLogger("test")
+_ONE_S = b"\x00" * 32000  # one second of 16 kHz linear16
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 1.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_pool_hands_out_warm_standbys_and_refills(
+    mock_transcriber_factory: Any,
+) -> None:
+    pool = TranscriberPool(mock_transcriber_factory, 2, _LOG, keepalive_s=0.02)
+    pool.start(model="nova-3")
+    await _until(lambda: pool.standby == 2)
+
+    first = await pool.acquire()
+    assert first is mock_transcriber_factory.instances[0]
+    assert first.connected
+    handed_out_keepalives = first.keepalives
+    await _until(lambda: pool.standby == 2)  # refilled behind the session
+    assert len(mock_transcriber_factory.instances) == 3
+
+    await _until(lambda: mock_transcriber_factory.instances[1].keepalives >= 2)
+    assert first.keepalives == handed_out_keepalives  # the session owns it now
+
+    await pool.close()
+    assert all(t.finished for t in mock_transcriber_factory.instances[1:])
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_expired_and_closed_standbys(
+    mock_transcriber_factory: Any,
+) -> None:
+    pool = TranscriberPool(
+        mock_transcriber_factory, 1, _LOG, keepalive_s=0.02, max_idle_s=0.05
+    )
+    pool.start()
+    await _until(lambda: len(mock_transcriber_factory.instances) >= 3)
+    assert mock_transcriber_factory.instances[0].finished  # recycled after 50 ms
+
+    standby = mock_transcriber_factory.instances[-1]
+    standby.closed = True
+    acquired = await pool.acquire()
+    assert acquired is not standby
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_survives_acquire_during_a_keepalive(
+    mock_transcriber_factory: Any,
+) -> None:
+    pool = TranscriberPool(mock_transcriber_factory, 2, _LOG, keepalive_s=0.02)
+    pool.start()
+    await _until(lambda: pool.standby == 2)
+
+    entered, release = asyncio.Event(), asyncio.Event()
+
+    async def failing_keep_alive() -> None:
+        entered.set()
+        await release.wait()
+        raise ConnectionError("socket closed")
+
+    mock_transcriber_factory.instances[0].keep_alive = failing_keep_alive
+    await asyncio.wait_for(entered.wait(), timeout=1)
+    taken: list[Any] = [await pool.acquire(), await pool.acquire()]  # empties pool
+    release.set()
+
+    await _until(lambda: pool.standby == 2)  # maintenance is still running
+    assert not any(t.finished for t in taken)  # in use: not the pool's to close
+    await pool.close()
+
+
+def test_replay_buffer_keeps_audio_after_last_final() -> None:
+    replay = ReplayBuffer(max_s=2.5)
+    for i in range(4):
+        replay.append(bytes([i]), 1.0)
+    assert replay.pending() == (1.0, [b"\x01", b"\x02", b"\x03"])  # capped at 2.5 s
+
+    replay.confirm(2.0)
+    assert replay.pending() == (2.0, [b"\x02", b"\x03"])
+    replay.confirm(4.0)
+    assert replay.pending() == (4.0, [])
+
+
+@pytest.mark.asyncio
+async def test_failover_replays_unconfirmed_audio_and_rebases_offsets(
+    mock_transcriber_factory: Any,
+) -> None:
+    pool = TranscriberPool(mock_transcriber_factory, 1, _LOG, keepalive_s=0.02)
+    pool.start(encoding="linear16")
+    await _until(lambda: pool.standby == 1)
+
+    transcriber = FailoverTranscriber(pool, _LOG)
+    await transcriber.connect(encoding="linear16")
+    first = mock_transcriber_factory.instances[0]
+    events: list[TranscriptionEvent] = []
+
+    async def collect() -> None:
+        async for event in transcriber.get_events():
+            events.append(event)  # noqa: PERF401 - read while the stream is open
+
+    collector = asyncio.create_task(collect())
+    for _ in range(3):
+        await transcriber.send_audio(_ONE_S)
+    await first.inject_event(TranscriptionEvent("hello", True, 0.9, 0.0, 1.0))
+    await _until(lambda: len(events) == 1)
+
+    await first.finish()  # the socket drops mid-session
+    await _until(lambda: transcriber.failovers == 1)
+    second = mock_transcriber_factory.instances[1]
+    assert second.sent_audio == [_ONE_S, _ONE_S]  # the two unconfirmed seconds
+
+    await transcriber.send_audio(_ONE_S)
+    await second.inject_event(TranscriptionEvent("world", True, 0.9, 0.0, 3.0))
+    await _until(lambda: len(events) == 2)
+    assert (events[1].start, events[1].duration) == (1.0, 3.0)
+
+    await transcriber.finish()
+    await asyncio.wait_for(collector, timeout=1)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failover_gives_up_when_no_connection_can_be_made() -> None:
+    class Failing(MockTranscriber):
+        async def connect(self, **kwargs) -> None:  # type: ignore[no-untyped-def]
+            raise ConnectionError("unreachable")
+
+    pool = TranscriberPool(Failing, 0, _LOG)
+    transcriber = FailoverTranscriber(pool, _LOG)
+    with pytest.raises(ConnectionError):
+        await transcriber.connect()
+
+    first = MockTranscriber()
+    transcriber._active = first
+    await first.finish()
+    events = [event async for event in transcriber.get_events()]
+    assert events == []  # the session loop sees dg_closed
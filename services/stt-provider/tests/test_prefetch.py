@@ -0,0 +1,135 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from stt_provider.prefetch import DrainStats, Prefetcher
+
+
+def _msg(i: int) -> MagicMock:
+    msg = MagicMock()
+    msg.data = bytes([i])
+    msg.nak = AsyncMock()
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_grows_batch_on_backlog_and_naks_leftovers() -> None:
+    """Full fetches double the batch size; unsent batches are NAKed on close."""
+    messages = [_msg(i) for i in range(40)]
+    backlog = list(messages)
+    requested: list[int] = []
+
+    async def fetch(n: int, timeout: float) -> list[Any]:
+        requested.append(n)
+        batch = backlog[:n]
+        del backlog[:n]
+        return batch
+
+    sub = MagicMock()
+    sub.fetch = fetch
+    prefetcher = Prefetcher(sub, "backfill", logging.getLogger("test"), asyncio.Event())
+    prefetcher.start()
+
+    first = await prefetcher.get()
+    second = await prefetcher.get()
+    assert [len(first), len(second)] == [1, 2]
+    await asyncio.sleep(0.05)  # fetcher runs ahead: two batches queued, one held
+    await prefetcher.close()
+
+    assert requested == [1, 2, 4, 8, 16]
+    naked = [m for m in messages if m.nak.called]
+    assert naked == messages[3:31]  # fetched but never handed out
+
+
+class _FillWaitSub:
+    """Pull subscription that fetches like nats-py.
+
+    Pending messages come back at once; with none pending, ``fetch(n)`` waits
+    until n messages arrive or the timeout expires.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[MagicMock] = []
+        self.requested: list[int] = []
+        self._arrived = asyncio.Event()
+
+    def publish(self, i: int) -> None:
+        msg = _msg(i)
+        msg.arrived = asyncio.get_running_loop().time()
+        self.pending.append(msg)
+        self._arrived.set()
+
+    async def fetch(self, n: int, timeout: float) -> list[Any]:
+        self.requested.append(n)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if not self.pending:
+            while len(self.pending) < n and (remaining := deadline - loop.time()) > 0:
+                self._arrived.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._arrived.wait(), remaining)
+            if not self.pending:
+                raise TimeoutError
+        batch = self.pending[:n]
+        del self.pending[:n]
+        for left, msg in enumerate(reversed(batch), start=len(self.pending)):
+            msg.metadata.num_pending = left
+        return batch
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_does_not_hold_live_audio_to_fill_a_batch() -> None:
+    """After a backlog drains, live messages are handed out as they arrive."""
+    sub = _FillWaitSub()
+    for i in range(30):
+        sub.publish(i)
+    stop_event = asyncio.Event()
+    prefetcher = Prefetcher(sub, "live", logging.getLogger("test"), stop_event)
+    prefetcher.start()
+
+    async def live_audio() -> None:
+        for i in range(20):
+            await asyncio.sleep(0.03)
+            sub.publish(i)
+
+    producer = asyncio.create_task(live_audio())
+    delays: list[float] = []
+    received = 0
+    while received < 50:
+        batch = await prefetcher.get()
+        now = asyncio.get_running_loop().time()
+        received += len(batch)
+        delays.extend(now - msg.arrived for msg in batch)
+    await producer
+    await prefetcher.close()
+
+    assert max(sub.requested) > 1  # the backlog was fetched in batches
+    assert max(delays[30:]) < 0.02  # live audio never waited for a batch to fill
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_get_returns_empty_once_stopped() -> None:
+    async def fetch(n: int, timeout: float) -> list[Any]:
+        await asyncio.sleep(timeout)
+        raise TimeoutError
+
+    sub = MagicMock()
+    sub.fetch = fetch
+    stop_event = asyncio.Event()
+    prefetcher = Prefetcher(sub, "live", logging.getLogger("test"), stop_event)
+    prefetcher.start()
+    asyncio.get_running_loop().call_later(0.05, stop_event.set)
+
+    assert await asyncio.wait_for(prefetcher.get(timeout=5), timeout=1) == []
+    await prefetcher.close()
+
+
+def test_drain_stats_realtime_factor() -> None:
+    stats = DrainStats(audio_s=60.0, messages=625, batches=5)
+    stats.started -= 2.0
+    report = stats.as_dict()
+    assert report["realtime_factor"] == pytest.approx(30.0, rel=0.05)
+    assert report["messages"] == 625
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from stt_provider.interfaces import TranscriptionEvent
+from stt_provider.main import STTProviderService
+from stt_provider.scheduler import SessionFeed, SessionScheduler, session_key
+
+_LOG = logging.getLogger("test")
+
+
+def _msg(
+    subject: str, data: bytes = b"a", eos: bool = False, seq: int | None = None
+) -> MagicMock:
+    msg = MagicMock()
+    msg.subject = subject
+    msg.data = b"" if eos else data
+    msg.headers = {"LiveSTT-EOS": "true"} if eos else None
+    msg.metadata.sequence.stream = seq
+    msg.ack = AsyncMock()
+    msg.nak = AsyncMock()
+    return msg
+
+
+class _Sub:
+    """Shared pull subscription over a list that tests append to.
+
+    With ``redeliver``, NAKed messages go back to the end of the list.
+    """
+
+    def __init__(self, msgs: list[Any], redeliver: bool = False) -> None:
+        self.msgs = msgs
+        if redeliver:
+            for msg in msgs:
+                msg.nak.side_effect = lambda *_, m=msg, **__: self.msgs.append(m)
+
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[Any]:
+        if not self.msgs:
+            await asyncio.sleep(0.01)
+            raise TimeoutError
+        out, self.msgs[:] = self.msgs[:batch], self.msgs[batch:]
+        return out
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 1.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+def test_session_key_reads_room_scoped_subjects() -> None:
+    assert session_key("audio.live.s1") == ("s1", "")
+    assert session_key("audio.backfill.hall.s2") == ("s2", "hall")
+
+
+@pytest.mark.asyncio
+async def test_overlapping_sessions_transcribe_concurrently_per_room(
+    monkeypatch: pytest.MonkeyPatch, mock_transcriber_factory: Any
+) -> None:
+    monkeypatch.setattr("stt_provider.main._MAX_SESSIONS", 4)
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    service.nc = AsyncMock()
+    js = AsyncMock()
+    backfill = _Sub(
+        [
+            _msg("audio.backfill.hall.s1", eos=True),
+            _msg("audio.backfill.chapel.s2", eos=True),
+        ],
+        redeliver=True,
+    )
+    live = _Sub(
+        [
+            _msg("audio.live.hall.s1", b"s1-a"),
+            _msg("audio.live.chapel.s2", b"s2-a"),
+            _msg("audio.live.hall.s1", b"s1-b"),
+            _msg("audio.live.chapel.s2", b"s2-b"),
+        ],
+        redeliver=True,
+    )
+    js.pull_subscribe.side_effect = lambda subject, durable: (
+        backfill if subject.startswith("audio.backfill") else live
+    )
+    stop_event = asyncio.Event()
+    task = asyncio.create_task(service._run_session_loop(js, stop_event))
+
+    instances = mock_transcriber_factory.instances
+    await _until(lambda: sum(len(t.sent_audio) for t in instances) == 4)
+    by_first = {t.sent_audio[0]: t for t in instances}
+    assert by_first[b"s1-a"].sent_audio == [b"s1-a", b"s1-b"]
+    assert by_first[b"s2-a"].sent_audio == [b"s2-a", b"s2-b"]
+
+    await by_first[b"s2-a"].inject_event(TranscriptionEvent("chapel", True, 0.9))
+
+    def published() -> dict[str, str]:
+        texts = {
+            c.args[0]: json.loads(c.args[1])["text"] for c in js.publish.call_args_list
+        }
+        return {subject: text for subject, text in texts.items() if text}
+
+    await _until(lambda: bool(published()))
+    assert published() == {"transcript.raw.live.chapel": "chapel"}
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=3)
+
+
+@pytest.mark.asyncio
+async def test_sessions_over_the_limit_are_deferred_until_a_slot_frees() -> None:
+    release = asyncio.Event()
+    ran: list[str] = []
+
+    async def run_session(sid: str, room: str, bf: Any, live: Any, stop: Any) -> None:
+        ran.append(sid)
+        await release.wait()
+
+    first, second = _msg("audio.backfill.s1"), _msg("audio.backfill.s2")
+    sub = _Sub([first, second])
+    scheduler = SessionScheduler(run_session, 1, _LOG, defer_s=0.5)
+    stop_event = asyncio.Event()
+    task = asyncio.create_task(scheduler.run(sub, _Sub([]), stop_event))
+
+    await _until(lambda: second.nak.await_count == 1)
+    second.nak.assert_awaited_with(delay=0.5)
+    assert ran == ["s1"]
+
+    release.set()  # s1 finishes; JetStream redelivers s2
+    await _until(lambda: scheduler.active == 0)
+    sub.msgs.append(second)
+    await _until(lambda: ran == ["s1", "s2"])
+    assert scheduler.stats.deferred == 1
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=3)
+
+
+@pytest.mark.asyncio
+async def test_rooms_reusing_a_session_id_get_separate_workers() -> None:
+    consumed: dict[str, list[bytes]] = {"hall": [], "chapel": []}
+    hall_done = asyncio.Event()
+
+    async def run_session(sid: str, room: str, bf: Any, live: Any, stop: Any) -> None:
+        live.open()
+        while True:
+            for msg in await live.fetch(10, timeout=1):
+                if msg.headers:
+                    if room == "hall":
+                        hall_done.set()
+                    return
+                consumed[room].append(msg.data)
+
+    msgs = [
+        _msg("audio.live.hall.s1", b"h1", seq=1),
+        _msg("audio.live.chapel.s1", b"c1", seq=2),
+        _msg("audio.live.hall.s1", eos=True, seq=3),
+    ]
+    scheduler = SessionScheduler(run_session, 2, _LOG, defer_s=0.01)
+    stop_event = asyncio.Event()
+    live = _Sub(msgs, redeliver=True)
+    task = asyncio.create_task(scheduler.run(_Sub([]), live, stop_event))
+
+    await _until(lambda: hall_done.is_set() and scheduler.active == 1)
+    # The hall session's EOS must not retire the chapel session
+    late = _msg("audio.live.chapel.s1", b"c2", seq=4)
+    chapel_eos = _msg("audio.live.chapel.s1", eos=True, seq=5)
+    live.msgs.extend([late, chapel_eos])
+    await _until(lambda: scheduler.active == 0)
+
+    assert consumed == {"hall": [b"h1"], "chapel": [b"c1", b"c2"]}
+    assert scheduler.stats.started == 2
+    assert scheduler.stats.dropped_late == 0
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=3)
+
+
+def test_session_feed_holds_one_message_until_connected_and_keeps_order() -> None:
+    feed = SessionFeed(maxsize=2)
+    first, second, third = (_msg("audio.live.s1", seq=seq) for seq in (1, 2, 3))
+
+    assert feed.offer(first)
+    assert not feed.offer(second)  # not connected yet: one message only
+    feed.open()
+    assert not feed.offer(third)  # room, but 2 was deferred first
+    assert feed.offer(second)
+    assert feed.offer(third) is False  # full (2 queued)
+    assert feed.deferred == 1
+
+
+@pytest.mark.asyncio
+async def test_full_session_feed_defers_its_audio_without_holding_up_the_lane() -> None:
+    consumed: dict[str, list[bytes]] = {"s1": [], "s2": []}
+    drain = asyncio.Event()
+
+    async def run_session(sid: str, room: str, bf: Any, live: Any, stop: Any) -> None:
+        live.open()
+        if sid == "s1":
+            await drain.wait()
+        want = 5 if sid == "s1" else 2
+        while len(consumed[sid]) < want:
+            consumed[sid].extend(m.data for m in await live.fetch(10, timeout=1))
+
+    s1 = [_msg("audio.live.s1", bytes([i]), seq=i + 1) for i in range(5)]
+    s2 = [_msg("audio.live.s2", bytes([i]), seq=i + 6) for i in range(2)]
+    scheduler = SessionScheduler(run_session, 2, _LOG, queue_max=2, defer_s=0.01)
+    stop_event = asyncio.Event()
+    live = _Sub([*s1, *s2], redeliver=True)
+    task = asyncio.create_task(scheduler.run(_Sub([]), live, stop_event))
+
+    # s1 is stuck with a full feed; s2 is served regardless
+    await _until(lambda: consumed["s2"] == [b"\x00", b"\x01"])
+    assert consumed["s1"] == []
+    assert scheduler.stats.backpressured > 0
+    s1[-1].nak.assert_awaited_with(delay=0.01)
+    assert not any(m.ack.called for m in s1)
+
+    drain.set()
+    await _until(lambda: len(consumed["s1"]) == 5)
+    assert consumed["s1"] == [bytes([i]) for i in range(5)]  # in order, none lost
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=3)
+
+
+@pytest.mark.asyncio
+async def test_session_without_backfill_starts_on_live(
+    monkeypatch: pytest.MonkeyPatch, mock_transcriber_factory: Any
+) -> None:
+    """E.g. after a restart, when the session's backfill was already acked."""
+    monkeypatch.setattr("stt_provider.main._MAX_SESSIONS", 2)
+    monkeypatch.setattr("stt_provider.main._BACKFILL_WAIT_S", 0.05)
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    service.nc = AsyncMock()
+    js = AsyncMock()
+    live = _Sub(
+        [
+            _msg("audio.live.s1", b"a"),
+            _msg("audio.live.s1", b"b"),
+            _msg("audio.live.s1", eos=True),
+        ],
+        redeliver=True,
+    )
+    js.pull_subscribe.side_effect = lambda subject, durable: (
+        _Sub([]) if subject.startswith("audio.backfill") else live
+    )
+    stop_event = asyncio.Event()
+    task = asyncio.create_task(service._run_session_loop(js, stop_event))
+
+    instances = mock_transcriber_factory.instances
+    await _until(lambda: bool(instances) and instances[0].finished, timeout=3)
+    assert instances[0].sent_audio == [b"a", b"b"]
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=3)
@@ -5,6 +5,7 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from messaging.audio import AudioFrame
 from stt_provider.interfaces import TranscriptionEvent
 from stt_provider.main import (
     _DURABLE_BACKFILL,
@@ -13,16 +14,20 @@ from stt_provider.main import (
 )
 
 
-def _eos_msg() -> MagicMock:
+def _eos_msg(subject: str | None = None) -> MagicMock:
     msg = MagicMock()
+    if subject is not None:
+        msg.subject = subject
     msg.data = b""
     msg.headers = {"LiveSTT-EOS": "true"}
     msg.ack = AsyncMock()
     return msg
 
 
-def _audio_msg(data: bytes) -> MagicMock:
+def _audio_msg(data: bytes, subject: str | None = None) -> MagicMock:
     msg = MagicMock()
+    if subject is not None:
+        msg.subject = subject
     msg.data = data
     msg.headers = None
     msg.ack = AsyncMock()
@@ -193,3 +198,225 @@ async def test_backfill_only_eos_skips_to_live(
 
     stop_event.set()
     await asyncio.wait_for(task, timeout=2.0)
+
+
+@pytest.mark.asyncio
+async def test_session_room_comes_from_its_subjects(
+    mock_transcriber_factory: Any,
+) -> None:
+    """Room-scoped audio is transcribed under its own room, and another
+    room's session with the same id is skipped as stale."""
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    service.nc = AsyncMock()
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+    backfill_sub, live_sub = AsyncMock(), AsyncMock()
+
+    async def subscribe(subject: str, durable: str) -> AsyncMock:
+        return backfill_sub if subject.startswith("audio.backfill") else live_sub
+
+    mock_js.pull_subscribe.side_effect = subscribe
+
+    def feed(msgs: list[Any]) -> Any:
+        async def fetch(n: int, timeout: float) -> list[Any]:
+            if msgs:
+                return [msgs.pop(0)]
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=timeout)
+            raise TimeoutError
+
+        return fetch
+
+    other = _audio_msg(b"chapel", "audio.live.chapel.s1")
+    backfill_sub.fetch.side_effect = feed([_eos_msg("audio.backfill.hall.s1")])
+    live_sub.fetch.side_effect = feed([other, _audio_msg(b"hall", "audio.live.hall.s1")])
+
+    task = asyncio.create_task(service._run_session_loop(mock_js, stop_event))
+    await asyncio.sleep(0.2)
+
+    transcriber = mock_transcriber_factory.instances[0]
+    assert transcriber.sent_audio == [b"hall"]
+    assert other.ack.called
+
+    await transcriber.inject_event(TranscriptionEvent("hello", True, 0.9))
+    await asyncio.sleep(0.05)
+    subjects = {c.args[0] for c in mock_js.publish.call_args_list}
+    assert "transcript.raw.live.hall" in subjects
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=2.0)
+
+
+def test_deepgram_frame_passthrough_and_transcode(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Encoded audio is forwarded as-is when Deepgram accepts its encoding."""
+    pcm = b"\x10\x00\xf0\xff" * 400
+    mulaw = AudioFrame(pcm).encoded("mulaw")
+
+    monkeypatch.setenv("DEEPGRAM_ENCODING", "mulaw")
+    svc = STTProviderService()
+    assert svc._deepgram_frame(mulaw) is mulaw
+    assert svc._deepgram_frame(AudioFrame(pcm)).data == mulaw.data
+
+    monkeypatch.setenv("DEEPGRAM_ENCODING", "linear16")
+    svc = STTProviderService()
+    lossless = AudioFrame(pcm).encoded("zlib-delta")
+    assert svc._deepgram_frame(lossless).data == pcm
+
+
+@pytest.mark.asyncio
+async def test_room_filters_subscriptions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """With STT_ROOM set, only that room's audio is consumed, on its own durables."""
+    monkeypatch.setenv("STT_ROOM", "hall")
+    service = STTProviderService()
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+    stop_event.set()
+
+    await service._run_session_loop(mock_js, stop_event)
+
+    subscriptions = {
+        call.args[0]: call.kwargs["durable"]
+        for call in mock_js.pull_subscribe.call_args_list
+    }
+    assert subscriptions == {
+        "audio.backfill.hall.>": f"{_DURABLE_BACKFILL}_hall",
+        "audio.live.hall.>": f"{_DURABLE_LIVE}_hall",
+    }
+
+
+@pytest.mark.asyncio
+async def test_transcript_carries_latency_trace(mock_transcriber_factory: Any) -> None:
+    """Results are matched to the traced message holding their end offset."""
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    transcriber = mock_transcriber_factory()
+    msgs = []
+    for i in range(3):  # three 100 ms messages captured at t=100, 101, 102
+        msg = _audio_msg(b"\x00" * 3200)
+        msg.headers = {
+            "LiveSTT-Capture-Ts": f"{100 + i}.0",
+            "LiveSTT-Publish-Ts": f"{100 + i}.01",
+        }
+        msgs.append(msg)
+
+    await service._send_msgs(msgs, transcriber, "live", asyncio.Event())
+
+    event = TranscriptionEvent("hi", True, 0.9, start=0.05, duration=0.14)
+    trace = service._event_trace(event, transcriber)
+    assert trace is not None
+    assert trace["capture"] == 101.0  # ends at 0.19 s → second message
+    assert trace["publish"] <= trace["stt_send"] <= trace["stt_result"]
+    # Without offsets the latest message is used
+    latest = service._event_trace(TranscriptionEvent("hi", True, 0.9), transcriber)
+    assert latest is not None and latest["capture"] == 102.0
+
+    service._timelines.clear()  # connection closed
+    assert service._event_trace(event, transcriber) is None
+
+
+@pytest.mark.asyncio
+async def test_send_msgs_batches_acks_and_naks_after_eos(
+    mock_transcriber_factory: Any,
+) -> None:
+    """A batch is ACKed up to the EOS; later messages go back for redelivery."""
+    from stt_provider.prefetch import DrainStats
+
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    transcriber = mock_transcriber_factory()
+    audio = [_audio_msg(b"\x00" * 3200) for _ in range(3)]
+    eos = _eos_msg()
+    next_session = _audio_msg(b"\x01" * 3200)
+    next_session.nak = AsyncMock()
+    stats = DrainStats()
+
+    eos_seen = await service._send_msgs(
+        [*audio, eos, next_session],
+        transcriber,
+        "backfill",
+        asyncio.Event(),
+        close_on_eos=False,
+        stats=stats,
+    )
+
+    assert eos_seen
+    assert transcriber.sent_audio == [b"\x00" * 3200] * 3
+    assert all(m.ack.await_count == 1 for m in (*audio, eos))
+    next_session.nak.assert_awaited_once()
+    next_session.ack.assert_not_called()
+    assert (stats.messages, stats.batches) == (3, 1)
+    assert stats.audio_s == pytest.approx(0.3)
+
+
+@pytest.mark.asyncio
+async def test_send_msgs_skips_undecodable_audio(mock_transcriber_factory: Any) -> None:
+    """A bad payload or unknown codec is ACKed and skipped, not fatal."""
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    transcriber = mock_transcriber_factory()
+    unknown = _audio_msg(b"\x00" * 3200)
+    unknown.headers = {"LiveSTT-Codec": "opus"}
+    corrupt = _audio_msg(b"not deflated")
+    corrupt.headers = {"LiveSTT-Codec": "mulaw-zlib"}
+    good = _audio_msg(b"\x01" * 3200)
+    dg_closed = asyncio.Event()
+
+    eos_seen = await service._send_msgs(
+        [unknown, corrupt, good], transcriber, "live", dg_closed
+    )
+
+    assert not eos_seen and not dg_closed.is_set()
+    assert transcriber.sent_audio == [b"\x01" * 3200]
+    assert all(m.ack.await_count == 1 for m in (unknown, corrupt, good))
+
+
+@pytest.mark.asyncio
+async def test_parallel_lanes_transcribe_live_during_backfill(
+    monkeypatch: pytest.MonkeyPatch, mock_transcriber_factory: Any
+) -> None:
+    """In parallel mode live audio is sent before the backfill drain finishes."""
+    monkeypatch.setattr("stt_provider.main._PARALLEL_LANES", True)
+    service = STTProviderService(transcriber_factory=mock_transcriber_factory)
+    service.nc = AsyncMock()
+    mock_js = AsyncMock()
+    stop_event = asyncio.Event()
+    backfill_sub, live_sub = AsyncMock(), AsyncMock()
+
+    async def subscribe(subject: str, durable: str) -> AsyncMock:
+        return backfill_sub if subject.startswith("audio.backfill") else live_sub
+
+    mock_js.pull_subscribe.side_effect = subscribe
+
+    def feed(msgs: list[Any]) -> Any:
+        async def fetch(n: int, timeout: float) -> list[Any]:
+            if msgs:
+                return [msgs.pop(0)]
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(stop_event.wait(), timeout=timeout)
+            raise TimeoutError
+
+        return fetch
+
+    # Backfill never reaches its EOS during the test
+    backfill_sub.fetch.side_effect = feed([_audio_msg(b"bf1"), _audio_msg(b"bf2")])
+    live_sub.fetch.side_effect = feed([_audio_msg(b"live1")])
+
+    task = asyncio.create_task(service._run_session_loop(mock_js, stop_event))
+    await asyncio.sleep(0.2)
+
+    lanes = {t.sent_audio[0]: t for t in mock_transcriber_factory.instances}
+    assert set(lanes) == {b"bf1", b"live1"}, "one connection per lane"
+    assert lanes[b"bf1"].sent_audio == [b"bf1", b"bf2"]
+
+    await lanes[b"live1"].inject_event(TranscriptionEvent("now", True, 0.9))
+    await lanes[b"bf1"].inject_event(TranscriptionEvent("earlier", True, 0.9))
+    await asyncio.sleep(0.05)
+    published = {
+        c.args[0]: json.loads(c.args[1])["text"] for c in mock_js.publish.call_args_list
+    }
+    assert published == {
+        "transcript.raw.live": "now",
+        "transcript.raw.backfill": "earlier",
+    }
+
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=2.0)
@@ -0,0 +1,69 @@
+"""DeepgramTranscriber over a real WebSocket, against scripts/mock_deepgram.py"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from scripts.mock_deepgram import MockConfig, MockDeepgramServer
+from stt_provider.deepgram_adapter import DeepgramTranscriber
+from stt_provider.interfaces import TranscriptionEvent
+
+_PERIOD = b"\x00" * 3200  # 100 ms of 16 kHz linear16
+
+
+async def _collect(transcriber: DeepgramTranscriber) -> list[TranscriptionEvent]:
+    return [event async for event in transcriber.get_events()]
+
+
+@pytest.mark.asyncio
+async def test_adapter_streams_through_mock_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = MockConfig(latency_median_ms=5, latency_p99_ms=20, seed=1)
+    async with MockDeepgramServer(config) as server:
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "test_key")
+        monkeypatch.setenv("DEEPGRAM_URL", server.url)
+        transcriber = DeepgramTranscriber()
+        await transcriber.connect()
+        events = asyncio.create_task(_collect(transcriber))
+
+        for _ in range(25):  # 2.5 s: four interims, a final, then one more interim
+            await transcriber.send_audio(_PERIOD)
+        await transcriber.keep_alive()
+        await transcriber.finalize()
+        await asyncio.sleep(0.2)
+        await transcriber.finish()
+        results = await asyncio.wait_for(events, timeout=2)
+
+    finals = [e for e in results if e.is_final]
+    assert [(e.start, e.duration) for e in finals[:2]] == [(0.0, 2.0), (2.0, 0.5)]
+    assert finals[0].text == "w0 w1 w2 w3 w4"
+    assert any(not e.is_final for e in results)
+    assert server.stats.finalizes >= 1
+    assert server.stats.keepalives == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_server_rejects_unsupported_encoding(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async with MockDeepgramServer() as server:
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "test_key")
+        monkeypatch.setenv("DEEPGRAM_URL", server.url)
+        transcriber = DeepgramTranscriber()
+        with pytest.raises(Exception, match="400"):
+            await transcriber.connect(encoding="opus")
+    assert server.stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_server_closes_idle_streams(monkeypatch: pytest.MonkeyPatch) -> None:
+    async with MockDeepgramServer(MockConfig(idle_timeout_s=0.1)) as server:
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "test_key")
+        monkeypatch.setenv("DEEPGRAM_URL", server.url)
+        transcriber = DeepgramTranscriber()
+        await transcriber.connect()
+        assert await asyncio.wait_for(_collect(transcriber), timeout=2) == []
+    assert transcriber.closed
+    assert server.stats.idle_closes == 1
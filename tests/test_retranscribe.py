@@ -0,0 +1,164 @@
+"""scripts/retranscribe.py against the mock Deepgram and an in-memory gateway DB"""
+
+from __future__ import annotations
+
+import wave
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from api_gateway.db import Base, SessionModel, TranscriptVersion, VersionSegment
+from messaging.audio import AudioFrame
+from scripts.mock_deepgram import MockConfig, MockDeepgramServer
+from scripts.retranscribe import (
+    archive_audio,
+    archived,
+    run_jobs,
+    stream_audio,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from stt_provider.deepgram_adapter import DeepgramTranscriber
+
+_SECOND = b"\x00" * 32000  # 1 s of 16 kHz int16
+
+
+def _write_wav(path: Path, seconds: int) -> None:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(_SECOND * seconds)
+
+
+@asynccontextmanager
+async def _db() -> AsyncIterator[Any]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as db:
+        for sid in ("s1", "s2"):
+            db.add(SessionModel(id=sid, started_at="2026-01-01T10:00:00+00:00"))
+        await db.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_retranscribed_into_new_versions(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    for sid in ("s1", "s2"):
+        _write_wav(tmp_path / f"{sid}.backfill.wav", 2)
+        _write_wav(tmp_path / f"{sid}.live.wav", 3)
+
+    config = MockConfig(latency_median_ms=5, latency_p99_ms=20, seed=1)
+    async with _db() as db_factory, MockDeepgramServer(config) as server:
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "test_key")
+        monkeypatch.setenv("DEEPGRAM_URL", server.url)
+        results = await run_jobs(
+            ["s1", "s2", "missing"],
+            lambda sid: archive_audio(tmp_path, sid),
+            DeepgramTranscriber,
+            db_factory,
+            concurrency=2,
+            options={"model": "nova-3"},
+            label="rerun",
+        )
+        async with db_factory() as db:
+            versions = (await db.execute(select(TranscriptVersion))).scalars().all()
+            segments = (
+                (
+                    await db.execute(
+                        select(VersionSegment)
+                        .where(VersionSegment.version_id == results[1].version_id)
+                        .order_by(VersionSegment.id)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+    s1, _, missing = results
+    assert missing.error is not None and "no audio" in missing.error
+    assert s1.error is None and s1.audio_s == pytest.approx(5.0)
+    assert s1.x_realtime > 1.0
+    # 2 s finals; the flush covers the last second
+    assert [(seg.start_s, seg.source) for seg in s1.segments] == [
+        (0.0, "backfill"),
+        (2.0, "live"),
+        (4.0, "live"),
+    ]
+
+    assert sorted(v.session_id for v in versions) == ["s1", "s2"]
+    assert {(v.model, v.label) for v in versions} == {("nova-3", "rerun")}
+    # Backfill audio precedes the session start
+    assert [s.timestamp for s in segments] == [
+        "2026-01-01T09:59:58+00:00",
+        "2026-01-01T10:00:00+00:00",
+        "2026-01-01T10:00:02+00:00",
+    ]
+
+
+class _Sub:
+    def __init__(self, msgs: list[Any]) -> None:
+        self.msgs = msgs
+        self.unsubscribe = AsyncMock()
+
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[Any]:
+        if not self.msgs:
+            raise TimeoutError
+        out, self.msgs = self.msgs[:batch], self.msgs[batch:]
+        return out
+
+
+def _msg(data: bytes, pending: int, headers: dict[str, str] | None = None) -> Any:
+    metadata = SimpleNamespace(num_pending=pending)
+    return SimpleNamespace(data=data, headers=headers, metadata=metadata)
+
+
+@pytest.mark.asyncio
+async def test_stream_audio_is_read_to_the_end_and_archived(tmp_path: Path) -> None:
+    packed = AudioFrame(_SECOND, periods=2)
+    eos = {"LiveSTT-EOS": "true"}
+    subs = {
+        "audio.backfill.hall.s1": _Sub([_msg(_SECOND, 1), _msg(b"", 0, eos)]),
+        "audio.live.hall.s1": _Sub([_msg(packed.data, 0, packed.headers())]),
+    }
+    js = AsyncMock()
+    js.pull_subscribe.side_effect = lambda subject, **kwargs: subs[subject]
+
+    audio = archived(stream_audio(js, "s1", room="hall"), tmp_path, "s1")
+    chunks = [(lane, len(pcm)) async for lane, pcm in audio]
+    assert chunks == [("backfill", 32000), ("live", 32000)]
+    assert all(sub.unsubscribe.await_count == 1 for sub in subs.values())
+
+    replayed = [(lane, len(pcm)) async for lane, pcm in archive_audio(tmp_path, "s1")]
+    assert replayed == [("backfill", 16000)] * 2 + [("live", 16000)] * 2
+
+
+class _DroppedSub(_Sub):
+    async def fetch(self, batch: int = 1, timeout: float = 1.0) -> list[Any]:
+        if not self.msgs:
+            raise ConnectionError("nats down")
+        return await super().fetch(batch, timeout)
+
+
+@pytest.mark.asyncio
+async def test_failed_stream_leaves_no_archive_behind(tmp_path: Path) -> None:
+    subs = {
+        "audio.backfill.s1": _Sub([_msg(_SECOND, 0)]),
+        "audio.live.s1": _DroppedSub([_msg(_SECOND, 1)]),
+    }
+    js = AsyncMock()
+    js.pull_subscribe.side_effect = lambda subject, **kwargs: subs[subject]
+
+    with pytest.raises(ConnectionError):
+        async for _ in archived(stream_audio(js, "s1"), tmp_path, "s1"):
+            pass
+    assert list(tmp_path.iterdir()) == []